@@ -1,3 +1,4 @@
+from contextlib import asynccontextmanager
 from logging.config import dictConfig
 from pathlib import Path
 
@@ -6,20 +7,43 @@ from fastapi.exceptions import RequestValidationError
 from fastapi.responses import RedirectResponse
 from fastapi_pagination import add_pagination
 from sqlalchemy.exc import DBAPIError
+from starlette.concurrency import run_in_threadpool
 
 from app import api
+from app.core.container import Container
+from app.core.database import QueryStatsMiddleware
 from app.core.exceptions import AppException, AppExceptionCase, app_exception_handler
 from app.core.log import log_config
+from app.core.metrics import PrometheusMiddleware
+from app.core.profiling import ProfilingMiddleware
+from app.core.tracing import TracingMiddleware, configure_tracing
+from app.utils import ORJSONResponse
+from config import settings
 
 dictConfig(log_config())
 
 APP_ROOT = Path(__file__).parent.parent
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    app.state.container = Container()
+    app.state.container.token_revocation_service.start()
+    app.state.container.activity_tracker_service.start()
+    if settings.warm_up_enabled:
+        await run_in_threadpool(app.state.container.health_service.warm_up)
+    yield
+    app.state.container.token_revocation_service.stop()
+    await run_in_threadpool(app.state.container.activity_tracker_service.stop)
+
+
 def create_app():
+    configure_tracing()
     app = FastAPI(
         title="FastApi Base Repository",
         description="Base repository for building microservices",
+        default_response_class=ORJSONResponse,
+        lifespan=lifespan,
     )
     register_api_routers(app)
     register_extensions(app)
@@ -38,6 +62,13 @@ def register_api_routers(app: FastAPI):
 
 def register_extensions(app: FastAPI):
     add_pagination(app)
+    if settings.profiling_enabled:
+        app.add_middleware(ProfilingMiddleware)
+    app.add_middleware(QueryStatsMiddleware)
+    if settings.metrics_enabled:
+        app.add_middleware(PrometheusMiddleware)
+    if settings.tracing_enabled:
+        app.add_middleware(TracingMiddleware)
 
     @app.exception_handler(HTTPException)
     def handle_http_exception(request, exc):
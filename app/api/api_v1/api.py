@@ -1,6 +1,14 @@
 from fastapi import FastAPI
 
+from config import settings
+
 from .endpoints import (
+    health_base_url,
+    health_router,
+    metrics_base_url,
+    metrics_router,
+    profile_base_url,
+    profile_router,
     resource_base_url,
     resource_router,
     role_base_url,
@@ -11,6 +19,15 @@ from .endpoints import (
 
 
 def init_api_v1(app: FastAPI):
+    app.include_router(router=health_router, tags=["Health"], prefix=health_base_url)
+    if settings.metrics_enabled:
+        app.include_router(
+            router=metrics_router, tags=["Metrics"], prefix=metrics_base_url
+        )
+    if settings.profiling_enabled:
+        app.include_router(
+            router=profile_router, tags=["Profiling"], prefix=profile_base_url
+        )
     app.include_router(
         router=user_router, tags=["UserAccountManagement"], prefix=user_base_url
     )
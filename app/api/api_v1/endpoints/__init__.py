@@ -1,3 +1,6 @@
+from .health_view import health_base_url, health_router
+from .metrics_view import metrics_base_url, metrics_router
+from .profile_view import profile_base_url, profile_router
 from .resource_view import resource_base_url, resource_router
 from .role_view import role_base_url, role_router
 from .user_view import user_base_url, user_router
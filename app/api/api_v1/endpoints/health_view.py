@@ -0,0 +1,46 @@
+from fastapi import APIRouter, Depends, Response, status
+
+from app.core.container import get_health_service
+from app.enums import HealthStatusEnum
+from app.schema import HealthSchema
+from app.services import HealthService
+
+health_router = APIRouter()
+health_base_url = "/health"
+
+
+@health_router.get("/live", response_model=HealthSchema)
+def live() -> HealthSchema:
+    """
+    Report that the worker is running, without checking any other service.
+
+    :return: The status of the worker.
+    :rtype: HealthSchema
+    """
+    return HealthSchema(status=HealthStatusEnum.ok)
+
+
+@health_router.get(
+    "/ready",
+    response_model=HealthSchema,
+    responses={status.HTTP_503_SERVICE_UNAVAILABLE: {"model": HealthSchema}},
+)
+def ready(
+    response: Response,
+    health_service: HealthService = Depends(get_health_service),  # noqa
+) -> HealthSchema:
+    """
+    Report whether the worker is warmed up and the services it needs are available.
+
+    :param response: The response, its status is 503 when the worker is not ready.
+    :type response: Response
+    :param health_service: The service checking the dependencies of the worker.
+    :type health_service: HealthService
+    :return: The status of the worker and the result of each check.
+    :rtype: HealthSchema
+    """
+    checks = health_service.checks()
+    if not health_service.is_ready(checks):
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+        return HealthSchema(status=HealthStatusEnum.unavailable, checks=checks)
+    return HealthSchema(status=HealthStatusEnum.ok, checks=checks)
@@ -0,0 +1,18 @@
+from fastapi import APIRouter, Response
+from prometheus_client import CONTENT_TYPE_LATEST
+
+from app.core.metrics import latest_metrics
+
+metrics_router = APIRouter()
+metrics_base_url = "/metrics"
+
+
+@metrics_router.get("", include_in_schema=False)
+def metrics() -> Response:
+    """
+    Expose the metrics of every worker in the prometheus text format.
+
+    :return: The metrics.
+    :rtype: Response
+    """
+    return Response(content=latest_metrics(), media_type=CONTENT_TYPE_LATEST)
@@ -0,0 +1,43 @@
+from fastapi import APIRouter, Depends
+from fastapi.responses import PlainTextResponse
+
+from app.core.container import get_profile_store_service
+from app.core.exceptions import AppException
+from app.services import ProfileStoreService
+from app.utils import KeycloakJwtAuthentication
+from config import settings
+
+profile_router = APIRouter()
+profile_base_url = "/api/v1/profiles"
+profiling_admin = KeycloakJwtAuthentication(roles=[settings.profiling_admin_role])
+
+
+@profile_router.get("/{profile_id}", response_class=PlainTextResponse)
+def get_profile(
+    profile_id: str,
+    current_user: dict = Depends(profiling_admin),  # noqa
+    profile_store_service: ProfileStoreService = Depends(  # noqa
+        get_profile_store_service
+    ),
+) -> PlainTextResponse:
+    """
+    Download the profile of a request, in the folded stacks format. The id the
+    client sent the request with, if any, is sent back in the X-Request-ID
+    header.
+
+    :param profile_id: The id sent back in the X-Profile-Id header.
+    :type profile_id: str
+    :param current_user: The admin downloading the profile.
+    :type current_user: dict
+    :param profile_store_service: The service keeping the profiles.
+    :type profile_store_service: ProfileStoreService
+    :return: The profile.
+    :rtype: PlainTextResponse
+    """
+    profile = profile_store_service.get(profile_id)
+    if profile is None:
+        raise AppException.NotFoundException(
+            error_message=f"profile {profile_id} does not exist"
+        )
+    headers = {"X-Request-ID": profile["request_id"]} if profile["request_id"] else {}
+    return PlainTextResponse(content=profile["profile"], headers=headers)
@@ -1,28 +1,23 @@
 import uuid
 from typing import Optional
 
-import pinject
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Response, status
 
+from app import constants
 from app.controllers import ResourceController
+from app.core.container import get_resource_controller
 from app.enums import SortResultEnum
-from app.repositories import PermissionRepository, ResourceRepository
 from app.schema import (
     CreateResourceSchema,
     PermissionSchema,
     ResourcePermissionSchema,
     ResourceSchema,
 )
-from app.utils import KeycloakJwtAuthentication, Page, Params
+from app.utils import CachedResponse, HttpCache, KeycloakJwtAuthentication, Page, Params
 
 resource_router = APIRouter()
 resource_base_url = "/api/v1/resources"
-
-obj_graph = pinject.new_object_graph(
-    modules=None,
-    classes=[ResourceController, ResourceRepository, PermissionRepository],
-)
-resource_controller: ResourceController = obj_graph.provide(ResourceController)
+resource_cache = HttpCache(namespace=constants.RESOURCE_CACHE_NAMESPACE)
 
 
 @resource_router.post(
@@ -31,6 +26,7 @@ resource_controller: ResourceController = obj_graph.provide(ResourceController)
 def add_resource(
     obj_data: CreateResourceSchema,
     current_user: dict = Depends(KeycloakJwtAuthentication()),  # noqa
+    resource_controller: ResourceController = Depends(get_resource_controller),  # noqa
 ) -> ResourceSchema:
     """
     Add a resource.
@@ -39,6 +35,8 @@ def add_resource(
     :type obj_data: CreateResourceSchema
     :param current_user: The current authenticated user data.
     :type current_user: dict, optional
+    :param resource_controller: The controller handling the request.
+    :type resource_controller: ResourceController
     :return: The added resource model.
     :rtype: ResourceSchema
     """
@@ -53,7 +51,9 @@ def view_all_resources(
     order_by: Optional[str] = None,
     paginate: Params = Depends(),  # noqa
     current_user: dict = Depends(KeycloakJwtAuthentication()),  # noqa
-):
+    cached_response: CachedResponse = Depends(resource_cache),  # noqa
+    resource_controller: ResourceController = Depends(get_resource_controller),  # noqa
+) -> Response:
     """
     View all resources.
 
@@ -67,23 +67,31 @@ def view_all_resources(
     :type paginate: Params
     :param current_user: Current user information.
     :type current_user: dict
+    :param cached_response: The conditional response of the request.
+    :type cached_response: CachedResponse
+    :param resource_controller: The controller handling the request.
+    :type resource_controller: ResourceController
     :return: Result of viewing all resources.
-    :rtype: [ResourceSchema]
+    :rtype: Response
     """
-    result = resource_controller.view_all_resource(
-        search=search,
-        sort_in=sort_in,
-        order_by=order_by,
-        paginate=paginate,
+    return cached_response.respond(
+        load=lambda: resource_controller.view_all_resource(
+            search=search,
+            sort_in=sort_in,
+            order_by=order_by,
+            paginate=paginate,
+        ),
+        response_model=Page[ResourceSchema],
     )
-    return result
 
 
 @resource_router.get("/{resource_id}", response_model=ResourceSchema)
 def view_resource(
     resource_id: uuid.UUID,
     current_user: dict = Depends(KeycloakJwtAuthentication()),  # noqa
-) -> ResourceSchema:
+    cached_response: CachedResponse = Depends(resource_cache),  # noqa
+    resource_controller: ResourceController = Depends(get_resource_controller),  # noqa
+) -> Response:
     """
     View a resource.
 
@@ -91,19 +99,27 @@ def view_resource(
     :type resource_id: uuid.UUID
     :param current_user: The current authenticated user data.
     :type current_user: dict
+    :param cached_response: The conditional response of the request.
+    :type cached_response: CachedResponse
+    :param resource_controller: The controller handling the request.
+    :type resource_controller: ResourceController
     :return: The resource model.
-    :rtype: ResourceSchema
+    :rtype: Response
 
     :raises AppException.NotFoundException: If the resource is not found.
     """
-    result = resource_controller.view_resource(str(resource_id))
-    return result
+    return cached_response.respond(
+        load=lambda: resource_controller.view_resource(str(resource_id)),
+        response_model=ResourceSchema,
+        load_first=True,
+    )
 
 
 @resource_router.post("/permissions", response_model=PermissionSchema)
 def assign_permission_to_resource(
     obj_data: ResourcePermissionSchema,
     current_user: dict = Depends(KeycloakJwtAuthentication()),  # noqa
+    resource_controller: ResourceController = Depends(get_resource_controller),  # noqa
 ) -> PermissionSchema:
     """
     Assign a permission to a resource.
@@ -112,6 +128,8 @@ def assign_permission_to_resource(
     :type obj_data: ResourcePermissionSchema
     :param current_user: The current authenticated user data.
     :type current_user: dict
+    :param resource_controller: The controller handling the request.
+    :type resource_controller: ResourceController
     :return: The permission model.
     :rtype: PermissionSchema
 
@@ -1,18 +1,12 @@
 import uuid
-from typing import List, Optional
+from typing import Optional
 
-import pinject
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Response, status
 
+from app import constants
 from app.controllers import RoleController
+from app.core.container import get_role_controller
 from app.enums import SortResultEnum
-from app.repositories import (
-    PermissionRepository,
-    RolePermissionRepository,
-    RoleRepository,
-    UserRepository,
-    UserRoleRepository,
-)
 from app.schema import (
     AssignRolePermissionSchema,
     AssignUserRoleSchema,
@@ -20,28 +14,18 @@ from app.schema import (
     PermissionSchema,
     RoleSchema,
 )
-from app.utils import KeycloakJwtAuthentication, Page, Params
+from app.utils import CachedResponse, HttpCache, KeycloakJwtAuthentication, Page, Params
 
 role_router = APIRouter()
 role_base_url = "/api/v1/roles"
-obj_graph = pinject.new_object_graph(
-    modules=None,
-    classes=[
-        RoleController,
-        RoleRepository,
-        UserRoleRepository,
-        UserRepository,
-        PermissionRepository,
-        RolePermissionRepository,
-    ],
-)
-role_controller: RoleController = obj_graph.provide(RoleController)
+role_cache = HttpCache(namespace=constants.ROLE_CACHE_NAMESPACE)
 
 
 @role_router.post("", response_model=RoleSchema, status_code=status.HTTP_201_CREATED)
 def add_role(
     obj_data: CreateRoleSchema,
     current_user: dict = Depends(KeycloakJwtAuthentication()),  # noqa
+    role_controller: RoleController = Depends(get_role_controller),  # noqa
 ):
     result = role_controller.add_role(current_user, obj_data.dict())
     return result
@@ -54,28 +38,39 @@ def view_all_roles(
     order_by: Optional[str] = None,
     paginate: Params = Depends(),  # noqa
     current_user: dict = Depends(KeycloakJwtAuthentication()),  # noqa
-) -> List[RoleSchema]:
-    result = role_controller.view_all_roles(
-        search=search,
-        sort_in=sort_in,
-        order_by=order_by,
-        paginate=paginate,
+    cached_response: CachedResponse = Depends(role_cache),  # noqa
+    role_controller: RoleController = Depends(get_role_controller),  # noqa
+) -> Response:
+    return cached_response.respond(
+        load=lambda: role_controller.view_all_roles(
+            search=search,
+            sort_in=sort_in,
+            order_by=order_by,
+            paginate=paginate,
+        ),
+        response_model=Page[RoleSchema],
     )
-    return result
 
 
 @role_router.get("/{role_id}", response_model=RoleSchema)
 def view_role(
-    role_id: uuid.UUID, current_user: dict = Depends(KeycloakJwtAuthentication())  # noqa
-):
-    result = role_controller.view_role(str(role_id))
-    return result
+    role_id: uuid.UUID,
+    current_user: dict = Depends(KeycloakJwtAuthentication()),  # noqa
+    cached_response: CachedResponse = Depends(role_cache),  # noqa
+    role_controller: RoleController = Depends(get_role_controller),  # noqa
+) -> Response:
+    return cached_response.respond(
+        load=lambda: role_controller.view_role(str(role_id)),
+        response_model=RoleSchema,
+        load_first=True,
+    )
 
 
 @role_router.post("/users", response_model=RoleSchema)
 def assign_role_to_user(
     obj_data: AssignUserRoleSchema,
     current_user: dict = Depends(KeycloakJwtAuthentication()),  # noqa
+    role_controller: RoleController = Depends(get_role_controller),  # noqa
 ):
     result = role_controller.assign_role_to_user(current_user, obj_data.dict())
     return result
@@ -85,6 +80,7 @@ def assign_role_to_user(
 def assign_permission_to_role(
     obj_data: AssignRolePermissionSchema,
     current_user: dict = Depends(KeycloakJwtAuthentication()),  # noqa
+    role_controller: RoleController = Depends(get_role_controller),  # noqa
 ):
     result = role_controller.assign_permission_to_role(current_user, obj_data.dict())
     return result
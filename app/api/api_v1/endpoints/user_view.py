@@ -1,20 +1,27 @@
 import uuid
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Union
 
-import pinject
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Query, Request, status
+from fastapi.responses import StreamingResponse
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 
+from app import constants
 from app.controllers import UserController
-from app.enums import SortResultEnum
-from app.repositories import UserOtpRepository, UserRepository
+from app.core.container import get_user_controller
+from app.enums import ExportFormatEnum, RateLimitKeyEnum, SortResultEnum
 from app.schema import (
     CreateUserSchema,
+    TokenIntrospectionResponseSchema,
+    TokenIntrospectionSchema,
     UpdateUserSchema,
+    UserBatchResponseSchema,
+    UserBatchSchema,
     UserChangePasswordSchema,
     UserChangePhoneSchema,
     UserIdSchema,
     UserLoginResponseSchema,
     UserLoginSchema,
+    UserLogoutSchema,
     UserOtpConfirmationResponseSchema,
     UserOtpConfirmationSchema,
     UserPhoneVerificationSchema,
@@ -23,29 +30,57 @@ from app.schema import (
     UserSendOtpSchema,
     UserTokenRefreshSchema,
 )
-from app.services import KeycloakAuthService, RedisService
 from app.utils import (
     KeycloakJwtAuthentication,
+    ORJSONResponse,
     Page,
     Params,
+    RateLimiter,
+    SparseFields,
+    accepts_gzip,
+    close_after_stream,
     data_responses,
+    gzip_stream,
     query_responses,
 )
+from config import settings
 
 user_router = APIRouter()
 user_base_url = "/api/v1/users"
 
-obj_graph = pinject.new_object_graph(
-    modules=None,
-    classes=[
-        UserController,
-        UserRepository,
-        UserOtpRepository,
-        RedisService,
-        KeycloakAuthService,
-    ],
+login_rate_limit = RateLimiter(
+    scope="login",
+    limits={
+        RateLimitKeyEnum.ip: settings.rate_limit_ip,
+        RateLimitKeyEnum.username: settings.rate_limit_login,
+    },
 )
-user_controller: UserController = obj_graph.provide(UserController)
+phone_verify_rate_limit = RateLimiter(
+    scope="phone_verify",
+    limits={
+        RateLimitKeyEnum.ip: settings.rate_limit_ip,
+        RateLimitKeyEnum.username: settings.rate_limit_phone_verify,
+    },
+)
+otp_send_rate_limit = RateLimiter(
+    scope="otp_send",
+    limits={
+        RateLimitKeyEnum.ip: settings.rate_limit_ip,
+        RateLimitKeyEnum.user_id: settings.rate_limit_otp_send,
+        RateLimitKeyEnum.phone: settings.rate_limit_otp_send,
+    },
+)
+otp_confirm_rate_limit = RateLimiter(
+    scope="otp_confirm",
+    limits={
+        RateLimitKeyEnum.ip: settings.rate_limit_ip,
+        RateLimitKeyEnum.user_id: settings.rate_limit_otp_confirm,
+    },
+)
+export_format_query = Query(ExportFormatEnum.csv, alias="format")
+user_fields = SparseFields(UserSchema)
+bearer_token = HTTPBearer()
+internal_service = KeycloakJwtAuthentication(roles=[settings.internal_service_role])
 
 
 @user_router.get("", response_model=Page[UserSchema], responses=query_responses)
@@ -54,12 +89,18 @@ def get_all_users(
     sort_in: Optional[SortResultEnum] = SortResultEnum.asc,
     order_by: Optional[str] = None,
     is_deleted: Optional[bool] = False,
+    fields: Optional[List[str]] = Depends(user_fields),  # noqa
     paginate: Params = Depends(),  # noqa
     current_user: dict = Depends(KeycloakJwtAuthentication()),  # noqa
-) -> Page[UserSchema]:
+    user_controller: UserController = Depends(get_user_controller),  # noqa
+) -> Union[Page[UserSchema], ORJSONResponse]:
     """
     Retrieve all users in the system based on the provided queries.
 
+    Only the columns of UserSchema are selected. With `fields`, e.g.
+    fields=id,username, only the requested columns are selected and the
+    rows are sent as they are read, without being validated by UserSchema.
+
     :param paginate: The pagination parameters.
     :type paginate: Params, optional
     :param search: The search keyword.
@@ -70,23 +111,128 @@ def get_all_users(
     :type order_by: str, optional
     :param is_deleted: Flag to include deleted users.
     :type is_deleted: bool, optional
+    :param fields: The fields of the users to return, all of them when None.
+    :type fields: List[str], optional
     :param current_user: The current user making the get request.
     :type current_user: dict
+    :param user_controller: The controller handling the request.
+    :type user_controller: UserController
     :return: The result of retrieving all users
     :rtype: Page[SampleSchema]
     """
-    return user_controller.get_all_users(
+    result: Page = user_controller.get_all_users(
         search=search,
         sort_in=sort_in,
         order_by=order_by,
         is_deleted=is_deleted,
         paginate=paginate,
+        columns=fields or list(UserSchema.__fields__),
+    )
+    if fields:
+        return ORJSONResponse(
+            {"data": [row._asdict() for row in result.data], "count": result.count}
+        )
+    return result
+
+
+@user_router.post(
+    "/batch",
+    response_model=UserBatchResponseSchema,
+    responses={**data_responses, **query_responses},
+)
+def get_users_batch(
+    obj_data: UserBatchSchema,
+    current_user: dict = Depends(KeycloakJwtAuthentication()),  # noqa
+    user_controller: UserController = Depends(get_user_controller),  # noqa
+) -> UserBatchResponseSchema:
+    """
+    Retrieve the users matching up to USER_BATCH_MAX_SIZE ids, usernames or
+    emails in one request.
+
+    :param obj_data: The field to match and the values to look up.
+    :type obj_data: UserBatchSchema
+    :param current_user: The current user making the request.
+    :type current_user: dict
+    :param user_controller: The controller handling the request.
+    :type user_controller: UserController
+    :return: The users found and the values matching no user.
+    :rtype: UserBatchResponseSchema
+    """
+    return user_controller.get_users_by(field=obj_data.field, values=obj_data.values)
+
+
+@user_router.get(
+    "/export",
+    response_class=StreamingResponse,
+    responses={
+        **query_responses,
+        200: {"content": dict.fromkeys(constants.EXPORT_MEDIA_TYPES.values(), {})},
+    },
+)
+def export_users(
+    request: Request,
+    export_format: ExportFormatEnum = export_format_query,
+    search: Optional[str] = "",
+    sort_in: Optional[SortResultEnum] = SortResultEnum.asc,
+    order_by: Optional[str] = None,
+    is_deleted: Optional[bool] = False,
+    current_user: dict = Depends(KeycloakJwtAuthentication()),  # noqa
+    user_controller: UserController = Depends(get_user_controller),  # noqa
+) -> StreamingResponse:
+    """
+    Export every user matching the provided queries, as csv or ndjson.
+
+    The users are streamed as they are read from the database, with the
+    same search, filter and sort semantics as get_all_users but without
+    pagination. The export is gzip compressed on the fly when the client
+    accepts it.
+
+    :param request: The request, its Accept-Encoding header is honoured.
+    :type request: Request
+    :param export_format: The format of the export.
+    :type export_format: ExportFormatEnum, optional
+    :param search: The search keyword.
+    :type search: str, optional
+    :param sort_in: The sorting direction.
+    :type sort_in: QuerySortEnum, optional
+    :param order_by: The attribute to sort by.
+    :type order_by: str, optional
+    :param is_deleted: Flag to include deleted users.
+    :type is_deleted: bool, optional
+    :param current_user: The current user making the export request.
+    :type current_user: dict
+    :param user_controller: The controller handling the request.
+    :type user_controller: UserController
+    :return: The streamed export.
+    :rtype: StreamingResponse
+    """
+    chunks = user_controller.export_users(
+        export_format=export_format,
+        columns=list(UserSchema.__fields__),
+        search=search,
+        sort_in=sort_in,
+        order_by=order_by,
+        is_deleted=is_deleted,
+    )
+    headers = {
+        "Content-Disposition": f'attachment; filename="users.{export_format.value}"',
+        "Vary": "Accept-Encoding",
+    }
+    if accepts_gzip(request.headers.get("Accept-Encoding", "")):
+        chunks = gzip_stream(chunks)
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(
+        close_after_stream(chunks),
+        media_type=constants.EXPORT_MEDIA_TYPES[export_format.value],
+        headers=headers,
     )
 
 
 @user_router.get("/{user_id}", response_model=UserSchema, responses=query_responses)
 def get_user(
-    user_id: uuid.UUID, current_user: dict = Depends(KeycloakJwtAuthentication())  # noqa
+    user_id: uuid.UUID,
+    current_user: dict = Depends(KeycloakJwtAuthentication()),  # noqa
+    user_controller: UserController = Depends(get_user_controller),  # noqa
 ) -> UserSchema:
     """
     Retrieve a user based on the user's id.
@@ -95,6 +241,8 @@ def get_user(
     :type user_id: uuid.UUID
     :param current_user: The current user making the get request.
     :type current_user: dict
+    :param user_controller: The controller handling the request.
+    :type user_controller: UserController
     :return: The result of retrieving the user.
     :rtype: SampleSchema
     """
@@ -107,12 +255,17 @@ def get_user(
     status_code=status.HTTP_201_CREATED,
     responses={**data_responses, **query_responses},
 )
-def create_user(obj_data: CreateUserSchema) -> UserSchema:
+def create_user(
+    obj_data: CreateUserSchema,
+    user_controller: UserController = Depends(get_user_controller),  # noqa
+) -> UserSchema:
     """
     Create a user.
 
     :param obj_data: The data for creating the user.
     :type obj_data: CreateSampleSchema
+    :param user_controller: The controller handling the request.
+    :type user_controller: UserController
     :return: The result of creating the user.
     :rtype: SampleSchema
     """
@@ -129,6 +282,7 @@ def update_user(
     user_id: uuid.UUID,
     obj_data: UpdateUserSchema,
     current_user: dict = Depends(KeycloakJwtAuthentication()),  # noqa
+    user_controller: UserController = Depends(get_user_controller),  # noqa
 ) -> UserSchema:
     """
     Update a user based on the user's id.
@@ -139,6 +293,8 @@ def update_user(
     :type obj_data: UpdateUserSchema
     :param current_user: The current user making the update request.
     :type current_user: dict
+    :param user_controller: The controller handling the request.
+    :type user_controller: UserController
     :return: The result of updating the user.
     :rtype: UserSchema
     """
@@ -149,7 +305,9 @@ def update_user(
     "/{user_id}", status_code=status.HTTP_204_NO_CONTENT, responses=query_responses
 )
 def delete_user(
-    user_id: uuid.UUID, current_user: dict = Depends(KeycloakJwtAuthentication())  # noqa
+    user_id: uuid.UUID,
+    current_user: dict = Depends(KeycloakJwtAuthentication()),  # noqa
+    user_controller: UserController = Depends(get_user_controller),  # noqa
 ) -> None:
     """
     Delete a resource based on the resource's id.
@@ -158,19 +316,30 @@ def delete_user(
     :type user_id: uuid.UUID
     :param current_user: The current user making the delete request.
     :type current_user: dict
+    :param user_controller: The controller handling the request.
+    :type user_controller: UserController
     :return: The result of deleting the user.
     :rtype: None
     """
     return user_controller.delete_user(str(user_id))
 
 
-@user_router.post("/token/access", response_model=UserLoginResponseSchema)
-def user_login(obj_data: UserLoginSchema) -> Dict:
+@user_router.post(
+    "/token/access",
+    response_model=UserLoginResponseSchema,
+    dependencies=[Depends(login_rate_limit)],
+)
+def user_login(
+    obj_data: UserLoginSchema,
+    user_controller: UserController = Depends(get_user_controller),  # noqa
+) -> Dict:
     """
     Perform user login with the provided user data.
 
     :param obj_data: The user data for login.
     :type obj_data: UserLoginSchema
+    :param user_controller: The controller handling the request.
+    :type user_controller: UserController
     :return: The result of the user login operation.
     :rtype: dict
     """
@@ -180,34 +349,105 @@ def user_login(obj_data: UserLoginSchema) -> Dict:
 @user_router.get("/account/profile", responses=query_responses)
 def user_profile(
     current_user: dict = Depends(KeycloakJwtAuthentication()),  # noqa
+    user_controller: UserController = Depends(get_user_controller),  # noqa
 ) -> UserSchema:
     """
     Get the user profile for the current user.
 
     :param current_user: The current user's information obtained from authentication.
     :type current_user: dict
+    :param user_controller: The controller handling the request.
+    :type user_controller: UserController
     :return: UserSchema
     """
     return user_controller.user_profile(current_user)
 
 
 @user_router.post("/token/refresh", response_model=UserLoginResponseSchema)
-def refresh_token(obj_data: UserTokenRefreshSchema) -> Dict:
+def refresh_token(
+    obj_data: UserTokenRefreshSchema,
+    user_controller: UserController = Depends(get_user_controller),  # noqa
+) -> Dict:
     """
     Refresh the user token with the provided data.
 
     :param obj_data: The data for refreshing the user token.
     :type obj_data: UserTokenRefreshSchema
+    :param user_controller: The controller handling the request.
+    :type user_controller: UserController
     :return: The result of the token refresh operation.
     :rtype: dict
     """
     return user_controller.refresh_user_token(obj_data.dict())
 
 
-@user_router.post("/update/phone/verify", response_model=UserIdSchema)
+@user_router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+def user_logout(
+    obj_data: UserLogoutSchema,
+    credentials: HTTPAuthorizationCredentials = Depends(bearer_token),  # noqa
+    current_user: dict = Depends(KeycloakJwtAuthentication()),  # noqa
+    user_controller: UserController = Depends(get_user_controller),  # noqa
+) -> None:
+    """
+    Log the current user out, their access token is revoked and their
+    refresh token can no longer be used.
+
+    :param obj_data: The refresh token of the user.
+    :type obj_data: UserLogoutSchema
+    :param credentials: The access token of the user.
+    :type credentials: HTTPAuthorizationCredentials
+    :param current_user: The current user's information obtained from authentication.
+    :type current_user: dict
+    :param user_controller: The controller handling the request.
+    :type user_controller: UserController
+    :return: None
+    """
+    user_controller.user_logout(
+        access_token=credentials.credentials,
+        auth_user=current_user,
+        obj_data=obj_data.dict(),
+    )
+
+
+@user_router.post(
+    "/token/introspect",
+    response_model=TokenIntrospectionResponseSchema,
+    response_model_exclude_none=True,
+)
+def introspect_token(
+    obj_data: TokenIntrospectionSchema,
+    caller: dict = Depends(internal_service),  # noqa
+    user_controller: UserController = Depends(get_user_controller),  # noqa
+) -> Dict:
+    """
+    Validate an access token for a downstream service, once for the cluster.
+
+    A valid token is described by the id, username, status and effective
+    roles of its user, anything else is reported as {"active": false}. The
+    downstream service authenticates with the token of its service account,
+    which must grant `internal_service_role`.
+
+    :param obj_data: The token to introspect.
+    :type obj_data: TokenIntrospectionSchema
+    :param caller: The service account of the downstream service.
+    :type caller: dict
+    :param user_controller: The controller handling the request.
+    :type user_controller: UserController
+    :return: The result of the introspection.
+    :rtype: dict
+    """
+    return user_controller.introspect_token(obj_data.token)
+
+
+@user_router.post(
+    "/update/phone/verify",
+    response_model=UserIdSchema,
+    dependencies=[Depends(phone_verify_rate_limit)],
+)
 def verify_phone(
     obj_data: UserPhoneVerificationSchema,
     current_user: dict = Depends(KeycloakJwtAuthentication()),  # noqa
+    user_controller: UserController = Depends(get_user_controller),  # noqa
 ) -> Dict:
     """
     Verify a new phone number for a user.
@@ -216,6 +456,8 @@ def verify_phone(
     :type obj_data: SampleSchema
     :param current_user: The current user obtained from authentication.
     :type current_user: dict
+    :param user_controller: The controller handling the request.
+    :type user_controller: UserController
     :return: The result of the phone verification operation.
     :rtype: dict
     """
@@ -226,6 +468,7 @@ def verify_phone(
 def change_phone(
     obj_data: UserChangePhoneSchema,
     current_user: dict = Depends(KeycloakJwtAuthentication()),  # noqa
+    user_controller: UserController = Depends(get_user_controller),  # noqa
 ) -> Dict:
     """
     Change the phone number for a user.
@@ -234,6 +477,8 @@ def change_phone(
     :type obj_data: SampleSchema
     :param current_user: The current user obtained from authentication.
     :type current_user: dict
+    :param user_controller: The controller handling the request.
+    :type user_controller: UserController
     :return: The result of the phone number change operation.
     :rtype: dict
     """
@@ -244,6 +489,7 @@ def change_phone(
 def change_password(
     obj_data: UserChangePasswordSchema,
     current_user: dict = Depends(KeycloakJwtAuthentication()),  # noqa
+    user_controller: UserController = Depends(get_user_controller),  # noqa
 ) -> Dict:
     """
     Change the password for a user.
@@ -252,6 +498,8 @@ def change_password(
     :type obj_data: UserChangePasswordSchema
     :param current_user: The current user obtained from authentication.
     :type current_user: dict
+    :param user_controller: The controller handling the request.
+    :type user_controller: UserController
     :return: The result of the password change operation.
     :rtype: dict
     """
@@ -259,21 +507,31 @@ def change_password(
 
 
 @user_router.post("/update/password/reset", response_model=UserIdSchema)
-def reset_password(obj_data: UserResetPasswordSchema) -> Dict:
+def reset_password(
+    obj_data: UserResetPasswordSchema,
+    user_controller: UserController = Depends(get_user_controller),  # noqa
+) -> Dict:
     """
     Reset the password for a user.
 
     :param obj_data: The data for resetting the password.
     :type obj_data: UserResetPasswordSchema
+    :param user_controller: The controller handling the request.
+    :type user_controller: UserController
     :return: The result of the password reset operation.
     :rtype: dict
     """
     return user_controller.reset_user_password(obj_data.dict())
 
 
-@user_router.post("/otp/send", response_model=UserIdSchema)
+@user_router.post(
+    "/otp/send", response_model=UserIdSchema, dependencies=[Depends(otp_send_rate_limit)]
+)
 def send_otp(
-    obj_data: UserSendOtpSchema, sms: Optional[bool] = None, email: Optional[bool] = None
+    obj_data: UserSendOtpSchema,
+    sms: Optional[bool] = None,
+    email: Optional[bool] = None,
+    user_controller: UserController = Depends(get_user_controller),  # noqa
 ) -> Dict:
     """
     Send an OTP (one-time password) code to the user.
@@ -284,19 +542,30 @@ def send_otp(
     :type sms: bool, optional
     :param email: If True, send the OTP via email.
     :type email: bool, optional
+    :param user_controller: The controller handling the request.
+    :type user_controller: UserController
     :return: The schema containing the user ID.
     :rtype: dict
     """
     return user_controller.send_otp_code(sms, email, obj_data.dict())
 
 
-@user_router.post("/otp/confirm", response_model=UserOtpConfirmationResponseSchema)
-def confirm_otp(obj_data: UserOtpConfirmationSchema) -> Dict:
+@user_router.post(
+    "/otp/confirm",
+    response_model=UserOtpConfirmationResponseSchema,
+    dependencies=[Depends(otp_confirm_rate_limit)],
+)
+def confirm_otp(
+    obj_data: UserOtpConfirmationSchema,
+    user_controller: UserController = Depends(get_user_controller),  # noqa
+) -> Dict:
     """
     Confirm an OTP (One-Time Password) entered by a user.
 
     :param obj_data: The data for confirming the OTP.
     :type obj_data: UserOtpConfirmationSchema
+    :param user_controller: The controller handling the request.
+    :type user_controller: UserController
     :return: The result of the OTP confirmation operation.
     :rtype: dict
     """
@@ -18,6 +18,59 @@ EXC_NOT_FOUND = "{} not found"
 EXC_FOUND = "{} exists"
 EXC_INVALID_INPUT = "invalid {}"
 EXC_EXPIRED_INPUT = "{} has expired"
+EXC_REVOKED_INPUT = "{} has been revoked"
+EXC_TOO_MANY_REQUESTS = "too many requests, retry in {} seconds"
+
+# OTP Store Backends
+REDIS_OTP_STORE = "redis"
+SQL_OTP_STORE = "sql"
+# seconds an expired code is kept to tell it apart from a code never sent
+OTP_RECORD_RETENTION = 3600
+
+# Rate Limit Store Backends
+REDIS_RATE_LIMIT_STORE = "redis"
+MEMORY_RATE_LIMIT_STORE = "memory"
+# number of keys kept by the in-memory store before stale keys are purged
+RATE_LIMIT_MEMORY_KEYS = 10000
+
+# HTTP Cache Namespaces
+ROLE_CACHE_NAMESPACE = "roles"
+RESOURCE_CACHE_NAMESPACE = "resources"
+
+# Health Checks
+DATABASE_HEALTH_CHECK = "database"
+REDIS_HEALTH_CHECK = "redis"
+KEYCLOAK_HEALTH_CHECK = "keycloak"
+KAFKA_HEALTH_CHECK = "kafka"
+# checks a worker needs to pass to be ready, events are buffered while kafka is down
+READINESS_CHECKS = [DATABASE_HEALTH_CHECK, REDIS_HEALTH_CHECK, KEYCLOAK_HEALTH_CHECK]
+
+# User Batch Lookups
+# number of users a batch lookup resolves at most
+USER_BATCH_MAX_SIZE = 100
+
+# Exports
+# rows fetched from the server-side cursor, and encoded, at a time
+EXPORT_BATCH_SIZE = 1000
+EXPORT_MEDIA_TYPES = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+
+# Token Revocation
+# pub/sub channel the denylist keys of revoked tokens and users are announced on
+TOKEN_REVOCATION_CHANNEL = "token_revocations"
+# seconds a worker waits before subscribing again after losing redis
+TOKEN_REVOCATION_RETRY_INTERVAL = 5
+
+# Read Replica Strategies
+ROUND_ROBIN_REPLICA = "round_robin"
+LEAST_LATENCY_REPLICA = "least_latency"
+# methods of the requests that only read, served by the read replicas
+SAFE_HTTP_METHODS = ("GET", "HEAD", "OPTIONS")
+
+# Span Exporters
+CONSOLE_SPAN_EXPORTER = "console"
+FILE_SPAN_EXPORTER = "file"
 
 # factory settings
 MASTER_OTP_CODE = ["123456"]
+# passwords of generated users, hashed once per run as bcrypt is slow by design
+FACTORY_PASSWORDS = ["1234", "0000", "2580", "1111", "4321", "9999", "1357", "2468"]
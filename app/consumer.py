@@ -2,7 +2,6 @@ import json
 import os
 import sys
 
-import pinject
 from kafka import KafkaConsumer
 from kafka.errors import KafkaError
 from loguru import logger
@@ -35,17 +34,14 @@ if __name__ == "__main__":
         app = create_app()
         # Create Application before importing from app
 
-        from app.controllers import SampleController
-        from app.repositories import SampleRepository
-        from app.services import RedisService
+        from app.core.tracing import extract_kafka_context, tracer
 
         for msg in consumer:
-            data = json.loads(msg.value)
-            logger.info("originating service: service name")
-            logger.info(f"topic consuming: {msg.topic}")
-            obj_graph = pinject.new_object_graph(
-                modules=None,
-                classes=[SampleController, SampleRepository, RedisService],
-            )
-            sample_controller: SampleController = obj_graph.provide(SampleController)
-            logger.info("message status: successfully consumed\n")
+            # reminder: continue the trace of the service publishing the message
+            with tracer.start_as_current_span(
+                f"kafka consume {msg.topic}", context=extract_kafka_context(msg.headers)
+            ):
+                data = json.loads(msg.value)
+                logger.info("originating service: service name")
+                logger.info(f"topic consuming: {msg.topic}")
+                logger.info("message status: successfully consumed\n")
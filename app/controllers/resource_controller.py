@@ -5,26 +5,33 @@ from sqlalchemy.orm import Query
 
 from app import constants
 from app.core.exceptions import AppException
+from app.core.notifications import Notifier
+from app.enums import DomainEventEnum
+from app.event import EventNotificationHandler
 from app.models import PermissionModel, ResourceModel
 from app.repositories import PermissionRepository, ResourceRepository
+from app.services import HttpCacheService
 
 
-class ResourceController:
+class ResourceController(Notifier):
     """Class responsible for controlling resources."""
 
     def __init__(
         self,
         resource_repository: ResourceRepository,
         permission_repository: PermissionRepository,
+        http_cache_service: HttpCacheService,
     ) -> None:
         """
         Initialize the ResourceController.
 
         :param resource_repository: An instance of the ResourceRepository class.
         :param permission_repository: An instance of the PermissionRepository class.
+        :param http_cache_service: An instance of the HttpCacheService class.
         """
         self.resource_repository = resource_repository
         self.permission_repository = permission_repository
+        self.http_cache_service = http_cache_service
 
     def add_resource(
         self, auth_user: Dict[str, Any], obj_data: Dict[str, Any]
@@ -51,6 +58,7 @@ class ResourceController:
         obj_data["created_by"] = user_id
         obj_data["updated_by"] = user_id
         result: ResourceModel = self.resource_repository.create(obj_in=obj_data)
+        self.http_cache_service.invalidate(constants.RESOURCE_CACHE_NAMESPACE)
         return result
 
     # noinspection PyMethodMayBeStatic
@@ -70,7 +78,9 @@ class ResourceController:
 
         :raises AssertionError: If `auth_user` is not a dictionary or if it is empty.
         """
-        query_result: Query = ResourceModel.search(keyword=kwargs.get("search"))
+        query_result: Query = ResourceModel.search(
+            keyword=kwargs.get("search"), session=self.resource_repository.db
+        )
         query_result: Query = ResourceModel.sort(
             query_result=query_result,
             sort_in=kwargs.get("sort_in"),
@@ -129,4 +139,16 @@ class ResourceController:
         obj_data["created_by"] = user_id
         obj_data["updated_by"] = user_id
         result: PermissionModel = self.permission_repository.create(obj_in=obj_data)
+        self.http_cache_service.invalidate(constants.RESOURCE_CACHE_NAMESPACE)
+        self.notify(
+            EventNotificationHandler(
+                event=DomainEventEnum.permission_assigned,
+                key=result.resource_id,
+                details={
+                    "resource_id": result.resource_id,
+                    "permission_id": result.id,
+                    "mode": result.mode,
+                },
+            )
+        )
         return result
@@ -1,9 +1,14 @@
+import uuid
+
 from fastapi_pagination.ext.sqlalchemy import paginate
 from sqlalchemy.orm import Query
 
 from app import constants
 from app.core.exceptions import AppException
-from app.models import PermissionModel, RoleModel, UserRoleModel
+from app.core.notifications import Notifier
+from app.enums import DomainEventEnum
+from app.event import EventNotificationHandler
+from app.models import PermissionModel, RoleModel, RolePermissionModel, UserRoleModel
 from app.repositories import (
     PermissionRepository,
     RolePermissionRepository,
@@ -11,9 +16,10 @@ from app.repositories import (
     UserRepository,
     UserRoleRepository,
 )
+from app.services import HttpCacheService
 
 
-class RoleController:
+class RoleController(Notifier):
     def __init__(
         self,
         role_repository: RoleRepository,
@@ -21,6 +27,7 @@ class RoleController:
         user_repository: UserRepository,
         permission_repository: PermissionRepository,
         role_permission_repository: RolePermissionRepository,
+        http_cache_service: HttpCacheService,
     ):
         """
         Initialize the RoleController.
@@ -35,12 +42,15 @@ class RoleController:
         :type permission_repository: PermissionRepository
         :param role_permission_repository: The role permission repository.
         :type role_permission_repository: RolePermissionRepository
+        :param http_cache_service: The service invalidating cached role responses.
+        :type http_cache_service: HttpCacheService
         """
         self.role_repository = role_repository
         self.user_role_repository = user_role_repository
         self.user_repository = user_repository
         self.permission_repository = permission_repository
         self.role_permission_repository = role_permission_repository
+        self.http_cache_service = http_cache_service
 
     def add_role(self, auth_user: dict, obj_data: dict) -> RoleModel:
         """
@@ -62,6 +72,7 @@ class RoleController:
         obj_data["created_by"] = user_id
         obj_data["updated_by"] = user_id
         result: RoleModel = self.role_repository.create(obj_in=obj_data)
+        self.http_cache_service.invalidate(constants.ROLE_CACHE_NAMESPACE)
         return result
 
     # noinspection PyMethodMayBeStatic
@@ -82,7 +93,9 @@ class RoleController:
         :raises AssertionError: If `auth_user` is not a dictionary or if it is empty.
         """
 
-        query_result: Query = RoleModel.search(keyword=kwargs.get("search"))
+        query_result: Query = RoleModel.search(
+            keyword=kwargs.get("search"), session=self.role_repository.db
+        )
         query_result: Query = RoleModel.sort(
             query_result=query_result,
             sort_in=kwargs.get("sort_in"),
@@ -116,6 +129,35 @@ class RoleController:
             )
         return result
 
+    def check_permission(self, user_id: str, resource: str, mode: str) -> bool:
+        """
+        Check whether a user is granted a permission on a resource by one of
+        their roles.
+
+        :param user_id: The ID of the user.
+        :type user_id: str
+        :param resource: The type of the resource.
+        :type resource: str
+        :param mode: The mode of the permission, e.g. read or write.
+        :type mode: str
+        :return: True if the user has the permission, False otherwise, also
+            when `user_id` is not a valid ID.
+        :rtype: bool
+
+        :raises AssertionError: If `user_id`, `resource` or `mode` is empty.
+        """
+        assert user_id, constants.ASSERT_NULL_OBJECT
+        assert resource, constants.ASSERT_NULL_OBJECT
+        assert mode, constants.ASSERT_NULL_OBJECT
+
+        try:
+            user_id = str(uuid.UUID(user_id))
+        except ValueError:
+            return False
+        return self.permission_repository.user_has_permission(
+            user_id=user_id, resource=resource, mode=mode
+        )
+
     def assign_role_to_user(self, auth_user: dict, obj_data: dict) -> RoleModel:
         """
         Assign a role to a user.
@@ -139,6 +181,17 @@ class RoleController:
         obj_data["created_by"] = user_id
         obj_data["updated_by"] = user_id
         result: UserRoleModel = self.user_role_repository.create(obj_in=obj_data)
+        self.notify(
+            EventNotificationHandler(
+                event=DomainEventEnum.role_assigned,
+                key=result.user_id,
+                details={
+                    "user_id": result.user_id,
+                    "role_id": result.role_id,
+                    "role_name": result.role.name,
+                },
+            )
+        )
         return result.role
 
     def assign_permission_to_role(
@@ -163,5 +216,20 @@ class RoleController:
         assert isinstance(auth_user, dict), constants.ASSERT_DICT_OBJECT
 
         obj_data["created_by"] = auth_user.get("user_id")
-        result: PermissionModel = self.role_permission_repository.create(obj_in=obj_data)
+        result: RolePermissionModel = self.role_permission_repository.create(
+            obj_in=obj_data
+        )
+        self.http_cache_service.invalidate(constants.ROLE_CACHE_NAMESPACE)
+        self.notify(
+            EventNotificationHandler(
+                event=DomainEventEnum.permission_assigned,
+                key=result.role_id,
+                details={
+                    "role_id": result.role_id,
+                    "permission_id": result.permission_id,
+                    "resource_id": result.permission.resource_id,
+                    "mode": result.permission.mode,
+                },
+            )
+        )
         return result.permission
@@ -1,44 +1,63 @@
 import random
 import secrets
-from datetime import datetime, timedelta
+import uuid
+from datetime import datetime
 from string import digits
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional
 
-import pytz
 from fastapi_pagination.ext.sqlalchemy import paginate
 from sqlalchemy.orm import Query
 
 from app import constants
 from app.core.exceptions import AppException
 from app.core.notifications import Notifier
-from app.models import UserModel, UserOtpModel
+from app.core.service_interfaces import OtpStoreInterface
+from app.core.tracing import trace_methods
+from app.enums import (
+    CodeStatusEnum,
+    DomainEventEnum,
+    ExportFormatEnum,
+    UserLookupFieldEnum,
+)
+from app.event import EventNotificationHandler
+from app.models import UserModel
 from app.notifications import EmailNotificationHandler, SMSNotificationHandler
-from app.repositories import UserOtpRepository, UserRepository
-from app.services import KeycloakAuthService
-
-utc = pytz.UTC
+from app.repositories import UserRepository
+from app.services import KeycloakAuthService, TokenCacheService, TokenRevocationService
+from app.utils import decode_token, encode_csv, encode_ndjson, token_roles
+from config import settings
 
 
+@trace_methods
 class UserController(Notifier):
     def __init__(
         self,
         user_repository: UserRepository,
         keycloak_auth_service: KeycloakAuthService,
-        user_otp_repository: UserOtpRepository,
+        otp_store: OtpStoreInterface,
+        token_revocation_service: TokenRevocationService,
+        token_cache_service: Optional[TokenCacheService] = None,
     ):
         """
         Initialize the UserController.
 
         :param user_repository: The user repository object.
         :type user_repository: UserRepository
-        :param user_otp_repository: The user otp repository object.
-        :type user_otp_repository: UserOtpRepository
+        :param otp_store: The store keeping otp codes and security tokens.
+        :type otp_store: OtpStoreInterface
         :param keycloak_auth_service: The KeycloakAuthService object.
         :type keycloak_auth_service: KeycloakAuthService
+        :param token_revocation_service: The denylist of revoked tokens.
+        :type token_revocation_service: TokenRevocationService
+        :param token_cache_service: The cache of token introspection results,
+            None to introspect every token.
+        :type token_cache_service: TokenCacheService, optional
         """
         self.user_repository = user_repository
-        self.user_otp_repository = user_otp_repository
+        self.otp_store = otp_store
         self.keycloak_auth_service = keycloak_auth_service
+        self.token_revocation_service = token_revocation_service
+        self.token_cache_service = token_cache_service
 
     # noinspection PyMethodMayBeStatic
     def get_all_users(self, **kwargs) -> paginate:
@@ -52,25 +71,52 @@ class UserController(Notifier):
                        - order_by: Field name to order the users by.
                        - is_deleted: Flag to filter deleted users.
                        - paginate: Pagination parameters.
+                       - columns: Names of the columns to select, the users
+                         are then returned as rows of these columns instead
+                         of UserModel instances.
         :type kwargs: Any
         :return: A list of SampleModel instances representing the retrieved users.
         :rtype: paginate
         """
-        query_result: Query = UserModel.search(keyword=kwargs.get("search"))
-        query_result: Query = UserModel.filter(
-            query_result=query_result,
-            filter_param={"is_deleted": kwargs.get("is_deleted")},
-        )
-        query_result: Query = UserModel.sort(
-            query_result=query_result,
-            sort_in=kwargs.get("sort_in"),
-            order_by=kwargs.get("order_by"),
-        )
+        query_result: Query = self.__users_query(**kwargs)
+        if kwargs.get("columns"):
+            query_result = query_result.with_entities(
+                *[getattr(UserModel, column) for column in kwargs["columns"]]
+            )
         result: paginate = UserModel.paginate(
             query_result=query_result, pagination=kwargs.get("paginate")
         )
         return result
 
+    def export_users(
+        self, export_format: ExportFormatEnum, columns: List[str], **kwargs
+    ) -> Iterator[bytes]:
+        """
+        Export every user matching the provided arguments.
+
+        The users are read over a server-side cursor and encoded batch by
+        batch, so the memory used does not grow with the number of users.
+
+        :param export_format: The format to encode the users in.
+        :type export_format: ExportFormatEnum
+        :param columns: The columns of the users to export.
+        :type columns: List[str]
+        :param kwargs: The search, sort_in, order_by and is_deleted arguments
+        of get_all_users.
+        :type kwargs: Any
+        :return: The encoded chunks of the export.
+        :rtype: Iterator[bytes]
+        """
+        query_result: Query = self.__users_query(**kwargs).with_entities(
+            *[getattr(UserModel, column) for column in columns]
+        )
+        batches = self.user_repository.stream(
+            query_result.statement, batch_size=constants.EXPORT_BATCH_SIZE
+        )
+        if export_format == ExportFormatEnum.ndjson:
+            return encode_ndjson(columns, batches)
+        return encode_csv(columns, batches)
+
     def get_user(self, obj_id: str) -> UserModel:
         """
         Get a user based on the provided id.
@@ -92,6 +138,43 @@ class UserController(Notifier):
             )
         return result
 
+    def get_users_by(self, field: UserLookupFieldEnum, values: List[str]) -> Dict:
+        """
+        Get the users matching any of the values of a unique field, in one lookup.
+
+        :param field: The field to match, id, username or email.
+        :type field: UserLookupFieldEnum
+        :param values: The values to match.
+        :type values: List[str]
+        :return: The users found, once each and in the order of the values,
+        and the values matching no user.
+        :rtype: Dict
+        :raises AssertionError: If `values` is empty or None.
+        """
+        assert values, constants.ASSERT_NULL_OBJECT
+
+        keys: Dict[str, str] = {}
+        for value in dict.fromkeys(values):
+            if field == UserLookupFieldEnum.id:
+                try:
+                    keys[value] = str(uuid.UUID(value))
+                except ValueError:
+                    continue
+            else:
+                keys[value] = value
+        users: List[UserModel] = self.user_repository.find_many_by(
+            field.value, list(dict.fromkeys(keys.values()))
+        )
+        found: Dict[str, UserModel] = {
+            str(getattr(user, field.value)): user for user in users
+        }
+        return {
+            "data": [found[key] for key in dict.fromkeys(keys.values()) if key in found],
+            "missing": [
+                value for value in dict.fromkeys(values) if keys.get(value) not in found
+            ],
+        }
+
     def create_user(self, obj_data: dict) -> UserModel:
         """
         Create a new user based on the provided data.
@@ -113,6 +196,7 @@ class UserController(Notifier):
         self.user_repository.update_by_id(
             obj_id=result.id, obj_in={"auth_provider_id": auth_user.get("id")}
         )
+        self.__user_event(event=DomainEventEnum.user_created, user=result)
         return result
 
     def update_user(self, obj_id: str, obj_data: dict) -> UserModel:
@@ -143,6 +227,7 @@ class UserController(Notifier):
                 obj_id=result.username, obj_data=obj_data
             )
             self.keycloak_auth_service.update_user(obj_data=auth_provider_fields)
+            self.__user_event(event=DomainEventEnum.user_updated, user=result)
             return result
         except AppException.NotFoundException:
             raise AppException.NotFoundException(error_message=constants.EXC_NOT_FOUND)
@@ -173,6 +258,8 @@ class UserController(Notifier):
                 obj_id=result.username, obj_data=disable_user
             )
             self.keycloak_auth_service.update_user(obj_data=auth_provider_fields)
+            self.token_revocation_service.revoke_user(result.username)
+            self.__user_event(event=DomainEventEnum.user_deleted, user=result)
             return None
         except AppException.NotFoundException:
             raise AppException.NotFoundException(error_message=constants.EXC_NOT_FOUND)
@@ -261,6 +348,88 @@ class UserController(Notifier):
                 error_message=constants.EXC_NOT_FOUND.format("user")
             )
 
+    def user_logout(self, access_token: str, auth_user: dict, obj_data: dict) -> None:
+        """
+        Log a user out, revoking their access token and ending the Keycloak
+        session of their refresh token.
+
+        :param access_token: The access token of the user.
+        :type access_token: str
+        :param auth_user: The decoded access token.
+        :type auth_user: dict
+        :param obj_data: The data for the logout, with the refresh token.
+        :type obj_data: dict
+        :return: None
+        :raises AssertionError: If obj_data is not a dict or if it is an empty dict.
+        """
+        assert access_token, constants.ASSERT_NULL_OBJECT
+        assert isinstance(obj_data, dict), constants.ASSERT_DICT_OBJECT
+        assert obj_data, constants.ASSERT_NULL_OBJECT
+
+        self.token_revocation_service.revoke_token(
+            access_token, expires_at=auth_user.get("exp")
+        )
+        self.keycloak_auth_service.logout(refresh_token=obj_data.get("refresh_token"))
+        return None
+
+    def introspect_token(self, token: str) -> Dict:
+        """
+        Validate an access token and describe the user it was issued to.
+
+        The user is the local user with the username of the token, their
+        effective roles are the roles of the token and the active roles
+        assigned to them in this service. A token that is not valid, or whose
+        user does not exist or is deleted, is reported as inactive.
+
+        Results are cached until the token expires, when a token cache is
+        given.
+
+        :param token: The access token.
+        :type token: str
+        :return: Whether the token is active and, if it is, the id, username,
+            status and effective roles of its user and its issue and expiry
+            times.
+        :rtype: dict
+        :raises AssertionError: If `token` is empty.
+        """
+        assert token, constants.ASSERT_NULL_OBJECT
+
+        inactive: Dict = {"active": False}
+        if self.token_cache_service is not None:
+            cached: Optional[Dict] = self.token_cache_service.get(token)
+            if cached is not None:
+                if self.token_revocation_service.is_revoked(token, cached):
+                    return inactive
+                return cached
+
+        try:
+            payload: dict = decode_token(token)
+            if self.token_revocation_service.is_revoked(token, payload):
+                return inactive
+            user: UserModel = self.user_repository.find(
+                {"username": payload.get("username")}
+            )
+        except (AppException.InvalidTokenException, AppException.NotFoundException):
+            return inactive
+        if user.is_deleted:
+            return inactive
+
+        roles = set(token_roles(payload)) | set(
+            self.user_repository.find_role_names(user.id)
+        )
+        result: Dict = {
+            "active": True,
+            "user_id": str(user.id),
+            "username": user.username,
+            "status": user.status.value,
+            "roles": sorted(roles),
+            "iat": payload.get("iat"),
+            "exp": payload.get("exp"),
+        }
+        if self.token_cache_service is not None and result["exp"]:
+            self.token_cache_service.set(token, result, expires_at=result["exp"])
+        return result
+
     def verify_phone(self, auth_user: Dict[str, Any], obj_data: Dict[str, Any]) -> Dict:
         """
         Request to change the phone number of the authenticated user.
@@ -294,11 +463,11 @@ class UserController(Notifier):
             try:
                 user: UserModel = self.user_repository.find({"username": username})
                 otp_code: str = self.__generate_otp_code(length=6)
-                expiration: datetime = datetime.now() + timedelta(minutes=5)
-                self.__create_otp_record(
+                self.otp_store.save_code(
                     user_id=user.id,
-                    otp_code=otp_code,
-                    otp_expiration=expiration,
+                    code_type="otp_code",
+                    code=otp_code,
+                    lifetime=settings.otp_code_lifetime,
                 )
                 self.__sms_otp(code=otp_code, phone=[new_phone])
                 self.__email_otp(code=otp_code, email=[user.email])
@@ -338,7 +507,6 @@ class UserController(Notifier):
             self.update_user(
                 obj_id=user.id, obj_data={"phone": obj_data.get("new_phone")}
             )
-            self.__create_otp_record(user_id=user.id)
             return {"user_id": user.id}
         except AppException.NotFoundException:
             raise AppException.NotFoundException(
@@ -384,7 +552,6 @@ class UserController(Notifier):
             self.keycloak_auth_service.change_password(
                 data={"username": user.username, "new_password": new_password}
             )
-            self.__create_otp_record(user_id=user.id)
             return {"user_id": user.id}
         except AppException.NotFoundException:
             raise AppException.NotFoundException(
@@ -419,7 +586,6 @@ class UserController(Notifier):
             self.keycloak_auth_service.change_password(
                 data={"username": user.username, "new_password": new_password}
             )
-            self.__create_otp_record(user_id=user.id)
             return {"user_id": user.id}
         except AppException.NotFoundException:
             raise AppException.NotFoundException(
@@ -458,11 +624,11 @@ class UserController(Notifier):
         try:
             user: UserModel = self.user_repository.find(filter_param=filter_param)
             otp_code: str = self.__generate_otp_code(length=6)
-            expiration: datetime = datetime.now() + timedelta(minutes=5)
-            self.__create_otp_record(
+            self.otp_store.save_code(
                 user_id=user.id,
-                otp_code=otp_code,
-                otp_expiration=expiration,
+                code_type="otp_code",
+                code=otp_code,
+                lifetime=settings.otp_code_lifetime,
             )
             self.__sms_otp(code=otp_code, phone=[user.phone]) if sms else None
             self.__email_otp(code=otp_code, email=[user.email]) if email else None
@@ -490,44 +656,49 @@ class UserController(Notifier):
         assert isinstance(obj_data, dict), constants.ASSERT_DICT_OBJECT
         assert obj_data, constants.ASSERT_NULL_OBJECT
 
-        otp: str = obj_data.get("otp_code")
-        try:
-            otp_record: UserOtpModel = self.user_otp_repository.find(
-                {"user_id": obj_data.get("user_id")}
-            )
-            if otp_record.otp_code != otp and otp not in constants.MASTER_OTP_CODE:
-                raise AppException.InvalidTokenException(
-                    error_message=constants.EXC_INVALID_INPUT.format("otp code")
-                )
-            if utc.localize(datetime.now()) > otp_record.otp_code_expiration:
-                raise AppException.InvalidTokenException(
-                    error_message=constants.EXC_EXPIRED_INPUT.format("otp code")
-                )
-            sec_code: str = self.__generate_security_code(length=16)
-            expiration: datetime = datetime.now() + timedelta(minutes=5)
-            self.__create_otp_record(
-                user_id=otp_record.user_id,
-                sec_code=sec_code,
-                sec_expiration=expiration,
-            )
-            return {"user_id": otp_record.user_id, "sec_token": otp_record.sec_token}
-        except AppException.NotFoundException:
-            raise AppException.NotFoundException(
-                error_message=constants.EXC_NOT_FOUND.format("otp record")
-            )
+        user_id: str = obj_data.get("user_id")
+        status: CodeStatusEnum = self.otp_store.consume_code(
+            user_id=user_id,
+            code_type="otp_code",
+            code=obj_data.get("otp_code"),
+            master_codes=constants.MASTER_OTP_CODE,
+        )
+        self.__check_code_status(status=status, name="otp code")
+        sec_code: str = self.__generate_security_code(length=16)
+        self.otp_store.save_code(
+            user_id=user_id,
+            code_type="sec_token",
+            code=sec_code,
+            lifetime=settings.sec_token_lifetime,
+        )
+        return {"user_id": user_id, "sec_token": sec_code}
 
-    def __confirm_sec_token(self, user_id: str, sec_token: str) -> UserOtpModel:
+    # noinspection PyMethodMayBeStatic
+    def __users_query(self, **kwargs) -> Query:
+        query_result: Query = UserModel.search(
+            keyword=kwargs.get("search"), session=self.user_repository.db
+        )
+        query_result: Query = UserModel.filter(
+            query_result=query_result,
+            filter_param={"is_deleted": kwargs.get("is_deleted")},
+        )
+        query_result: Query = UserModel.sort(
+            query_result=query_result,
+            sort_in=kwargs.get("sort_in"),
+            order_by=kwargs.get("order_by"),
+        )
+        return query_result
+
+    def __confirm_sec_token(self, user_id: str, sec_token: str) -> None:
         """
-        Confirm the security token for a user.
+        Confirm and consume the security token of a user.
 
         :param user_id: The ID of the user.
         :type user_id: str
         :param sec_token: The security token to confirm.
         :type sec_token: str
-        :return: The UserOtpModel object representing the confirmed security token.
-        :rtype: UserOtpModel
-        :raises AppException.NotFoundException: If the OTP record for the user
-        is not found.
+        :raises AppException.NotFoundException: If no security token was issued
+        to the user.
         :raises AppException.InvalidTokenException: If the provided security token
         is invalid or expired.
         :raises AssertionError: If the user_id or sec_token parameters are empty or None.
@@ -535,63 +706,35 @@ class UserController(Notifier):
         assert user_id, constants.ASSERT_NULL_OBJECT
         assert sec_token, constants.ASSERT_NULL_OBJECT
 
-        try:
-            result: UserOtpModel = self.user_otp_repository.find({"user_id": user_id})
-            if result.sec_token != sec_token:
-                raise AppException.InvalidTokenException(
-                    error_message=constants.EXC_INVALID_INPUT.format("security token")
-                )
-            if utc.localize(datetime.now()) > result.sec_token_expiration:
-                raise AppException.InvalidTokenException(
-                    error_message=constants.EXC_EXPIRED_INPUT.format("security token")
-                )
-            return result
-        except AppException.NotFoundException:
-            raise AppException.NotFoundException(
-                error_message=constants.EXC_NOT_FOUND.format("otp record")
-            )
+        status: CodeStatusEnum = self.otp_store.consume_code(
+            user_id=user_id, code_type="sec_token", code=sec_token
+        )
+        self.__check_code_status(status=status, name="security token")
 
-    def __create_otp_record(
-        self,
-        user_id: str,
-        otp_code: Optional[str] = None,
-        otp_expiration: Optional[datetime] = None,
-        sec_code: Optional[str] = None,
-        sec_expiration: Optional[datetime] = None,
-    ) -> UserOtpModel:
+    # noinspection PyMethodMayBeStatic
+    def __check_code_status(self, status: CodeStatusEnum, name: str) -> None:
         """
-        Create or update an OTP record for a user.
+        Raise the exception matching the outcome of confirming a code.
 
-        :param user_id: The ID of the user.
-        :type user_id: str
-        :param otp_code: The OTP code.
-        :type otp_code: str, optional
-        :param sec_code: The security code.
-        :type sec_code: str, optional
-        :param expiration: The expiration datetime of the OTP record.
-        :type expiration: datetime, optional
-        :return: The UserOtpModel object representing the created or updated OTP record.
-        :rtype: UserOtpModel
-        :raises AppException.NotFoundException: If the OTP record for the user is
-        not found during update.
-        :raises AssertionError: If the user_id parameter is empty or None.
+        :param status: The outcome of confirming the code.
+        :type status: CodeStatusEnum
+        :param name: The name of the code used in the error message.
+        :type name: str
+        :raises AppException.NotFoundException: If no code was issued.
+        :raises AppException.InvalidTokenException: If the code is invalid or expired.
         """
-        assert user_id, constants.ASSERT_NULL_OBJECT
-
-        obj_data = {
-            "otp_code": otp_code,
-            "otp_code_expiration": otp_expiration,
-            "sec_token": sec_code,
-            "sec_token_expiration": sec_expiration,
-        }
-        try:
-            result: UserOtpModel = self.user_otp_repository.update(
-                filter_params={"user_id": user_id}, obj_in=obj_data
+        if status == CodeStatusEnum.missing:
+            raise AppException.NotFoundException(
+                error_message=constants.EXC_NOT_FOUND.format("otp record")
+            )
+        if status == CodeStatusEnum.invalid:
+            raise AppException.InvalidTokenException(
+                error_message=constants.EXC_INVALID_INPUT.format(name)
+            )
+        if status == CodeStatusEnum.expired:
+            raise AppException.InvalidTokenException(
+                error_message=constants.EXC_EXPIRED_INPUT.format(name)
             )
-        except AppException.NotFoundException:
-            obj_data["user_id"] = user_id
-            result: UserOtpModel = self.user_otp_repository.create(obj_in=obj_data)
-        return result
 
     # noinspection PyMethodMayBeStatic
     def __generate_otp_code(self, length: int) -> str:
@@ -647,6 +790,35 @@ class UserController(Notifier):
             )
         )
 
+    def __user_event(self, event: DomainEventEnum, user: UserModel) -> None:
+        """
+        Publish a domain event about a user for consumption by other services.
+
+        :param event: The domain event that occurred.
+        :type event: DomainEventEnum
+        :param user: The user the event is about.
+        :type user: UserModel
+        :raises AssertionError: If the user is empty or None.
+        """
+        assert user, constants.ASSERT_NULL_OBJECT
+
+        self.notify(
+            EventNotificationHandler(
+                event=event,
+                key=user.id,
+                details={
+                    "user_id": user.id,
+                    "username": user.username,
+                    "email": user.email,
+                    "phone": user.phone,
+                    "status": user.status.value if user.status else None,
+                    "is_deleted": user.is_deleted,
+                    "auth_provider_id": user.auth_provider_id,
+                    "updated_at": user.updated_at,
+                },
+            )
+        )
+
     def __sms_otp(self, code: str, phone: List[str]) -> None:
         """
         Send an SMS with the provided OTP code to the given phone numbers.
@@ -0,0 +1,204 @@
+from datetime import datetime
+from typing import Dict, Iterator
+
+from fastapi import Depends, Request
+from sqlalchemy.orm import Session
+
+from app import constants
+from app.controllers import ResourceController, RoleController, UserController
+from app.core.database import create_session
+from app.core.service_interfaces import OtpStoreInterface
+from app.repositories import (
+    PermissionRepository,
+    ResourceRepository,
+    RolePermissionRepository,
+    RoleRepository,
+    UserOtpRepository,
+    UserRepository,
+    UserRoleRepository,
+)
+from app.services import (
+    ActivityTrackerService,
+    HealthService,
+    HttpCacheService,
+    KeycloakAuthService,
+    ProfileStoreService,
+    RedisOtpStore,
+    RedisService,
+    SQLOtpStore,
+    TokenCacheService,
+    TokenRevocationService,
+    UserCacheService,
+)
+from config import settings
+
+
+class Container:
+    """
+    Wires the application's services, repositories and controllers.
+
+    Services hold no per-request state and are created once with the
+    container. Repositories, and the controllers built on them, are created
+    for every request with the session of the request, see get_session, or
+    of the rpc call they serve. Sessions are not thread safe, and requests
+    are served concurrently from a thread pool, so no two requests share a
+    session.
+    """
+
+    def __init__(self):
+        self.redis_service = RedisService()
+        self.keycloak_auth_service = KeycloakAuthService()
+        self.http_cache_service = HttpCacheService()
+        self.redis_otp_store = RedisOtpStore()
+        self.profile_store_service = ProfileStoreService()
+        self.user_cache_service = UserCacheService(ttl=settings.user_cache_ttl)
+        self.token_cache_service = TokenCacheService(
+            ttl=settings.token_cache_ttl, local_size=settings.token_cache_local_size
+        )
+        self.token_revocation_service = TokenRevocationService(
+            capacity=settings.token_revocation_capacity,
+            error_rate=settings.token_revocation_error_rate,
+            rebuild_interval=settings.token_revocation_rebuild_interval,
+        )
+        self.activity_tracker_service = ActivityTrackerService(
+            flush=self.flush_activity,
+            flush_interval=settings.activity_flush_interval,
+            flush_size=settings.activity_flush_size,
+        )
+        self.health_service = HealthService(
+            keycloak_auth_service=self.keycloak_auth_service,
+            cache_ttl=settings.health_check_ttl,
+        )
+
+    def otp_store(self, user_otp_repository: UserOtpRepository) -> OtpStoreInterface:
+        """
+        Provide the otp store selected by the otp_store_backend setting.
+
+        :param user_otp_repository: The repository used by the sql store.
+        :type user_otp_repository: UserOtpRepository
+        :return: The otp store.
+        :rtype: OtpStoreInterface
+        """
+        if settings.otp_store_backend == constants.SQL_OTP_STORE:
+            return SQLOtpStore(user_otp_repository=user_otp_repository)
+        return self.redis_otp_store
+
+    def user_repository(self, session: Session) -> UserRepository:
+        """
+        Provide a user repository, reading the user cache first when the
+        user_cache_enabled setting is on.
+
+        :param session: The session to query with.
+        :type session: Session
+        :return: The user repository.
+        :rtype: UserRepository
+        """
+        if settings.user_cache_enabled:
+            return UserRepository(
+                user_cache_service=self.user_cache_service, session=session
+            )
+        return UserRepository(session=session)
+
+    # noinspection PyMethodMayBeStatic
+    def flush_activity(self, activity: Dict[str, datetime]) -> None:
+        """
+        Write a batch of user activity, with a session of its own as batches
+        are written from the thread of the activity tracker.
+
+        :param activity: The last time each user was seen, by username.
+        :type activity: Dict[str, datetime]
+        """
+        session: Session = create_session()
+        try:
+            UserRepository(session=session).update_last_active(activity)
+        finally:
+            session.close()
+
+    def user_controller(self, session: Session) -> UserController:
+        return UserController(
+            user_repository=self.user_repository(session=session),
+            keycloak_auth_service=self.keycloak_auth_service,
+            otp_store=self.otp_store(
+                user_otp_repository=UserOtpRepository(session=session)
+            ),
+            token_revocation_service=self.token_revocation_service,
+            token_cache_service=self.token_cache_service,
+        )
+
+    def role_controller(self, session: Session) -> RoleController:
+        return RoleController(
+            role_repository=RoleRepository(session=session),
+            user_role_repository=UserRoleRepository(session=session),
+            user_repository=self.user_repository(session=session),
+            permission_repository=PermissionRepository(session=session),
+            role_permission_repository=RolePermissionRepository(session=session),
+            http_cache_service=self.http_cache_service,
+        )
+
+    def resource_controller(self, session: Session) -> ResourceController:
+        return ResourceController(
+            resource_repository=ResourceRepository(session=session),
+            permission_repository=PermissionRepository(session=session),
+            http_cache_service=self.http_cache_service,
+        )
+
+
+def get_container(request: Request) -> Container:
+    """
+    Return the container created for the application on startup.
+
+    :param request: The incoming request.
+    :type request: Request
+    :return: The application's container.
+    :rtype: Container
+    """
+    return request.app.state.container
+
+
+def get_session(request: Request) -> Iterator[Session]:
+    """
+    Provide a session of its own to every request, closed once the response
+    is sent.
+
+    Requests with a safe method only read, and are served by a read replica
+    when there is one. Every statement of the other requests goes to the
+    primary, their reads included.
+
+    :param request: The incoming request.
+    :type request: Request
+    :return: The session of the request.
+    :rtype: Iterator[Session]
+    """
+    session: Session = create_session(
+        read_only=request.method in constants.SAFE_HTTP_METHODS
+    )
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+def get_health_service(request: Request) -> HealthService:
+    return get_container(request).health_service
+
+
+def get_profile_store_service(request: Request) -> ProfileStoreService:
+    return get_container(request).profile_store_service
+
+
+def get_user_controller(
+    request: Request, session: Session = Depends(get_session)
+) -> UserController:
+    return get_container(request).user_controller(session)
+
+
+def get_role_controller(
+    request: Request, session: Session = Depends(get_session)
+) -> RoleController:
+    return get_container(request).role_controller(session)
+
+
+def get_resource_controller(
+    request: Request, session: Session = Depends(get_session)
+) -> ResourceController:
+    return get_container(request).resource_controller(session)
@@ -1 +1,3 @@
-from .sql_db_setup import Base, db, engine
+from .query_tracker import QueryStats, QueryStatsMiddleware, query_stats
+from .routing import ReplicaSession, ReplicaSet
+from .sql_db_setup import Base, SessionLocal, create_session, db, engine, replicas
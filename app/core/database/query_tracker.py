@@ -0,0 +1,178 @@
+import time
+from collections import Counter
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Optional
+
+from loguru import logger
+from opentelemetry.trace import SpanKind, Status, StatusCode
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core import metrics
+from app.core.tracing import tracer
+from config import settings
+
+# reminder: statements the database can explain without running them
+EXPLAINABLE_OPERATIONS = {"SELECT", "INSERT", "UPDATE", "DELETE"}
+
+
+@dataclass
+class QueryStats:
+    """
+    The queries sent to the database while serving a request.
+
+    :param count: The number of queries.
+    :param duration: The seconds spent waiting for the queries.
+    :param statements: The number of times each statement was sent.
+    """
+
+    count: int = 0
+    duration: float = 0.0
+    statements: Counter = field(default_factory=Counter)
+
+    def repeated_statements(self, threshold: int) -> dict:
+        """
+        Return the statements sent at least `threshold` times.
+
+        Statements are sent with bound parameters, so a statement repeated with
+        different parameters, e.g. loading a relationship for every row of a
+        list, is a probable N+1 query.
+
+        :param threshold: The number of times a statement has to be sent.
+        :type threshold: int
+        :return: The repeated statements and their number of executions.
+        :rtype: dict
+        """
+        return {
+            statement: count
+            for statement, count in self.statements.items()
+            if count >= threshold
+        }
+
+
+# stats of the request being served, None outside of a request
+query_stats: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    span = tracer.start_span(
+        f"database {statement_operation(statement)}",
+        kind=SpanKind.CLIENT,
+        attributes={"db.system": "postgresql", "db.statement": statement},
+    )
+    conn.info.setdefault("query_started", []).append((time.perf_counter(), span))
+
+
+def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started, span = conn.info["query_started"].pop()
+    span.end()
+    elapsed = time.perf_counter() - started
+    operation: str = statement_operation(statement)
+    metrics.DEPENDENCY_LATENCY.labels("database", operation, "success").observe(elapsed)
+    stats: Optional[QueryStats] = query_stats.get()
+    if stats is not None:
+        stats.count += 1
+        stats.duration += elapsed
+        stats.statements[statement] += 1
+    if elapsed * 1000 >= settings.slow_query_threshold_ms:
+        plan: str = ""
+        if operation in EXPLAINABLE_OPERATIONS and not executemany:
+            plan = explain(conn, statement, parameters)
+        logger.warning(f"slow query took {elapsed * 1000:.1f} ms: {statement}\n{plan}")
+
+
+def handle_error(exception_context):
+    conn = exception_context.connection
+    if conn is None or not conn.info.get("query_started"):
+        return
+    started, span = conn.info["query_started"].pop()
+    span.set_status(Status(StatusCode.ERROR, str(exception_context.original_exception)))
+    span.end()
+    elapsed = time.perf_counter() - started
+    operation: str = statement_operation(exception_context.statement or "")
+    metrics.DEPENDENCY_LATENCY.labels("database", operation, "error").observe(elapsed)
+
+
+def statement_operation(statement: str) -> str:
+    words = statement.split(None, 1)
+    return words[0].upper() if words else "UNKNOWN"
+
+
+def explain(conn, statement: str, parameters) -> str:
+    """
+    Return the plan the database chose for a statement, without running it.
+
+    A cursor of its own is used, so neither the result of the explained
+    statement nor the query stats of the request are affected.
+
+    :param conn: The connection the statement was sent on.
+    :param statement: The statement to explain.
+    :type statement: str
+    :param parameters: The parameters the statement was sent with.
+    :return: The query plan, empty if it could not be explained.
+    :rtype: str
+    """
+    try:
+        cursor = conn.connection.cursor()
+        try:
+            cursor.execute(f"EXPLAIN {statement}", parameters)
+            return "\n".join(row[0] for row in cursor.fetchall())
+        finally:
+            cursor.close()
+    except Exception as exc:
+        logger.warning(f"failed to explain slow query with error {exc}")
+        return ""
+
+
+class QueryStatsMiddleware:
+    """
+    Attributes the queries sent to the database to the request sending them.
+
+    The number of queries and the time spent on them are recorded as metrics
+    per route, and with `query_stats_headers` sent back in the
+    X-DB-Query-Count and X-DB-Query-Time headers. A statement sent at least
+    `n_plus_one_threshold` times in one request is logged as a probable N+1.
+
+    :param app: The application to wrap.
+    :type app: ASGIApp
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+        token = query_stats.set(stats)
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start" and settings.query_stats_headers:
+                headers = MutableHeaders(scope=message)
+                headers["X-DB-Query-Count"] = str(stats.count)
+                headers["X-DB-Query-Time"] = f"{stats.duration * 1000:.1f}"
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            query_stats.reset(token)
+            self.record(scope, stats)
+
+    # noinspection PyMethodMayBeStatic
+    def record(self, scope: Scope, stats: QueryStats) -> None:
+        route: str = metrics.route_template(scope)
+        metrics.REQUEST_DB_QUERIES.labels(scope["method"], route).observe(stats.count)
+        metrics.REQUEST_DB_DURATION.labels(scope["method"], route).observe(
+            stats.duration
+        )
+        repeated = stats.repeated_statements(settings.n_plus_one_threshold)
+        for statement, count in repeated.items():
+            metrics.N_PLUS_ONE_QUERIES.labels(scope["method"], route).inc()
+            logger.warning(
+                f"probable N+1 query on {scope['method']} {route}, "
+                f"sent {count} times: {statement}"
+            )
@@ -0,0 +1,172 @@
+import itertools
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+from loguru import logger
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import DBAPIError, InvalidRequestError, OperationalError
+from sqlalchemy.orm import Session
+
+from app import constants
+
+# reminder: weight of the latest query in the moving average of a replica latency
+LATENCY_SMOOTHING = 0.2
+# reminder: seconds for the average latency of an idle replica to halve, so a
+# replica that was slow is tried again after a while
+LATENCY_HALF_LIFE = 30.0
+
+
+class ReplicaSet:
+    """
+    The read replicas of the database and the choice between them.
+
+    With the round robin strategy replicas take turns, with the least latency
+    strategy the replica with the lowest moving average of query latency is
+    chosen. The average of a replica decays while it serves no query, so a
+    replica that recovered from being slow gets reads again. A replica failing
+    a query is left out for `retry_interval` seconds.
+
+    :param engines: The engines of the replicas.
+    :type engines: List[Engine]
+    :param strategy: Either "round_robin" or "least_latency".
+    :type strategy: str
+    :param retry_interval: The seconds a failed replica is left out for.
+    :type retry_interval: float
+    """
+
+    def __init__(self, engines: List[Engine], strategy: str, retry_interval: float):
+        self.engines = engines
+        self.strategy = strategy
+        self.retry_interval = retry_interval
+        self.latency: Dict[Engine, float] = {engine: 0.0 for engine in engines}
+        self.measured_at: Dict[Engine, float] = {
+            engine: time.monotonic() for engine in engines
+        }
+        self.down_until: Dict[Engine, float] = {}
+        self._turn = itertools.count()
+        self._lock = threading.Lock()
+        for engine in engines:
+            event.listen(engine, "before_cursor_execute", self.before_cursor_execute)
+            event.listen(engine, "after_cursor_execute", self.after_cursor_execute)
+
+    def __bool__(self) -> bool:
+        return bool(self.engines)
+
+    def choose(self) -> Optional[Engine]:
+        """
+        Choose the replica to send a read to.
+
+        :return: The replica, None if no replica is available.
+        :rtype: Optional[Engine]
+        """
+        now = time.monotonic()
+        available = [
+            engine for engine in self.engines if self.down_until.get(engine, 0) <= now
+        ]
+        if not available:
+            return None
+        if self.strategy == constants.LEAST_LATENCY_REPLICA:
+            return min(available, key=lambda engine: self.current_latency(engine, now))
+        return available[next(self._turn) % len(available)]
+
+    def current_latency(self, engine: Engine, now: float) -> float:
+        """
+        Return the average latency of a replica, decayed since its last query.
+
+        :param engine: The replica.
+        :type engine: Engine
+        :param now: The current time, from time.monotonic.
+        :type now: float
+        :return: The average latency in seconds.
+        :rtype: float
+        """
+        idle = max(now - self.measured_at[engine], 0.0)
+        return self.latency[engine] * 0.5 ** (idle / LATENCY_HALF_LIFE)
+
+    def mark_down(self, engine: Engine) -> None:
+        with self._lock:
+            self.down_until[engine] = time.monotonic() + self.retry_interval
+        logger.warning(
+            f"replica {engine.url.host}:{engine.url.port} failed, "
+            f"reads go to the other replicas for {self.retry_interval} seconds"
+        )
+
+    # noinspection PyMethodMayBeStatic
+    def before_cursor_execute(self, conn, cursor, statement, *args):
+        conn.info["replica_query_started"] = time.perf_counter()
+
+    def after_cursor_execute(self, conn, cursor, statement, *args):
+        elapsed = time.perf_counter() - conn.info.pop("replica_query_started")
+        engine: Engine = conn.engine
+        now = time.monotonic()
+        with self._lock:
+            latency = self.current_latency(engine, now)
+            self.latency[engine] = latency + LATENCY_SMOOTHING * (elapsed - latency)
+            self.measured_at[engine] = now
+
+
+class ReplicaSession(Session):
+    """
+    Session of a unit of work that only reads, bound to a read replica.
+
+    Sessions are created for a single request or rpc call, a request that
+    may write is given a session of the primary instead, so every read of a
+    unit of work that writes is served by the primary and sees its own
+    writes. The session refuses to flush, a write in a read-only unit of
+    work is a bug rather than something to send to a replica.
+
+    A read failing on the replica with a connection error is retried on
+    another replica, or on the primary once no replica is left, unless the
+    session holds changes that are not flushed yet.
+
+    :param primary: The engine of the primary.
+    :type primary: Engine
+    :param replicas: The read replicas.
+    :type replicas: ReplicaSet
+    """
+
+    def __init__(self, *args, primary: Engine, replicas: ReplicaSet, **kwargs):
+        kwargs["bind"] = replicas.choose() or primary
+        super().__init__(*args, **kwargs)
+        self.primary = primary
+        self.replicas = replicas
+
+    def execute(self, statement, *args, **kwargs):
+        return self.retry(super().execute, statement, *args, **kwargs)
+
+    def scalar(self, statement, *args, **kwargs):
+        return self.retry(super().scalar, statement, *args, **kwargs)
+
+    def scalars(self, statement, *args, **kwargs):
+        return self.retry(super().scalars, statement, *args, **kwargs)
+
+    def retry(self, method: Callable, *args, **kwargs):
+        """
+        Run a statement, on another replica or the primary if the replica the
+        session is bound to cannot be reached.
+
+        :param method: The method of the session running the statement.
+        :type method: Callable
+        :return: The result of the method.
+        """
+        while True:
+            try:
+                return method(*args, **kwargs)
+            except DBAPIError as exc:
+                replica: Engine = self.bind
+                if replica is self.primary or not (
+                    isinstance(exc, OperationalError) or exc.connection_invalidated
+                ):
+                    raise
+                self.replicas.mark_down(replica)
+                if self.new or self.dirty or self.deleted:
+                    raise
+                self.rollback()
+                self.bind = self.replicas.choose() or self.primary
+
+
+@event.listens_for(ReplicaSession, "before_flush")
+def refuse_flush(session: ReplicaSession, flush_context, instances) -> None:
+    raise InvalidRequestError("the session of a read-only unit of work cannot write")
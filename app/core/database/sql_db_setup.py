@@ -1,15 +1,79 @@
-from sqlalchemy import create_engine
+from typing import Optional
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import URL, Engine, make_url
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import Session, sessionmaker
 
+from app.utils.lazy import LazyObject, unwrap
 from config import settings
 
-# reminder: establish a connection to to postgresql
-engine = create_engine(settings.SQLALCHEMY_DATABASE_URI)
+from . import query_tracker
+from .routing import ReplicaSession, ReplicaSet
+
+
+def create_db_engine(url: Optional[URL] = None) -> Engine:
+    db_engine = create_engine(
+        url or settings.SQLALCHEMY_DATABASE_URI,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+    )
+    event.listen(db_engine, "before_cursor_execute", query_tracker.before_cursor_execute)
+    event.listen(db_engine, "after_cursor_execute", query_tracker.after_cursor_execute)
+    event.listen(db_engine, "handle_error", query_tracker.handle_error)
+    return db_engine
+
+
+def create_replica_set() -> ReplicaSet:
+    """
+    Create the engines of the read replicas listed in `db_replica_hosts`.
+
+    Replicas are reached with the credentials and database name of the
+    primary, a host without a port uses the port of the primary.
+
+    :return: The read replicas, empty if there is none.
+    :rtype: ReplicaSet
+    """
+    hosts = [host.strip() for host in settings.db_replica_hosts.split(",")]
+    primary_url = make_url(settings.SQLALCHEMY_DATABASE_URI)
+    engines = []
+    for host in filter(None, hosts):
+        name, _, port = host.partition(":")
+        url = primary_url.set(host=name, port=int(port) if port else primary_url.port)
+        engines.append(create_db_engine(url))
+    return ReplicaSet(
+        engines,
+        strategy=settings.db_replica_strategy,
+        retry_interval=settings.db_replica_retry_interval,
+    )
+
+
+def create_session(read_only: bool = False) -> Session:
+    """
+    Create the session of a unit of work, e.g. a request.
+
+    :param read_only: Whether the unit of work only reads, its session is then
+        bound to a read replica when there is one.
+    :type read_only: bool
+    :return: The session.
+    :rtype: Session
+    """
+    if read_only and unwrap(replicas):
+        return ReplicaSessionLocal(primary=unwrap(engine), replicas=unwrap(replicas))
+    return SessionLocal(bind=unwrap(engine))
+
+
+# reminder: establish a connection to to postgresql, the engine is created
+# on first use so importing the models does not load the database driver
+engine: Engine = LazyObject(create_db_engine)
+replicas: ReplicaSet = LazyObject(create_replica_set)
 
 # reminder: create a session factory for interacting with the database
-SessionLocal: sessionmaker = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+SessionLocal: sessionmaker = sessionmaker(autocommit=False, autoflush=False)
+ReplicaSessionLocal: sessionmaker = sessionmaker(
+    class_=ReplicaSession, autocommit=False, autoflush=False
+)
 
 Base = declarative_base()
 
-db: Session = SessionLocal()
+db: Session = LazyObject(create_session)
@@ -1,8 +1,9 @@
 from fastapi import HTTPException, status
 from fastapi.exceptions import RequestValidationError
-from fastapi.responses import JSONResponse
 from sqlalchemy.exc import DBAPIError
 
+from app.utils.encoders import ORJSONResponse
+
 from .app_exceptions import AppExceptionCase
 
 
@@ -20,7 +21,7 @@ def exception_message(error: str, message: str, internal_code: int) -> dict:
     return {"error": error, "message": message, "internal_code": internal_code}
 
 
-def http_exception_handler(exc: HTTPException) -> JSONResponse:
+def http_exception_handler(exc: HTTPException) -> ORJSONResponse:
     """
     Handle HTTP exceptions raised by the application.
 
@@ -28,9 +29,9 @@ def http_exception_handler(exc: HTTPException) -> JSONResponse:
     :type exc: HTTPException
 
     :return: A JSON response with the error information.
-    :rtype: JSONResponse
+    :rtype: ORJSONResponse
     """
-    return JSONResponse(
+    return ORJSONResponse(
         content=exception_message(
             error="HttpException", message=exc.detail, internal_code=exc.status_code
         ),
@@ -39,7 +40,7 @@ def http_exception_handler(exc: HTTPException) -> JSONResponse:
     )
 
 
-def db_exception_handler(exc: DBAPIError) -> JSONResponse:
+def db_exception_handler(exc: DBAPIError) -> ORJSONResponse:
     """
     Handle database exceptions raised by the application.
 
@@ -47,9 +48,9 @@ def db_exception_handler(exc: DBAPIError) -> JSONResponse:
     :type exc: DBAPIError
 
     :return: A JSON response with the error information.
-    :rtype: JSONResponse
+    :rtype: ORJSONResponse
     """
-    return JSONResponse(
+    return ORJSONResponse(
         content=exception_message(
             error="DatabaseException",
             message=exc.orig.pgerror,
@@ -60,7 +61,7 @@ def db_exception_handler(exc: DBAPIError) -> JSONResponse:
     )
 
 
-def validation_exception_handler(exc: RequestValidationError) -> JSONResponse:
+def validation_exception_handler(exc: RequestValidationError) -> ORJSONResponse:
     """
     Handle data validation exceptions raised by the application.
 
@@ -68,10 +69,10 @@ def validation_exception_handler(exc: RequestValidationError) -> JSONResponse:
     :type exc: RequestValidationError
 
     :return: A JSON response with the error information.
-    :rtype: JSONResponse
+    :rtype: ORJSONResponse
     """
     fields = [(*error.get("loc"), error.get("msg")) for error in exc.errors()]
-    return JSONResponse(
+    return ORJSONResponse(
         content=exception_message(
             error="ValidationException",
             message=f"invalid fields {fields}",
@@ -82,7 +83,7 @@ def validation_exception_handler(exc: RequestValidationError) -> JSONResponse:
     )
 
 
-def app_exception_handler(exc: AppExceptionCase) -> JSONResponse:
+def app_exception_handler(exc: AppExceptionCase) -> ORJSONResponse:
     """
     Handle any other exceptions raised by the application.
 
@@ -90,14 +91,15 @@ def app_exception_handler(exc: AppExceptionCase) -> JSONResponse:
     :type exc: AppExceptionCase
 
     :return: A JSON response with the error information.
-    :rtype: JSONResponse
+    :rtype: ORJSONResponse
     """
-    return JSONResponse(
+    return ORJSONResponse(
         content=exception_message(
             error=exc.exception_case,
             message=exc.error_message,
             internal_code=exc.status_code,
         ),
         status_code=exc.status_code,
+        headers=getattr(exc, "headers", None),
         media_type="application/json",
     )
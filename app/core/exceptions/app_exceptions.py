@@ -115,6 +115,20 @@ class AppException:
             status_code = 401
             super().__init__(status_code, error_message, context=context)
 
+    class ForbiddenException(AppExceptionCase):
+        """
+        Exception to catch errors caused by a user lacking the required role.
+
+        :param error_message: The message returned from the request.
+        :type error_message: Any
+        :param context: Other message suitable for troubleshooting errors.
+        :type context: Any, optional
+        """
+
+        def __init__(self, error_message, context=None):
+            status_code = 403
+            super().__init__(status_code, error_message, context=context)
+
     class ValidationException(AppExceptionCase):
         """
         Exception to catch errors caused by invalid data.
@@ -157,6 +171,23 @@ class AppException:
             status_code = 400
             super().__init__(status_code, error_message, context=context)
 
+    class TooManyRequestsException(AppExceptionCase):
+        """
+        Exception to catch errors caused by exceeding a rate limit.
+
+        :param error_message: The message returned from the request.
+        :type error_message: Any
+        :param retry_after: The number of seconds to wait before retrying.
+        :type retry_after: int, optional
+        :param context: Other message suitable for troubleshooting errors.
+        :type context: Any, optional
+        """
+
+        def __init__(self, error_message, retry_after=None, context=None):
+            status_code = 429
+            super().__init__(status_code, error_message, context=context)
+            self.headers = {"Retry-After": str(retry_after)} if retry_after else None
+
     class ServiceRequestException(AppExceptionCase):
         """
         Exception to catch errors caused by failure to connect to external services.
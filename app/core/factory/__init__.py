@@ -0,0 +1,2 @@
+from .factory import ModelFactory
+from .seeder import CopyStream, Seeder
@@ -0,0 +1,94 @@
+import abc
+import random
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from typing import Callable, Iterator, List, Optional, Sequence, Tuple
+
+from app.core.database import Base
+
+
+class ModelFactory(abc.ABC):
+    """
+    Generates the rows of a model's table deterministically from a seed.
+
+    Subclasses set `model` and implement `row`, which returns the values of
+    the row at an index. Every factory draws from a random generator seeded
+    with the seed and its table, so the same seed always produces the same
+    rows, and adding rows to one table does not change the others.
+
+    :param seed: The seed the rows are generated from.
+    :type seed: int
+    """
+
+    model: Base
+
+    def __init__(self, seed: int):
+        self.seed = seed
+        self.random = random.Random(f"{seed}:{self.model.__tablename__}")
+        self.namespace = uuid.uuid5(
+            uuid.NAMESPACE_OID, f"{seed}:{self.model.__tablename__}"
+        )
+
+    @property
+    def columns(self) -> List[str]:
+        return [column.name for column in self.model.__table__.columns]
+
+    def id(self, index: int) -> uuid.UUID:
+        """
+        Return the primary key of the row at an index.
+
+        The key only depends on the seed, the table and the index, so other
+        factories can reference a row without keeping every generated key.
+
+        :param index: The index of the row.
+        :type index: int
+        :return: The primary key.
+        :rtype: uuid.UUID
+        """
+        return uuid.uuid5(self.namespace, str(index))
+
+    @abc.abstractmethod
+    def row(self, index: int) -> dict:
+        """
+        Return the values of the row at an index, by column name.
+
+        Values are drawn from `self.random`, so rows must be generated in
+        order of their index to be the same for a seed.
+
+        :param index: The index of the row.
+        :type index: int
+        :return: The values of the row, columns left out are NULL.
+        :rtype: dict
+        """
+        raise NotImplementedError
+
+    def rows(
+        self, count: int, observer: Optional[Callable[[dict], None]] = None
+    ) -> Iterator[Tuple]:
+        """
+        Generate the first `count` rows, as tuples ordered like `columns`.
+
+        :param count: The number of rows to generate.
+        :type count: int
+        :param observer: Called with the values of every row as it is generated.
+        :type observer: Callable[[dict], None], optional
+        :return: The rows.
+        :rtype: Iterator[tuple]
+        """
+        columns: List[str] = self.columns
+        for index in range(count):
+            values: dict = self.row(index)
+            if observer is not None:
+                observer(values)
+            yield tuple(values.get(column) for column in columns)
+
+    def choice(self, values: Sequence):
+        return values[self.random.randrange(len(values))]
+
+    def date_between(self, start: date, end: date) -> date:
+        return start + timedelta(days=self.random.randrange((end - start).days))
+
+    def datetime_within(self, days: int) -> datetime:
+        return datetime(2024, 1, 1, tzinfo=timezone.utc) - timedelta(
+            seconds=self.random.randrange(days * 86400)
+        )
@@ -0,0 +1,179 @@
+import os
+import time
+from contextlib import contextmanager
+from typing import Iterator
+
+from opentelemetry.trace import SpanKind
+from prometheus_client import (
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from starlette.routing import Match
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.tracing import tracer
+
+# reminder: seconds, from a cached redis read up to a slow keycloak call
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+# label of requests not matching any route, so unknown paths share one series
+UNMATCHED_ROUTE = "<unmatched>"
+
+REQUEST_COUNT = Counter(
+    "http_requests_total",
+    "Number of HTTP requests served.",
+    ["method", "route", "status"],
+)
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "Time spent serving HTTP requests.",
+    ["method", "route"],
+    buckets=LATENCY_BUCKETS,
+)
+REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress",
+    "Number of HTTP requests being served.",
+    ["method"],
+    multiprocess_mode="livesum",
+)
+DEPENDENCY_LATENCY = Histogram(
+    "dependency_request_duration_seconds",
+    "Time spent calling the database, redis, keycloak and kafka.",
+    ["dependency", "operation", "outcome"],
+    buckets=LATENCY_BUCKETS,
+)
+REQUEST_DB_QUERIES = Histogram(
+    "http_request_db_queries",
+    "Number of database queries sent while serving HTTP requests.",
+    ["method", "route"],
+    buckets=(0, 1, 2, 5, 10, 20, 50, 100),
+)
+REQUEST_DB_DURATION = Histogram(
+    "http_request_db_duration_seconds",
+    "Time spent on database queries while serving HTTP requests.",
+    ["method", "route"],
+    buckets=LATENCY_BUCKETS,
+)
+N_PLUS_ONE_QUERIES = Counter(
+    "http_request_n_plus_one_queries_total",
+    "Number of statements repeated within one HTTP request, probable N+1 queries.",
+    ["method", "route"],
+)
+
+
+@contextmanager
+def observe_dependency(dependency: str, operation: str) -> Iterator[None]:
+    """
+    Time a call to a dependency of the service, in a span of the current trace.
+
+    :param dependency: The dependency called, e.g. redis.
+    :type dependency: str
+    :param operation: The operation performed, e.g. the redis command. Keep
+        the number of distinct operations small, every one is its own series.
+    :type operation: str
+    """
+    started = time.perf_counter()
+    outcome = "success"
+    try:
+        with tracer.start_as_current_span(
+            f"{dependency} {operation}", kind=SpanKind.CLIENT
+        ):
+            yield
+    except Exception:
+        outcome = "error"
+        raise
+    finally:
+        DEPENDENCY_LATENCY.labels(dependency, operation, outcome).observe(
+            time.perf_counter() - started
+        )
+
+
+def route_template(scope: Scope) -> str:
+    """
+    Return the path template of the route a request matches.
+
+    :param scope: The scope of the request.
+    :type scope: Scope
+    :return: The path template, e.g. /api/v1/users/{user_id}.
+    :rtype: str
+    """
+    if "route_template" in scope:
+        return scope["route_template"]
+    # a partial match is a route answering the path with another method
+    template: str = UNMATCHED_ROUTE
+    for route in scope["app"].routes:
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            template = route.path
+            break
+        if match == Match.PARTIAL and template == UNMATCHED_ROUTE:
+            template = route.path
+    scope["route_template"] = template
+    return template
+
+
+class PrometheusMiddleware:
+    """
+    Counts and times the requests served by the application.
+
+    Requests are labelled with the path template of the route they match,
+    e.g. /api/v1/users/{user_id}, so the series do not grow with the ids in
+    the requested paths.
+
+    :param app: The application to wrap.
+    :type app: ASGIApp
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method: str = scope["method"]
+        status_code: int = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        started = time.perf_counter()
+        REQUESTS_IN_PROGRESS.labels(method).inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            REQUESTS_IN_PROGRESS.labels(method).dec()
+            route: str = route_template(scope)
+            REQUEST_COUNT.labels(method, route, status_code).inc()
+            REQUEST_LATENCY.labels(method, route).observe(elapsed)
+
+
+def metrics_registry() -> CollectorRegistry:
+    """
+    Return the registry holding the metrics of every worker.
+
+    When PROMETHEUS_MULTIPROC_DIR is set, each gunicorn worker writes its
+    metrics to that directory and they are aggregated on every scrape,
+    otherwise the metrics of the current process are returned.
+
+    :return: The registry to expose.
+    :rtype: CollectorRegistry
+    """
+    if "PROMETHEUS_MULTIPROC_DIR" not in os.environ:
+        return REGISTRY
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return registry
+
+
+def latest_metrics() -> bytes:
+    return generate_latest(metrics_registry())
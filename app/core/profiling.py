@@ -0,0 +1,166 @@
+import os
+import random
+import sys
+import threading
+import uuid
+from collections import Counter
+from typing import Optional
+
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.exceptions import AppExceptionCase
+from config import settings
+
+# reminder: leaf frames of threads waiting for work, their samples are dropped
+IDLE_FRAMES = {
+    ("threading.py", "wait"),
+    ("queue.py", "get"),
+    ("selectors.py", "select"),
+}
+# only one request per worker is profiled at a time, as the profiler samples
+# every thread of the worker
+profiling_lock = threading.Lock()
+
+
+class SamplingProfiler:
+    """
+    Samples the stacks of every busy thread of the process at a fixed interval.
+
+    Sampling rather than tracing every call keeps the overhead independent of
+    the number of calls, and covers the threads sync endpoints and
+    dependencies run in. The samples are rendered in the folded stacks format
+    read by flame graph tools, e.g. speedscope or flamegraph.pl.
+
+    :param interval: The number of seconds between two samples.
+    :type interval: float
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self.interval):
+            self.sample()
+
+    def sample(self) -> None:
+        own_thread_id: int = threading.get_ident()
+        names: dict = {thread.ident: thread.name for thread in threading.enumerate()}
+        for thread_id, frame in sys._current_frames().items():
+            code = frame.f_code
+            if (
+                thread_id == own_thread_id
+                or (os.path.basename(code.co_filename), code.co_name) in IDLE_FRAMES
+            ):
+                continue
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(
+                    f"{code.co_name} ({os.path.basename(code.co_filename)}:"
+                    f"{code.co_firstlineno})"
+                )
+                frame = frame.f_back
+            stack.append(names.get(thread_id, str(thread_id)))
+            self.stacks[";".join(reversed(stack))] += 1
+
+    def folded(self) -> str:
+        """
+        Render the samples in the folded stacks format.
+
+        :return: One line per distinct stack, followed by its number of samples.
+        :rtype: str
+        """
+        return "\n".join(f"{stack} {count}" for stack, count in self.stacks.items())
+
+
+class ProfilingMiddleware:
+    """
+    Runs selected requests under the sampling profiler.
+
+    A request is profiled when an admin sends it with the `profiling_header`
+    header, or when it matches the sampling rule, i.e. its path starts with
+    one of `profiling_paths` and it is picked with `profiling_sample_rate`.
+    The profile is stored under an id generated by the server, sent back in
+    the X-Profile-Id header, and can be downloaded from the profiles endpoint
+    along with the X-Request-ID the client sent.
+
+    The middleware is only installed with `profiling_enabled`.
+
+    :param app: The application to wrap.
+    :type app: ASGIApp
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or not self.should_profile(scope)
+            or not profiling_lock.acquire(blocking=False)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        # reminder: never store under an id the client chose, sampled requests
+        # need no admin rights and could overwrite the profiles of others
+        profile_id: str = uuid.uuid4().hex
+        request_id: Optional[str] = Headers(scope=scope).get("X-Request-ID")
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message)["X-Profile-Id"] = profile_id
+            await send(message)
+
+        profiler = SamplingProfiler(interval=settings.profiling_interval)
+        profiler.start()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            profiler.stop()
+            profiling_lock.release()
+            await run_in_threadpool(
+                scope["app"].state.container.profile_store_service.save,
+                profile_id,
+                profiler.folded(),
+                ttl=settings.profiling_ttl,
+                request_id=request_id,
+            )
+
+    def should_profile(self, scope: Scope) -> bool:
+        headers = Headers(scope=scope)
+        if settings.profiling_header in headers:
+            return self.is_admin(headers)
+        paths = [path for path in settings.profiling_paths.split(",") if path]
+        return (
+            settings.profiling_sample_rate > 0
+            and any(scope["path"].startswith(path) for path in paths)
+            and random.random() < settings.profiling_sample_rate
+        )
+
+    # noinspection PyMethodMayBeStatic
+    def is_admin(self, headers: Headers) -> bool:
+        from app.utils import KeycloakJwtAuthentication, token_roles
+
+        scheme, _, token = headers.get("Authorization", "").partition(" ")
+        if scheme != "Bearer" or not token:
+            return False
+        try:
+            payload: dict = KeycloakJwtAuthentication().decode_token(token=token)
+        except AppExceptionCase:
+            return False
+        return settings.profiling_admin_role in token_roles(payload)
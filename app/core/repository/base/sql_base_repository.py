@@ -1,24 +1,31 @@
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterator, List, Optional, Sequence
 
+from sqlalchemy import Select
 from sqlalchemy.exc import DBAPIError, IntegrityError
+from sqlalchemy.orm import Session
 
-from app.core.database import Base, db
+from app.core.database import Base, create_session, db
 from app.core.exceptions import AppException
+from app.core.tracing import trace_methods
 
 from .crud_repository_interface import CRUDRepositoryInterface
 
 
+@trace_methods
 class SQLBaseRepository(CRUDRepositoryInterface):
     model: Base
 
-    def __init__(self):
+    def __init__(self, session: Optional[Session] = None):
         """
         Base class to be inherited by all repositories. This class comes with
         base CRUD functionalities attached.
 
         :param model: Base model of the class to be used for queries.
+        :param session: The session to query with, None for the application's
+            session.
+        :type session: Session, optional
         """
-        self.db = db
+        self.db = db if session is None else session
 
     def index(self) -> List[Base]:
         """
@@ -207,3 +214,54 @@ class SQLBaseRepository(CRUDRepositoryInterface):
             return db_obj
         except DBAPIError as exc:
             raise AppException.OperationErrorException(error_message=exc.orig.args[0])
+
+    def find_many_by(self, field: str, values: Sequence[Any]) -> List[Base]:
+        """
+        Retrieve the objects whose field matches any of the values, in one query.
+
+        :param field: The name of the column to match.
+        :type field: str
+        :param values: The values to match.
+        :type values: Sequence[Any]
+        :return: The matching objects, in no particular order.
+        :rtype: List[Base]
+        :raises AppException.OperationError: If there is an error in the database operation.
+        :raises AssertionError: If `field` is not a column of the model.
+        """
+        assert field in self.model.__table__.columns, f"{field} is not a column"
+        if not values:
+            return []
+
+        try:
+            column = getattr(self.model, field)
+            return self.db.query(self.model).filter(column.in_(values)).all()
+        except DBAPIError as exc:
+            raise AppException.OperationErrorException(error_message=exc.orig.args[0])
+
+    # noinspection PyMethodMayBeStatic
+    def stream(self, statement: Select, batch_size: int) -> Iterator[Sequence]:
+        """
+        Stream the rows of a query in batches, with a server-side cursor.
+
+        Only `batch_size` rows are held in memory at a time, whatever the
+        number of rows. The cursor stays open until the stream is exhausted
+        or closed, so the query runs on a session of its own and the commits
+        of other requests do not close it. The session only reads, it is
+        served by a read replica when there is one.
+
+        :param statement: The query to stream the rows of.
+        :type statement: Select
+        :param batch_size: The number of rows fetched at a time.
+        :type batch_size: int
+        :return: The batches of rows.
+        :rtype: Iterator[Sequence]
+        :raises AppException.OperationError: If there is an error in the database operation.
+        """
+        session = create_session(read_only=True)
+        try:
+            result = session.execute(statement.execution_options(yield_per=batch_size))
+            yield from result.partitions()
+        except DBAPIError as exc:
+            raise AppException.OperationErrorException(error_message=exc.orig.args[0])
+        finally:
+            session.close()
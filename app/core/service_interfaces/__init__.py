@@ -1,3 +1,5 @@
 from .auth_service_interface import AuthServiceInterface
 from .cache_service_interface import CacheServiceInterface
 from .event_handler_interface import EventHandlerInterface
+from .otp_store_interface import OtpStoreInterface
+from .rate_limit_store_interface import RateLimitStoreInterface
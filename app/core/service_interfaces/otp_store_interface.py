@@ -0,0 +1,51 @@
+import abc
+from typing import Any, Sequence
+
+
+class OtpStoreInterface(metaclass=abc.ABCMeta):
+    @classmethod
+    def __subclasshook__(cls, subclass: Any) -> bool:
+        return (
+            hasattr(subclass, "save_code")
+            and callable(subclass.save_code)
+            and hasattr(subclass, "consume_code")
+            and callable(subclass.consume_code)
+        )
+
+    @abc.abstractmethod
+    def save_code(self, user_id: Any, code_type: str, code: str, lifetime: int) -> Any:
+        """
+        Saves a code issued to a user, replacing any code previously issued.
+
+        :param user_id: The ID of the user the code is issued to.
+        :type user_id: Any
+        :param code_type: The type of code, either otp_code or sec_token.
+        :type code_type: str
+        :param code: The code to save.
+        :type code: str
+        :param lifetime: The number of seconds the code is valid for.
+        :type lifetime: int
+        :return: Any
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def consume_code(
+        self, user_id: Any, code_type: str, code: str, master_codes: Sequence[str] = ()
+    ) -> Any:
+        """
+        Compares a code with the one issued to the user and, when it matches,
+        removes it so it cannot be used twice.
+
+        :param user_id: The ID of the user the code was issued to.
+        :type user_id: Any
+        :param code_type: The type of code, either otp_code or sec_token.
+        :type code_type: str
+        :param code: The code provided by the user.
+        :type code: str
+        :param master_codes: Codes accepted in place of the issued code.
+        :type master_codes: Sequence[str]
+        :return: The outcome of the comparison.
+        :rtype: CodeStatusEnum
+        """
+        raise NotImplementedError
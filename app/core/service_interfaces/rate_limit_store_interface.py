@@ -0,0 +1,27 @@
+import abc
+from typing import Any, Sequence, Tuple
+
+
+class RateLimitStoreInterface(metaclass=abc.ABCMeta):
+    @classmethod
+    def __subclasshook__(cls, subclass: Any) -> bool:
+        return hasattr(subclass, "hit") and callable(subclass.hit)
+
+    @abc.abstractmethod
+    def hit(
+        self, keys: Sequence[str], limits: Sequence[Tuple[int, int]], algorithm: Any
+    ) -> float:
+        """
+        Records a request against every key, unless one of the keys is over its
+        limit, in which case nothing is recorded.
+
+        :param keys: The keys identifying the caller, e.g. by ip and username.
+        :type keys: Sequence[str]
+        :param limits: The (requests, seconds) limit of each key.
+        :type limits: Sequence[Tuple[int, int]]
+        :param algorithm: The algorithm used to count the requests.
+        :type algorithm: RateLimitAlgorithmEnum
+        :return: The number of seconds to wait before retrying, 0 if allowed.
+        :rtype: float
+        """
+        raise NotImplementedError
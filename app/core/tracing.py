@@ -0,0 +1,217 @@
+import functools
+import inspect
+import sys
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from opentelemetry import propagate, trace
+from opentelemetry.sdk.resources import SERVICE_NAME, Resource
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import (
+    BatchSpanProcessor,
+    ConsoleSpanExporter,
+    SpanExporter,
+)
+from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+from opentelemetry.trace import SpanKind, Status, StatusCode
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app import constants
+from config import settings
+
+# reminder: spans are no-ops until configure_tracing sets the tracer provider
+tracer = trace.get_tracer("app")
+
+
+def create_span_exporter(exporter: str) -> Optional[SpanExporter]:
+    """
+    Create the exporter selected by the tracing_exporter setting.
+
+    Both exporters write one JSON encoded span per line, so traces can be
+    inspected offline, e.g. with jq.
+
+    :param exporter: Either "console" or "file".
+    :type exporter: str
+    :return: The span exporter, None for an unknown exporter.
+    :rtype: SpanExporter, optional
+    """
+
+    def formatter(span) -> str:
+        return span.to_json(indent=None) + "\n"
+
+    if exporter == constants.CONSOLE_SPAN_EXPORTER:
+        return ConsoleSpanExporter(out=sys.stdout, formatter=formatter)
+    if exporter == constants.FILE_SPAN_EXPORTER:
+        return ConsoleSpanExporter(
+            out=open(settings.tracing_file, "a"), formatter=formatter
+        )
+    return None
+
+
+def configure_tracing() -> None:
+    """
+    Set the tracer provider of the process, if tracing is enabled.
+
+    A trace is sampled with the tracing_sample_ratio probability when it starts
+    in this service, and follows the decision of the caller otherwise. The
+    provider can only be set once per process, later calls do nothing.
+    """
+    if not settings.tracing_enabled or isinstance(
+        trace.get_tracer_provider(), TracerProvider
+    ):
+        return
+    provider = TracerProvider(
+        resource=Resource.create({SERVICE_NAME: settings.app_id}),
+        sampler=ParentBased(TraceIdRatioBased(settings.tracing_sample_ratio)),
+    )
+    exporter: Optional[SpanExporter] = create_span_exporter(settings.tracing_exporter)
+    if exporter is not None:
+        provider.add_span_processor(BatchSpanProcessor(exporter))
+    trace.set_tracer_provider(provider)
+
+
+def traced(func: Callable) -> Callable:
+    """
+    Run a method in a span named after its class, e.g. UserController.user_login.
+
+    The class of the instance is used rather than the class defining the
+    method, so methods inherited from a base repository are named after the
+    repository they are called on.
+
+    The span of a generator method covers its iteration rather than the call,
+    which only creates the generator. The span is current while the generator
+    runs, not between the items, as the items may be consumed in another
+    context, e.g. a streamed response iterated from the thread pool.
+
+    :param func: The method to trace.
+    :type func: Callable
+    :return: The traced method.
+    :rtype: Callable
+    """
+
+    if inspect.isgeneratorfunction(func):
+
+        @functools.wraps(func)
+        def generator_wrapper(self, *args, **kwargs):
+            generator = func(self, *args, **kwargs)
+            span = tracer.start_span(f"{type(self).__name__}.{func.__name__}")
+            try:
+                while True:
+                    with trace.use_span(span):
+                        try:
+                            item = next(generator)
+                        except StopIteration as stop:
+                            return stop.value
+                    yield item
+            finally:
+                generator.close()
+                span.end()
+
+        return generator_wrapper
+
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        with tracer.start_as_current_span(f"{type(self).__name__}.{func.__name__}"):
+            return func(self, *args, **kwargs)
+
+    return wrapper
+
+
+def trace_methods(cls: type) -> type:
+    """
+    Class decorator tracing every public method defined by a class.
+
+    :param cls: The class to trace.
+    :type cls: type
+    :return: The class, with its public methods traced.
+    :rtype: type
+    """
+    for name, member in list(vars(cls).items()):
+        if not name.startswith("_") and inspect.isfunction(member):
+            setattr(cls, name, traced(member))
+    return cls
+
+
+def inject_headers(headers: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+    """
+    Add the context of the current span to outgoing http headers.
+
+    :param headers: The headers of the request, a new dict if None.
+    :type headers: dict, optional
+    :return: The headers, with a traceparent header when a span is recording.
+    :rtype: dict
+    """
+    headers = dict(headers or {})
+    propagate.inject(headers)
+    return headers
+
+
+def kafka_headers() -> List[Tuple[str, bytes]]:
+    """
+    Return the context of the current span as kafka message headers.
+
+    :return: The headers to send the message with.
+    :rtype: list[tuple[str, bytes]]
+    """
+    carrier: Dict[str, str] = {}
+    propagate.inject(carrier)
+    return [(key, value.encode()) for key, value in carrier.items()]
+
+
+def extract_kafka_context(headers: Optional[List[Tuple[str, bytes]]]) -> Any:
+    """
+    Return the context a kafka message was sent with.
+
+    :param headers: The headers of the consumed message.
+    :type headers: list[tuple[str, bytes]], optional
+    :return: The context to start the span processing the message in.
+    :rtype: Context
+    """
+    carrier = {key: value.decode() for key, value in headers or [] if value}
+    return propagate.extract(carrier)
+
+
+class TracingMiddleware:
+    """
+    Serves every request in a span, continuing the trace of the caller.
+
+    The span is named after the method and the path template of the route,
+    e.g. POST /api/v1/users/token/access.
+
+    :param app: The application to wrap.
+    :type app: ASGIApp
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        from app.core.metrics import route_template
+
+        carrier: Dict[str, str] = {
+            key.decode("latin-1"): value.decode("latin-1")
+            for key, value in scope["headers"]
+        }
+        with tracer.start_as_current_span(
+            scope["method"],
+            context=propagate.extract(carrier),
+            kind=SpanKind.SERVER,
+            attributes={"http.method": scope["method"], "http.target": scope["path"]},
+        ) as span:
+
+            async def send_wrapper(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    span.set_attribute("http.status_code", message["status"])
+                    if message["status"] >= 500:
+                        span.set_status(Status(StatusCode.ERROR))
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                route: str = route_template(scope)
+                span.update_name(f"{scope['method']} {route}")
+                span.set_attribute("http.route", route)
@@ -0,0 +1,12 @@
+from uvicorn.workers import UvicornWorker
+
+
+class UvloopWorker(UvicornWorker):
+    """
+    Uvicorn worker pinned to uvloop and the httptools parser.
+
+    The default worker picks them when they are installed and silently falls
+    back to asyncio and h11 otherwise, this worker fails to boot instead.
+    """
+
+    CONFIG_KWARGS = {"loop": "uvloop", "http": "httptools"}
@@ -21,7 +21,78 @@ class StatusEnum(enum.Enum):
     disabled = "disabled"
 
 
+class CodeStatusEnum(enum.Enum):
+    """
+    Enum values for the outcome of confirming an otp code or security token
+    """
+
+    valid = "valid"
+    invalid = "invalid"
+    expired = "expired"
+    missing = "missing"
+
+
+class RateLimitAlgorithmEnum(enum.Enum):
+    """
+    Enum values for the algorithms used to rate limit requests
+    """
+
+    sliding_window = "sliding_window"
+    token_bucket = "token_bucket"
+
+
+class RateLimitKeyEnum(enum.Enum):
+    """
+    Enum values for the attributes a request is rate limited by
+    """
+
+    ip = "ip"
+    username = "username"
+    user_id = "user_id"
+    phone = "phone"
+
+
+class HealthStatusEnum(enum.Enum):
+    """
+    Enum values for the status reported by the health endpoints
+    """
+
+    ok = "ok"
+    unavailable = "unavailable"
+
+
+class UserLookupFieldEnum(enum.Enum):
+    """
+    Enum values for the unique fields users are looked up by in batches
+    """
+
+    id = "id"
+    username = "username"
+    email = "email"
+
+
+class ExportFormatEnum(enum.Enum):
+    """
+    Enum values for the formats data is exported in
+    """
+
+    csv = "csv"
+    ndjson = "ndjson"
+
+
 class RegularExpression(enum.Enum):
     phone_number = r"((\+?233)((2)[03467]|(5)[045679])\d{7}$)|(((02)[03467]|(05)[045679])\d{7}$)"  # noqa
     pin = r"([0-9]{4}$)"
     token = r"([0-9]{6}$)"
+
+
+class DomainEventEnum(enum.Enum):
+    """
+    Enum values for domain events published to the message queue
+    """
+
+    user_created = "user.created"
+    user_updated = "user.updated"
+    user_deleted = "user.deleted"
+    role_assigned = "role.assigned"
+    permission_assigned = "permission.assigned"
@@ -0,0 +1,38 @@
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Any, Dict
+
+from config import settings
+
+
+@dataclass
+class EventDataStructure:
+    """
+    Structure of a domain event published to the message queue.
+
+    :param event: The name of the event e.g. user.created.
+    :type event: str
+    :param key: The partitioning key of the event, usually the user id.
+    :type key: str
+    :param details: The state of the object the event is about.
+    :type details: Dict[str, Any]
+    """
+
+    event: str
+    key: str
+    details: Dict[str, Any]
+    service_name: str = settings.app_id
+    occurred_at: str = field(default_factory=lambda: datetime.utcnow().isoformat())
+
+    def serialize(self) -> Dict[str, Any]:
+        """
+        Convert the event to a dictionary, leaving out empty details.
+
+        :return: The event message.
+        :rtype: dict
+        """
+        data: Dict[str, Any] = asdict(self)
+        data["details"] = {
+            key: value for key, value in self.details.items() if value is not None
+        }
+        return data
@@ -1,4 +1,11 @@
+from typing import Any, Dict
+
 from app.core.notifications import NotificationHandler
+from app.enums import DomainEventEnum
+from app.producer import event_publisher
+from config import settings
+
+from .event_data_structure import EventDataStructure
 
 
 class EventNotificationHandler(NotificationHandler):
@@ -6,9 +13,24 @@ class EventNotificationHandler(NotificationHandler):
     Event Notification handler.
 
     This class handles event notification. It publishes an Event message to
-    the message queue which is consumed by the rightful service.
+    the message queue which is consumed by the rightful service. Events are
+    batched per flush interval and partitioned by key, so every event about
+    the same user is consumed in order.
+
+    :param event: The domain event that occurred.
+    :type event: DomainEventEnum
+    :param key: The partitioning key of the event, usually the user id.
+    :type key: str
+    :param details: The state of the object the event is about.
+    :type details: Dict[str, Any]
     """
 
+    def __init__(self, event: DomainEventEnum, key: str, details: Dict[str, Any]):
+        self.event: DomainEventEnum = event
+        self.key: str = str(key)
+        self.details: dict = details
+        self.topic: str = settings.kafka_event_topic
+
     def send(self) -> None:
         """
         Send the event notification.
@@ -16,3 +38,7 @@ class EventNotificationHandler(NotificationHandler):
         This method publishes an Event message to the message queue for consumption
         by the appropriate service.
         """
+        data = EventDataStructure(
+            event=self.event.value, key=self.key, details=self.details
+        )
+        event_publisher.publish(topic=self.topic, key=self.key, value=data.serialize())
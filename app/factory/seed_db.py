@@ -0,0 +1,371 @@
+"""
+Generate a database of realistic users, roles, resources and permissions.
+
+Every row is derived from the seed, so runs with the same seed and sizes
+produce the same database, and the rows are bulk loaded with COPY. The
+passwords of the users are taken from constants.FACTORY_PASSWORDS, the user
+at index i having the password at index i modulo their number, and are
+hashed once per run.
+
+With --keycloak-fixtures, the matching Keycloak users are written as JSON
+lines, loaded by the Keycloak stand-in of the load test.
+
+usage: python -m app.factory.seed_db [--users N] [--roles N] [--resources N]
+    [--roles-per-user N] [--permissions-per-role N] [--seed N] [--truncate]
+    [--keycloak-fixtures PATH]
+"""
+import argparse
+import json
+from datetime import date
+from pathlib import Path
+from typing import Dict, List, Optional, TextIO
+
+from loguru import logger
+
+from app import constants
+from app.core.database import Base, engine
+from app.core.factory import ModelFactory, Seeder
+from app.enums import StatusEnum
+from app.models import (
+    PermissionModel,
+    ResourceModel,
+    RoleModel,
+    RolePermissionModel,
+    UserModel,
+    UserRoleModel,
+)
+from app.models.user_model import pwd_context
+from app.utils.lazy import unwrap
+
+# fmt: off
+FIRST_NAMES = (
+    "Kwame", "Ama", "Kofi", "Akosua", "Yaw", "Efua", "Kojo", "Abena", "Kwabena",
+    "Adwoa", "Kwaku", "Afua", "Fiifi", "Esi", "Kwesi", "Yaa", "Emmanuel", "Grace",
+    "Daniel", "Mercy", "Samuel", "Gifty", "Michael", "Comfort", "Joseph", "Linda",
+)
+LAST_NAMES = (
+    "Mensah", "Boateng", "Owusu", "Asante", "Osei", "Addo", "Appiah", "Agyeman",
+    "Darko", "Ofori", "Amoah", "Nkrumah", "Quaye", "Tetteh", "Adjei", "Annan",
+    "Sarpong", "Bonsu", "Acheampong", "Frimpong", "Opoku", "Antwi", "Badu",
+)
+# fmt: on
+# reminder: mobile prefixes accepted by RegularExpression.phone_number
+PHONE_PREFIXES = ("020", "024", "026", "027", "050", "054", "055")
+ROLE_NAMES = ("admin", "manager", "auditor", "support", "agent", "viewer", "editor")
+RESOURCE_TYPES = ("users", "roles", "accounts", "payments", "reports", "settings")
+PERMISSION_MODES = ("read", "write", "delete", "approve")
+# reminder: share of users in each status, mostly active as in production
+STATUS_WEIGHTS = {StatusEnum.active: 85, StatusEnum.inactive: 15}
+
+
+class UserFactory(ModelFactory):
+    """
+    Generates users with unique usernames, emails, phones and national ids.
+
+    :param seed: The seed the rows are generated from.
+    :type seed: int
+    :param password_hashes: The bcrypt hashes of constants.FACTORY_PASSWORDS.
+    :type password_hashes: list[str]
+    """
+
+    model = UserModel
+
+    def __init__(self, seed: int, password_hashes: List[str]):
+        super().__init__(seed)
+        self.password_hashes = password_hashes
+
+    def row(self, index: int) -> dict:
+        first_name: str = self.choice(FIRST_NAMES)
+        last_name: str = self.choice(LAST_NAMES)
+        username = f"{first_name.lower()}.{last_name.lower()}{index}"
+        created_at = self.datetime_within(days=3 * 365)
+        status: StatusEnum = self.random.choices(
+            list(STATUS_WEIGHTS), list(STATUS_WEIGHTS.values())
+        )[0]
+        return {
+            "id": self.id(index),
+            "first_name": first_name,
+            "last_name": last_name,
+            "username": username,
+            "email": f"{username}@example.com",
+            "phone": f"{PHONE_PREFIXES[index % len(PHONE_PREFIXES)]}"
+            f"{1_000_000 + index // len(PHONE_PREFIXES):07d}",
+            "birth_date": self.date_between(date(1950, 1, 1), date(2005, 1, 1)),
+            "national_id": f"GHA-{index:09d}-{self.random.randrange(10)}",
+            "id_expiration": self.date_between(date(2025, 1, 1), date(2035, 1, 1)),
+            "password": self.password_hashes[index % len(self.password_hashes)],
+            "is_verified": self.random.random() < 0.7,
+            "last_active": self.datetime_within(days=90),
+            "auth_provider_id": str(self.id(index)),
+            "status": status,
+            "is_deleted": self.random.random() < 0.02,
+            "meta_data": None,
+            "created_at": created_at,
+            "updated_at": created_at,
+        }
+
+    # noinspection PyMethodMayBeStatic
+    def keycloak_user(self, values: dict) -> dict:
+        """
+        Return the Keycloak user matching a generated user.
+
+        :param values: The values of the generated user.
+        :type values: dict
+        :return: The user, as the Keycloak admin api returns it.
+        :rtype: dict
+        """
+        return {
+            "id": values["auth_provider_id"],
+            "username": values["username"],
+            "email": values["email"],
+            "firstName": values["first_name"],
+            "lastName": values["last_name"],
+            "enabled": True,
+            "emailVerified": values["is_verified"],
+            "attributes": {
+                "phone": values["phone"],
+                "birthdate": str(values["birth_date"]),
+                "national_id": values["national_id"],
+                "status": values["status"].value,
+            },
+        }
+
+
+class OwnedFactory(ModelFactory):
+    """
+    Generates rows created by the first generated user.
+    """
+
+    def __init__(self, seed: int):
+        super().__init__(seed)
+        self.created_by = UserFactory(seed, password_hashes=[]).id(0)
+
+
+class RoleFactory(OwnedFactory):
+    model = RoleModel
+
+    def row(self, index: int) -> dict:
+        created_by = self.created_by
+        return {
+            "id": self.id(index),
+            "name": f"{self.choice(ROLE_NAMES)}_{index}",
+            "description": "generated role",
+            "is_active": self.random.random() < 0.9,
+            "created_by": created_by,
+            "updated_by": created_by,
+            "created_at": self.datetime_within(days=3 * 365),
+            "updated_at": self.datetime_within(days=365),
+        }
+
+
+class ResourceFactory(OwnedFactory):
+    model = ResourceModel
+
+    def row(self, index: int) -> dict:
+        created_by = str(self.created_by)
+        return {
+            "id": self.id(index),
+            "type": f"{self.choice(RESOURCE_TYPES)}_{index}",
+            "description": "generated resource",
+            "created_by": created_by,
+            "updated_by": created_by,
+            "created_at": self.datetime_within(days=3 * 365),
+            "updated_at": self.datetime_within(days=365),
+        }
+
+
+class PermissionFactory(OwnedFactory):
+    """
+    Generates one permission per mode of PERMISSION_MODES for every resource.
+    """
+
+    model = PermissionModel
+
+    def __init__(self, seed: int):
+        super().__init__(seed)
+        self.resources = ResourceFactory(seed)
+
+    def row(self, index: int) -> dict:
+        resource_index, mode_index = divmod(index, len(PERMISSION_MODES))
+        created_by = str(self.created_by)
+        return {
+            "id": self.id(index),
+            "resource_id": self.resources.id(resource_index),
+            "mode": PERMISSION_MODES[mode_index],
+            "description": f"{PERMISSION_MODES[mode_index]} access",
+            "is_active": True,
+            "created_by": created_by,
+            "updated_by": created_by,
+            "created_at": self.datetime_within(days=3 * 365),
+            "updated_at": self.datetime_within(days=365),
+        }
+
+
+class AssignmentFactory(ModelFactory):
+    """
+    Assigns `per_owner` distinct targets to every owner, e.g. roles to users.
+
+    The row at an index belongs to the owner at index // per_owner, and the
+    targets of an owner are drawn when its first row is generated.
+
+    :param seed: The seed the rows are generated from.
+    :type seed: int
+    :param owner: The factory of the owners.
+    :type owner: ModelFactory
+    :param target: The factory of the assigned rows.
+    :type target: ModelFactory
+    :param target_count: The number of generated targets.
+    :type target_count: int
+    :param per_owner: The number of targets assigned to every owner.
+    :type per_owner: int
+    """
+
+    owner_column: str
+    target_column: str
+
+    def __init__(
+        self,
+        seed: int,
+        owner: ModelFactory,
+        target: ModelFactory,
+        target_count: int,
+        per_owner: int,
+    ):
+        super().__init__(seed)
+        self.owner = owner
+        self.target = target
+        self.target_count = target_count
+        self.per_owner = min(per_owner, target_count)
+        self._targets: List[int] = []
+
+    def row(self, index: int) -> dict:
+        owner_index, position = divmod(index, self.per_owner)
+        if position == 0:
+            self._targets = self.random.sample(range(self.target_count), self.per_owner)
+        return {
+            "id": self.id(index),
+            self.owner_column: self.owner.id(owner_index),
+            self.target_column: self.target.id(self._targets[position]),
+            "created_at": self.datetime_within(days=365),
+            "updated_at": self.datetime_within(days=365),
+        }
+
+
+class UserRoleFactory(AssignmentFactory):
+    model = UserRoleModel
+    owner_column = "user_id"
+    target_column = "role_id"
+
+
+class RolePermissionFactory(AssignmentFactory):
+    model = RolePermissionModel
+    owner_column = "role_id"
+    target_column = "permission_id"
+
+
+def seed_db(
+    users: int,
+    roles: int,
+    resources: int,
+    roles_per_user: int,
+    permissions_per_role: int,
+    seed: int,
+    truncate: bool = False,
+    keycloak_fixtures: Optional[TextIO] = None,
+) -> Dict[str, int]:
+    """
+    Generate the rows of every table and load them into the database.
+
+    :param users: The number of users.
+    :type users: int
+    :param roles: The number of roles.
+    :type roles: int
+    :param resources: The number of resources, each with every permission mode.
+    :type resources: int
+    :param roles_per_user: The number of roles assigned to every user.
+    :type roles_per_user: int
+    :param permissions_per_role: The number of permissions granted to every role.
+    :type permissions_per_role: int
+    :param seed: The seed the rows are generated from.
+    :type seed: int
+    :param truncate: Empty the tables before loading them.
+    :type truncate: bool
+    :param keycloak_fixtures: A file the matching Keycloak users are written to.
+    :type keycloak_fixtures: TextIO, optional
+    :return: The number of rows loaded per table.
+    :rtype: dict[str, int]
+    """
+    Base.metadata.create_all(bind=engine)
+    seeder = Seeder(unwrap(engine))
+    if truncate:
+        seeder.truncate([UserModel, RoleModel, ResourceModel, PermissionModel])
+
+    password_hashes = [
+        pwd_context.hash(password) for password in constants.FACTORY_PASSWORDS
+    ]
+    user_factory = UserFactory(seed, password_hashes)
+    role_factory = RoleFactory(seed)
+    resource_factory = ResourceFactory(seed)
+    permission_factory = PermissionFactory(seed)
+    permissions: int = resources * len(PERMISSION_MODES)
+    user_role_factory = UserRoleFactory(
+        seed, user_factory, role_factory, roles, roles_per_user
+    )
+    role_permission_factory = RolePermissionFactory(
+        seed, role_factory, permission_factory, permissions, permissions_per_role
+    )
+
+    def write_fixture(values: dict) -> None:
+        keycloak_fixtures.write(json.dumps(user_factory.keycloak_user(values)) + "\n")
+
+    observer = write_fixture if keycloak_fixtures is not None else None
+    counts: Dict[str, int] = {}
+    for factory, count, row_observer in (
+        (user_factory, users, observer),
+        (role_factory, roles, None),
+        (resource_factory, resources, None),
+        (permission_factory, permissions, None),
+        (role_permission_factory, roles * role_permission_factory.per_owner, None),
+        (user_role_factory, users * user_role_factory.per_owner, None),
+    ):
+        counts[factory.model.__tablename__] = seeder.copy(
+            factory.model, factory.columns, factory.rows(count, row_observer)
+        )
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--users", type=int, default=100_000)
+    parser.add_argument("--roles", type=int, default=50)
+    parser.add_argument("--resources", type=int, default=200)
+    parser.add_argument("--roles-per-user", type=int, default=2)
+    parser.add_argument("--permissions-per-role", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--truncate", action="store_true")
+    parser.add_argument("--keycloak-fixtures", type=Path)
+    args = parser.parse_args()
+
+    fixtures: Optional[TextIO] = (
+        args.keycloak_fixtures.open("w") if args.keycloak_fixtures else None
+    )
+    try:
+        counts = seed_db(
+            users=args.users,
+            roles=args.roles,
+            resources=args.resources,
+            roles_per_user=args.roles_per_user,
+            permissions_per_role=args.permissions_per_role,
+            seed=args.seed,
+            truncate=args.truncate,
+            keycloak_fixtures=fixtures,
+        )
+    finally:
+        if fixtures is not None:
+            fixtures.close()
+    for table, count in counts.items():
+        logger.info(f"{table}: {count} rows")
+
+
+if __name__ == "__main__":
+    main()
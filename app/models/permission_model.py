@@ -1,18 +1,16 @@
-import uuid
-
 import sqlalchemy as sa
 from fastapi_pagination.ext.sqlalchemy import paginate
-from sqlalchemy.orm import Query, relationship
+from sqlalchemy.orm import Query, Session, relationship
 
 from app import constants
-from app.core.database import Base, db
+from app.core.database import Base
 from app.enums import SortResultEnum
-from app.utils import GUID, Params
+from app.utils import GUID, Params, uuid7
 
 
 class PermissionModel(Base):
     __tablename__ = "permissions"
-    id = sa.Column(GUID, primary_key=True, default=uuid.uuid4)
+    id = sa.Column(GUID, primary_key=True, default=uuid7)
     resource_id = sa.Column(
         GUID, sa.ForeignKey("resources.id"), nullable=False, index=True
     )
@@ -38,15 +36,16 @@ class PermissionModel(Base):
     )
 
     @classmethod
-    def search(cls, keyword: str) -> Query:
+    def search(cls, keyword: str, session: Session) -> Query:
         """
         Search for Permissions matching a keyword.
 
         :param keyword: The keyword to search for.
+        :param session: The session to query with.
         :return: The query result.
         :rtype: Query
         """
-        result = db.query(PermissionModel).filter(
+        result = session.query(PermissionModel).filter(
             sa.or_(
                 PermissionModel.mode.ilike(f"%{keyword}%"),
                 PermissionModel.description.ilike(f"%{keyword}%"),
@@ -1,18 +1,16 @@
-import uuid
-
 import sqlalchemy as sa
 from fastapi_pagination.ext.sqlalchemy import paginate
-from sqlalchemy.orm import Query, relationship
+from sqlalchemy.orm import Query, Session, relationship
 
 from app import constants
-from app.core.database import Base, db
+from app.core.database import Base
 from app.enums import SortResultEnum
-from app.utils import GUID, Params
+from app.utils import GUID, Params, uuid7
 
 
 class ResourceModel(Base):
     __tablename__ = "resources"
-    id = sa.Column(GUID, primary_key=True, default=uuid.uuid4)
+    id = sa.Column(GUID, primary_key=True, default=uuid7)
     type = sa.Column(sa.String, nullable=False, unique=True)
     description = sa.Column(sa.String)
     created_by = sa.Column(sa.String, nullable=False)
@@ -31,15 +29,16 @@ class ResourceModel(Base):
     permissions = relationship("PermissionModel", backref="resource")
 
     @classmethod
-    def search(cls, keyword: str) -> Query:
+    def search(cls, keyword: str, session: Session) -> Query:
         """
         Search for resources matching a keyword.
 
         :param keyword: The keyword to search for.
+        :param session: The session to query with.
         :return: The query result.
         :rtype: Query
         """
-        result = db.query(ResourceModel).filter(
+        result = session.query(ResourceModel).filter(
             sa.or_(
                 ResourceModel.type.ilike(f"%{keyword}%"),
                 ResourceModel.description.ilike(f"%{keyword}%"),
@@ -1,18 +1,16 @@
-import uuid
-
 import sqlalchemy as sa
 from fastapi_pagination.ext.sqlalchemy import paginate
-from sqlalchemy.orm import Query, relationship
+from sqlalchemy.orm import Query, Session, relationship
 
 from app import constants
-from app.core.database import Base, db
+from app.core.database import Base
 from app.enums import SortResultEnum
-from app.utils import GUID, Params
+from app.utils import GUID, Params, uuid7
 
 
 class RoleModel(Base):
     __tablename__ = "roles"
-    id = sa.Column(GUID, primary_key=True, default=uuid.uuid4)
+    id = sa.Column(GUID, primary_key=True, default=uuid7)
     name = sa.Column(sa.String, nullable=False, unique=True)
     description = sa.Column(sa.String)
     is_active = sa.Column(sa.Boolean, nullable=False)
@@ -33,15 +31,16 @@ class RoleModel(Base):
     role_permission = relationship("RolePermissionModel", backref="role")
 
     @classmethod
-    def search(cls, keyword: str) -> Query:
+    def search(cls, keyword: str, session: Session) -> Query:
         """
         Search for samples matching a keyword.
 
         :param keyword: The keyword to search for.
+        :param session: The session to query with.
         :return: The query result.
         :rtype: Query
         """
-        result = db.query(RoleModel).filter(
+        result = session.query(RoleModel).filter(
             sa.or_(
                 RoleModel.name.ilike(f"%{keyword}%"),
                 RoleModel.description.ilike(f"%{keyword}%"),
@@ -1,14 +1,12 @@
-import uuid
-
 import sqlalchemy as sa
 
 from app.core.database import Base
-from app.utils import GUID
+from app.utils import GUID, uuid7
 
 
 class RolePermissionModel(Base):
     __tablename__ = "role_permissions"
-    id = sa.Column(GUID, primary_key=True, default=uuid.uuid4)
+    id = sa.Column(GUID, primary_key=True, default=uuid7)
     permission_id = sa.Column(
         GUID, sa.ForeignKey("permissions.id"), nullable=False, index=True
     )
@@ -1,16 +1,19 @@
-import uuid
-
 import sqlalchemy as sa
 from fastapi_pagination.ext.sqlalchemy import paginate
 from passlib.context import CryptContext
-from sqlalchemy.orm import Query
+from sqlalchemy.orm import Query, Session
 
 from app import constants
-from app.core.database import Base, db
+from app.core.database import Base
+from app.core.tracing import tracer
 from app.enums import SortResultEnum, StatusEnum
-from app.utils import GUID, Params
+from app.utils import GUID, Params, uuid7
+from app.utils.lazy import LazyObject
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# reminder: the bcrypt backend is loaded on the first password hash
+pwd_context: CryptContext = LazyObject(
+    lambda: CryptContext(schemes=["bcrypt"], deprecated="auto")
+)
 
 
 class UserModel(Base):
@@ -19,7 +22,7 @@ class UserModel(Base):
     """
 
     __tablename__ = "users"
-    id = sa.Column(GUID, primary_key=True, default=uuid.uuid4)
+    id = sa.Column(GUID, primary_key=True, default=uuid7)
     first_name = sa.Column(sa.String, nullable=False)
     last_name = sa.Column(sa.String, nullable=False)
     username = sa.Column(sa.String, nullable=False, unique=True, index=True)
@@ -56,22 +59,25 @@ class UserModel(Base):
 
     @hash_password.setter
     def hash_password(self, password):
-        self.password = pwd_context.hash(password)
+        with tracer.start_as_current_span("bcrypt.hash"):
+            self.password = pwd_context.hash(password)
 
     # noinspection PyMethodMayBeStatic
     def verify_password(self, plain_password):
-        return pwd_context.verify(plain_password, self.password)
+        with tracer.start_as_current_span("bcrypt.verify"):
+            return pwd_context.verify(plain_password, self.password)
 
     @classmethod
-    def search(cls, keyword: str) -> Query:
+    def search(cls, keyword: str, session: Session) -> Query:
         """
         Search for samples matching a keyword.
 
         :param keyword: The keyword to search for.
+        :param session: The session to query with.
         :return: The query result.
         :rtype: Query
         """
-        result = db.query(UserModel).filter(
+        result = session.query(UserModel).filter(
             sa.or_(
                 UserModel.first_name.ilike(f"%{keyword}%"),
                 UserModel.last_name.ilike(f"%{keyword}%"),
@@ -1,14 +1,12 @@
-import uuid
-
 from sqlalchemy import Column, DateTime, ForeignKey, String, func
 
 from app.core.database import Base
-from app.utils import GUID
+from app.utils import GUID, uuid7
 
 
 class UserOtpModel(Base):
     __tablename__ = "users_otp"
-    id = Column(GUID, primary_key=True, default=uuid.uuid4)
+    id = Column(GUID, primary_key=True, default=uuid7)
     user_id = Column(GUID, ForeignKey("users.id"), nullable=False, index=True)
     otp_code = Column(String(), nullable=True, index=True)
     otp_code_expiration = Column(DateTime(timezone=True), nullable=True)
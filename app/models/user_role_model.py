@@ -1,14 +1,12 @@
-import uuid
-
 import sqlalchemy as sa
 
 from app.core.database import Base
-from app.utils import GUID
+from app.utils import GUID, uuid7
 
 
 class UserRoleModel(Base):
     __tablename__ = "user_roles"
-    id = sa.Column(GUID, primary_key=True, default=uuid.uuid4)
+    id = sa.Column(GUID, primary_key=True, default=uuid7)
     user_id = sa.Column(GUID, sa.ForeignKey("users.id"), nullable=False, index=True)
     role_id = sa.Column(GUID, sa.ForeignKey("roles.id"), nullable=False, index=True)
     created_by = sa.Column(sa.String)
@@ -1,14 +1,25 @@
+import atexit
 import json
+import threading
+from typing import TYPE_CHECKING, Any, List, Optional, Tuple
 
-from kafka import KafkaProducer
-from kafka.errors import KafkaError
+from loguru import logger
 
 from app.core.exceptions import AppException
+from app.core.metrics import observe_dependency
+from app.core.tracing import kafka_headers
 from config import settings
 
+if TYPE_CHECKING:
+    from kafka import KafkaProducer
+
 
 def json_serializer(data):
-    return json.dumps(data).encode("UTF-8")
+    return json.dumps(data, separators=(",", ":"), default=str).encode("UTF-8")
+
+
+def key_serializer(key):
+    return str(key).encode("UTF-8") if key is not None else None
 
 
 def get_partition(key, all, available):
@@ -16,6 +27,10 @@ def get_partition(key, all, available):
 
 
 def publish_to_kafka(topic, value):
+    # reminder: kafka is imported on first publish as it is slow to import
+    from kafka import KafkaProducer
+    from kafka.errors import KafkaError
+
     try:
         producer = KafkaProducer(
             bootstrap_servers=settings.kafka_bootstrap_servers.split("|"),
@@ -26,9 +41,160 @@ def publish_to_kafka(topic, value):
             sasl_plain_username=settings.kafka_server_username,
             sasl_plain_password=settings.kafka_server_password,
         )
-        producer.send(topic=topic, value=value)
+        with observe_dependency("kafka", "SEND"):
+            producer.send(topic=topic, value=value, headers=kafka_headers())
         return True
     except KafkaError as exc:
         raise AppException.OperationErrorException(
             error_message=f"kafka error with error {exc}"
         )
+
+
+class KafkaBatchPublisher:
+    """
+    Buffers keyed messages in memory and publishes them to Kafka in batches.
+
+    Messages are flushed by a background thread every `flush_interval` seconds,
+    or as soon as `batch_size` messages are waiting. A single producer is reused
+    for every flush and messages are partitioned by key, so all messages sharing
+    a key land on the same partition in the order they were published.
+
+    :param flush_interval: The maximum number of seconds a message waits in the buffer.
+    :type flush_interval: float
+    :param batch_size: The number of buffered messages that triggers an early flush.
+    :type batch_size: int
+    """
+
+    def __init__(self, flush_interval: float, batch_size: int):
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.max_buffer_size = batch_size * 10
+        self._buffer: List[Tuple[str, Any, Any, List[Tuple[str, bytes]]]] = []
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._producer: Optional["KafkaProducer"] = None
+        self._worker: Optional[threading.Thread] = None
+
+    def publish(self, topic: str, key: Any, value: Any) -> None:
+        """
+        Add a message to the buffer.
+
+        The message is sent with the trace context it was published in, rather
+        than the one of the background flush.
+
+        :param topic: The topic to publish the message to.
+        :type topic: str
+        :param key: The partitioning key of the message.
+        :type key: Any
+        :param value: The message to publish.
+        :type value: Any
+        """
+        with self._lock:
+            self._buffer.append((topic, key, value, kafka_headers()))
+            buffer_size = len(self._buffer)
+            self._start_worker()
+        if buffer_size >= self.batch_size:
+            self._wakeup.set()
+
+    def flush(self) -> int:
+        """
+        Publish every buffered message and wait for the broker to acknowledge them.
+
+        Messages whose delivery is not confirmed once the producer is flushed
+        are put back in front of the buffer, in the order they were published,
+        and retried on the next flush. A message still in flight when the flush
+        fails is retried too, so it may be published twice. The buffer keeps up
+        to `max_buffer_size` messages, the messages past it are dropped.
+
+        :return: The number of messages published.
+        :rtype: int
+        """
+        from kafka.errors import KafkaError
+
+        with self._lock:
+            batch, self._buffer = self._buffer, []
+        if not batch:
+            return 0
+        futures = []
+        error: Optional[Exception] = None
+        try:
+            with observe_dependency("kafka", "FLUSH"):
+                producer = self.get_producer()
+                for topic, key, value, headers in batch:
+                    futures.append(
+                        producer.send(topic=topic, key=key, value=value, headers=headers)
+                    )
+                producer.flush()
+        except KafkaError as exc:
+            error = exc
+        # reminder: flush does not raise for a failed delivery, it is only
+        # reported on the future of the message
+        failed = [
+            message for message, future in zip(batch, futures) if not future.succeeded()
+        ] + batch[len(futures) :]
+        if failed:
+            errors = (future.exception for future in futures if future.failed())
+            self.requeue(failed, error or next(errors, None))
+        return len(batch) - len(failed)
+
+    def requeue(self, messages: list, error: Exception) -> None:
+        """
+        Put messages that were not published back in front of the buffer.
+
+        :param messages: The messages to publish again, in the order they were
+            published.
+        :type messages: list
+        :param error: The error the messages failed with.
+        :type error: Exception
+        """
+        with self._lock:
+            buffer = messages + self._buffer
+            self._buffer = buffer[: self.max_buffer_size]
+        logger.error(f"failed to publish {len(messages)} messages with error {error}")
+        dropped = len(buffer) - self.max_buffer_size
+        if dropped > 0:
+            logger.error(
+                f"dropped {dropped} messages, the buffer holds up to "
+                f"{self.max_buffer_size} messages"
+            )
+
+    def get_producer(self) -> "KafkaProducer":
+        """
+        Return the producer used for flushing, creating it on first use.
+
+        :return: The Kafka producer.
+        :rtype: KafkaProducer
+        """
+        from kafka import KafkaProducer
+
+        if self._producer is None:
+            self._producer = KafkaProducer(
+                bootstrap_servers=settings.kafka_bootstrap_servers.split("|"),
+                value_serializer=json_serializer,
+                key_serializer=key_serializer,
+                compression_type=settings.kafka_compression_type or None,
+                linger_ms=int(self.flush_interval * 1000),
+                security_protocol="SASL_PLAINTEXT",
+                sasl_mechanism="SCRAM-SHA-256",
+                sasl_plain_username=settings.kafka_server_username,
+                sasl_plain_password=settings.kafka_server_password,
+            )
+        return self._producer
+
+    def _start_worker(self) -> None:
+        if self._worker is None or not self._worker.is_alive():
+            self._worker = threading.Thread(target=self._run, daemon=True)
+            self._worker.start()
+
+    def _run(self) -> None:
+        while True:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self.flush()
+
+
+event_publisher = KafkaBatchPublisher(
+    flush_interval=settings.kafka_event_flush_interval,
+    batch_size=settings.kafka_event_batch_size,
+)
+atexit.register(event_publisher.flush)
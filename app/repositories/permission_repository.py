@@ -1,6 +1,54 @@
+from sqlalchemy import select
+from sqlalchemy.exc import DBAPIError
+
+from app.core.exceptions import AppException
 from app.core.repository import SQLBaseRepository
-from app.models import PermissionModel
+from app.models import (
+    PermissionModel,
+    ResourceModel,
+    RoleModel,
+    RolePermissionModel,
+    UserRoleModel,
+)
 
 
 class PermissionRepository(SQLBaseRepository):
     model = PermissionModel
+
+    def user_has_permission(self, user_id: str, resource: str, mode: str) -> bool:
+        """
+        Check whether any active role of a user grants a permission on a
+        resource, in one query.
+
+        :param user_id: The id of the user.
+        :type user_id: str
+        :param resource: The type of the resource.
+        :type resource: str
+        :param mode: The mode of the permission, e.g. read or write.
+        :type mode: str
+        :return: True if the user has the permission.
+        :rtype: bool
+        :raises AppException.OperationError: If there is an error in the database operation.
+        """
+        statement = (
+            select(PermissionModel.id)
+            .join(ResourceModel, ResourceModel.id == PermissionModel.resource_id)
+            .join(
+                RolePermissionModel,
+                RolePermissionModel.permission_id == PermissionModel.id,
+            )
+            .join(RoleModel, RoleModel.id == RolePermissionModel.role_id)
+            .join(UserRoleModel, UserRoleModel.role_id == RoleModel.id)
+            .where(
+                UserRoleModel.user_id == user_id,
+                ResourceModel.type == resource,
+                PermissionModel.mode == mode,
+                PermissionModel.is_active.is_not(False),
+                RoleModel.is_active.is_(True),
+                RoleModel.deleted_at.is_(None),
+            )
+        )
+        try:
+            return self.db.query(statement.exists()).scalar()
+        except DBAPIError as exc:
+            raise AppException.OperationErrorException(error_message=exc.orig.args[0])
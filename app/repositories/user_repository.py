@@ -1,6 +1,145 @@
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence
+
+import sqlalchemy as sa
+from sqlalchemy import select, update
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Session
+
+from app.core.exceptions import AppException
 from app.core.repository import SQLBaseRepository
-from app.models import UserModel
+from app.core.tracing import trace_methods
+from app.models import RoleModel, UserModel, UserRoleModel
+from app.services import UserCacheService
 
 
+@trace_methods
 class UserRepository(SQLBaseRepository):
     model = UserModel
+
+    def __init__(
+        self,
+        user_cache_service: Optional[UserCacheService] = None,
+        session: Optional[Session] = None,
+    ):
+        """
+        :param user_cache_service: The cache batch lookups read first, None
+            to always read the database.
+        :type user_cache_service: UserCacheService, optional
+        :param session: The session to query with, None for the application's
+            session.
+        :type session: Session, optional
+        """
+        super().__init__(session=session)
+        self.user_cache_service = user_cache_service
+
+    def find_many_by(self, field: str, values: Sequence[Any]) -> List[UserModel]:
+        """
+        Retrieve the users whose field matches any of the values.
+
+        With a cache, the cached users are returned as they are and the
+        others are read in one query, then cached.
+
+        :param field: The name of the column to match, id, username or email
+            when a cache is used.
+        :type field: str
+        :param values: The values to match.
+        :type values: Sequence[Any]
+        :return: The matching users, in no particular order.
+        :rtype: List[UserModel]
+        :raises AppException.OperationError: If there is an error in the database operation.
+        """
+        if self.user_cache_service is None:
+            return super().find_many_by(field, values)
+
+        cached: Dict[str, UserModel] = self.user_cache_service.get_many(field, values)
+        missing = [value for value in values if value not in cached]
+        users: List[UserModel] = super().find_many_by(field, missing)
+        if users:
+            self.user_cache_service.set_many(users)
+        return [*cached.values(), *users]
+
+    def find_role_names(self, user_id: Any) -> List[str]:
+        """
+        Retrieve the names of the active roles assigned to a user.
+
+        :param user_id: The id of the user.
+        :type user_id: Any
+        :return: The names of the roles, sorted.
+        :rtype: List[str]
+        :raises AppException.OperationError: If there is an error in the database operation.
+        """
+        statement = (
+            select(RoleModel.name)
+            .join(UserRoleModel, UserRoleModel.role_id == RoleModel.id)
+            .where(
+                UserRoleModel.user_id == user_id,
+                RoleModel.is_active.is_(True),
+                RoleModel.deleted_at.is_(None),
+            )
+            .order_by(RoleModel.name)
+        )
+        try:
+            return list(self.db.scalars(statement))
+        except DBAPIError as exc:
+            raise AppException.OperationErrorException(error_message=exc.orig.args[0])
+
+    def update_last_active(self, activity: Dict[str, datetime]) -> None:
+        """
+        Set the last time users were seen, in a single update.
+
+        A time older than the one stored is ignored, so batches written out of
+        order by different workers never move a user's activity back. The
+        users' updated_at is left as it is and their cached copy is not
+        invalidated, activity is not a change of the user.
+
+        :param activity: The last time each user was seen, by username.
+        :type activity: Dict[str, datetime]
+        :raises AppException.OperationError: If there is an error in the database operation.
+        """
+        rows = sa.values(
+            sa.column("username", sa.String),
+            sa.column("last_active", sa.DateTime),
+            name="activity",
+        ).data(list(activity.items()))
+        statement = (
+            update(UserModel)
+            .where(
+                UserModel.username == rows.c.username,
+                sa.or_(
+                    UserModel.last_active.is_(None),
+                    UserModel.last_active < rows.c.last_active,
+                ),
+            )
+            .values(last_active=rows.c.last_active, updated_at=UserModel.updated_at)
+            .execution_options(synchronize_session=False)
+        )
+        try:
+            self.db.execute(statement)
+            self.db.commit()
+        except DBAPIError as exc:
+            self.db.rollback()
+            raise AppException.OperationErrorException(error_message=exc.orig.args[0])
+
+    def update(self, filter_params: Dict[str, Any], obj_in: Dict[str, Any]) -> UserModel:
+        user: UserModel = super().update(filter_params, obj_in)
+        self.invalidate(user.id)
+        return user
+
+    def update_by_id(self, obj_id: str, obj_in: Dict[str, Any]) -> UserModel:
+        user: UserModel = super().update_by_id(obj_id, obj_in)
+        self.invalidate(user.id)
+        return user
+
+    def delete(self, filter_params: Dict[str, Any]) -> None:
+        user: UserModel = self.find(filter_params)
+        super().delete_by_id(user.id)
+        self.invalidate(user.id)
+
+    def delete_by_id(self, obj_id: str) -> None:
+        super().delete_by_id(obj_id)
+        self.invalidate(obj_id)
+
+    def invalidate(self, user_id: Any) -> None:
+        if self.user_cache_service is not None:
+            self.user_cache_service.invalidate(str(user_id))
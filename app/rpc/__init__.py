@@ -0,0 +1,3 @@
+from .interceptors import ServiceAuthInterceptor
+from .server import create_rpc_server
+from .user_rpc_service import UserRpcService
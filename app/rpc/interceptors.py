@@ -0,0 +1,82 @@
+from typing import Callable, Dict, Optional, Tuple
+
+import grpc
+
+from app import constants
+from app.core.container import Container
+from app.core.exceptions import AppException
+from app.utils import decode_token, token_roles
+
+# reminder: handler factories by whether the rpc streams its requests and its
+# responses
+HANDLER_FACTORIES: Dict[Tuple[bool, bool], Callable] = {
+    (False, False): grpc.unary_unary_rpc_method_handler,
+    (False, True): grpc.unary_stream_rpc_method_handler,
+    (True, False): grpc.stream_unary_rpc_method_handler,
+    (True, True): grpc.stream_stream_rpc_method_handler,
+}
+
+
+class ServiceAuthInterceptor(grpc.ServerInterceptor):
+    """
+    Authenticate the calls of the internal rpc api.
+
+    Callers send the Keycloak access token of their service account in the
+    `authorization` metadata, as "Bearer <token>". The token is verified like
+    the bearer tokens of the http api, and must grant one of the roles.
+
+    :param container: The container the token revocation service is taken from.
+    :type container: Container
+    :param roles: Roles the service account needs one of.
+    :type roles: list[str]
+    """
+
+    def __init__(self, container: Container, roles: list):
+        self.container = container
+        self.roles = roles
+
+    def authenticate(self, metadata: dict) -> Optional[Tuple[grpc.StatusCode, str]]:
+        """
+        Check the token a call was sent with.
+
+        :param metadata: The metadata of the call.
+        :type metadata: dict
+        :return: The status and message to end the call with, None if the
+            call is authenticated.
+        :rtype: tuple[grpc.StatusCode, str], optional
+        """
+        scheme, _, token = metadata.get("authorization", "").partition(" ")
+        if scheme != "Bearer" or not token:
+            return grpc.StatusCode.UNAUTHENTICATED, "missing bearer token"
+        try:
+            payload: dict = decode_token(token)
+        except AppException.InvalidTokenException:
+            error = constants.EXC_INVALID_INPUT.format("token")
+            return grpc.StatusCode.UNAUTHENTICATED, error
+        if self.container.token_revocation_service.is_revoked(token, payload):
+            error = constants.EXC_REVOKED_INPUT.format("token")
+            return grpc.StatusCode.UNAUTHENTICATED, error
+        if not set(self.roles) & set(token_roles(payload)):
+            error = "caller does not have the required role"
+            return grpc.StatusCode.PERMISSION_DENIED, error
+        return None
+
+    def intercept_service(self, continuation, handler_call_details):
+        handler = continuation(handler_call_details)
+        if handler is None:
+            return None
+        error = self.authenticate(dict(handler_call_details.invocation_metadata))
+        if error is None:
+            return handler
+
+        def abort(request, context):
+            context.abort(*error)
+
+        factory = HANDLER_FACTORIES[
+            (handler.request_streaming, handler.response_streaming)
+        ]
+        return factory(
+            abort,
+            request_deserializer=handler.request_deserializer,
+            response_serializer=handler.response_serializer,
+        )
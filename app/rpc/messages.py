@@ -0,0 +1,59 @@
+from datetime import datetime
+from typing import Optional
+
+from google.protobuf.timestamp_pb2 import Timestamp
+
+from app.models import UserModel
+from app.schema import UserSchema
+
+from . import user_service_pb2
+
+
+def timestamp(value: Optional[datetime]) -> Optional[Timestamp]:
+    """
+    Convert a datetime to a protobuf timestamp.
+
+    :param value: The datetime, naive datetimes are taken as utc.
+    :type value: datetime, optional
+    :return: The timestamp, None to leave the field unset.
+    :rtype: Timestamp, optional
+    """
+    if value is None:
+        return None
+    message = Timestamp()
+    message.FromDatetime(value)
+    return message
+
+
+def user_message(user: UserModel) -> user_service_pb2.User:
+    """
+    Convert a user to its rpc message, with the fields of UserSchema.
+
+    :param user: The user.
+    :type user: UserModel
+    :return: The user message.
+    :rtype: user_service_pb2.User
+    """
+    data: UserSchema = UserSchema.from_orm(user)
+    message = user_service_pb2.User(
+        id=str(data.id),
+        first_name=data.first_name,
+        last_name=data.last_name,
+        username=data.username,
+        email=data.email,
+        phone=data.phone,
+        birth_date=data.birth_date.isoformat(),
+        national_id=data.national_id,
+        id_expiration=data.id_expiration.isoformat(),
+        is_verified=data.is_verified,
+        last_active=timestamp(data.last_active),
+        auth_provider_id=data.auth_provider_id or "",
+        status=data.status.value,
+        is_deleted=data.is_deleted,
+        created_at=timestamp(data.created_at),
+        updated_at=timestamp(data.updated_at),
+        deleted_at=timestamp(data.deleted_at),
+    )
+    if data.meta_data is not None:
+        message.meta_data.update(data.meta_data)
+    return message
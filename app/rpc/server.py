@@ -0,0 +1,34 @@
+from concurrent import futures
+
+import grpc
+
+from app.core.container import Container
+from config import settings
+
+from . import user_service_pb2_grpc
+from .interceptors import ServiceAuthInterceptor
+from .user_rpc_service import UserRpcService
+
+
+def create_rpc_server(container: Container, max_workers: int) -> grpc.Server:
+    """
+    Create the internal rpc server, it still has to be given a port and be
+    started. Calls must carry a token granting `internal_service_role`.
+
+    :param container: The container the controllers are built from.
+    :type container: Container
+    :param max_workers: The number of calls served at the same time.
+    :type max_workers: int
+    :return: The server.
+    :rtype: grpc.Server
+    """
+    server = grpc.server(
+        futures.ThreadPoolExecutor(max_workers=max_workers),
+        interceptors=[
+            ServiceAuthInterceptor(container, roles=[settings.internal_service_role])
+        ],
+    )
+    user_service_pb2_grpc.add_UserServiceServicer_to_server(
+        UserRpcService(container), server
+    )
+    return server
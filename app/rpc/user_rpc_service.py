@@ -0,0 +1,184 @@
+import uuid
+from contextlib import contextmanager
+from typing import Dict, Iterator
+
+import grpc
+from sqlalchemy.orm import Session
+
+from app import constants
+from app.controllers import RoleController, UserController
+from app.core.container import Container
+from app.core.database import create_session
+from app.core.exceptions import AppException, AppExceptionCase
+from app.enums import UserLookupFieldEnum
+from app.utils import KeycloakJwtAuthentication, token_roles
+
+from . import user_service_pb2, user_service_pb2_grpc
+from .messages import user_message
+
+# reminder: status of the rpc failing with an application exception, by the
+# status code the exception carries for http
+STATUS_CODES: Dict[int, grpc.StatusCode] = {
+    400: grpc.StatusCode.INVALID_ARGUMENT,
+    401: grpc.StatusCode.UNAUTHENTICATED,
+    403: grpc.StatusCode.PERMISSION_DENIED,
+    404: grpc.StatusCode.NOT_FOUND,
+    409: grpc.StatusCode.ALREADY_EXISTS,
+    429: grpc.StatusCode.RESOURCE_EXHAUSTED,
+}
+
+
+class UserRpcService(user_service_pb2_grpc.UserServiceServicer):
+    """
+    Internal rpc api for user lookups and authorization checks.
+
+    Calls go through the same controllers and repositories as the http api,
+    built from the container for every call. The server serves calls from a
+    thread pool, so every call queries with a session of its own rather than
+    the application's session, and its reads are sent to the read replicas
+    when there are any, as none of the calls write.
+
+    Callers are other services of the internal network, authenticated by
+    ServiceAuthInterceptor with the token of their service account.
+
+    :param container: The container the controllers are built from.
+    :type container: Container
+    """
+
+    def __init__(self, container: Container):
+        self.container = container
+        self.jwt_authentication = KeycloakJwtAuthentication(auto_error=False)
+
+    # noinspection PyMethodMayBeStatic
+    @contextmanager
+    def call(self, context: grpc.ServicerContext) -> Iterator[Session]:
+        """
+        Provide the session of a call, and end the call with the status
+        matching an application exception raised while serving it.
+
+        Streams roll the session back after every response, so they do not
+        hold a connection while the caller is idle and every request reads
+        the latest data rather than the users already in the session.
+
+        :param context: The context of the call.
+        :type context: grpc.ServicerContext
+        :return: The session of the call.
+        :rtype: Iterator[Session]
+        """
+        session: Session = create_session(read_only=True)
+        try:
+            yield session
+        except AppExceptionCase as exc:
+            context.abort(
+                STATUS_CODES.get(exc.status_code, grpc.StatusCode.INTERNAL),
+                str(exc.error_message),
+            )
+        finally:
+            session.close()
+
+    # noinspection PyMethodMayBeStatic
+    def get_user(
+        self, user_controller: UserController, request: user_service_pb2.GetUserRequest
+    ) -> user_service_pb2.GetUserResponse:
+        response = user_service_pb2.GetUserResponse(id=request.id)
+        try:
+            user_id = str(uuid.UUID(request.id))
+            response.user.CopyFrom(user_message(user_controller.get_user(user_id)))
+        except (ValueError, AppException.NotFoundException):
+            return response
+        response.found = True
+        return response
+
+    # noinspection PyMethodMayBeStatic
+    def check_permission(
+        self,
+        role_controller: RoleController,
+        request: user_service_pb2.CheckPermissionRequest,
+        context: grpc.ServicerContext,
+    ) -> user_service_pb2.CheckPermissionResponse:
+        if not (request.user_id and request.resource and request.mode):
+            context.abort(
+                grpc.StatusCode.INVALID_ARGUMENT,
+                constants.EXC_INVALID_INPUT.format("user_id, resource or mode"),
+            )
+        allowed: bool = role_controller.check_permission(
+            user_id=request.user_id, resource=request.resource, mode=request.mode
+        )
+        return user_service_pb2.CheckPermissionResponse(allowed=allowed)
+
+    def validate_token(
+        self, request: user_service_pb2.ValidateTokenRequest
+    ) -> user_service_pb2.ValidateTokenResponse:
+        try:
+            payload: dict = self.jwt_authentication.decode_token(token=request.token)
+        except AppException.InvalidTokenException as exc:
+            error = exc.error_message
+            if isinstance(error, tuple):
+                error = ", ".join(map(str, error))
+            return user_service_pb2.ValidateTokenResponse(valid=False, error=str(error))
+        if self.container.token_revocation_service.is_revoked(request.token, payload):
+            return user_service_pb2.ValidateTokenResponse(
+                valid=False, error=constants.EXC_REVOKED_INPUT.format("token")
+            )
+        response = user_service_pb2.ValidateTokenResponse(
+            valid=True,
+            user_id=str(payload.get("user_id", "")),
+            username=payload.get("username", ""),
+            roles=token_roles(payload),
+        )
+        if "exp" in payload:
+            response.expires_at.FromSeconds(int(payload["exp"]))
+        return response
+
+    def GetUser(self, request, context):
+        with self.call(context) as session:
+            response = self.get_user(self.container.user_controller(session), request)
+            if not response.found:
+                context.abort(
+                    grpc.StatusCode.NOT_FOUND, constants.EXC_NOT_FOUND.format("user")
+                )
+            return response
+
+    def BatchGetUsers(self, request, context):
+        if not 0 < len(request.values) <= constants.USER_BATCH_MAX_SIZE:
+            context.abort(
+                grpc.StatusCode.INVALID_ARGUMENT,
+                f"between 1 and {constants.USER_BATCH_MAX_SIZE} values are required",
+            )
+        field = UserLookupFieldEnum[
+            user_service_pb2.LookupField.Name(request.field).lower()
+        ]
+        with self.call(context) as session:
+            result: dict = self.container.user_controller(session).get_users_by(
+                field=field, values=list(request.values)
+            )
+            return user_service_pb2.BatchGetUsersResponse(
+                users=[user_message(user) for user in result["data"]],
+                missing=result["missing"],
+            )
+
+    def CheckPermission(self, request, context):
+        with self.call(context) as session:
+            role_controller = self.container.role_controller(session)
+            return self.check_permission(role_controller, request, context)
+
+    def ValidateToken(self, request, context):
+        return self.validate_token(request)
+
+    def StreamGetUsers(self, request_iterator, context):
+        with self.call(context) as session:
+            user_controller = self.container.user_controller(session)
+            for request in request_iterator:
+                yield self.get_user(user_controller, request)
+                session.rollback()
+
+    def StreamCheckPermissions(self, request_iterator, context):
+        with self.call(context) as session:
+            role_controller = self.container.role_controller(session)
+            for request in request_iterator:
+                yield self.check_permission(role_controller, request, context)
+                session.rollback()
+
+    def StreamValidateTokens(self, request_iterator, context):
+        for request in request_iterator:
+            yield self.validate_token(request)
@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+# Generated by the protocol buffer compiler.  DO NOT EDIT!
+# source: app/rpc/user_service.proto
+# Protobuf Python Version: 4.25.1
+"""Generated protocol buffer code."""
+from google.protobuf import descriptor as _descriptor
+from google.protobuf import descriptor_pool as _descriptor_pool
+from google.protobuf import symbol_database as _symbol_database
+from google.protobuf.internal import builder as _builder
+# @@protoc_insertion_point(imports)
+
+_sym_db = _symbol_database.Default()
+
+
+from google.protobuf import struct_pb2 as google_dot_protobuf_dot_struct__pb2
+from google.protobuf import timestamp_pb2 as google_dot_protobuf_dot_timestamp__pb2
+
+
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x1a\x61pp/rpc/user_service.proto\x12\x08users.v1\x1a\x1cgoogle/protobuf/struct.proto\x1a\x1fgoogle/protobuf/timestamp.proto\"\xe9\x03\n\x04User\x12\n\n\x02id\x18\x01 \x01(\t\x12\x12\n\nfirst_name\x18\x02 \x01(\t\x12\x11\n\tlast_name\x18\x03 \x01(\t\x12\x10\n\x08username\x18\x04 \x01(\t\x12\r\n\x05\x65mail\x18\x05 \x01(\t\x12\r\n\x05phone\x18\x06 \x01(\t\x12\x12\n\nbirth_date\x18\x07 \x01(\t\x12\x13\n\x0bnational_id\x18\x08 \x01(\t\x12\x15\n\rid_expiration\x18\t \x01(\t\x12\x13\n\x0bis_verified\x18\n \x01(\x08\x12/\n\x0blast_active\x18\x0b \x01(\x0b\x32\x1a.google.protobuf.Timestamp\x12\x18\n\x10\x61uth_provider_id\x18\x0c \x01(\t\x12\x0e\n\x06status\x18\r \x01(\t\x12\x12\n\nis_deleted\x18\x0e \x01(\x08\x12*\n\tmeta_data\x18\x0f \x01(\x0b\x32\x17.google.protobuf.Struct\x12.\n\ncreated_at\x18\x10 \x01(\x0b\x32\x1a.google.protobuf.Timestamp\x12.\n\nupdated_at\x18\x11 \x01(\x0b\x32\x1a.google.protobuf.Timestamp\x12.\n\ndeleted_at\x18\x12 \x01(\x0b\x32\x1a.google.protobuf.Timestamp\"\x1c\n\x0eGetUserRequest\x12\n\n\x02id\x18\x01 \x01(\t\"J\n\x0fGetUserResponse\x12\n\n\x02id\x18\x01 \x01(\t\x12\r\n\x05\x66ound\x18\x02 \x01(\x08\x12\x1c\n\x04user\x18\x03 \x01(\x0b\x32\x0e.users.v1.User\"L\n\x14\x42\x61tchGetUsersRequest\x12$\n\x05\x66ield\x18\x01 \x01(\x0e\x32\x15.users.v1.LookupField\x12\x0e\n\x06values\x18\x02 \x03(\t\"G\n\x15\x42\x61tchGetUsersResponse\x12\x1d\n\x05users\x18\x01 \x03(\x0b\x32\x0e.users.v1.User\x12\x0f\n\x07missing\x18\x02 \x03(\t\"I\n\x16\x43heckPermissionRequest\x12\x0f\n\x07user_id\x18\x01 \x01(\t\x12\x10\n\x08resource\x18\x02 \x01(\t\x12\x0c\n\x04mode\x18\x03 \x01(\t\"*\n\x17\x43heckPermissionResponse\x12\x0f\n\x07\x61llowed\x18\x01 \x01(\x08\"%\n\x14ValidateTokenRequest\x12\r\n\x05token\x18\x01 \x01(\t\"\x97\x01\n\x15ValidateTokenResponse\x12\r\n\x05valid\x18\x01 \x01(\x08\x12\x0f\n\x07user_id\x18\x02 \x01(\t\x12\x10\n\x08username\x18\x03 \x01(\t\x12\r\n\x05roles\x18\x04 \x03(\t\x12.\n\nexpires_at\x18\x05 \x01(\x0b\x32\x1a.google.protobuf.Timestamp\x12\r\n\x05\x65rror\x18\x06 \x01(\t*.\n\x0bLookupField\x12\x06\n\x02ID\x10\x00\x12\x0c\n\x08USERNAME\x10\x01\x12\t\n\x05\x45MAIL\x10\x02\x32\xd4\x04\n\x0bUserService\x12>\n\x07GetUser\x12\x18.users.v1.GetUserRequest\x1a\x19.users.v1.GetUserResponse\x12P\n\rBatchGetUsers\x12\x1e.users.v1.BatchGetUsersRequest\x1a\x1f.users.v1.BatchGetUsersResponse\x12V\n\x0f\x43heckPermission\x12 .users.v1.CheckPermissionRequest\x1a!.users.v1.CheckPermissionResponse\x12P\n\rValidateToken\x12\x1e.users.v1.ValidateTokenRequest\x1a\x1f.users.v1.ValidateTokenResponse\x12I\n\x0eStreamGetUsers\x12\x18.users.v1.GetUserRequest\x1a\x19.users.v1.GetUserResponse(\x01\x30\x01\x12\x61\n\x16StreamCheckPermissions\x12 .users.v1.CheckPermissionRequest\x1a!.users.v1.CheckPermissionResponse(\x01\x30\x01\x12[\n\x14StreamValidateTokens\x12\x1e.users.v1.ValidateTokenRequest\x1a\x1f.users.v1.ValidateTokenResponse(\x01\x30\x01\x62\x06proto3')
+
+_globals = globals()
+_builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
+_builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'app.rpc.user_service_pb2', _globals)
+if _descriptor._USE_C_DESCRIPTORS == False:
+  DESCRIPTOR._options = None
+  _globals['_LOOKUPFIELD']._serialized_start=1164
+  _globals['_LOOKUPFIELD']._serialized_end=1210
+  _globals['_USER']._serialized_start=104
+  _globals['_USER']._serialized_end=593
+  _globals['_GETUSERREQUEST']._serialized_start=595
+  _globals['_GETUSERREQUEST']._serialized_end=623
+  _globals['_GETUSERRESPONSE']._serialized_start=625
+  _globals['_GETUSERRESPONSE']._serialized_end=699
+  _globals['_BATCHGETUSERSREQUEST']._serialized_start=701
+  _globals['_BATCHGETUSERSREQUEST']._serialized_end=777
+  _globals['_BATCHGETUSERSRESPONSE']._serialized_start=779
+  _globals['_BATCHGETUSERSRESPONSE']._serialized_end=850
+  _globals['_CHECKPERMISSIONREQUEST']._serialized_start=852
+  _globals['_CHECKPERMISSIONREQUEST']._serialized_end=925
+  _globals['_CHECKPERMISSIONRESPONSE']._serialized_start=927
+  _globals['_CHECKPERMISSIONRESPONSE']._serialized_end=969
+  _globals['_VALIDATETOKENREQUEST']._serialized_start=971
+  _globals['_VALIDATETOKENREQUEST']._serialized_end=1008
+  _globals['_VALIDATETOKENRESPONSE']._serialized_start=1011
+  _globals['_VALIDATETOKENRESPONSE']._serialized_end=1162
+  _globals['_USERSERVICE']._serialized_start=1213
+  _globals['_USERSERVICE']._serialized_end=1809
+# @@protoc_insertion_point(module_scope)
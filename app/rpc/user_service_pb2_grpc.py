@@ -0,0 +1,270 @@
+# Generated by the gRPC Python protocol compiler plugin. DO NOT EDIT!
+"""Client and server classes corresponding to protobuf-defined services."""
+import grpc
+
+from app.rpc import user_service_pb2 as app_dot_rpc_dot_user__service__pb2
+
+
+class UserServiceStub(object):
+    """Missing associated documentation comment in .proto file."""
+
+    def __init__(self, channel):
+        """Constructor.
+
+        Args:
+            channel: A grpc.Channel.
+        """
+        self.GetUser = channel.unary_unary(
+                '/users.v1.UserService/GetUser',
+                request_serializer=app_dot_rpc_dot_user__service__pb2.GetUserRequest.SerializeToString,
+                response_deserializer=app_dot_rpc_dot_user__service__pb2.GetUserResponse.FromString,
+                )
+        self.BatchGetUsers = channel.unary_unary(
+                '/users.v1.UserService/BatchGetUsers',
+                request_serializer=app_dot_rpc_dot_user__service__pb2.BatchGetUsersRequest.SerializeToString,
+                response_deserializer=app_dot_rpc_dot_user__service__pb2.BatchGetUsersResponse.FromString,
+                )
+        self.CheckPermission = channel.unary_unary(
+                '/users.v1.UserService/CheckPermission',
+                request_serializer=app_dot_rpc_dot_user__service__pb2.CheckPermissionRequest.SerializeToString,
+                response_deserializer=app_dot_rpc_dot_user__service__pb2.CheckPermissionResponse.FromString,
+                )
+        self.ValidateToken = channel.unary_unary(
+                '/users.v1.UserService/ValidateToken',
+                request_serializer=app_dot_rpc_dot_user__service__pb2.ValidateTokenRequest.SerializeToString,
+                response_deserializer=app_dot_rpc_dot_user__service__pb2.ValidateTokenResponse.FromString,
+                )
+        self.StreamGetUsers = channel.stream_stream(
+                '/users.v1.UserService/StreamGetUsers',
+                request_serializer=app_dot_rpc_dot_user__service__pb2.GetUserRequest.SerializeToString,
+                response_deserializer=app_dot_rpc_dot_user__service__pb2.GetUserResponse.FromString,
+                )
+        self.StreamCheckPermissions = channel.stream_stream(
+                '/users.v1.UserService/StreamCheckPermissions',
+                request_serializer=app_dot_rpc_dot_user__service__pb2.CheckPermissionRequest.SerializeToString,
+                response_deserializer=app_dot_rpc_dot_user__service__pb2.CheckPermissionResponse.FromString,
+                )
+        self.StreamValidateTokens = channel.stream_stream(
+                '/users.v1.UserService/StreamValidateTokens',
+                request_serializer=app_dot_rpc_dot_user__service__pb2.ValidateTokenRequest.SerializeToString,
+                response_deserializer=app_dot_rpc_dot_user__service__pb2.ValidateTokenResponse.FromString,
+                )
+
+
+class UserServiceServicer(object):
+    """Missing associated documentation comment in .proto file."""
+
+    def GetUser(self, request, context):
+        """Get a user by id, fails with NOT_FOUND if there is none.
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def BatchGetUsers(self, request, context):
+        """Get the users matching any of the values of a field, in one lookup.
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def CheckPermission(self, request, context):
+        """Check whether a user is granted a permission on a resource.
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def ValidateToken(self, request, context):
+        """Validate an access token and return its claims.
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def StreamGetUsers(self, request_iterator, context):
+        """Streaming variants, answering every request of the stream in order. A
+        missing user is answered with found unset rather than ending the stream.
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def StreamCheckPermissions(self, request_iterator, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def StreamValidateTokens(self, request_iterator, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+
+def add_UserServiceServicer_to_server(servicer, server):
+    rpc_method_handlers = {
+            'GetUser': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetUser,
+                    request_deserializer=app_dot_rpc_dot_user__service__pb2.GetUserRequest.FromString,
+                    response_serializer=app_dot_rpc_dot_user__service__pb2.GetUserResponse.SerializeToString,
+            ),
+            'BatchGetUsers': grpc.unary_unary_rpc_method_handler(
+                    servicer.BatchGetUsers,
+                    request_deserializer=app_dot_rpc_dot_user__service__pb2.BatchGetUsersRequest.FromString,
+                    response_serializer=app_dot_rpc_dot_user__service__pb2.BatchGetUsersResponse.SerializeToString,
+            ),
+            'CheckPermission': grpc.unary_unary_rpc_method_handler(
+                    servicer.CheckPermission,
+                    request_deserializer=app_dot_rpc_dot_user__service__pb2.CheckPermissionRequest.FromString,
+                    response_serializer=app_dot_rpc_dot_user__service__pb2.CheckPermissionResponse.SerializeToString,
+            ),
+            'ValidateToken': grpc.unary_unary_rpc_method_handler(
+                    servicer.ValidateToken,
+                    request_deserializer=app_dot_rpc_dot_user__service__pb2.ValidateTokenRequest.FromString,
+                    response_serializer=app_dot_rpc_dot_user__service__pb2.ValidateTokenResponse.SerializeToString,
+            ),
+            'StreamGetUsers': grpc.stream_stream_rpc_method_handler(
+                    servicer.StreamGetUsers,
+                    request_deserializer=app_dot_rpc_dot_user__service__pb2.GetUserRequest.FromString,
+                    response_serializer=app_dot_rpc_dot_user__service__pb2.GetUserResponse.SerializeToString,
+            ),
+            'StreamCheckPermissions': grpc.stream_stream_rpc_method_handler(
+                    servicer.StreamCheckPermissions,
+                    request_deserializer=app_dot_rpc_dot_user__service__pb2.CheckPermissionRequest.FromString,
+                    response_serializer=app_dot_rpc_dot_user__service__pb2.CheckPermissionResponse.SerializeToString,
+            ),
+            'StreamValidateTokens': grpc.stream_stream_rpc_method_handler(
+                    servicer.StreamValidateTokens,
+                    request_deserializer=app_dot_rpc_dot_user__service__pb2.ValidateTokenRequest.FromString,
+                    response_serializer=app_dot_rpc_dot_user__service__pb2.ValidateTokenResponse.SerializeToString,
+            ),
+    }
+    generic_handler = grpc.method_handlers_generic_handler(
+            'users.v1.UserService', rpc_method_handlers)
+    server.add_generic_rpc_handlers((generic_handler,))
+
+
+ # This class is part of an EXPERIMENTAL API.
+class UserService(object):
+    """Missing associated documentation comment in .proto file."""
+
+    @staticmethod
+    def GetUser(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/users.v1.UserService/GetUser',
+            app_dot_rpc_dot_user__service__pb2.GetUserRequest.SerializeToString,
+            app_dot_rpc_dot_user__service__pb2.GetUserResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def BatchGetUsers(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/users.v1.UserService/BatchGetUsers',
+            app_dot_rpc_dot_user__service__pb2.BatchGetUsersRequest.SerializeToString,
+            app_dot_rpc_dot_user__service__pb2.BatchGetUsersResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def CheckPermission(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/users.v1.UserService/CheckPermission',
+            app_dot_rpc_dot_user__service__pb2.CheckPermissionRequest.SerializeToString,
+            app_dot_rpc_dot_user__service__pb2.CheckPermissionResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def ValidateToken(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/users.v1.UserService/ValidateToken',
+            app_dot_rpc_dot_user__service__pb2.ValidateTokenRequest.SerializeToString,
+            app_dot_rpc_dot_user__service__pb2.ValidateTokenResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def StreamGetUsers(request_iterator,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.stream_stream(request_iterator, target, '/users.v1.UserService/StreamGetUsers',
+            app_dot_rpc_dot_user__service__pb2.GetUserRequest.SerializeToString,
+            app_dot_rpc_dot_user__service__pb2.GetUserResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def StreamCheckPermissions(request_iterator,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.stream_stream(request_iterator, target, '/users.v1.UserService/StreamCheckPermissions',
+            app_dot_rpc_dot_user__service__pb2.CheckPermissionRequest.SerializeToString,
+            app_dot_rpc_dot_user__service__pb2.CheckPermissionResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def StreamValidateTokens(request_iterator,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.stream_stream(request_iterator, target, '/users.v1.UserService/StreamValidateTokens',
+            app_dot_rpc_dot_user__service__pb2.ValidateTokenRequest.SerializeToString,
+            app_dot_rpc_dot_user__service__pb2.ValidateTokenResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
@@ -0,0 +1,32 @@
+import os
+import signal
+import sys
+
+from loguru import logger
+
+# Add "app" root to PYTHONPATH so we can import from app i.e. from app import create_app.
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app import create_app  # noqa: E402
+from config import settings  # noqa: E402
+
+# reminder: seconds calls in progress are given to finish on shutdown
+SHUTDOWN_GRACE = 10
+
+if __name__ == "__main__":
+    app = create_app()
+    # Create Application before importing from app
+
+    from app.core.container import Container
+    from app.rpc import create_rpc_server
+
+    container = Container()
+    container.token_revocation_service.start()
+    server = create_rpc_server(container, max_workers=settings.grpc_max_workers)
+    # reminder: the server is not encrypted, bind it to the internal interface
+    # only, calls are authenticated with the token of the calling service
+    server.add_insecure_port(f"{settings.grpc_host}:{settings.grpc_port}")
+    server.start()
+    logger.info(f"RPC SERVER LISTENING ON {settings.grpc_host}:{settings.grpc_port}")
+    signal.signal(signal.SIGTERM, lambda *args: server.stop(SHUTDOWN_GRACE))
+    server.wait_for_termination()
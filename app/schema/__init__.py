@@ -1,3 +1,4 @@
+from .health_schema import HealthSchema
 from .resource_schema import (
     CreateResourceSchema,
     PermissionSchema,
@@ -13,12 +14,17 @@ from .role_schema import (
 )
 from .user_schema import (
     CreateUserSchema,
+    TokenIntrospectionResponseSchema,
+    TokenIntrospectionSchema,
     UpdateUserSchema,
+    UserBatchResponseSchema,
+    UserBatchSchema,
     UserChangePasswordSchema,
     UserChangePhoneSchema,
     UserIdSchema,
     UserLoginResponseSchema,
     UserLoginSchema,
+    UserLogoutSchema,
     UserOtpConfirmationResponseSchema,
     UserOtpConfirmationSchema,
     UserPhoneVerificationSchema,
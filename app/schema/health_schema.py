@@ -0,0 +1,10 @@
+from typing import Dict
+
+from pydantic import BaseModel
+
+from app.enums import HealthStatusEnum
+
+
+class HealthSchema(BaseModel):
+    status: HealthStatusEnum
+    checks: Dict[str, bool] = {}
@@ -1,12 +1,13 @@
 import re
 import uuid
 from datetime import date, datetime
-from typing import Optional, Union
+from typing import List, Optional, Union
 
-from pydantic import BaseModel, EmailStr, validator
+from pydantic import BaseModel, EmailStr, conlist, validator
 
+from app import constants
 from app.core.exceptions import AppException
-from app.enums import RegularExpression, StatusEnum
+from app.enums import RegularExpression, StatusEnum, UserLookupFieldEnum
 
 
 def phone_validator(cls, v, values, **kwargs):
@@ -45,6 +46,16 @@ class UserSchema(BaseModel):
         orm_mode = True
 
 
+class UserBatchSchema(BaseModel):
+    field: UserLookupFieldEnum = UserLookupFieldEnum.id
+    values: conlist(str, min_items=1, max_items=constants.USER_BATCH_MAX_SIZE)
+
+
+class UserBatchResponseSchema(BaseModel):
+    data: List[UserSchema]
+    missing: List[str]
+
+
 class CreateUserSchema(BaseModel):
     first_name: str
     last_name: str
@@ -88,6 +99,24 @@ class UserTokenRefreshSchema(BaseModel):
     refresh_token: str
 
 
+class UserLogoutSchema(BaseModel):
+    refresh_token: str
+
+
+class TokenIntrospectionSchema(BaseModel):
+    token: str
+
+
+class TokenIntrospectionResponseSchema(BaseModel):
+    active: bool
+    user_id: Optional[uuid.UUID]
+    username: Optional[str]
+    status: Optional[StatusEnum]
+    roles: Optional[List[str]]
+    iat: Optional[int]
+    exp: Optional[int]
+
+
 class UserPhoneVerificationSchema(BaseModel):
     new_phone: str
 
@@ -1,2 +1,13 @@
+from .activity_tracker_service import ActivityTrackerService
+from .health_service import HealthService
+from .http_cache_service import HttpCacheService
 from .keycloak_service import KeycloakAuthService
+from .memory_rate_limit_store import MemoryRateLimitStore
+from .profile_store_service import ProfileStoreService
+from .redis_otp_store import RedisOtpStore
+from .redis_rate_limit_store import RedisRateLimitStore
 from .redis_service import RedisService
+from .sql_otp_store import SQLOtpStore
+from .token_cache_service import TokenCacheService
+from .token_revocation_service import TokenRevocationService
+from .user_cache_service import UserCacheService
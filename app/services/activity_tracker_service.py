@@ -0,0 +1,108 @@
+import threading
+from datetime import datetime
+from typing import Callable, Dict, Optional
+
+from loguru import logger
+
+from app.core.exceptions import AppException
+
+
+class ActivityTrackerService:
+    """
+    Records the last time authenticated users were seen and writes it to the
+    database in batches.
+
+    Recording a user only sets their time in the worker's buffer, so a user
+    seen many times between two flushes is written once. A thread flushes the
+    buffer every `flush_interval` seconds, or as soon as `flush_size` users
+    are waiting, and the service flushes what is left when it is stopped. A
+    batch that fails is put back in the buffer and written with the next one.
+
+    :param flush: Writes a batch, the last time each user was seen by
+        username.
+    :type flush: Callable[[Dict[str, datetime]], None]
+    :param flush_interval: The most seconds a time waits before it is written.
+    :type flush_interval: float
+    :param flush_size: The number of users waiting that triggers a flush.
+    :type flush_size: int
+    """
+
+    def __init__(
+        self,
+        flush: Callable[[Dict[str, datetime]], None],
+        flush_interval: float,
+        flush_size: int,
+    ):
+        self._flush = flush
+        self.flush_interval = flush_interval
+        self.flush_size = flush_size
+        self._pending: Dict[str, datetime] = {}
+        self._lock = threading.Lock()
+        self._full = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """
+        Start the thread flushing the buffer of the worker.
+        """
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self.run, name="activity-tracker", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self) -> None:
+        """
+        Stop the thread and flush the buffer.
+        """
+        self._stopped.set()
+        self._full.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.flush_interval)
+        self.flush()
+
+    def record(self, username: str) -> None:
+        """
+        Record that a user was seen now.
+
+        :param username: The username of the user.
+        :type username: str
+        """
+        with self._lock:
+            self._pending[username] = datetime.now()
+            if len(self._pending) >= self.flush_size:
+                self._full.set()
+
+    def flush(self) -> None:
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            self._full.clear()
+        if not pending:
+            return
+        try:
+            self._flush(pending)
+        except AppException.OperationErrorException as exc:
+            logger.error(f"failed to flush user activity with error {exc.error_message}")
+            self.requeue(pending)
+        except Exception:
+            logger.exception("failed to flush user activity")
+            self.requeue(pending)
+
+    def requeue(self, pending: Dict[str, datetime]) -> None:
+        with self._lock:
+            # reminder: a user seen again since keeps the later time
+            for username, last_active in pending.items():
+                self._pending.setdefault(username, last_active)
+
+    def run(self) -> None:
+        while not self._stopped.is_set():
+            self._full.wait(self.flush_interval)
+            if self._stopped.is_set():
+                continue
+            try:
+                self.flush()
+            except Exception:
+                # reminder: the thread must outlive any error, nothing else
+                # empties the buffer
+                logger.exception("activity tracker failed to flush")
@@ -0,0 +1,147 @@
+import threading
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+from loguru import logger
+from sqlalchemy import text
+
+from app import constants
+from app.core.database import engine
+from app.producer import event_publisher
+from app.utils.lazy import unwrap
+from config import settings
+
+from . import redis_service
+from .keycloak_service import KeycloakAuthService
+
+
+class HealthService:
+    """
+    Warms up the connections of a worker and checks the services it depends on.
+
+    The result of the checks is kept for `cache_ttl` seconds, so liveness and
+    readiness probes hitting every worker do not reach the database, redis,
+    keycloak and kafka on every call.
+
+    :param keycloak_auth_service: The service used to reach keycloak.
+    :type keycloak_auth_service: KeycloakAuthService
+    :param cache_ttl: The number of seconds the result of the checks is kept for.
+    :type cache_ttl: float
+    """
+
+    def __init__(self, keycloak_auth_service: KeycloakAuthService, cache_ttl: float):
+        self.keycloak_auth_service = keycloak_auth_service
+        self.cache_ttl = cache_ttl
+        self.warmed_up = not settings.warm_up_enabled
+        self._checks: Optional[Tuple[float, Dict[str, bool]]] = None
+        self._lock = threading.Lock()
+
+    def warm_up(self) -> Dict[str, bool]:
+        """
+        Open the connections the first requests of a worker would otherwise pay for.
+
+        Opens `db_pool_warm_size` database connections and returns them to the
+        pool, connects to redis, fetches the keycloak openid configuration and
+        signing keys and creates the kafka producer. A failing step is logged
+        and skipped, the readiness checks then report the unavailable service.
+
+        :return: Whether each service was warmed up.
+        :rtype: dict[str, bool]
+        """
+        steps: Dict[str, Callable[[], None]] = {
+            constants.DATABASE_HEALTH_CHECK: self.warm_up_database,
+            constants.REDIS_HEALTH_CHECK: self.check_redis,
+            constants.KEYCLOAK_HEALTH_CHECK: self.warm_up_keycloak,
+            constants.KAFKA_HEALTH_CHECK: self.check_kafka,
+        }
+        result: Dict[str, bool] = {}
+        for name, step in steps.items():
+            started = time.perf_counter()
+            result[name] = self.run_check(name, step)
+            elapsed = (time.perf_counter() - started) * 1000
+            logger.info(f"warmed up {name} in {elapsed:.1f} ms, ok={result[name]}")
+        self.warmed_up = True
+        return result
+
+    def checks(self) -> Dict[str, bool]:
+        """
+        Check every service, reusing the result of the last `cache_ttl` seconds.
+
+        :return: Whether each service is available.
+        :rtype: dict[str, bool]
+        """
+        with self._lock:
+            now = time.monotonic()
+            if self._checks is None or now - self._checks[0] >= self.cache_ttl:
+                checks: Dict[str, bool] = {
+                    constants.DATABASE_HEALTH_CHECK: self.run_check(
+                        constants.DATABASE_HEALTH_CHECK, self.check_database
+                    ),
+                    constants.REDIS_HEALTH_CHECK: self.run_check(
+                        constants.REDIS_HEALTH_CHECK, self.check_redis
+                    ),
+                    constants.KEYCLOAK_HEALTH_CHECK: self.run_check(
+                        constants.KEYCLOAK_HEALTH_CHECK, self.check_keycloak
+                    ),
+                    constants.KAFKA_HEALTH_CHECK: self.run_check(
+                        constants.KAFKA_HEALTH_CHECK, self.check_kafka
+                    ),
+                }
+                self._checks = (now, checks)
+            return dict(self._checks[1])
+
+    def is_ready(self, checks: Dict[str, bool]) -> bool:
+        """
+        Check whether a worker can serve requests.
+
+        :param checks: The result of the checks.
+        :type checks: dict[str, bool]
+        :return: True once warmed up and every readiness check passed.
+        :rtype: bool
+        """
+        return self.warmed_up and all(
+            checks.get(name, False) for name in constants.READINESS_CHECKS
+        )
+
+    # noinspection PyMethodMayBeStatic
+    def run_check(self, name: str, check: Callable[[], None]) -> bool:
+        try:
+            check()
+            return True
+        except Exception as exc:
+            logger.warning(f"{name} health check failed with error {exc}")
+            return False
+
+    # noinspection PyMethodMayBeStatic
+    def warm_up_database(self) -> None:
+        # connections are held together so the pool opens distinct connections
+        connections = []
+        try:
+            for _ in range(min(settings.db_pool_warm_size, settings.db_pool_size)):
+                connection = unwrap(engine).connect()
+                connections.append(connection)
+                connection.execute(text("SELECT 1"))
+        finally:
+            for connection in connections:
+                connection.close()
+
+    # noinspection PyMethodMayBeStatic
+    def check_database(self) -> None:
+        with unwrap(engine).connect() as connection:
+            connection.execute(text("SELECT 1"))
+
+    # noinspection PyMethodMayBeStatic
+    def check_redis(self) -> None:
+        redis_service.redis_conn.ping()
+
+    def warm_up_keycloak(self) -> None:
+        self.keycloak_auth_service.realm_openid_configuration()
+        self.keycloak_auth_service.realm_signing_keys()
+
+    def check_keycloak(self) -> None:
+        self.keycloak_auth_service.realm_openid_configuration()
+
+    # noinspection PyMethodMayBeStatic
+    def check_kafka(self) -> None:
+        if not event_publisher.get_producer().bootstrap_connected():
+            raise ConnectionError("kafka bootstrap servers are not connected")
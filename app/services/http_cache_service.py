@@ -0,0 +1,94 @@
+import time
+from typing import Optional, Tuple
+
+from loguru import logger
+from redis.exceptions import RedisError
+
+from . import redis_service
+
+
+class HttpCacheService:
+    """
+    Keeps a version counter per namespace, e.g. roles or resources, along with
+    the responses cached for the current version of each namespace.
+
+    Writes bump the version of the namespaces they change, so responses cached
+    for an older version are never served again and expire on their own.
+    """
+
+    # noinspection PyMethodMayBeStatic
+    def version_key(self, namespace: str) -> str:
+        return f"http_cache:{namespace}:version"
+
+    def version(self, namespace: str) -> Optional[Tuple[int, float]]:
+        """
+        Get the current version of a namespace and the time it was last changed.
+
+        :param namespace: The namespace to get the version of.
+        :type namespace: str
+        :return: The version and the unix time it was set, None if redis fails.
+        :rtype: Tuple[int, float], optional
+        """
+        key: str = self.version_key(namespace)
+        try:
+            pipeline = redis_service.redis_conn.pipeline()
+            pipeline.hsetnx(key, "modified_at", int(time.time()))
+            pipeline.hmget(key, "version", "modified_at")
+            _, (version, modified_at) = pipeline.execute()
+        except RedisError as exc:
+            logger.warning(f"failed to get {namespace} version with error {exc}")
+            return None
+        return int(version or 0), float(modified_at)
+
+    def invalidate(self, *namespaces: str) -> None:
+        """
+        Bump the version of the namespaces, invalidating their cached responses.
+
+        A failure is logged rather than raised as the write it follows has
+        already been committed, cached responses then expire with their ttl.
+
+        :param namespaces: The namespaces to invalidate.
+        :type namespaces: str
+        """
+        try:
+            pipeline = redis_service.redis_conn.pipeline()
+            for namespace in namespaces:
+                key: str = self.version_key(namespace)
+                pipeline.hincrby(key, "version", 1)
+                pipeline.hset(key, "modified_at", int(time.time()))
+            pipeline.execute()
+        except RedisError as exc:
+            logger.error(f"failed to invalidate {namespaces} with error {exc}")
+
+    # noinspection PyMethodMayBeStatic
+    def get(self, key: str) -> Optional[bytes]:
+        """
+        Get a cached response body.
+
+        :param key: The key of the cached response.
+        :type key: str
+        :return: The response body, None if it is not cached.
+        :rtype: bytes, optional
+        """
+        try:
+            return redis_service.redis_conn.get(key)
+        except RedisError as exc:
+            logger.warning(f"failed to get cached response with error {exc}")
+            return None
+
+    # noinspection PyMethodMayBeStatic
+    def set(self, key: str, body: bytes, ttl: int) -> None:
+        """
+        Cache a response body.
+
+        :param key: The key of the cached response.
+        :type key: str
+        :param body: The response body.
+        :type body: bytes
+        :param ttl: The number of seconds to keep the response for.
+        :type ttl: int
+        """
+        try:
+            redis_service.redis_conn.set(key, body, ex=ttl)
+        except RedisError as exc:
+            logger.warning(f"failed to cache response with error {exc}")
@@ -1,16 +1,19 @@
 import inspect
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional, Union
-
-import requests
-from requests import Response, exceptions
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Union
 
 from app import constants
 from app.core.exceptions import AppException
 from app.core.log import get_error_context, get_full_class_name
+from app.core.metrics import observe_dependency
 from app.core.service_interfaces import AuthServiceInterface
+from app.core.tracing import inject_headers
+from app.utils.lazy import LazyObject
 from config import settings
 
+if TYPE_CHECKING:
+    from requests import Response, Session
+
 CLIENT_ID: str = settings.keycloak_client_id
 CLIENT_SECRET: str = settings.keycloak_client_secret
 URI: str = settings.keycloak_uri
@@ -19,11 +22,35 @@ REALM_PREFIX: str = "/realms/"
 REALM_URL: str = f"{REALM_PREFIX}{REALM}"
 ADMIN_REALM_URL: str = "/admin/realms/"
 AUTH_ENDPOINT: str = "/protocol/openid-connect/token/"
+LOGOUT_ENDPOINT: str = "/protocol/openid-connect/logout"
 OPENID_CONFIGURATION_ENDPOINT: str = "/.well-known/openid-configuration"
 JWT_CERTS_ENDPOINT: str = "/protocol/openid-connect/certs"
 JWT_ISSUER: str = f"{URI}{REALM_PREFIX}{REALM}"
 
 
+def create_http_session() -> "Session":
+    """
+    Create the http session used to call keycloak.
+
+    The session keeps a pool of connections to keycloak alive between
+    requests, and requests is only imported when the first call is made.
+
+    :return: The http session.
+    :rtype: Session
+    """
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_maxsize=settings.keycloak_pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+http_session: "Session" = LazyObject(create_http_session)
+
+
 @dataclass
 class KeycloakAuthService(AuthServiceInterface):
     """
@@ -94,6 +121,28 @@ class KeycloakAuthService(AuthServiceInterface):
             "refresh_token": data.get("refresh_token"),
         }
 
+    def logout(self, refresh_token: str) -> bool:
+        """
+        End the Keycloak session of a refresh token, so it can no longer be
+        refreshed.
+
+        :param refresh_token: A string containing the refresh token.
+        :type refresh_token: str
+        :return: True if the session is ended.
+        :rtype: bool
+        :raises AssertionError: If the refresh token is missing.
+        """
+        assert refresh_token, constants.ASSERT_NULL_OBJECT
+
+        request_data: Dict[str, str] = {
+            "client_id": CLIENT_ID,
+            "client_secret": CLIENT_SECRET,
+            "refresh_token": refresh_token,
+        }
+        url: str = URI + REALM_PREFIX + REALM + LOGOUT_ENDPOINT
+        self.send_request_to_keycloak(method="post", url=url, data=request_data)
+        return True
+
     def create_user(self, obj_data: dict) -> dict:
         """
         Create a user in Keycloak.
@@ -297,7 +346,7 @@ class KeycloakAuthService(AuthServiceInterface):
         self.keycloak_put(url, data)
         return True
 
-    def keycloak_post(self, endpoint: str, data: dict) -> Response:
+    def keycloak_post(self, endpoint: str, data: dict) -> "Response":
         """
         Make a POST request to Keycloak.
 
@@ -320,7 +369,7 @@ class KeycloakAuthService(AuthServiceInterface):
         )
         return keycloak_response
 
-    def keycloak_put(self, endpoint: str, data: dict) -> Response:
+    def keycloak_put(self, endpoint: str, data: dict) -> "Response":
         """
         Make a PUT request to Keycloak.
 
@@ -342,7 +391,7 @@ class KeycloakAuthService(AuthServiceInterface):
         )
         return keycloak_response
 
-    def keycloak_delete(self, endpoint: str) -> Response:
+    def keycloak_delete(self, endpoint: str) -> "Response":
         """
         Make a DELETE request to Keycloak.
 
@@ -396,6 +445,23 @@ class KeycloakAuthService(AuthServiceInterface):
         data = keycloak_response.json()
         return data
 
+    def realm_signing_keys(self) -> dict:
+        """
+        Returns the JSON Web Key Set the realm signs its tokens with.
+
+        :return: The realm's public signing keys.
+        :rtype: dict
+
+        :raises AppException.KeyCloakAdminException: If the Keycloak response status
+        code is not OK.
+        """
+        url: str = URI + REALM_URL + JWT_CERTS_ENDPOINT
+        keycloak_response: Response = self.send_request_to_keycloak(
+            method="get", url=url
+        )
+        data = keycloak_response.json()
+        return data
+
     # noinspection PyMethodMayBeStatic
     def send_request_to_keycloak(
         self,
@@ -404,7 +470,7 @@ class KeycloakAuthService(AuthServiceInterface):
         headers: Optional[dict] = None,
         json: Optional[dict] = None,
         data: Optional[dict] = None,
-    ) -> Response:
+    ) -> "Response":
         """
         Sends a request to the Keycloak server.
 
@@ -426,10 +492,18 @@ class KeycloakAuthService(AuthServiceInterface):
         while connecting to the Keycloak server.
         """
 
+        from requests import exceptions
+
         try:
-            response = requests.request(
-                method=method, url=url, headers=headers, json=json, data=data
-            )
+            with observe_dependency("keycloak", method.upper()):
+                response = http_session.request(
+                    method=method,
+                    url=url,
+                    headers=inject_headers(headers),
+                    json=json,
+                    data=data,
+                    timeout=settings.keycloak_timeout,
+                )
             if response.status_code >= 300:
                 raise AppException.ServiceRequestException(
                     status_code=response.status_code,
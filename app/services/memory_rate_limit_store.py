@@ -0,0 +1,94 @@
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, List, Sequence, Tuple
+
+from app import constants
+from app.core.service_interfaces import RateLimitStoreInterface
+from app.enums import RateLimitAlgorithmEnum
+
+
+class MemoryRateLimitStore(RateLimitStoreInterface):
+    """
+    Counts requests in the memory of the current process.
+
+    Limits are enforced per worker, so it is only meant for running without
+    redis or for riding out a redis outage.
+    """
+
+    def __init__(self, max_keys: int = constants.RATE_LIMIT_MEMORY_KEYS):
+        self.max_keys = max_keys
+        self._records: Dict[str, Any] = {}
+        self._expires_at: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def hit(
+        self,
+        keys: Sequence[str],
+        limits: Sequence[Tuple[int, int]],
+        algorithm: RateLimitAlgorithmEnum,
+    ) -> float:
+        """
+        Record a request against every key, unless one of them is over its limit.
+
+        :param keys: The keys identifying the caller.
+        :type keys: Sequence[str]
+        :param limits: The (requests, seconds) limit of each key.
+        :type limits: Sequence[Tuple[int, int]]
+        :param algorithm: The algorithm used to count the requests.
+        :type algorithm: RateLimitAlgorithmEnum
+        :return: The number of seconds to wait before retrying, 0 if allowed.
+        :rtype: float
+        """
+        assert len(keys) == len(limits), constants.EXC_INVALID_INPUT.format("limits")
+
+        now: float = time.time()
+        with self._lock:
+            self._purge(now)
+            if algorithm == RateLimitAlgorithmEnum.token_bucket:
+                return self._token_bucket(keys, limits, now)
+            return self._sliding_window(keys, limits, now)
+
+    def _sliding_window(
+        self, keys: Sequence[str], limits: Sequence[Tuple[int, int]], now: float
+    ) -> float:
+        retry_after: float = 0
+        for key, (limit, window) in zip(keys, limits):
+            requests: deque = self._records.setdefault(key, deque())
+            self._expires_at.setdefault(key, now + window)
+            while requests and requests[0] <= now - window:
+                requests.popleft()
+            if len(requests) >= limit:
+                retry_after = max(retry_after, requests[0] + window - now)
+        if retry_after > 0:
+            return retry_after
+        for key, (_, window) in zip(keys, limits):
+            self._records[key].append(now)
+            self._expires_at[key] = now + window
+        return 0
+
+    def _token_bucket(
+        self, keys: Sequence[str], limits: Sequence[Tuple[int, int]], now: float
+    ) -> float:
+        retry_after: float = 0
+        tokens: List[float] = []
+        for key, (limit, window) in zip(keys, limits):
+            rate: float = limit / window
+            available, updated_at = self._records.get(key, (limit, now))
+            available = min(limit, available + (now - updated_at) * rate)
+            tokens.append(available)
+            if available < 1:
+                retry_after = max(retry_after, (1 - available) / rate)
+        if retry_after > 0:
+            return retry_after
+        for key, (_, window), available in zip(keys, limits, tokens):
+            self._records[key] = (available - 1, now)
+            self._expires_at[key] = now + window
+        return 0
+
+    def _purge(self, now: float) -> None:
+        if len(self._records) < self.max_keys:
+            return
+        for key in [key for key, value in self._expires_at.items() if value <= now]:
+            self._records.pop(key, None)
+            self._expires_at.pop(key, None)
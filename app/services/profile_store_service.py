@@ -0,0 +1,62 @@
+from typing import Dict, Optional
+
+from loguru import logger
+from redis.exceptions import RedisError
+
+from . import redis_service
+
+
+class ProfileStoreService:
+    """
+    Keeps the profiles of profiled requests, keyed by a profile id generated
+    by the server, so any worker can serve a profile recorded by another.
+    """
+
+    # noinspection PyMethodMayBeStatic
+    def key(self, profile_id: str) -> str:
+        return f"profile:{profile_id}"
+
+    def save(
+        self, profile_id: str, profile: str, ttl: int, request_id: Optional[str] = None
+    ) -> None:
+        """
+        Store the profile of a request.
+
+        :param profile_id: The id of the profile.
+        :type profile_id: str
+        :param profile: The profile, in the folded stacks format.
+        :type profile: str
+        :param ttl: The number of seconds to keep the profile for.
+        :type ttl: int
+        :param request_id: The id the client sent the request with.
+        :type request_id: str, optional
+        """
+        try:
+            pipeline = redis_service.redis_conn.pipeline(transaction=True)
+            pipeline.hset(
+                self.key(profile_id),
+                mapping={"profile": profile, "request_id": request_id or ""},
+            )
+            pipeline.expire(self.key(profile_id), ttl)
+            pipeline.execute()
+        except RedisError as exc:
+            logger.error(f"failed to store profile {profile_id} with error {exc}")
+
+    def get(self, profile_id: str) -> Optional[Dict[str, str]]:
+        """
+        Get a profile and the id of the request it was recorded for.
+
+        :param profile_id: The id of the profile.
+        :type profile_id: str
+        :return: The profile and the request_id the client sent, empty if it
+            sent none, None if there is no profile or it expired.
+        :rtype: dict, optional
+        """
+        try:
+            stored: dict = redis_service.redis_conn.hgetall(self.key(profile_id))
+        except RedisError as exc:
+            logger.warning(f"failed to get profile {profile_id} with error {exc}")
+            return None
+        if not stored:
+            return None
+        return {key.decode(): value.decode() for key, value in stored.items()}
@@ -0,0 +1,132 @@
+import time
+from typing import Any, Sequence
+
+from redis.exceptions import RedisError
+
+from app import constants
+from app.core.exceptions import HTTPException
+from app.core.service_interfaces import OtpStoreInterface
+from app.enums import CodeStatusEnum
+
+from . import redis_service
+
+CODE_TYPES = ("otp_code", "sec_token")
+
+# compare the provided code with the stored one and delete it on a match, as a
+# single atomic step so a code can never be consumed twice
+CONSUME_CODE_SCRIPT = """
+local value = redis.call("GET", KEYS[1])
+if not value then
+    return "missing"
+end
+local separator = string.find(value, ":", 1, true)
+local expires_at = tonumber(string.sub(value, 1, separator - 1))
+local code = string.sub(value, separator + 1)
+if code ~= ARGV[1] and ARGV[3] ~= "1" then
+    return "invalid"
+end
+redis.call("DEL", KEYS[1])
+if tonumber(ARGV[2]) > expires_at then
+    return "expired"
+end
+return "valid"
+"""
+
+
+class RedisOtpStore(OtpStoreInterface):
+    """
+    Keeps otp codes and security tokens in redis.
+
+    Every code lives in its own key, stored with its expiration time and a
+    native TTL, so expired codes are evicted by redis instead of piling up.
+    """
+
+    def __init__(self):
+        # reminder: scripts are registered once, calls send the sha of the
+        # script and only load it again when redis does not know it
+        self.consume_code_script = redis_service.redis_conn.register_script(
+            CONSUME_CODE_SCRIPT
+        )
+
+    # noinspection PyMethodMayBeStatic
+    def key(self, user_id: Any, code_type: str) -> str:
+        """
+        Build the redis key of a user's code.
+
+        :param user_id: The ID of the user.
+        :type user_id: Any
+        :param code_type: The type of code, either otp_code or sec_token.
+        :type code_type: str
+        :return: The redis key.
+        :rtype: str
+        """
+        assert code_type in CODE_TYPES, constants.EXC_INVALID_INPUT.format("code type")
+
+        return f"otp:{user_id}:{code_type}"
+
+    def save_code(self, user_id: Any, code_type: str, code: str, lifetime: int) -> bool:
+        """
+        Save a code issued to a user, replacing any code previously issued.
+
+        :param user_id: The ID of the user the code is issued to.
+        :type user_id: Any
+        :param code_type: The type of code, either otp_code or sec_token.
+        :type code_type: str
+        :param code: The code to save.
+        :type code: str
+        :param lifetime: The number of seconds the code is valid for.
+        :type lifetime: int
+        :return: True if the code is saved.
+        :rtype: bool
+        :raises AssertionError: If the user_id, code or lifetime is empty or None.
+        """
+        assert user_id, constants.ASSERT_NULL_OBJECT
+        assert code, constants.ASSERT_NULL_OBJECT
+        assert lifetime, constants.ASSERT_NULL_OBJECT
+
+        expires_at: float = time.time() + lifetime
+        try:
+            pipeline = redis_service.redis_conn.pipeline()
+            pipeline.set(
+                self.key(user_id, code_type),
+                f"{expires_at}:{code}",
+                ex=lifetime + constants.OTP_RECORD_RETENTION,
+            )
+            for other_code_type in CODE_TYPES:
+                if other_code_type != code_type:
+                    pipeline.delete(self.key(user_id, other_code_type))
+            pipeline.execute()
+            return True
+        except RedisError:
+            raise HTTPException(status_code=500, description="Error saving to cache")
+
+    def consume_code(
+        self, user_id: Any, code_type: str, code: str, master_codes: Sequence[str] = ()
+    ) -> CodeStatusEnum:
+        """
+        Compare a code with the one issued to the user and delete it on a match.
+
+        :param user_id: The ID of the user the code was issued to.
+        :type user_id: Any
+        :param code_type: The type of code, either otp_code or sec_token.
+        :type code_type: str
+        :param code: The code provided by the user.
+        :type code: str
+        :param master_codes: Codes accepted in place of the issued code.
+        :type master_codes: Sequence[str]
+        :return: The outcome of the comparison.
+        :rtype: CodeStatusEnum
+        :raises AssertionError: If the user_id is empty or None.
+        """
+        assert user_id, constants.ASSERT_NULL_OBJECT
+
+        try:
+            result = self.consume_code_script(
+                keys=[self.key(user_id, code_type)],
+                args=[code or "", time.time(), int(code in master_codes)],
+            )
+        except RedisError:
+            raise HTTPException(status_code=500, description="Error getting from cache")
+        if isinstance(result, bytes):
+            result = result.decode()
+        return CodeStatusEnum(result)
@@ -0,0 +1,116 @@
+import time
+import uuid
+from typing import List, Sequence, Tuple
+
+from loguru import logger
+from redis.exceptions import RedisError
+
+from app import constants
+from app.core.service_interfaces import RateLimitStoreInterface
+from app.enums import RateLimitAlgorithmEnum
+
+from . import redis_service
+from .memory_rate_limit_store import MemoryRateLimitStore
+
+# ARGV holds the current time, a unique request id and then a (limit, window)
+# pair per key. nothing is recorded unless every key is under its limit.
+SLIDING_WINDOW_SCRIPT = """
+local now = tonumber(ARGV[1])
+local retry_after = 0
+for i, key in ipairs(KEYS) do
+    local limit = tonumber(ARGV[2 * i + 1])
+    local window = tonumber(ARGV[2 * i + 2])
+    redis.call("ZREMRANGEBYSCORE", key, "-inf", now - window)
+    if redis.call("ZCARD", key) >= limit then
+        local oldest = redis.call("ZRANGE", key, 0, 0, "WITHSCORES")
+        retry_after = math.max(retry_after, tonumber(oldest[2]) + window - now)
+    end
+end
+if retry_after > 0 then
+    return tostring(retry_after)
+end
+for i, key in ipairs(KEYS) do
+    redis.call("ZADD", key, now, ARGV[2])
+    redis.call("EXPIRE", key, ARGV[2 * i + 2])
+end
+return "0"
+"""
+
+TOKEN_BUCKET_SCRIPT = """
+local now = tonumber(ARGV[1])
+local retry_after = 0
+local tokens = {}
+for i, key in ipairs(KEYS) do
+    local limit = tonumber(ARGV[2 * i + 1])
+    local rate = limit / tonumber(ARGV[2 * i + 2])
+    local bucket = redis.call("HMGET", key, "tokens", "updated_at")
+    local available = limit
+    if bucket[1] then
+        available = tonumber(bucket[1]) + (now - tonumber(bucket[2])) * rate
+        available = math.min(limit, available)
+    end
+    tokens[i] = available
+    if available < 1 then
+        retry_after = math.max(retry_after, (1 - available) / rate)
+    end
+end
+if retry_after > 0 then
+    return tostring(retry_after)
+end
+for i, key in ipairs(KEYS) do
+    redis.call(
+        "HSET", key, "tokens", tostring(tokens[i] - 1), "updated_at", ARGV[1]
+    )
+    redis.call("EXPIRE", key, ARGV[2 * i + 2])
+end
+return "0"
+"""
+
+SCRIPTS = {
+    RateLimitAlgorithmEnum.sliding_window: SLIDING_WINDOW_SCRIPT,
+    RateLimitAlgorithmEnum.token_bucket: TOKEN_BUCKET_SCRIPT,
+}
+
+
+class RedisRateLimitStore(RateLimitStoreInterface):
+    """
+    Counts requests in redis, so limits are shared by every worker.
+
+    Each check runs as a single lua script, keeping the read and the update
+    atomic under concurrent requests. When redis cannot be reached the
+    requests are counted in memory instead of being let through unchecked.
+    """
+
+    def __init__(self):
+        self.fallback_store = MemoryRateLimitStore()
+
+    def hit(
+        self,
+        keys: Sequence[str],
+        limits: Sequence[Tuple[int, int]],
+        algorithm: RateLimitAlgorithmEnum,
+    ) -> float:
+        """
+        Record a request against every key, unless one of them is over its limit.
+
+        :param keys: The keys identifying the caller.
+        :type keys: Sequence[str]
+        :param limits: The (requests, seconds) limit of each key.
+        :type limits: Sequence[Tuple[int, int]]
+        :param algorithm: The algorithm used to count the requests.
+        :type algorithm: RateLimitAlgorithmEnum
+        :return: The number of seconds to wait before retrying, 0 if allowed.
+        :rtype: float
+        """
+        assert len(keys) == len(limits), constants.EXC_INVALID_INPUT.format("limits")
+
+        args: List = [time.time(), uuid.uuid4().hex]
+        for limit, window in limits:
+            args.extend([limit, window])
+        try:
+            script = redis_service.redis_conn.register_script(SCRIPTS[algorithm])
+            result = script(keys=list(keys), args=args)
+        except RedisError as exc:
+            logger.warning(f"rate limiting in memory after redis error {exc}")
+            return self.fallback_store.hit(keys, limits, algorithm)
+        return float(result)
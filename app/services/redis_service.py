@@ -1,21 +1,51 @@
 import json
 
 import redis
+from redis.client import Pipeline
 from redis.exceptions import RedisError
 
 from app.core.exceptions import HTTPException
+from app.core.metrics import observe_dependency
 from app.core.service_interfaces import CacheServiceInterface
+from app.core.tracing import trace_methods
+from app.utils.lazy import LazyObject
 from config import settings
 
 REDIS_SERVER = settings.redis_server
 REDIS_PASSWORD = settings.redis_password
 REDIS_PORT = settings.redis_port
 
-redis_conn = redis.Redis(
-    host=REDIS_SERVER, port=REDIS_PORT, db=0, password=REDIS_PASSWORD
-)
 
+class TimedPipeline(Pipeline):
+    def execute(self, raise_on_error=True):
+        with observe_dependency("redis", "PIPELINE"):
+            return super().execute(raise_on_error=raise_on_error)
 
+
+class TimedRedis(redis.Redis):
+    """
+    Redis client recording the latency of every command it sends.
+    """
+
+    def execute_command(self, *args, **options):
+        with observe_dependency("redis", str(args[0]).upper()):
+            return super().execute_command(*args, **options)
+
+    def pipeline(self, transaction=True, shard_hint=None):
+        return TimedPipeline(
+            self.connection_pool, self.response_callbacks, transaction, shard_hint
+        )
+
+
+def create_redis_connection() -> redis.Redis:
+    return TimedRedis(host=REDIS_SERVER, port=REDIS_PORT, db=0, password=REDIS_PASSWORD)
+
+
+# reminder: the client and its connection pool are created on first use
+redis_conn: redis.Redis = LazyObject(create_redis_connection)
+
+
+@trace_methods
 class RedisService(CacheServiceInterface):
     def set(self, name, data):
         """
@@ -0,0 +1,104 @@
+from datetime import datetime, timedelta
+from typing import Any, Sequence
+
+import pytz
+
+from app import constants
+from app.core.exceptions import AppException
+from app.core.service_interfaces import OtpStoreInterface
+from app.enums import CodeStatusEnum
+from app.models import UserOtpModel
+from app.repositories import UserOtpRepository
+
+utc = pytz.UTC
+
+
+class SQLOtpStore(OtpStoreInterface):
+    """
+    Keeps otp codes and security tokens in the users_otp table, one row per user.
+    """
+
+    def __init__(self, user_otp_repository: UserOtpRepository):
+        """
+        Initialize the SQLOtpStore.
+
+        :param user_otp_repository: The user otp repository object.
+        :type user_otp_repository: UserOtpRepository
+        """
+        self.user_otp_repository = user_otp_repository
+
+    def save_code(
+        self, user_id: Any, code_type: str, code: str, lifetime: int
+    ) -> UserOtpModel:
+        """
+        Save a code issued to a user, replacing any code previously issued.
+
+        :param user_id: The ID of the user the code is issued to.
+        :type user_id: Any
+        :param code_type: The type of code, either otp_code or sec_token.
+        :type code_type: str
+        :param code: The code to save.
+        :type code: str
+        :param lifetime: The number of seconds the code is valid for.
+        :type lifetime: int
+        :return: The UserOtpModel object holding the code.
+        :rtype: UserOtpModel
+        :raises AssertionError: If the user_id, code or lifetime is empty or None.
+        """
+        assert user_id, constants.ASSERT_NULL_OBJECT
+        assert code, constants.ASSERT_NULL_OBJECT
+        assert lifetime, constants.ASSERT_NULL_OBJECT
+
+        obj_data: dict = {
+            "otp_code": None,
+            "otp_code_expiration": None,
+            "sec_token": None,
+            "sec_token_expiration": None,
+        }
+        obj_data[code_type] = code
+        obj_data[f"{code_type}_expiration"] = datetime.now() + timedelta(
+            seconds=lifetime
+        )
+        try:
+            result: UserOtpModel = self.user_otp_repository.update(
+                filter_params={"user_id": user_id}, obj_in=obj_data
+            )
+        except AppException.NotFoundException:
+            obj_data["user_id"] = user_id
+            result: UserOtpModel = self.user_otp_repository.create(obj_in=obj_data)
+        return result
+
+    def consume_code(
+        self, user_id: Any, code_type: str, code: str, master_codes: Sequence[str] = ()
+    ) -> CodeStatusEnum:
+        """
+        Compare a code with the one issued to the user and clear it on a match.
+
+        :param user_id: The ID of the user the code was issued to.
+        :type user_id: Any
+        :param code_type: The type of code, either otp_code or sec_token.
+        :type code_type: str
+        :param code: The code provided by the user.
+        :type code: str
+        :param master_codes: Codes accepted in place of the issued code.
+        :type master_codes: Sequence[str]
+        :return: The outcome of the comparison.
+        :rtype: CodeStatusEnum
+        :raises AssertionError: If the user_id is empty or None.
+        """
+        assert user_id, constants.ASSERT_NULL_OBJECT
+
+        try:
+            record: UserOtpModel = self.user_otp_repository.find({"user_id": user_id})
+        except AppException.NotFoundException:
+            return CodeStatusEnum.missing
+        expiration: datetime = getattr(record, f"{code_type}_expiration")
+        if getattr(record, code_type) != code and code not in master_codes:
+            return CodeStatusEnum.invalid
+        self.user_otp_repository.update(
+            filter_params={"user_id": user_id},
+            obj_in={code_type: None, f"{code_type}_expiration": None},
+        )
+        if not expiration or utc.localize(datetime.now()) > expiration:
+            return CodeStatusEnum.expired
+        return CodeStatusEnum.valid
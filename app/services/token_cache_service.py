@@ -0,0 +1,103 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+import orjson
+from loguru import logger
+from redis.exceptions import RedisError
+
+from app.utils.auth import token_digest
+
+from . import redis_service
+
+
+class TokenCacheService:
+    """
+    Caches the introspection results of access tokens, in the worker and in
+    redis.
+
+    A result is looked up in the worker first, then in redis, where it is
+    shared with the other workers and pods, so a token is verified once in
+    the cluster rather than once per worker. A result is kept until its token
+    expires, or for `ttl` seconds if that comes first, so a change of the
+    user's roles or status shows within `ttl` seconds.
+
+    Tokens are keyed by their sha256 digest, they are never stored.
+
+    :param ttl: The most seconds a result is cached for.
+    :type ttl: int
+    :param local_size: The number of results each worker keeps, the least
+        recently used is dropped first.
+    :type local_size: int
+    """
+
+    def __init__(self, ttl: int, local_size: int):
+        self.ttl = ttl
+        self.local_size = local_size
+        self._local: "OrderedDict[str, Tuple[float, Dict]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    # noinspection PyMethodMayBeStatic
+    def key(self, token: str) -> str:
+        return f"token:{token_digest(token)}"
+
+    def get(self, token: str) -> Optional[Dict]:
+        """
+        Get the cached introspection result of a token.
+
+        :param token: The access token.
+        :type token: str
+        :return: The result, None if it is not cached.
+        :rtype: dict, optional
+        """
+        key: str = self.key(token)
+        with self._lock:
+            entry: Optional[Tuple[float, Dict]] = self._local.get(key)
+            if entry is not None:
+                if entry[0] > time.time():
+                    self._local.move_to_end(key)
+                    return entry[1]
+                del self._local[key]
+        try:
+            pipeline = redis_service.redis_conn.pipeline(transaction=False)
+            pipeline.get(key)
+            pipeline.pttl(key)
+            data, ttl = pipeline.execute()
+        except RedisError as exc:
+            logger.warning(f"failed to get cached token with error {exc}")
+            return None
+        if data is None or ttl <= 0:
+            return None
+        result: Dict = orjson.loads(data)
+        self.set_local(key, result, expires_at=time.time() + ttl / 1000)
+        return result
+
+    def set(self, token: str, result: Dict, expires_at: float) -> None:
+        """
+        Cache the introspection result of a token.
+
+        :param token: The access token.
+        :type token: str
+        :param result: The introspection result.
+        :type result: dict
+        :param expires_at: The unix time the token expires at.
+        :type expires_at: float
+        """
+        expires_at = min(expires_at, time.time() + self.ttl)
+        ttl_ms = int((expires_at - time.time()) * 1000)
+        if ttl_ms <= 0:
+            return
+        key: str = self.key(token)
+        self.set_local(key, result, expires_at=expires_at)
+        try:
+            redis_service.redis_conn.set(key, orjson.dumps(result), px=ttl_ms)
+        except RedisError as exc:
+            logger.warning(f"failed to cache token with error {exc}")
+
+    def set_local(self, key: str, result: Dict, expires_at: float) -> None:
+        with self._lock:
+            self._local[key] = (expires_at, result)
+            self._local.move_to_end(key)
+            while len(self._local) > self.local_size:
+                self._local.popitem(last=False)
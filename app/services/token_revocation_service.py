@@ -0,0 +1,187 @@
+import threading
+import time
+from typing import List, Optional
+
+from loguru import logger
+from redis.exceptions import RedisError
+
+from app import constants
+from app.core.exceptions import HTTPException
+from app.utils.auth import token_digest
+from app.utils.bloom_filter import BloomFilter
+from config import settings
+
+from . import redis_service
+
+
+class TokenRevocationService:
+    """
+    Denies access tokens before they expire, on logout or when their user is
+    deleted.
+
+    The denylist is kept in redis: a revoked token is denied under its digest
+    until it expires, and revoking the tokens of a user denies every token of
+    that user issued until then. Every worker keeps a bloom filter of the
+    denylist keys, so checking a token only reaches redis when the filter
+    reports it as possibly revoked, which a token that is not revoked does at
+    the error rate of the filter.
+
+    The filter is kept in sync by a thread listening to the keys announced on
+    `constants.TOKEN_REVOCATION_CHANNEL`. It is rebuilt from redis every
+    `rebuild_interval` seconds, dropping the keys that expired, and after a
+    loss of the connection, when announcements may have been missed. Until the
+    thread has built the filter, and while it is out of sync, tokens are
+    checked against redis directly.
+
+    When redis cannot be reached, tokens are checked against the last filter
+    the worker built, keeping the keys revoked until then denied. A worker
+    that never built the filter only knows the keys it revoked itself and
+    lets the other tokens through: their signature and expiry are still
+    verified, and a redis outage must not deny every authenticated request.
+
+    :param capacity: The number of denylist keys the filter is sized for.
+    :type capacity: int
+    :param error_rate: The rate of false positives of the filter.
+    :type error_rate: float
+    :param rebuild_interval: The seconds between two rebuilds of the filter.
+    :type rebuild_interval: int
+    """
+
+    def __init__(self, capacity: int, error_rate: float, rebuild_interval: int):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.rebuild_interval = rebuild_interval
+        self.bloom_filter = BloomFilter(capacity, error_rate)
+        self.synced = False
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    # noinspection PyMethodMayBeStatic
+    def key(self, kind: str, value: str) -> str:
+        return f"revoked:{kind}:{value}"
+
+    def start(self) -> None:
+        """
+        Start the thread keeping the filter of the worker in sync.
+        """
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self.sync, name="token-revocation", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        self.synced = False
+
+    def revoke_token(self, token: str, expires_at: Optional[float]) -> None:
+        """
+        Deny an access token until it expires.
+
+        :param token: The access token.
+        :type token: str
+        :param expires_at: The unix time the token expires at, None to deny
+            it for `token_max_lifetime` seconds.
+        :type expires_at: float, optional
+        :raises HTTPException: If the token could not be denied.
+        """
+        ttl: int = settings.token_max_lifetime
+        if expires_at is not None:
+            ttl = int(expires_at - time.time()) + 1
+        if ttl > 0:
+            self.deny(self.key("token", token_digest(token)), "1", ttl)
+
+    def revoke_user(self, username: str) -> None:
+        """
+        Deny every access token issued to a user until now.
+
+        :param username: The username of the user.
+        :type username: str
+        :raises HTTPException: If the tokens could not be denied.
+        """
+        self.deny(
+            self.key("user", username), str(time.time()), settings.token_max_lifetime
+        )
+
+    def deny(self, key: str, value: str, ttl: int) -> None:
+        try:
+            pipeline = redis_service.redis_conn.pipeline(transaction=False)
+            pipeline.set(key, value, ex=ttl)
+            pipeline.publish(constants.TOKEN_REVOCATION_CHANNEL, key)
+            pipeline.execute()
+        except RedisError as exc:
+            logger.error(f"failed to revoke {key} with error {exc}")
+            raise HTTPException(status_code=500, description="Error saving to cache")
+        self.bloom_filter.add(key)
+
+    def is_revoked(self, token: str, payload: dict) -> bool:
+        """
+        Check whether an access token was revoked.
+
+        When redis cannot be reached, a token is denied if the last filter
+        built reports it as possibly revoked.
+
+        :param token: The access token.
+        :type token: str
+        :param payload: The decoded token.
+        :type payload: dict
+        :return: True if the token was revoked.
+        :rtype: bool
+        """
+        keys: List[str] = [
+            self.key("token", token_digest(token)),
+            self.key("user", str(payload.get("username"))),
+        ]
+        if self.synced:
+            keys = [key for key in keys if key in self.bloom_filter]
+            if not keys:
+                return False
+        try:
+            values: List[Optional[bytes]] = redis_service.redis_conn.mget(keys)
+        except RedisError as exc:
+            logger.error(f"failed to check token revocation with error {exc}")
+            return any(key in self.bloom_filter for key in keys)
+        for key, value in zip(keys, values):
+            if value is None:
+                continue
+            if key.startswith(self.key("token", "")):
+                return True
+            if payload.get("iat", 0) <= float(value):
+                return True
+        return False
+
+    def rebuild(self) -> None:
+        bloom_filter = BloomFilter(self.capacity, self.error_rate)
+        for key in redis_service.redis_conn.scan_iter(
+            match=self.key("*", "*"), count=1000
+        ):
+            bloom_filter.add(key.decode())
+        self.bloom_filter = bloom_filter
+
+    def sync(self) -> None:
+        """
+        Keep the filter in sync with the denylist until the service is stopped.
+        """
+        while not self._stopped.is_set():
+            try:
+                pubsub = redis_service.redis_conn.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(constants.TOKEN_REVOCATION_CHANNEL)
+                try:
+                    # reminder: subscribe first, a key denied while the filter
+                    # is rebuilt is then announced to the new filter
+                    self.rebuild()
+                    self.synced = True
+                    rebuild_at = time.monotonic() + self.rebuild_interval
+                    while not self._stopped.is_set():
+                        message = pubsub.get_message(timeout=1.0)
+                        if message is not None:
+                            self.bloom_filter.add(message["data"].decode())
+                        if time.monotonic() >= rebuild_at:
+                            self.rebuild()
+                            rebuild_at = time.monotonic() + self.rebuild_interval
+                finally:
+                    self.synced = False
+                    pubsub.close()
+            except RedisError as exc:
+                logger.error(f"failed to sync token revocations with error {exc}")
+                self._stopped.wait(constants.TOKEN_REVOCATION_RETRY_INTERVAL)
@@ -0,0 +1,98 @@
+from typing import Dict, List, Optional, Sequence
+
+from loguru import logger
+from redis.exceptions import RedisError
+
+from app.models import UserModel
+from app.schema import UserSchema
+
+from . import redis_service
+
+
+class UserCacheService:
+    """
+    Caches users in redis, keyed by id, for batch lookups.
+
+    A user is stored once under its id, without its password hash, and its
+    username and email point to that id. A lookup by username or email
+    follows the pointer and only counts as a hit when the cached user still
+    has that username or email, so invalidating a user only has to delete
+    the entry under its id.
+
+    Cached users are returned as transient UserModel instances, they are
+    never added to a session.
+
+    :param ttl: The number of seconds a user is cached for.
+    :type ttl: int
+    """
+
+    def __init__(self, ttl: int):
+        self.ttl = ttl
+
+    # noinspection PyMethodMayBeStatic
+    def key(self, field: str, value: str) -> str:
+        return f"user:{field}:{value}"
+
+    def get_many(self, field: str, values: Sequence[str]) -> Dict[str, UserModel]:
+        """
+        Get the cached users matching values of a field.
+
+        :param field: The field to match, id, username or email.
+        :type field: str
+        :param values: The values to match.
+        :type values: Sequence[str]
+        :return: The cached users, keyed by the value they matched.
+        :rtype: dict[str, UserModel]
+        """
+        try:
+            ids: List[Optional[bytes]] = [value.encode() for value in values]
+            if field != "id":
+                ids = redis_service.redis_conn.mget(
+                    [self.key(field, value) for value in values]
+                )
+            keys = [self.key("id", user_id.decode()) for user_id in ids if user_id]
+            cached: List[Optional[bytes]] = (
+                redis_service.redis_conn.mget(keys) if keys else []
+            )
+        except RedisError as exc:
+            logger.warning(f"failed to get cached users with error {exc}")
+            return {}
+        users: Dict[str, UserModel] = {}
+        for data in filter(None, cached):
+            user = UserModel(**UserSchema.parse_raw(data).dict())
+            users[str(getattr(user, field))] = user
+        return {value: users[value] for value in values if value in users}
+
+    def set_many(self, users: Sequence[UserModel]) -> None:
+        """
+        Cache users, along with the pointers of their username and email.
+
+        :param users: The users to cache.
+        :type users: Sequence[UserModel]
+        """
+        try:
+            pipeline = redis_service.redis_conn.pipeline(transaction=False)
+            for user in users:
+                user_id = str(user.id)
+                data: str = UserSchema.from_orm(user).json()
+                pipeline.set(self.key("id", user_id), data, ex=self.ttl)
+                pipeline.set(self.key("username", user.username), user_id, ex=self.ttl)
+                pipeline.set(self.key("email", user.email), user_id, ex=self.ttl)
+            pipeline.execute()
+        except RedisError as exc:
+            logger.warning(f"failed to cache users with error {exc}")
+
+    def invalidate(self, user_id: str) -> None:
+        """
+        Remove a user from the cache.
+
+        A failure is logged rather than raised as the write it follows has
+        already been committed, the user then expires with the ttl.
+
+        :param user_id: The id of the user.
+        :type user_id: str
+        """
+        try:
+            redis_service.redis_conn.delete(self.key("id", user_id))
+        except RedisError as exc:
+            logger.error(f"failed to invalidate user {user_id} with error {exc}")
@@ -1,5 +1,17 @@
-from .auth import KeycloakJwtAuthentication
-from .encoders import JSONEncoder
-from .guid import GUID
+from .auth import KeycloakJwtAuthentication, decode_token, token_digest, token_roles
+from .bloom_filter import BloomFilter
+from .encoders import (
+    ORJSONResponse,
+    accepts_gzip,
+    close_after_stream,
+    encode_csv,
+    encode_ndjson,
+    gzip_stream,
+    orjson_dumps,
+)
+from .fields import SparseFields
+from .guid import GUID, uuid7
+from .http_cache import CachedResponse, HttpCache
 from .paginate import Page, Params
+from .rate_limit import RateLimiter
 from .swagger_responses import data_responses, query_responses
@@ -1,15 +1,83 @@
+import hashlib
+from typing import List, Optional
+
 import jwt
 from fastapi import Request
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from jwt.exceptions import PyJWTError
+from starlette.concurrency import run_in_threadpool
 
+from app import constants
 from app.core.exceptions import AppException
 from config import settings
 
 
+def token_roles(payload: dict) -> List[str]:
+    """
+    Return the realm roles and the client roles granted by a token.
+
+    :param payload: The decoded token.
+    :type payload: dict
+    :return: The roles of the user.
+    :rtype: list[str]
+    """
+    realm_roles: list = payload.get("realm_access", {}).get("roles", [])
+    client_access: dict = payload.get("resource_access", {})
+    client_roles: list = client_access.get(settings.keycloak_client_id, {}).get(
+        "roles", []
+    )
+    return realm_roles + client_roles
+
+
+def token_digest(token: str) -> str:
+    """
+    Return the sha256 digest of a token, tokens are stored by their digest
+    so they cannot be read back from the store.
+
+    :param token: The encoded token.
+    :type token: str
+    :return: The hex digest.
+    :rtype: str
+    """
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def decode_token(token: str) -> dict:
+    """
+    Verify a Keycloak access token and return its claims.
+
+    :param token: The encoded token.
+    :type token: str
+    :return: The decoded token.
+    :rtype: dict
+    :raises AppException.InvalidTokenException: If the token is not valid.
+    """
+    try:
+        payload: dict = jwt.decode(
+            jwt=token,
+            key=settings.jwt_public_key,
+            algorithms=settings.jwt_algorithms,
+            audience="account",
+            issuer=f"{settings.keycloak_uri}/realms/{settings.keycloak_realm}",
+        )
+        return payload
+    except PyJWTError as exc:
+        raise AppException.InvalidTokenException(error_message=exc.args)
+
+
 class KeycloakJwtAuthentication(HTTPBearer):
-    def __init__(self, auto_error: bool = True):
+    """
+    Dependency authenticating a request with its Keycloak bearer token.
+
+    :param auto_error: Raise an error when the request carries no token.
+    :type auto_error: bool
+    :param roles: Roles the user needs one of, any authenticated user if None.
+    :type roles: list[str], optional
+    """
+
+    def __init__(self, auto_error: bool = True, roles: Optional[List[str]] = None):
         super().__init__(auto_error=auto_error)
+        self.roles = roles
 
     async def __call__(self, request: Request):
         credentials: HTTPAuthorizationCredentials = await super().__call__(request)
@@ -18,18 +86,47 @@ class KeycloakJwtAuthentication(HTTPBearer):
                 raise AppException.UnauthorizedException(
                     error_message="invalid authentication scheme"
                 )
-            return self.decode_token(token=credentials.credentials)
+            payload: dict = self.token_payload(request, credentials.credentials)
+            container = request.app.state.container
+            # reminder: checking a token may reach redis, keep it off the loop
+            if await run_in_threadpool(
+                container.token_revocation_service.is_revoked,
+                credentials.credentials,
+                payload,
+            ):
+                raise AppException.UnauthorizedException(
+                    error_message=constants.EXC_REVOKED_INPUT.format("token")
+                )
+            if self.roles and not set(self.roles) & set(token_roles(payload)):
+                raise AppException.ForbiddenException(
+                    error_message="user does not have the required role"
+                )
+            if payload.get("username"):
+                container.activity_tracker_service.record(payload["username"])
+            return payload
 
     # noinspection PyMethodMayBeStatic
     def decode_token(self, token: str):
-        try:
-            payload: dict = jwt.decode(
-                jwt=token,
-                key=settings.jwt_public_key,
-                algorithms=settings.jwt_algorithms,
-                audience="account",
-                issuer=f"{settings.keycloak_uri}/realms/{settings.keycloak_realm}",
-            )
-            return payload
-        except PyJWTError as exc:
-            raise AppException.InvalidTokenException(error_message=exc.args)
+        return decode_token(token)
+
+    def token_payload(self, request: Request, token: str) -> dict:
+        """
+        Decode the bearer token of a request, once per request.
+
+        The payload is kept on the request, so the other dependencies of the
+        route, e.g. the rate limiter, reuse it rather than verifying the
+        token again.
+
+        :param request: The incoming request.
+        :type request: Request
+        :param token: The bearer token of the request.
+        :type token: str
+        :return: The decoded token.
+        :rtype: dict
+        :raises AppException.InvalidTokenException: If the token is not valid.
+        """
+        payload: Optional[dict] = getattr(request.state, "token_payload", None)
+        if payload is None:
+            payload = self.decode_token(token=token)
+            request.state.token_payload = payload
+        return payload
@@ -0,0 +1,47 @@
+import hashlib
+import math
+import threading
+from typing import Iterator
+
+
+class BloomFilter:
+    """
+    Set of strings answering membership with false positives but no false
+    negatives.
+
+    The filter is sized for `capacity` items at `error_rate` false positives,
+    past that the rate of false positives grows. Items cannot be removed, the
+    filter is rebuilt instead.
+
+    :param capacity: The number of items the filter is sized for.
+    :type capacity: int
+    :param error_rate: The rate of false positives at capacity.
+    :type error_rate: float
+    """
+
+    def __init__(self, capacity: int, error_rate: float):
+        self.size = max(
+            8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        )
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self._lock = threading.Lock()
+
+    def positions(self, item: str) -> Iterator[int]:
+        # reminder: the hash_count positions are derived from two hashes
+        # (Kirsch-Mitzenmacher), a single digest is computed per item
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        return ((first + index * second) % self.size for index in range(self.hash_count))
+
+    def add(self, item: str) -> None:
+        with self._lock:
+            for position in self.positions(item):
+                self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, item: str) -> bool:
+        return all(
+            self.bits[position >> 3] & (1 << (position & 7))
+            for position in self.positions(item)
+        )
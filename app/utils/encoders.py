@@ -1,10 +1,176 @@
-import json
+import csv
+import enum
+import io
+import zlib
+from datetime import date
 from decimal import Decimal
-from typing import Any
+from typing import Any, AsyncIterator, Generator, Iterable, Iterator, Sequence
 
+import anyio
+import orjson
+from fastapi.responses import JSONResponse
+from starlette.concurrency import iterate_in_threadpool, run_in_threadpool
 
-class JSONEncoder(json.JSONEncoder):
-    def default(self, obj: Any) -> Any:
-        if isinstance(obj, Decimal):
-            return str(obj)
-        return json.JSONEncoder.default(self, obj)
+
+def orjson_default(obj: Any) -> Any:
+    """
+    Serialize the types orjson does not handle natively.
+
+    :param obj: The object to serialize.
+    :type obj: Any
+    :return: The serializable representation of the object.
+    :rtype: Any
+    :raises TypeError: If the object cannot be serialized.
+    """
+    if isinstance(obj, Decimal):
+        return str(obj)
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError(f"Object of type {obj.__class__.__name__} is not JSON serializable")
+
+
+def orjson_dumps(content: Any) -> bytes:
+    """
+    Serialize content to json with orjson.
+
+    UUID, datetime, date, enum and dataclass values are serialized natively,
+    decimals are serialized as strings.
+
+    :param content: The content to serialize.
+    :type content: Any
+    :return: The json encoded content.
+    :rtype: bytes
+    """
+    return orjson.dumps(content, default=orjson_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+class ORJSONResponse(JSONResponse):
+    """
+    Json response rendered with orjson, the default response class of the app.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson_dumps(content)
+
+
+def csv_value(value: Any) -> Any:
+    """
+    Convert a value to the representation written to csv exports.
+
+    :param value: The value to convert.
+    :type value: Any
+    :return: The value as written by csv.writer.
+    :rtype: Any
+    """
+    if value is None:
+        return ""
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, date):
+        return value.isoformat()
+    return value
+
+
+def encode_csv(columns: Sequence[str], batches: Iterable[Sequence]) -> Iterator[bytes]:
+    """
+    Encode batches of rows to csv, one chunk per batch after the header.
+
+    :param columns: The names of the columns, written as header.
+    :type columns: Sequence[str]
+    :param batches: The batches of rows, rows hold a value per column.
+    :type batches: Iterable[Sequence]
+    :return: The csv encoded chunks.
+    :rtype: Iterator[bytes]
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    yield buffer.getvalue().encode()
+    for rows in batches:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows([csv_value(value) for value in row] for row in rows)
+        yield buffer.getvalue().encode()
+
+
+def encode_ndjson(
+    columns: Sequence[str], batches: Iterable[Sequence]
+) -> Iterator[bytes]:
+    """
+    Encode batches of rows to newline delimited json, one chunk per batch.
+
+    :param columns: The names of the columns, used as keys of the objects.
+    :type columns: Sequence[str]
+    :param batches: The batches of rows, rows hold a value per column.
+    :type batches: Iterable[Sequence]
+    :return: The json encoded chunks.
+    :rtype: Iterator[bytes]
+    """
+    for rows in batches:
+        yield b"".join(orjson_dumps(dict(zip(columns, row))) + b"\n" for row in rows)
+
+
+def gzip_stream(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    """
+    Compress a stream of chunks to gzip as they are produced.
+
+    :param chunks: The chunks to compress.
+    :type chunks: Iterable[bytes]
+    :return: The gzip compressed chunks.
+    :rtype: Iterator[bytes]
+    """
+    compressor = zlib.compressobj(wbits=16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        compressed: bytes = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+def accepts_gzip(accept_encoding: str) -> bool:
+    """
+    Check whether an Accept-Encoding header allows a gzip response.
+
+    :param accept_encoding: The value of the header.
+    :type accept_encoding: str
+    :return: True if gzip, or any coding when gzip is not listed, has a
+        quality above 0.
+    :rtype: bool
+    """
+    qualities = {}
+    for coding in accept_encoding.split(","):
+        name, *params = [part.strip() for part in coding.split(";")]
+        quality = 1.0
+        for param in params:
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if name:
+            qualities[name.lower()] = quality
+    quality = qualities.get("gzip", qualities.get("x-gzip", qualities.get("*", 0.0)))
+    return quality > 0
+
+
+async def close_after_stream(
+    chunks: Generator[bytes, None, None]
+) -> AsyncIterator[bytes]:
+    """
+    Stream the chunks of a blocking generator from the threadpool, and close
+    the generator once the response ends, also when the client disconnects,
+    so the resources it holds, e.g. a server-side cursor, are released.
+
+    :param chunks: The chunks to stream.
+    :type chunks: Generator[bytes, None, None]
+    :return: The chunks.
+    :rtype: AsyncIterator[bytes]
+    """
+    try:
+        async for chunk in iterate_in_threadpool(chunks):
+            yield chunk
+    finally:
+        # reminder: a disconnect cancels the response, shield the close from it
+        with anyio.CancelScope(shield=True):
+            await run_in_threadpool(chunks.close)
@@ -0,0 +1,43 @@
+from typing import List, Optional, Type
+
+from pydantic import BaseModel
+
+from app import constants
+from app.core.exceptions import AppException
+
+
+class SparseFields:
+    """
+    Dependency reading the comma separated `fields` query parameter of a list
+    endpoint, i.e. the sparse fieldset of the items to return.
+
+    The returned names are the columns the endpoint selects, so list
+    endpoints only read and send the requested columns of every row.
+
+    :param schema: The schema of the items, its fields are the valid names.
+    :type schema: Type[BaseModel]
+    """
+
+    def __init__(self, schema: Type[BaseModel]):
+        self.schema = schema
+
+    def __call__(self, fields: Optional[str] = None) -> Optional[List[str]]:
+        """
+        :param fields: The comma separated names of the fields to return.
+        :type fields: str, optional
+        :return: The requested names, None when every field is requested.
+        :rtype: Optional[List[str]]
+        :raises AppException.BadRequestException: If a name is not a field
+            of the schema.
+        """
+        if not fields:
+            return None
+        names = list(dict.fromkeys(filter(None, map(str.strip, fields.split(",")))))
+        unknown = [name for name in names if name not in self.schema.__fields__]
+        if unknown or not names:
+            raise AppException.BadRequestException(
+                error_message=constants.EXC_INVALID_INPUT.format(
+                    f"fields: {', '.join(unknown)}"
+                )
+            )
+        return names
@@ -1,13 +1,55 @@
+import os
+import threading
+import time
 import uuid
 
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.types import CHAR, TypeDecorator
 
+# reminder: the last timestamp and counter handed out by uuid7
+_uuid7_lock = threading.Lock()
+_uuid7_last = (0, 0)
+
+
+def uuid7() -> uuid.UUID:
+    """
+    Generate a time-ordered UUID, version 7 of RFC 9562.
+
+    The first 48 bits hold the unix timestamp in milliseconds, so keys
+    generated one after another land next to each other in the primary key
+    and foreign key indexes instead of splitting random pages. The 12 bits
+    following the version are a counter, starting at a random value every
+    millisecond, so ids generated by the process are strictly increasing.
+    The remaining 62 bits are random.
+
+    :return: The generated UUID.
+    :rtype: uuid.UUID
+    """
+    global _uuid7_last
+    rand_b: int = int.from_bytes(os.urandom(8), "big") & 0x3FFF_FFFF_FFFF_FFFF
+    timestamp: int = time.time_ns() // 1_000_000
+    with _uuid7_lock:
+        last_timestamp, counter = _uuid7_last
+        if timestamp <= last_timestamp:
+            # clock went backwards or same millisecond, keep counting from last
+            timestamp, counter = last_timestamp, counter + 1
+            if counter > 0xFFF:
+                timestamp, counter = timestamp + 1, 0
+        else:
+            counter = rand_b >> 51
+        _uuid7_last = (timestamp, counter)
+    return uuid.UUID(
+        int=(timestamp << 80) | (0x7 << 76) | (counter << 64) | (0b10 << 62) | rand_b
+    )
+
 
 class GUID(TypeDecorator):
     """Platform-independent GUID type.
     Uses PostgreSQL's UUID type, otherwise uses
     CHAR(32), storing as stringified hex values.
+
+    On PostgreSQL the driver adapts uuid.UUID values in both directions, so
+    they are passed through without a conversion to and from strings.
     """
 
     impl = CHAR
@@ -15,7 +57,7 @@ class GUID(TypeDecorator):
 
     def load_dialect_impl(self, dialect):
         if dialect.name == "postgresql":
-            return dialect.type_descriptor(UUID())
+            return dialect.type_descriptor(UUID(as_uuid=True))
         else:
             return dialect.type_descriptor(CHAR(32))
 
@@ -23,7 +65,7 @@ class GUID(TypeDecorator):
         if value is None:
             return value
         elif dialect.name == "postgresql":
-            return str(value)
+            return value if isinstance(value, uuid.UUID) else str(value)
         else:
             if not isinstance(value, uuid.UUID):
                 return "%.32x" % uuid.UUID(value).int
@@ -38,3 +80,9 @@ class GUID(TypeDecorator):
             if not isinstance(value, uuid.UUID):
                 value = uuid.UUID(value)
             return value
+
+    def result_processor(self, dialect, coltype):
+        if dialect.name == "postgresql":
+            # the driver already returns uuid.UUID values
+            return self.impl_instance.result_processor(dialect, coltype)
+        return super().result_processor(dialect, coltype)
@@ -0,0 +1,132 @@
+import hashlib
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Any, Callable, Optional
+
+from fastapi import Request, Response, status
+from fastapi.encoders import jsonable_encoder
+from pydantic import parse_obj_as
+
+from config import settings
+
+from .encoders import orjson_dumps
+
+
+class HttpCache:
+    """
+    Dependency answering conditional GET requests on rarely changing data.
+
+    Responses carry an ETag and a Last-Modified header derived from the
+    version of their namespace, so a client revalidating an unchanged response
+    gets a 304 without the data being queried, unless the data may not exist,
+    see CachedResponse.respond. With `http_cache_enabled` the
+    response body is also cached, keyed by path and query parameters, until
+    a write bumps the namespace version.
+
+    Declare the dependency after the authentication dependency of a route so
+    cached responses are only served to authenticated users.
+
+    :param namespace: The namespace the cached responses belong to.
+    :type namespace: str
+    """
+
+    def __init__(self, namespace: str):
+        self.namespace = namespace
+
+    def __call__(self, request: Request) -> "CachedResponse":
+        return CachedResponse(
+            namespace=self.namespace,
+            request=request,
+            http_cache_service=request.app.state.container.http_cache_service,
+        )
+
+
+class CachedResponse:
+    """
+    The conditional response of a single request.
+
+    :param namespace: The namespace the cached response belongs to.
+    :type namespace: str
+    :param request: The incoming request.
+    :type request: Request
+    :param http_cache_service: The service keeping the namespace versions.
+    :type http_cache_service: HttpCacheService
+    """
+
+    def __init__(self, namespace: str, request: Request, http_cache_service: Any):
+        self.namespace = namespace
+        self.request = request
+        self.http_cache_service = http_cache_service
+
+    def respond(
+        self, load: Callable[[], Any], response_model: Any, load_first: bool = False
+    ) -> Response:
+        """
+        Build the response, only calling `load` when there is no usable cache.
+
+        :param load: Returns the data of the response.
+        :type load: Callable
+        :param response_model: The schema the data is serialized with.
+        :type response_model: Any
+        :param load_first: Whether the data may not exist, e.g. an item looked
+            up by id, it is then loaded, or found in the cache, before a 304 is
+            answered, so an unknown item is still answered with its error.
+        :type load_first: bool
+        :return: The response.
+        :rtype: Response
+        """
+        namespace: str = self.namespace
+        service = self.http_cache_service
+        version = service.version(namespace)
+        if version is None:
+            return self.render(load, response_model)
+        version, modified_at = version
+        query: list = sorted(self.request.query_params.multi_items())
+        digest: str = hashlib.sha1(
+            f"{self.request.url.path}?{query}".encode()
+        ).hexdigest()
+        headers: dict = {
+            "ETag": f'"{namespace}-{version}-{digest[:16]}"',
+            "Last-Modified": formatdate(modified_at, usegmt=True),
+            "Cache-Control": "private, no-cache",
+        }
+        not_modified: bool = self.not_modified(headers["ETag"], modified_at)
+        if not_modified and not load_first:
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        key: str = f"http_cache:{namespace}:{version}:{digest}"
+        body: Optional[bytes] = None
+        if settings.http_cache_enabled:
+            body = service.get(key)
+        if body is None:
+            response: Response = self.render(load, response_model, headers)
+            if settings.http_cache_enabled:
+                service.set(key, response.body, ttl=settings.http_cache_ttl)
+        else:
+            response = Response(
+                content=body, media_type="application/json", headers=headers
+            )
+        if not_modified:
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        return response
+
+    # noinspection PyMethodMayBeStatic
+    def render(
+        self, load: Callable[[], Any], response_model: Any, headers: dict = None
+    ) -> Response:
+        content = jsonable_encoder(parse_obj_as(response_model, load()))
+        return Response(
+            content=orjson_dumps(content), media_type="application/json", headers=headers
+        )
+
+    def not_modified(self, etag: str, modified_at: float) -> bool:
+        if_none_match: Optional[str] = self.request.headers.get("If-None-Match")
+        if if_none_match is not None:
+            tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+            return "*" in tags or etag in tags
+        if_modified_since: Optional[str] = self.request.headers.get("If-Modified-Since")
+        if if_modified_since is not None:
+            try:
+                since = parsedate_to_datetime(if_modified_since).timestamp()
+            except (TypeError, ValueError):
+                return False
+            return int(modified_at) <= since
+        return False
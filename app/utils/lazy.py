@@ -0,0 +1,65 @@
+import threading
+from typing import Any, Callable
+
+
+class LazyObject:
+    """
+    Proxy creating the object it stands for on first use.
+
+    Module level clients, e.g. the database engine or the redis connection,
+    are wrapped in a LazyObject so importing their module does not build
+    them. Attribute access is forwarded to the object, which is created once
+    with `factory` and shared by every thread.
+
+    :param factory: Creates the proxied object.
+    :type factory: Callable[[], Any]
+    """
+
+    def __init__(self, factory: Callable[[], Any]):
+        object.__setattr__(self, "_factory", factory)
+        object.__setattr__(self, "_lock", threading.Lock())
+        object.__setattr__(self, "_wrapped", None)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(unwrap(self), name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        setattr(unwrap(self), name, value)
+
+    def __delattr__(self, name: str) -> None:
+        delattr(unwrap(self), name)
+
+    def __repr__(self) -> str:
+        if self._wrapped is None:
+            return f"<LazyObject {self._factory!r} (not created)>"
+        return repr(self._wrapped)
+
+
+def unwrap(obj: Any) -> Any:
+    """
+    Return the object behind a LazyObject, creating it if needed.
+
+    :param obj: A LazyObject, or any other object which is returned as is.
+    :type obj: Any
+    :return: The proxied object.
+    :rtype: Any
+    """
+    if not isinstance(obj, LazyObject):
+        return obj
+    if obj._wrapped is None:
+        with obj._lock:
+            if obj._wrapped is None:
+                object.__setattr__(obj, "_wrapped", obj._factory())
+    return obj._wrapped
+
+
+def is_created(obj: Any) -> bool:
+    """
+    Check whether the object behind a LazyObject has been created.
+
+    :param obj: The LazyObject to check.
+    :type obj: Any
+    :return: True if the object has been created or is not lazy.
+    :rtype: bool
+    """
+    return not isinstance(obj, LazyObject) or obj._wrapped is not None
@@ -0,0 +1,189 @@
+import math
+import re
+from typing import Dict, List, Optional, Tuple
+
+from fastapi import Request
+from starlette.concurrency import run_in_threadpool
+
+from app import constants
+from app.core.exceptions import AppException, AppExceptionCase
+from app.core.service_interfaces import RateLimitStoreInterface
+from app.enums import RateLimitAlgorithmEnum, RateLimitKeyEnum
+from config import settings
+
+from .auth import KeycloakJwtAuthentication
+
+
+def parse_limit(limit: str) -> Tuple[int, int]:
+    """
+    Parse a limit written as "<requests>/<seconds>", e.g. "5/60".
+
+    :param limit: The limit to parse.
+    :type limit: str
+    :return: The number of requests allowed and the window in seconds.
+    :rtype: Tuple[int, int]
+    """
+    requests, seconds = limit.split("/")
+    return int(requests), int(seconds)
+
+
+def client_ip(request: Request) -> Optional[str]:
+    """
+    Return the ip of the client of a request.
+
+    Behind reverse proxies the peer of the connection is the last proxy, the
+    client is then the first address of the X-Forwarded-For header, from the
+    right, that is not one of the `trusted_proxies`. The header is ignored
+    when the peer is not a trusted proxy, as any client can send it.
+
+    :param request: The incoming request.
+    :type request: Request
+    :return: The ip of the client, None if it is unknown.
+    :rtype: Optional[str]
+    """
+    host: Optional[str] = request.client.host if request.client else None
+    trusted = {proxy.strip() for proxy in settings.trusted_proxies.split(",")}
+    if host is None or not ("*" in trusted or host in trusted):
+        return host
+    forwarded: List[str] = [
+        address.strip()
+        for address in request.headers.get("X-Forwarded-For", "").split(",")
+        if address.strip()
+    ]
+    if "*" in trusted:
+        return forwarded[0] if forwarded else host
+    for address in reversed(forwarded):
+        if address not in trusted:
+            return address
+    return host
+
+
+def get_rate_limit_store() -> RateLimitStoreInterface:
+    """
+    Create the rate limit store selected by the rate_limit_backend setting.
+
+    :return: The rate limit store.
+    :rtype: RateLimitStoreInterface
+    """
+    # imported here as the services depend on the models, which import app.utils
+    from app.services import MemoryRateLimitStore, RedisRateLimitStore
+
+    if settings.rate_limit_backend == constants.MEMORY_RATE_LIMIT_STORE:
+        return MemoryRateLimitStore()
+    return RedisRateLimitStore()
+
+
+class RateLimiter:
+    """
+    Dependency rejecting requests to a route once a caller exceeds its limits.
+
+    A caller is identified by each attribute in `limits` and the request is
+    rejected when any of them is over its limit. The check runs before the
+    route handler, so a rejected request never reaches password hashing or any
+    outbound call.
+
+    :param scope: The name the route's counters are kept under.
+    :type scope: str
+    :param limits: The "<requests>/<seconds>" limit of each attribute.
+    :type limits: Dict[RateLimitKeyEnum, str]
+    :param algorithm: The algorithm used to count the requests.
+    :type algorithm: RateLimitAlgorithmEnum, optional
+    """
+
+    def __init__(
+        self,
+        scope: str,
+        limits: Dict[RateLimitKeyEnum, str],
+        algorithm: Optional[RateLimitAlgorithmEnum] = None,
+    ):
+        self.scope = scope
+        self.limits = {key: parse_limit(limit) for key, limit in limits.items()}
+        self.algorithm = algorithm or RateLimitAlgorithmEnum(
+            settings.rate_limit_algorithm
+        )
+        self._store: Optional[RateLimitStoreInterface] = None
+
+    @property
+    def store(self) -> RateLimitStoreInterface:
+        if self._store is None:
+            self._store = get_rate_limit_store()
+        return self._store
+
+    async def __call__(self, request: Request) -> None:
+        if not settings.rate_limit_enabled:
+            return None
+        try:
+            body = await request.json()
+        except ValueError:
+            body = None
+        body = body if isinstance(body, dict) else {}
+        # reminder: decoding the token and the store round trip are blocking
+        await run_in_threadpool(self.check, request, body)
+        return None
+
+    def check(self, request: Request, body: dict) -> None:
+        """
+        Count a request against the limits of its caller.
+
+        :param request: The incoming request.
+        :type request: Request
+        :param body: The json body of the request, empty if it has none.
+        :type body: dict
+        :raises AppException.TooManyRequestsException: If the caller is over
+            one of its limits.
+        """
+        identities: dict = self.identities(request, body)
+        keys: List[str] = []
+        limits: List[Tuple[int, int]] = []
+        for key_type, limit in self.limits.items():
+            if identities.get(key_type):
+                keys.append(
+                    f"rate_limit:{self.scope}:{key_type.value}:{identities[key_type]}"
+                )
+                limits.append(limit)
+        if not keys:
+            return None
+        retry_after: float = self.store.hit(keys, limits, self.algorithm)
+        if retry_after > 0:
+            retry_after = math.ceil(retry_after)
+            raise AppException.TooManyRequestsException(
+                error_message=constants.EXC_TOO_MANY_REQUESTS.format(retry_after),
+                retry_after=retry_after,
+            )
+        return None
+
+    # noinspection PyMethodMayBeStatic
+    def identities(self, request: Request, body: dict) -> Dict[RateLimitKeyEnum, str]:
+        """
+        Collect the attributes identifying the caller of a request.
+
+        The username and user_id are read from the json body, falling back to
+        the claims of the bearer token for authenticated routes, decoded once
+        for the rate limiter and the authentication of the route. The phone is
+        only read from the body, by its last 9 digits so every format of a
+        number is counted together.
+
+        :param request: The incoming request.
+        :type request: Request
+        :param body: The json body of the request, empty if it has none.
+        :type body: dict
+        :return: The value of each attribute found in the request.
+        :rtype: Dict[RateLimitKeyEnum, str]
+        """
+        claims: dict = {}
+        authorization: str = request.headers.get("Authorization", "")
+        scheme, _, token = authorization.partition(" ")
+        if scheme == "Bearer" and token:
+            try:
+                claims = KeycloakJwtAuthentication().token_payload(request, token)
+            except AppExceptionCase:
+                claims = {}
+        username = body.get("username") or claims.get("username")
+        user_id = body.get("user_id") or claims.get("user_id")
+        phone = re.sub(r"\D", "", str(body.get("phone") or ""))[-9:]
+        return {
+            RateLimitKeyEnum.ip: client_ip(request),
+            RateLimitKeyEnum.username: str(username).lower() if username else None,
+            RateLimitKeyEnum.user_id: str(user_id).lower() if user_id else None,
+            RateLimitKeyEnum.phone: phone or None,
+        }
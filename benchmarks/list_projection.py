@@ -0,0 +1,118 @@
+"""
+Compare loading a page of users as ORM objects with column projections.
+
+Every round fetches one page of GET /api/v1/users from a seeded database,
+see app.factory.seed_db, and encodes it as the endpoint does:
+
+- orm: UserModel instances, validated by UserSchema
+- columns: rows of the UserSchema columns, validated by UserSchema
+- sparse: rows of the --fields columns, encoded without validation
+
+Reported per variant: the median time per page, the bytes Postgres sent
+for the rows of the page, and the size of the response body.
+
+usage: FASTAPI_CONFIG=development python -m benchmarks.list_projection
+    [--rounds N] [--page N] [--fields id,username,email]
+"""
+import argparse
+import statistics
+import time
+from typing import Callable, List, Optional
+
+import sqlalchemy as sa
+from fastapi.encoders import jsonable_encoder
+from fastapi_pagination import set_page
+
+from app.controllers import UserController
+from app.core.database import db
+from app.enums import SortResultEnum
+from app.models import UserModel
+from app.repositories import UserRepository
+from app.schema import UserSchema
+from app.utils import ORJSONResponse, Page, Params
+
+# reminder: the largest page the list endpoints serve
+PAGE_SIZE = 100
+
+
+def fetch(columns: Optional[List[str]], page: int) -> Page:
+    controller = UserController(UserRepository(), None, None, None)
+    return controller.get_all_users(
+        search="",
+        sort_in=SortResultEnum.asc,
+        order_by="username",
+        is_deleted=False,
+        paginate=Params(page=page, limit=PAGE_SIZE),
+        columns=columns,
+    )
+
+
+def encode(result: Page, sparse: bool) -> bytes:
+    if sparse:
+        content = {"data": [row._asdict() for row in result.data], "count": result.count}
+        return ORJSONResponse(content).body
+    page = Page[UserSchema](
+        data=[UserSchema.from_orm(item) for item in result.data], count=result.count
+    )
+    return ORJSONResponse(jsonable_encoder(page)).body
+
+
+def row_bytes(columns: List[str], page: int) -> int:
+    query = (
+        UserModel.search(keyword="", session=db)
+        .filter_by(is_deleted=False)
+        .order_by(UserModel.username)
+        .with_entities(*[getattr(UserModel, column) for column in columns])
+        .limit(PAGE_SIZE)
+        .offset((page - 1) * PAGE_SIZE)
+        .subquery()
+    )
+    return db.execute(
+        sa.select(
+            sa.func.sum(sa.func.pg_column_size(sa.literal_column("anon_1.*")))
+        ).select_from(query)
+    ).scalar()
+
+
+def measure(func: Callable, rounds: int) -> float:
+    timings: List[float] = []
+    for _ in range(rounds):
+        db.expunge_all()
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rounds", type=int, default=200)
+    parser.add_argument("--page", type=int, default=10)
+    parser.add_argument("--fields", default="id,username,email")
+    args = parser.parse_args()
+
+    schema_columns = list(UserSchema.__fields__)
+    fields = args.fields.split(",")
+    variants = {
+        "orm": (None, [column.name for column in UserModel.__table__.columns]),
+        "columns": (schema_columns, schema_columns),
+        "sparse": (fields, fields),
+    }
+    print(f"{'variant':>8} {'ms/page':>8} {'db bytes':>9} {'body bytes':>11}")
+    for name, (columns, selected) in variants.items():
+        sparse = name == "sparse"
+        with set_page(Page):
+            body = encode(fetch(columns, args.page), sparse)
+            assert body.count(b'"username"') == PAGE_SIZE, "seed at least 1000 users"
+            elapsed = measure(
+                lambda: encode(fetch(columns, args.page), sparse),  # noqa: B023
+                args.rounds,
+            )
+        print(
+            f"{name:>8} {elapsed:>8.2f} {row_bytes(selected, args.page):>9} "
+            f"{len(body):>11}"
+        )
+
+
+if __name__ == "__main__":
+    main()
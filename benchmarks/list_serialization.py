@@ -0,0 +1,104 @@
+"""
+Compare the time spent serializing a page of users with FastAPI's default
+JSONResponse and with the app's ORJSONResponse.
+
+Two measurements are taken for every page size:
+
+- render: encoding an already validated page, i.e. the response class alone
+- endpoint: a full request to a list route returning the page, including
+  response model validation and jsonable_encoder
+
+usage: FASTAPI_CONFIG=testing python -m benchmarks.list_serialization [--rounds N]
+"""
+import argparse
+import statistics
+import time
+import uuid
+from datetime import date, datetime, timezone
+from typing import Callable, List
+
+from fastapi import FastAPI
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from fastapi.testclient import TestClient
+
+from app.enums import StatusEnum
+from app.schema import UserSchema
+from app.utils import ORJSONResponse, Page
+
+PAGE_SIZES = (10, 50, 100)
+
+
+def build_page(size: int) -> Page[UserSchema]:
+    now = datetime.now(timezone.utc)
+    users = [
+        UserSchema(
+            id=uuid.uuid4(),
+            first_name=f"first_name_{index}",
+            last_name=f"last_name_{index}",
+            username=f"username_{index}",
+            email=f"user_{index}@example.com",
+            phone="0500000000",
+            birth_date=date(1990, 1, 1),
+            national_id=f"GHA-{index:09d}",
+            id_expiration=date(2030, 1, 1),
+            is_verified=True,
+            last_active=now,
+            auth_provider_id=str(uuid.uuid4()),
+            status=StatusEnum.active,
+            is_deleted=False,
+            meta_data={"source": "benchmark"},
+            created_at=now,
+            updated_at=now,
+            deleted_at=None,
+        )
+        for index in range(size)
+    ]
+    return Page[UserSchema](data=users, count=size)
+
+
+def build_client(page: Page[UserSchema], response_class) -> TestClient:
+    app = FastAPI(default_response_class=response_class)
+
+    @app.get("/users", response_model=Page[UserSchema])
+    def get_all_users():
+        return page
+
+    return TestClient(app)
+
+
+def measure(func: Callable, rounds: int) -> float:
+    timings: List[float] = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"{'page size':>9} {'measure':>9} {'json (ms)':>10} {'orjson (ms)':>12}")
+    for size in PAGE_SIZES:
+        page = build_page(size)
+        content = jsonable_encoder(page)
+        results = {}
+        for name, response_class in (("json", JSONResponse), ("orjson", ORJSONResponse)):
+            client = build_client(page, response_class)
+            results[name] = (
+                measure(lambda: response_class(content), args.rounds),  # noqa: B023
+                measure(lambda: client.get("/users"), args.rounds),  # noqa: B023
+            )
+            assert client.get("/users").json()["count"] == size
+        for index, label in enumerate(("render", "endpoint")):
+            print(
+                f"{size:>9} {label:>9} {results['json'][index]:>10.3f} "
+                f"{results['orjson'][index]:>12.3f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,17 @@
+"""
+End-to-end load test of the application against local stand-ins.
+
+The app is served by uvicorn against the Postgres database it is configured
+with, while its other dependencies are replaced by stand-ins that answer with
+a configurable injected latency:
+
+- keycloak: an http server issuing signed tokens, keeping admin users and
+  serving the JWKS, see benchmarks.loadtest.keycloak
+- kafka: a producer counting the messages it is sent, see
+  benchmarks.loadtest.standins
+- redis: an in-memory fakeredis client, see benchmarks.loadtest.standins
+
+Virtual users then drive the scenarios of benchmarks.loadtest.scenarios and
+the throughput and latency percentiles of every endpoint are written to a
+results file, see benchmarks.loadtest.__main__.
+"""
@@ -0,0 +1,182 @@
+"""
+Run the load test and write the throughput and latency of every endpoint.
+
+The keycloak stand-in and the app are started as subprocesses, the app
+against the database of the selected config. Once the app is ready, the
+virtual users run for the given duration. Rate limiting is disabled unless
+--rate-limit is given, as every virtual user shares one ip.
+
+The results are printed and written as JSON, with the commit they were
+measured on and the version of the results format, to
+benchmarks/loadtest/results/<timestamp>-<commit>.json unless --output is
+given, so runs on different commits can be compared.
+
+usage: FASTAPI_CONFIG=development python -m benchmarks.loadtest [--users N]
+    [--duration S] [--think-time MS] [--keycloak-latency MS]
+    [--redis-latency MS] [--kafka-latency MS] [--rate-limit]
+    [--keycloak-fixtures PATH] [--output PATH]
+"""
+import argparse
+import asyncio
+import json
+import os
+import secrets
+import signal
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List
+
+import httpx
+
+from benchmarks.loadtest.scenarios import Stats, VirtualUser
+
+ROOT = Path(__file__).parent.parent.parent
+RESULTS_DIR = Path(__file__).parent / "results"
+# reminder: bump when the layout of the results file changes
+RESULTS_FORMAT_VERSION = 1
+KEYCLOAK_PORT = 8180
+APP_PORT = 8181
+REALM = "loadtest"
+
+
+def git_commit() -> str:
+    result = subprocess.run(
+        ["git", "rev-parse", "--short", "HEAD"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+    )
+    return result.stdout.strip() or "unknown"
+
+
+def wait_until_ready(url: str, timeout: float = 60) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            httpx.get(url).raise_for_status()
+            return
+        except httpx.HTTPError:
+            time.sleep(0.5)
+    raise RuntimeError(f"app did not become ready on {url}")
+
+
+async def load(args: argparse.Namespace) -> Dict[str, Dict[str, float]]:
+    stats = Stats()
+    limits = httpx.Limits(max_connections=args.users)
+    async with httpx.AsyncClient(
+        base_url=f"http://127.0.0.1:{APP_PORT}", limits=limits, timeout=30
+    ) as client:
+        started = time.perf_counter()
+        deadline = started + args.duration
+        await asyncio.gather(
+            *(
+                VirtualUser(client, stats).run(deadline, args.think_time / 1000)
+                for _ in range(args.users)
+            )
+        )
+        duration = time.perf_counter() - started
+    return stats.summary(duration)
+
+
+def print_summary(endpoints: Dict[str, Dict[str, float]]) -> None:
+    columns: List[str] = ["requests/s", "p50 ms", "p95 ms", "p99 ms", "errors"]
+    width = max(len(endpoint) for endpoint in endpoints)
+    print(f"{'':<{width}}" + "".join(f"{column:>12}" for column in columns))
+    for endpoint, result in endpoints.items():
+        print(
+            f"{endpoint:<{width}}"
+            + "".join(f"{result[column]:>12.1f}" for column in columns)
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--duration", type=float, default=30)
+    parser.add_argument("--think-time", type=float, default=0.0, help="ms")
+    parser.add_argument("--keycloak-latency", type=float, default=5.0, help="ms")
+    parser.add_argument("--redis-latency", type=float, default=0.5, help="ms")
+    parser.add_argument("--kafka-latency", type=float, default=2.0, help="ms")
+    parser.add_argument("--rate-limit", action="store_true")
+    parser.add_argument(
+        "--keycloak-fixtures", help="users written by app.factory.seed_db"
+    )
+    parser.add_argument("--output", type=Path)
+    args = parser.parse_args()
+
+    secret = secrets.token_hex(32)
+    env = {
+        **os.environ,
+        "KEYCLOAK_URI": f"http://127.0.0.1:{KEYCLOAK_PORT}",
+        "KEYCLOAK_REALM": REALM,
+        "KEYCLOAK_CLIENT_ID": REALM,
+        "KEYCLOAK_CLIENT_SECRET": REALM,
+        "KEYCLOAK_ADMIN_USERNAME": "admin",
+        "KEYCLOAK_ADMIN_PASSWORD": "admin",
+        "JWT_PUBLIC_KEY": secret,
+        "RATE_LIMIT_ENABLED": str(args.rate_limit).lower(),
+    }
+    processes = [
+        subprocess.Popen(
+            [
+                sys.executable,
+                "-m",
+                "benchmarks.loadtest.keycloak",
+                f"--port={KEYCLOAK_PORT}",
+                f"--realm={REALM}",
+                f"--secret={secret}",
+                f"--latency={args.keycloak_latency}",
+                *(
+                    [f"--fixtures={args.keycloak_fixtures}"]
+                    if args.keycloak_fixtures
+                    else []
+                ),
+            ],
+            cwd=ROOT,
+        ),
+        subprocess.Popen(
+            [
+                sys.executable,
+                "-m",
+                "benchmarks.loadtest.serve",
+                f"--port={APP_PORT}",
+                f"--redis-latency={args.redis_latency}",
+                f"--kafka-latency={args.kafka_latency}",
+            ],
+            cwd=ROOT,
+            env=env,
+        ),
+    ]
+    try:
+        wait_until_ready(f"http://127.0.0.1:{APP_PORT}/health/ready")
+        started_at = datetime.now(timezone.utc)
+        endpoints = asyncio.run(load(args))
+    finally:
+        for process in reversed(processes):
+            process.send_signal(signal.SIGINT)
+            process.wait(timeout=30)
+
+    print_summary(endpoints)
+    commit = git_commit()
+    results = {
+        "format_version": RESULTS_FORMAT_VERSION,
+        "commit": commit,
+        "started_at": started_at.isoformat(),
+        "options": {
+            name: value for name, value in vars(args).items() if name != "output"
+        },
+        "endpoints": endpoints,
+    }
+    output: Path = args.output or (
+        RESULTS_DIR / f"{started_at:%Y%m%dT%H%M%S}-{commit}.json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2) + "\n")
+    print(f"results written to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,251 @@
+"""
+A Keycloak stand-in serving the endpoints KeycloakAuthService calls.
+
+Users created through the admin API, or loaded from the fixtures written by
+app.factory.seed_db, are kept in memory. The token endpoint issues HS256
+tokens signed with the secret the app is started with as JWT_PUBLIC_KEY,
+carrying the username and user_id claims the app reads.
+
+usage: python -m benchmarks.loadtest.keycloak --port PORT --realm REALM
+    --secret SECRET [--latency MS] [--fixtures PATH]
+"""
+import argparse
+import json
+import re
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+import jwt
+
+# reminder: lifetimes of the issued tokens, in seconds
+ACCESS_TOKEN_LIFETIME = 300
+REFRESH_TOKEN_LIFETIME = 1800
+
+
+class KeycloakStandIn(ThreadingHTTPServer):
+    """
+    Http server standing in for a Keycloak realm.
+
+    :param address: The host and port to listen on.
+    :type address: tuple[str, int]
+    :param realm: The realm the app is configured with.
+    :type realm: str
+    :param secret: The secret tokens are signed with.
+    :type secret: str
+    :param latency: The seconds every response is delayed by.
+    :type latency: float
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self, address: Tuple[str, int], realm: str, secret: str, latency: float = 0.0
+    ):
+        super().__init__(address, KeycloakRequestHandler)
+        self.realm = realm
+        self.secret = secret
+        self.latency = latency
+        self.users: Dict[str, dict] = {}
+        self.user_ids: Dict[str, str] = {}
+        self.lock = threading.Lock()
+
+    @property
+    def issuer(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/realms/{self.realm}"
+
+    def find_user(self, username: str) -> Optional[dict]:
+        with self.lock:
+            return self.users.get(self.user_ids.get(username, ""))
+
+    def save_user(self, user: dict) -> None:
+        with self.lock:
+            previous: Optional[dict] = self.users.get(user["id"])
+            if previous is not None:
+                self.user_ids.pop(previous["username"], None)
+            self.users[user["id"]] = user
+            self.user_ids[user["username"]] = user["id"]
+
+    def delete_user(self, user_id: str) -> None:
+        with self.lock:
+            user: Optional[dict] = self.users.pop(user_id, None)
+            if user is not None:
+                self.user_ids.pop(user["username"], None)
+
+    def load_fixtures(self, path: str) -> int:
+        """
+        Load users written by app.factory.seed_db as JSON lines.
+
+        :param path: The fixtures file.
+        :type path: str
+        :return: The number of users loaded.
+        :rtype: int
+        """
+        count = 0
+        with open(path) as fixtures:
+            for line in fixtures:
+                self.save_user(json.loads(line))
+                count += 1
+        return count
+
+    def issue_tokens(self, username: str) -> dict:
+        user: dict = self.find_user(username) or {"id": username}
+        now = int(time.time())
+        claims = {
+            "iss": self.issuer,
+            "aud": "account",
+            "sub": user["id"],
+            "iat": now,
+            "username": username,
+            "preferred_username": username,
+            "user_id": user["id"],
+            "realm_access": {"roles": user.get("roles", [])},
+        }
+        return {
+            "access_token": jwt.encode(
+                {**claims, "exp": now + ACCESS_TOKEN_LIFETIME, "typ": "Bearer"},
+                self.secret,
+                algorithm="HS256",
+            ),
+            "refresh_token": jwt.encode(
+                {**claims, "exp": now + REFRESH_TOKEN_LIFETIME, "typ": "Refresh"},
+                self.secret,
+                algorithm="HS256",
+            ),
+            "expires_in": ACCESS_TOKEN_LIFETIME,
+            "refresh_expires_in": REFRESH_TOKEN_LIFETIME,
+            "token_type": "Bearer",
+        }
+
+
+class KeycloakRequestHandler(BaseHTTPRequestHandler):
+    server: KeycloakStandIn
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self.handle_request("GET")
+
+    def do_POST(self):
+        self.handle_request("POST")
+
+    def do_PUT(self):
+        self.handle_request("PUT")
+
+    def do_DELETE(self):
+        self.handle_request("DELETE")
+
+    def handle_request(self, method: str) -> None:
+        time.sleep(self.server.latency)
+        url = urlsplit(self.path)
+        length = int(self.headers.get("Content-Length") or 0)
+        body: bytes = self.rfile.read(length) if length else b""
+        realm_url = f"/realms/{self.server.realm}"
+        admin_url = f"/admin/realms/{self.server.realm}"
+        path: str = url.path.rstrip("/")
+
+        if method == "POST" and path == f"{realm_url}/protocol/openid-connect/token":
+            self.token(parse_qs(body.decode()))
+        elif method == "GET" and path == f"{realm_url}/.well-known/openid-configuration":
+            self.send_json(
+                200,
+                {
+                    "issuer": self.server.issuer,
+                    "token_endpoint": f"{self.server.issuer}"
+                    "/protocol/openid-connect/token",
+                    "jwks_uri": f"{self.server.issuer}/protocol/openid-connect/certs",
+                },
+            )
+        elif method == "GET" and path == f"{realm_url}/protocol/openid-connect/certs":
+            self.send_json(200, {"keys": [{"kid": "loadtest", "kty": "oct"}]})
+        elif path.startswith(admin_url):
+            self.admin(method, path[len(admin_url) :], url.query, body)
+        else:
+            self.send_json(404, {"error": "not found"})
+
+    def token(self, form: Dict[str, list]) -> None:
+        grant_type: str = form.get("grant_type", [""])[0]
+        if grant_type == "password":
+            self.send_json(200, self.server.issue_tokens(form["username"][0]))
+            return
+        if grant_type == "refresh_token":
+            try:
+                claims: dict = jwt.decode(
+                    form["refresh_token"][0],
+                    self.server.secret,
+                    algorithms=["HS256"],
+                    audience="account",
+                )
+            except (KeyError, jwt.PyJWTError):
+                self.send_json(400, {"error": "invalid_grant"})
+                return
+            self.send_json(200, self.server.issue_tokens(claims["username"]))
+            return
+        self.send_json(400, {"error": "unsupported_grant_type"})
+
+    def admin(self, method: str, path: str, query: str, body: bytes) -> None:
+        users = self.server.users
+        if path == "/groups":
+            self.send_json(200, [])
+        elif path == "/users" and method == "POST":
+            user: dict = json.loads(body)
+            user["id"] = str(uuid.uuid4())
+            user.pop("credentials", None)
+            self.server.save_user(user)
+            self.send_json(201, None)
+        elif path == "/users" and method == "GET":
+            username: str = parse_qs(query).get("username", [""])[0]
+            user = self.server.find_user(username)
+            self.send_json(200, [user] if user else [])
+        elif re.fullmatch(r"/users/[^/]+(/reset-password|/groups/[^/]+)?", path):
+            user_id: str = path.split("/")[2]
+            if user_id not in users:
+                self.send_json(404, {"error": "user not found"})
+            elif method == "PUT" and path.count("/") == 2:
+                self.server.save_user({**users[user_id], **json.loads(body)})
+                self.send_json(204, None)
+            elif method == "DELETE":
+                self.server.delete_user(user_id)
+                self.send_json(204, None)
+            else:
+                self.send_json(204, None)
+        else:
+            self.send_json(404, {"error": "not found"})
+
+    def send_json(self, status: int, data) -> None:
+        content: bytes = json.dumps(data).encode() if data is not None else b""
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, required=True)
+    parser.add_argument("--realm", required=True)
+    parser.add_argument("--secret", required=True)
+    parser.add_argument("--latency", type=float, default=0.0, help="milliseconds")
+    parser.add_argument("--fixtures", help="users written by app.factory.seed_db")
+    args = parser.parse_args()
+    server = KeycloakStandIn(
+        (args.host, args.port), args.realm, args.secret, args.latency / 1000
+    )
+    if args.fixtures:
+        server.load_fixtures(args.fixtures)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,224 @@
+"""
+The scenarios virtual users drive, and the latency statistics they record.
+
+Every virtual user signs up and logs in, then runs scenarios picked at
+random with the weights of SCENARIOS until the load test ends. OTP codes
+are confirmed with the master code, as the codes themselves only reach the
+kafka stand-in.
+"""
+import asyncio
+import random
+import time
+import uuid
+from typing import Awaitable, Callable, Dict, List, Optional
+
+import httpx
+
+from app import constants
+
+USERS_URL = "/api/v1/users"
+PASSWORD = "1234"
+# reminder: prefixes of the first names of signed up users, searched for
+# when listing users
+FIRST_NAMES = ("Ama", "Kofi", "Akosua", "Kwame", "Efua", "Yaw")
+
+
+class Stats:
+    """
+    The latency of every request sent during the load test, per endpoint.
+    """
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = {}
+        self.errors: Dict[str, int] = {}
+
+    def record(self, endpoint: str, latency: float, ok: bool) -> None:
+        self.latencies.setdefault(endpoint, [])
+        self.errors.setdefault(endpoint, 0)
+        if ok:
+            self.latencies[endpoint].append(latency)
+        else:
+            self.errors[endpoint] += 1
+
+    def summary(self, duration: float) -> Dict[str, Dict[str, float]]:
+        """
+        Return the throughput and latency percentiles of every endpoint.
+
+        :param duration: The seconds the load test ran for.
+        :type duration: float
+        :return: The requests/s, p50, p95 and p99 in ms and errors per endpoint.
+        :rtype: dict[str, dict[str, float]]
+        """
+        return {
+            endpoint: {
+                "requests": len(latencies),
+                "requests/s": len(latencies) / duration,
+                "p50 ms": percentile(latencies, 50) * 1000,
+                "p95 ms": percentile(latencies, 95) * 1000,
+                "p99 ms": percentile(latencies, 99) * 1000,
+                "errors": self.errors[endpoint],
+            }
+            for endpoint, latencies in sorted(self.latencies.items())
+        }
+
+
+def percentile(values: List[float], percent: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * percent / 100))]
+
+
+class VirtualUser:
+    """
+    A user of the app, signing up once and then running random scenarios.
+
+    :param client: The client sending the requests, shared by virtual users.
+    :type client: httpx.AsyncClient
+    :param stats: The statistics the requests are recorded in.
+    :type stats: Stats
+    """
+
+    def __init__(self, client: httpx.AsyncClient, stats: Stats):
+        self.client = client
+        self.stats = stats
+        self.username: str = ""
+        self.user_id: Optional[str] = None
+        self.access_token: Optional[str] = None
+        self.refresh_token: Optional[str] = None
+
+    @property
+    def headers(self) -> Dict[str, str]:
+        return {"Authorization": f"Bearer {self.access_token}"}
+
+    async def request(
+        self, method: str, endpoint: str, url: str, **kwargs
+    ) -> Optional[httpx.Response]:
+        started = time.perf_counter()
+        try:
+            response = await self.client.request(method, url, **kwargs)
+        except httpx.HTTPError:
+            self.stats.record(
+                f"{method} {endpoint}", time.perf_counter() - started, False
+            )
+            return None
+        ok = response.status_code < 400
+        self.stats.record(f"{method} {endpoint}", time.perf_counter() - started, ok)
+        return response if ok else None
+
+    async def run(self, deadline: float, think_time: float) -> None:
+        await self.signup()
+        await self.login()
+        scenarios: List[Callable[["VirtualUser"], Awaitable[None]]] = list(SCENARIOS)
+        weights: List[int] = list(SCENARIOS.values())
+        while time.perf_counter() < deadline:
+            scenario = random.choices(scenarios, weights)[0]
+            await scenario(self)
+            if think_time:
+                await asyncio.sleep(think_time)
+
+    async def signup(self) -> None:
+        self.username = f"loadtest_{uuid.uuid4().hex[:12]}"
+        response = await self.request(
+            "POST",
+            USERS_URL,
+            USERS_URL,
+            json={
+                "first_name": f"{random.choice(FIRST_NAMES)}{random.randint(0, 999)}",
+                "last_name": "Mensah",
+                "username": self.username,
+                "email": f"{self.username}@example.com",
+                "phone": f"024{random.randint(0, 9999999):07d}",
+                "password": PASSWORD,
+                "birth_date": "1990-01-01",
+                "national_id": uuid.uuid4().hex[:10],
+                "id_expiration": "2030-01-01",
+            },
+        )
+        if response is not None:
+            self.user_id = response.json()["id"]
+
+    async def login(self) -> None:
+        response = await self.request(
+            "POST",
+            f"{USERS_URL}/token/access",
+            f"{USERS_URL}/token/access",
+            json={"username": self.username, "password": PASSWORD},
+        )
+        if response is not None:
+            self.access_token = response.json()["access_token"]
+            self.refresh_token = response.json()["refresh_token"]
+
+    async def refresh(self) -> None:
+        if self.refresh_token is None:
+            return
+        response = await self.request(
+            "POST",
+            f"{USERS_URL}/token/refresh",
+            f"{USERS_URL}/token/refresh",
+            json={"user_id": self.user_id, "refresh_token": self.refresh_token},
+        )
+        if response is not None:
+            self.access_token = response.json()["access_token"]
+            self.refresh_token = response.json()["refresh_token"]
+
+    async def profile(self) -> None:
+        await self.request(
+            "GET",
+            f"{USERS_URL}/account/profile",
+            f"{USERS_URL}/account/profile",
+            headers=self.headers,
+        )
+
+    async def get_user(self) -> None:
+        await self.request(
+            "GET",
+            f"{USERS_URL}/{{user_id}}",
+            f"{USERS_URL}/{self.user_id}",
+            headers=self.headers,
+        )
+
+    async def list_users(self) -> None:
+        await self.request(
+            "GET",
+            USERS_URL,
+            USERS_URL,
+            params={"search": random.choice(FIRST_NAMES), "page": 1, "size": 20},
+            headers=self.headers,
+        )
+
+    async def otp(self) -> None:
+        response = await self.request(
+            "POST",
+            f"{USERS_URL}/otp/send",
+            f"{USERS_URL}/otp/send",
+            params={"sms": True},
+            json={"user_id": self.user_id},
+        )
+        if response is not None:
+            await self.request(
+                "POST",
+                f"{USERS_URL}/otp/confirm",
+                f"{USERS_URL}/otp/confirm",
+                json={
+                    "user_id": self.user_id,
+                    "otp_code": constants.MASTER_OTP_CODE[0],
+                },
+            )
+
+    async def new_account(self) -> None:
+        await self.signup()
+        await self.login()
+
+
+# reminder: scenarios and their relative weights, reads dominate as they do
+# in production
+SCENARIOS: Dict[Callable[[VirtualUser], Awaitable[None]], int] = {
+    VirtualUser.profile: 35,
+    VirtualUser.list_users: 20,
+    VirtualUser.refresh: 15,
+    VirtualUser.login: 10,
+    VirtualUser.otp: 10,
+    VirtualUser.get_user: 5,
+    VirtualUser.new_account: 5,
+}
@@ -0,0 +1,49 @@
+"""
+Serve the app with uvicorn, its redis and kafka replaced by the stand-ins.
+
+The tables are created on startup if they do not exist yet. Run by
+benchmarks.loadtest, which points the app at the keycloak stand-in through
+the environment.
+
+usage: python -m benchmarks.loadtest.serve --port PORT [--redis-latency MS]
+    [--kafka-latency MS]
+"""
+import argparse
+
+import uvicorn
+from loguru import logger
+
+from benchmarks.loadtest import standins
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, required=True)
+    parser.add_argument("--redis-latency", type=float, default=0.0, help="ms")
+    parser.add_argument("--kafka-latency", type=float, default=0.0, help="ms")
+    args = parser.parse_args()
+
+    standins.install(args.redis_latency / 1000, args.kafka_latency / 1000)
+
+    from app import create_app
+    from app.core.database import Base, engine
+
+    Base.metadata.create_all(bind=engine)
+    try:
+        uvicorn.run(
+            create_app(),
+            host=args.host,
+            port=args.port,
+            loop="uvloop",
+            http="httptools",
+            access_log=False,
+        )
+    finally:
+        logger.info(
+            f"kafka stand-in received {dict(standins.StandInKafkaProducer.messages)}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+In-process stand-ins for redis and kafka, installed by benchmarks.loadtest.serve.
+
+Both delay every round trip by a configurable latency, so the load test
+shows how the app behaves when its dependencies are slow rather than only
+how fast its own code is.
+"""
+import time
+from collections import Counter
+from typing import Any, Callable, Optional
+
+import fakeredis
+from kafka.future import Future
+
+from app.services.redis_service import TimedPipeline, TimedRedis
+
+
+class StandInPipeline(TimedPipeline):
+    latency: float = 0.0
+
+    def execute(self, raise_on_error=True):
+        time.sleep(self.latency)
+        return super().execute(raise_on_error=raise_on_error)
+
+
+class StandInRedis(fakeredis.FakeStrictRedis, TimedRedis):
+    """
+    In-memory redis client, with the command metrics of the app's client.
+
+    Every command, and every pipeline as a whole, is delayed by `latency`
+    seconds, the round trip to a redis server.
+    """
+
+    latency: float = 0.0
+
+    def execute_command(self, *args, **options):
+        time.sleep(self.latency)
+        return super().execute_command(*args, **options)
+
+    def pipeline(self, transaction=True, shard_hint=None):
+        pipeline = StandInPipeline(
+            self.connection_pool, self.response_callbacks, transaction, shard_hint
+        )
+        pipeline.latency = self.latency
+        return pipeline
+
+
+class StandInKafkaProducer:
+    """
+    Kafka producer counting the messages sent per topic instead of sending them.
+
+    Values and keys are still serialized, and creating a producer and
+    flushing one are delayed by `latency` seconds, the round trip to a
+    broker.
+    """
+
+    latency: float = 0.0
+    messages: Counter = Counter()
+
+    def __init__(
+        self,
+        value_serializer: Optional[Callable[[Any], bytes]] = None,
+        key_serializer: Optional[Callable[[Any], bytes]] = None,
+        **configs,
+    ):
+        self.value_serializer = value_serializer
+        self.key_serializer = key_serializer
+        time.sleep(self.latency)
+
+    def send(self, topic: str, value=None, key=None, headers=None, **kwargs) -> Future:
+        if self.value_serializer is not None:
+            self.value_serializer(value)
+        if self.key_serializer is not None and key is not None:
+            self.key_serializer(key)
+        self.messages[topic] += 1
+        return Future().success(None)
+
+    def flush(self, timeout=None) -> None:
+        time.sleep(self.latency)
+
+    # noinspection PyMethodMayBeStatic
+    def bootstrap_connected(self) -> bool:
+        return True
+
+
+def install(redis_latency: float, kafka_latency: float) -> None:
+    """
+    Replace the redis client and the kafka producer of the app by the stand-ins.
+
+    :param redis_latency: The seconds every redis round trip is delayed by.
+    :type redis_latency: float
+    :param kafka_latency: The seconds every kafka round trip is delayed by.
+    :type kafka_latency: float
+    """
+    import kafka
+
+    from app.services import redis_service
+
+    StandInRedis.latency = redis_latency
+    StandInKafkaProducer.latency = kafka_latency
+    redis_service.redis_conn = StandInRedis()
+    # the app imports the producer class from kafka when it first sends
+    kafka.KafkaProducer = StandInKafkaProducer
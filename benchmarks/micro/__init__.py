@@ -0,0 +1,4 @@
+"""
+Micro-benchmarks of the functions every request goes through, see
+benchmarks.micro.__main__ for saving and comparing baselines.
+"""
@@ -0,0 +1,57 @@
+"""
+Save micro-benchmark baselines, or compare a run against the latest one.
+
+Baselines are pytest-benchmark results stored per machine under
+benchmarks/micro/baselines, so a run is only compared with one taken on the
+same machine and interpreter. The comparison fails when the median of any
+benchmark is more than --threshold percent slower than its baseline.
+
+usage: python -m benchmarks.micro save
+       python -m benchmarks.micro compare [--threshold PERCENT] [--against ID]
+"""
+import argparse
+import sys
+from pathlib import Path
+
+import pytest
+
+SUITE_DIR = Path(__file__).parent
+BASELINES_DIR = SUITE_DIR / "baselines"
+# reminder: percent a median may regress by before the comparison fails, wide
+# enough to absorb the noise of a shared machine
+DEFAULT_THRESHOLD = 15
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("save", help="run the suite and store it as a baseline")
+    compare = subparsers.add_parser("compare", help="run the suite against a baseline")
+    compare.add_argument(
+        "--threshold", type=int, default=DEFAULT_THRESHOLD, help="percent, below 100"
+    )
+    compare.add_argument(
+        "--against", default="", help="baseline number or name, the latest if unset"
+    )
+    args = parser.parse_args()
+
+    options = [
+        str(SUITE_DIR),
+        "-p",
+        "no:cacheprovider",
+        f"--benchmark-storage=file://{BASELINES_DIR}",
+        "--benchmark-columns=min,median,mean,stddev,rounds",
+        "--benchmark-sort=name",
+    ]
+    if args.command == "save":
+        options.append("--benchmark-autosave")
+    else:
+        options += [
+            f"--benchmark-compare={args.against}".rstrip("="),
+            f"--benchmark-compare-fail=median:{args.threshold}%",
+        ]
+    sys.exit(pytest.main(options))
+
+
+if __name__ == "__main__":
+    main()
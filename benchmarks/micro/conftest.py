@@ -0,0 +1,98 @@
+import uuid
+from datetime import date, datetime, timezone
+from typing import List
+
+import fakeredis
+import jwt
+import pytest
+
+from app.models import UserModel
+from config import settings
+
+# reminder: number of rows in a benchmarked page, the default page size
+PAGE_SIZE = 50
+JWT_SECRET = "benchmark-secret"
+
+
+@pytest.fixture
+def users() -> List[UserModel]:
+    now = datetime.now(timezone.utc)
+    return [
+        UserModel(
+            id=uuid.uuid4(),
+            first_name=f"first_name_{index}",
+            last_name=f"last_name_{index}",
+            username=f"username_{index}",
+            email=f"user_{index}@example.com",
+            phone="0500000000",
+            birth_date=date(1990, 1, 1),
+            national_id=f"GHA-{index:09d}",
+            id_expiration=date(2030, 1, 1),
+            is_verified=True,
+            last_active=now,
+            auth_provider_id=str(uuid.uuid4()),
+            status="active",
+            is_deleted=False,
+            meta_data={"source": "benchmark"},
+            created_at=now,
+            updated_at=now,
+        )
+        for index in range(PAGE_SIZE)
+    ]
+
+
+@pytest.fixture
+def roles() -> List[dict]:
+    now = datetime.now(timezone.utc)
+    user_id = str(uuid.uuid4())
+    permission = {
+        "id": uuid.uuid4(),
+        "resource_id": uuid.uuid4(),
+        "mode": "read",
+        "description": "read users",
+        "created_by": user_id,
+        "updated_by": user_id,
+        "deleted_by": None,
+        "created_at": now,
+        "updated_at": now,
+        "deleted_at": None,
+    }
+    return [
+        {
+            "id": uuid.uuid4(),
+            "name": f"role_{index}",
+            "description": "benchmark role",
+            "is_active": True,
+            "role_permission": [
+                {**permission, "id": uuid.uuid4(), "permission": permission}
+                for _ in range(5)
+            ],
+            "created_by": user_id,
+            "updated_by": user_id,
+            "deleted_by": None,
+            "created_at": now,
+            "updated_at": now,
+            "deleted_at": None,
+        }
+        for index in range(PAGE_SIZE)
+    ]
+
+
+@pytest.fixture
+def access_token(mocker) -> str:
+    mocker.patch.object(settings, "jwt_public_key", JWT_SECRET)
+    payload = {
+        "iss": f"{settings.keycloak_uri}/realms/{settings.keycloak_realm}",
+        "aud": "account",
+        "exp": int(datetime.now(timezone.utc).timestamp()) + 3600,
+        "username": "username_0",
+        "user_id": str(uuid.uuid4()),
+    }
+    return jwt.encode(payload, JWT_SECRET, algorithm="HS256")
+
+
+@pytest.fixture
+def redis_conn(mocker):
+    redis_conn = fakeredis.FakeStrictRedis()
+    mocker.patch("app.services.redis_service.redis_conn", redis_conn)
+    return redis_conn
@@ -0,0 +1,9 @@
+from app.services import ActivityTrackerService
+
+
+def test_record(benchmark):
+    activity_tracker_service = ActivityTrackerService(
+        flush=lambda activity: None, flush_interval=30, flush_size=1000
+    )
+    benchmark(activity_tracker_service.record, username="username_0")
+    assert list(activity_tracker_service._pending) == ["username_0"]
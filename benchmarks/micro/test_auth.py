@@ -0,0 +1,22 @@
+from app.services import KeycloakAuthService
+from app.utils import KeycloakJwtAuthentication
+
+
+def test_decode_token(benchmark, access_token):
+    authentication = KeycloakJwtAuthentication()
+    payload = benchmark(authentication.decode_token, token=access_token)
+    assert payload["username"] == "username_0"
+
+
+def test_auth_service_field(benchmark):
+    obj_data = {
+        "first_name": "first_name",
+        "last_name": "last_name",
+        "phone_number": "0500000000",
+        "id_expiration_date": "2030-01-01",
+        "is_verified": True,
+    }
+    result = benchmark(
+        KeycloakAuthService().auth_service_field, obj_id="username", obj_data=obj_data
+    )
+    assert result["idExpirationDate"] == "2030-01-01"
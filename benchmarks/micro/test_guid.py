@@ -0,0 +1,26 @@
+import uuid
+
+import pytest
+from sqlalchemy.dialects import postgresql, sqlite
+
+from app.utils import GUID, uuid7
+
+IDS = [uuid.uuid4() for _ in range(1000)]
+
+
+@pytest.mark.parametrize("dialect", [postgresql.dialect(), sqlite.dialect()])
+def test_guid_round_trip(benchmark, dialect):
+    guid = GUID()
+
+    def round_trip() -> list:
+        return [
+            guid.process_result_value(guid.process_bind_param(id, dialect), dialect)
+            for id in IDS
+        ]
+
+    assert benchmark(round_trip) == IDS
+
+
+@pytest.mark.parametrize("generate", [uuid.uuid4, uuid7], ids=["uuid4", "uuid7"])
+def test_generate(benchmark, generate):
+    benchmark(generate)
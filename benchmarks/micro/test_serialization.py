@@ -0,0 +1,35 @@
+import json
+
+from app.models import UserModel
+from app.repositories.cache_object import objs_deserializer, objs_serializer
+from app.schema import RoleSchema, UserSchema
+from app.services import RedisService
+from app.utils import ORJSONResponse, Page
+
+
+def test_objs_serializer(benchmark, users, redis_conn):
+    benchmark(objs_serializer, users, "users", RedisService())
+    assert len(json.loads(redis_conn.get("users"))) == len(users)
+
+
+def test_objs_deserializer(benchmark, users, redis_conn):
+    objs_serializer(users, "users", RedisService())
+    cached = json.loads(redis_conn.get("users"))
+    result = benchmark(objs_deserializer, cached, UserModel)
+    assert result[0].username == users[0].username
+
+
+def test_user_page(benchmark, users):
+    def render() -> bytes:
+        page = Page[UserSchema](data=users, count=len(users))
+        return ORJSONResponse(content=page.dict()).body
+
+    assert benchmark(render).startswith(b'{"data":')
+
+
+def test_role_page(benchmark, roles):
+    def render() -> bytes:
+        page = Page[RoleSchema](data=roles, count=len(roles))
+        return ORJSONResponse(content=page.dict()).body
+
+    assert benchmark(render).startswith(b'{"data":')
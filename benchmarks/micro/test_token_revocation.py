@@ -0,0 +1,13 @@
+from app.services import TokenRevocationService
+
+
+def test_is_revoked(benchmark, redis_conn, access_token):
+    token_revocation_service = TokenRevocationService(100000, 0.001, 300)
+    token_revocation_service.rebuild()
+    token_revocation_service.synced = True
+    revoked = benchmark(
+        token_revocation_service.is_revoked,
+        token=access_token,
+        payload={"username": "username_0", "iat": 0},
+    )
+    assert not revoked
@@ -0,0 +1,35 @@
+from fastapi_pagination.ext.sqlalchemy import paginate_query
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session
+
+from app.enums import SortResultEnum
+from app.models import UserModel
+from app.utils import Params
+
+
+def test_hash_password(benchmark):
+    user = UserModel()
+    benchmark(setattr, user, "hash_password", "1234")
+    assert user.password.startswith("$2b$")
+
+
+def test_verify_password(benchmark):
+    user = UserModel(hash_password="1234")
+    assert benchmark(user.verify_password, "1234")
+
+
+def test_list_query(benchmark):
+    # the session only builds the query, it never connects
+    session = Session()
+
+    def build_query() -> str:
+        query = UserModel.search(keyword="first_name", session=session)
+        query = UserModel.filter(query_result=query, filter_param={"is_deleted": False})
+        query = UserModel.sort(
+            query_result=query, sort_in=SortResultEnum.desc, order_by="created_at"
+        )
+        statement = paginate_query(query.statement, Params(page=2, limit=50))
+        return str(statement.compile(dialect=postgresql.dialect()))
+
+    statement = benchmark(build_query)
+    assert "ORDER BY users.created_at DESC" in statement
@@ -0,0 +1,183 @@
+"""
+Compare the per-call latency of user lookups over http and over the rpc api.
+
+The application is started with gunicorn and the rpc server with
+app/rpc_server.py, each with a single worker, then users of a seeded
+database, see app.factory.seed_db, are looked up one call after the other
+over a kept-alive connection:
+
+- http get: GET /api/v1/users/{user_id}
+- rpc get: GetUser
+- rpc stream: StreamGetUsers, one request and response per lookup
+- http batch: POST /api/v1/users/batch with --batch ids
+- rpc batch: BatchGetUsers with --batch ids
+
+The http calls carry a token signed with a throwaway HS256 key, which the
+application under test is configured to accept.
+
+usage: FASTAPI_CONFIG=development python -m benchmarks.rpc_lookup
+    [--rounds N] [--batch N]
+"""
+import argparse
+import os
+import signal
+import statistics
+import subprocess
+import sys
+import time
+from typing import Callable, Dict, Iterator, List
+
+import grpc
+import httpx
+import jwt
+
+from app.core.database import db
+from app.models import UserModel
+from app.rpc.user_service_pb2 import BatchGetUsersRequest, GetUserRequest
+from app.rpc.user_service_pb2_grpc import UserServiceStub
+from benchmarks.server import ROOT, wait_until_serving
+from config import settings
+
+HTTP_PORT = 8111
+RPC_PORT = 50111
+JWT_KEY = "benchmark-key"
+
+
+def token() -> str:
+    return jwt.encode(
+        {
+            "aud": "account",
+            "iss": f"{settings.keycloak_uri}/realms/{settings.keycloak_realm}",
+            "exp": int(time.time()) + 3600,
+        },
+        JWT_KEY,
+        algorithm="HS256",
+    )
+
+
+def measure(func: Callable, rounds: int) -> List[float]:
+    timings: List[float] = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def stream_lookups(stub: UserServiceStub, user_ids: List[str], rounds: int):
+    """
+    Time the lookups sent over one stream, each request waits for the
+    response to the previous one.
+    """
+    timings: List[float] = []
+    pending: List[float] = []
+
+    def requests() -> Iterator[GetUserRequest]:
+        for index in range(rounds):
+            pending.append(time.perf_counter())
+            yield GetUserRequest(id=user_ids[index % len(user_ids)])
+            while pending:
+                time.sleep(0)
+
+    for response in stub.StreamGetUsers(requests()):
+        assert response.found
+        timings.append(time.perf_counter() - pending.pop())
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rounds", type=int, default=2000)
+    parser.add_argument("--batch", type=int, default=100)
+    args = parser.parse_args()
+    if os.getenv("FASTAPI_CONFIG", "testing") == "testing":
+        sys.exit("app.asgi does not run with the testing config, set FASTAPI_CONFIG")
+
+    user_ids = [
+        str(user_id)
+        for user_id, in db.query(UserModel.id).limit(max(args.batch, 1000)).all()
+    ]
+    assert len(user_ids) >= args.batch, "seed at least --batch users"
+    env = {
+        **os.environ,
+        "JWT_PUBLIC_KEY": JWT_KEY,
+        "GRPC_PORT": str(RPC_PORT),
+        "GRPC_MAX_WORKERS": "1",
+        "GUNICORN_ACCESSLOG": "",
+        "WARM_UP_ENABLED": "false",
+    }
+    servers = [
+        subprocess.Popen(
+            command,
+            cwd=ROOT,
+            env=env,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        for command in (
+            [
+                "gunicorn",
+                "--worker-class",
+                "uvicorn.workers.UvicornWorker",
+                "--workers",
+                "1",
+                "--bind",
+                f"127.0.0.1:{HTTP_PORT}",
+                "app.asgi:app",
+            ],
+            [sys.executable, "app/rpc_server.py"],
+        )
+    ]
+    try:
+        wait_until_serving(f"http://127.0.0.1:{HTTP_PORT}/health/live")
+        channel = grpc.insecure_channel(f"127.0.0.1:{RPC_PORT}")
+        grpc.channel_ready_future(channel).result(timeout=30)
+        stub = UserServiceStub(channel)
+        client = httpx.Client(
+            base_url=f"http://127.0.0.1:{HTTP_PORT}/api/v1/users",
+            headers={"Authorization": f"Bearer {token()}"},
+        )
+        lookups = iter(range(sys.maxsize))
+
+        def next_id() -> str:
+            return user_ids[next(lookups) % len(user_ids)]
+
+        batch = user_ids[: args.batch]
+        variants: Dict[str, Callable[[], List[float]]] = {
+            "http get": lambda: measure(
+                lambda: client.get(f"/{next_id()}").raise_for_status(), args.rounds
+            ),
+            "rpc get": lambda: measure(
+                lambda: stub.GetUser(GetUserRequest(id=next_id())), args.rounds
+            ),
+            "rpc stream": lambda: stream_lookups(stub, user_ids, args.rounds),
+            "http batch": lambda: measure(
+                lambda: client.post(
+                    "/batch", json={"field": "id", "values": batch}
+                ).raise_for_status(),
+                args.rounds // 10,
+            ),
+            "rpc batch": lambda: measure(
+                lambda: stub.BatchGetUsers(BatchGetUsersRequest(values=batch)),
+                args.rounds // 10,
+            ),
+        }
+        print(f"{'variant':>10} {'p50 ms':>8} {'p99 ms':>8} {'calls/s':>8}")
+        for name, run in variants.items():
+            run()  # warm up the connections and the caches of both servers
+            timings = sorted(run())
+            print(
+                f"{name:>10} {statistics.median(timings) * 1000:>8.3f} "
+                f"{timings[int(len(timings) * 0.99)] * 1000:>8.3f} "
+                f"{len(timings) / sum(timings):>8.0f}"
+            )
+        channel.close()
+        client.close()
+    finally:
+        for server in servers:
+            server.send_signal(signal.SIGTERM)
+            server.wait(timeout=30)
+
+
+if __name__ == "__main__":
+    main()
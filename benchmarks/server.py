@@ -0,0 +1,148 @@
+"""
+Compare the throughput and memory of gunicorn with and without gunicorn_conf.py.
+
+Each setup is started on its own port and loaded with concurrent keep-alive
+requests for a fixed duration, then the memory of the master and its workers
+is read from /proc:
+
+- rss: resident memory, counting pages shared between processes once per process
+- pss: proportional memory, splitting shared pages between the processes
+  sharing them, so it shows what copy on write sharing saves
+
+usage: FASTAPI_CONFIG=production python -m benchmarks.server [--duration S]
+    [--concurrency N] [--path PATH]
+"""
+import argparse
+import asyncio
+import os
+import signal
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+import httpx
+
+ROOT = Path(__file__).parent.parent
+
+SETUPS: Dict[str, List[str]] = {
+    # the command line gunicorn_starter.sh used before gunicorn_conf.py
+    "baseline": [
+        "--worker-class",
+        "uvicorn.workers.UvicornWorker",
+        "--workers",
+        "4",
+    ],
+    "gunicorn_conf": ["--config", "gunicorn_conf.py"],
+}
+
+
+def process_tree(pid: int) -> List[int]:
+    pids = [pid]
+    for child in Path(f"/proc/{pid}/task/{pid}/children").read_text().split():
+        pids.extend(process_tree(int(child)))
+    return pids
+
+
+def memory(pid: int) -> Dict[str, float]:
+    """
+    Return the rss and pss of a process and its children in MiB.
+
+    :param pid: The pid of the gunicorn master.
+    :type pid: int
+    :return: The memory of the process tree.
+    :rtype: dict[str, float]
+    """
+    total = {"rss": 0.0, "pss": 0.0}
+    for process in process_tree(pid):
+        for line in Path(f"/proc/{process}/smaps_rollup").read_text().splitlines():
+            name, _, value = line.partition(":")
+            if name.lower() in total:
+                total[name.lower()] += int(value.split()[0]) / 1024
+    return total
+
+
+async def load(url: str, duration: float, concurrency: int) -> Dict[str, float]:
+    latencies: List[float] = []
+    errors = 0
+    deadline = time.perf_counter() + duration
+
+    async def client_loop(client: httpx.AsyncClient):
+        nonlocal errors
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            try:
+                response = await client.get(url)
+                response.raise_for_status()
+                latencies.append(time.perf_counter() - started)
+            except httpx.HTTPError:
+                errors += 1
+
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(limits=limits) as client:
+        await asyncio.gather(*(client_loop(client) for _ in range(concurrency)))
+    latencies.sort()
+    return {
+        "requests/s": len(latencies) / duration,
+        "p50 ms": latencies[len(latencies) // 2] * 1000 if latencies else 0.0,
+        "p99 ms": latencies[int(len(latencies) * 0.99)] * 1000 if latencies else 0.0,
+        "errors": errors,
+    }
+
+
+def wait_until_serving(url: str, timeout: float = 30) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            httpx.get(url).raise_for_status()
+            return
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    raise RuntimeError(f"server did not start serving {url}")
+
+
+def run(name: str, port: int, args: argparse.Namespace) -> Dict[str, float]:
+    server = subprocess.Popen(
+        ["gunicorn", *SETUPS[name], "--bind", f"127.0.0.1:{port}", "app.asgi:app"],
+        cwd=ROOT,
+        env={**os.environ, "GUNICORN_ACCESSLOG": "", "WARM_UP_ENABLED": "false"},
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        url = f"http://127.0.0.1:{port}{args.path}"
+        wait_until_serving(url)
+        # let every worker boot before measuring its memory
+        time.sleep(2)
+        result = asyncio.run(load(url, args.duration, args.concurrency))
+        result.update(memory(server.pid))
+        result["processes"] = len(process_tree(server.pid))
+        return result
+    finally:
+        server.send_signal(signal.SIGTERM)
+        server.wait(timeout=30)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--path", default="/health/live")
+    args = parser.parse_args()
+    if os.getenv("FASTAPI_CONFIG", "testing") == "testing":
+        sys.exit("app.asgi does not run with the testing config, set FASTAPI_CONFIG")
+
+    results = {
+        name: run(name, port, args) for port, name in enumerate(SETUPS, start=8101)
+    }
+    print(f"{'':>14}" + "".join(f"{name:>16}" for name in results))
+    for metric in next(iter(results.values())):
+        print(
+            f"{metric:>14}"
+            + "".join(f"{result[metric]:>16.1f}" for result in results.values())
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Measure the import time and cold start of the application.
+
+Every round runs in a fresh interpreter, so nothing is shared between rounds:
+
+- import: cumulative import time of the app package, from -X importtime
+- create_app: building the FastAPI application
+- startup: running the lifespan, i.e. wiring the container
+- first request: serving the first request once started
+
+A worker is ready to serve once the app is imported, created and started,
+the run fails when the median of that cold start exceeds the budget.
+
+usage: FASTAPI_CONFIG=testing python -m benchmarks.startup [--rounds N] [--budget MS]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from typing import Dict, List
+
+# cold start budget of a gunicorn worker, i.e. import + create_app + startup
+COLD_START_BUDGET_MS = 1000
+
+COLD_START_SCRIPT = """
+import json, time
+from app import create_app
+imported = time.perf_counter()
+app = create_app()
+created = time.perf_counter()
+from fastapi.testclient import TestClient
+with TestClient(app) as client:
+    started = time.perf_counter()
+    client.get("/", allow_redirects=False)
+    served = time.perf_counter()
+print(json.dumps({
+    "create_app": created - imported,
+    "startup": started - created,
+    "first request": served - started,
+}))
+"""
+
+
+def import_time(package: str = "app") -> float:
+    """
+    Return the cumulative import time of a package in seconds.
+
+    :param package: The top level package to measure.
+    :type package: str
+    :return: The cumulative import time.
+    :rtype: float
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {package}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    for line in result.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        fields = [field.strip() for field in line.split("|")]
+        if len(fields) == 3 and fields[2] == package:
+            return int(fields[1]) / 1_000_000
+    raise RuntimeError(f"no import time reported for {package}")
+
+
+def cold_start() -> Dict[str, float]:
+    result = subprocess.run(
+        [sys.executable, "-c", COLD_START_SCRIPT],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--budget", type=float, default=COLD_START_BUDGET_MS)
+    args = parser.parse_args()
+    os.environ.setdefault("FASTAPI_CONFIG", "testing")
+
+    timings: Dict[str, List[float]] = {"import": []}
+    for _ in range(args.rounds):
+        timings["import"].append(import_time())
+        for name, value in cold_start().items():
+            timings.setdefault(name, []).append(value)
+
+    medians = {
+        name: statistics.median(values) * 1000 for name, values in timings.items()
+    }
+    for name, median in medians.items():
+        print(f"{name:>14}: {median:9.1f} ms")
+    cold_start_ms = medians["import"] + medians["create_app"] + medians["startup"]
+    print(f"{'cold start':>14}: {cold_start_ms:9.1f} ms (budget {args.budget:.0f} ms)")
+    if cold_start_ms > args.budget:
+        sys.exit("cold start is over budget")
+
+
+if __name__ == "__main__":
+    main()
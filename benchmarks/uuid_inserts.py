@@ -0,0 +1,90 @@
+"""
+Compare the insert throughput of random UUIDv4 and time-ordered UUIDv7 keys.
+
+For every key version a table shaped like user_roles is created, i.e. a uuid
+primary key and an indexed uuid foreign key, then filled in batches of
+single-row inserts, each batch in its own transaction, as the app inserts.
+Random keys land on random pages of the indexes, so once the indexes
+outgrow shared_buffers every insert reads and splits a page; ordered keys
+always append to the rightmost page.
+
+Reported per version: rows inserted per second, the throughput of the last
+batch, and the size of the primary key index, which page splits leave
+partly empty.
+
+usage: FASTAPI_CONFIG=development python -m benchmarks.uuid_inserts
+    [--rows N] [--batch N]
+"""
+import argparse
+import time
+import uuid
+from typing import Callable, Dict
+
+import sqlalchemy as sa
+
+from app.core.database import engine
+from app.utils import GUID, uuid7
+from app.utils.lazy import unwrap
+
+GENERATORS: Dict[str, Callable[[], uuid.UUID]] = {"uuid4": uuid.uuid4, "uuid7": uuid7}
+
+
+def build_table(name: str) -> sa.Table:
+    return sa.Table(
+        f"benchmark_{name}_keys",
+        sa.MetaData(),
+        sa.Column("id", GUID, primary_key=True),
+        sa.Column("owner_id", GUID, nullable=False, index=True),
+    )
+
+
+def run(name: str, rows: int, batch: int) -> dict:
+    generate = GENERATORS[name]
+    table = build_table(name)
+    db_engine = unwrap(engine)
+    table.drop(db_engine, checkfirst=True)
+    table.create(db_engine)
+    insert = table.insert()
+    started = time.perf_counter()
+    last_batch: float = 0.0
+    try:
+        for offset in range(0, rows, batch):
+            batch_started = time.perf_counter()
+            with db_engine.begin() as connection:
+                for _ in range(min(batch, rows - offset)):
+                    connection.execute(
+                        insert, {"id": generate(), "owner_id": generate()}
+                    )
+            last_batch = time.perf_counter() - batch_started
+        elapsed = time.perf_counter() - started
+        with db_engine.connect() as connection:
+            index_size: int = connection.scalar(
+                sa.text("SELECT pg_relation_size(:index)"),
+                {"index": f"{table.name}_pkey"},
+            )
+    finally:
+        table.drop(db_engine)
+    return {
+        "rows/s": rows / elapsed,
+        "last batch rows/s": min(batch, rows) / last_batch,
+        "pkey size (MB)": index_size / 2**20,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--batch", type=int, default=1000)
+    args = parser.parse_args()
+
+    results = {name: run(name, args.rows, args.batch) for name in GENERATORS}
+    print(f"{'measure':>18} {'uuid4':>10} {'uuid7':>10}")
+    for measure in results["uuid4"]:
+        print(
+            f"{measure:>18} {results['uuid4'][measure]:>10.1f} "
+            f"{results['uuid7'][measure]:>10.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
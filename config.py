@@ -17,10 +17,102 @@ class BaseConfig(BaseSettings):
     db_password: str = ""
     db_name: str = ""
     db_port: str = ""
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    # reminder: read replica config, db_replica_hosts are comma separated
+    # "host" or "host:port" entries sharing the credentials of the primary,
+    # db_replica_strategy is either "round_robin" or "least_latency"
+    db_replica_hosts: str = ""
+    db_replica_strategy: str = constants.ROUND_ROBIN_REPLICA
+    db_replica_retry_interval: float = 30.0
+    # reminder: query stats config, the number and time of the queries of a
+    # request are sent in response headers outside of production
+    query_stats_headers: bool = True
+    slow_query_threshold_ms: float = 500
+    n_plus_one_threshold: int = 5
+    # reminder: startup and health check config, on startup every worker opens
+    # db_pool_warm_size connections and connects to redis, keycloak and kafka
+    warm_up_enabled: bool = True
+    db_pool_warm_size: int = 2
+    health_check_ttl: float = 5.0
+    # reminder: prometheus metrics config, served on /metrics
+    metrics_enabled: bool = True
+    # reminder: tracing config, tracing_exporter is either "console" or "file"
+    tracing_enabled: bool = False
+    tracing_exporter: str = constants.CONSOLE_SPAN_EXPORTER
+    tracing_file: str = "traces.jsonl"
+    tracing_sample_ratio: float = 1.0
+    # reminder: profiling config, admins profile a request by sending the
+    # profiling_header header, and requests whose path starts with one of the
+    # comma separated profiling_paths are profiled with profiling_sample_rate
+    profiling_enabled: bool = False
+    profiling_header: str = "X-Profile"
+    profiling_sample_rate: float = 0.0
+    profiling_paths: str = ""
+    profiling_admin_role: str = "admin"
+    profiling_interval: float = 0.001
+    profiling_ttl: int = 3600
     # reminder: redis server config
     redis_server: str = ""
     redis_port: str = ""
     redis_password: str = ""
+    # reminder: otp config, otp_store_backend is either "redis" or "sql"
+    otp_store_backend: str = constants.REDIS_OTP_STORE
+    otp_code_lifetime: int = 300
+    sec_token_lifetime: int = 300
+    # reminder: rate limit config, limits are "<requests>/<seconds>" and
+    # rate_limit_backend is either "redis" or "memory"
+    rate_limit_enabled: bool = True
+    rate_limit_backend: str = constants.REDIS_RATE_LIMIT_STORE
+    rate_limit_algorithm: str = "sliding_window"
+    rate_limit_ip: str = "60/60"
+    rate_limit_login: str = "5/60"
+    rate_limit_otp_send: str = "3/300"
+    rate_limit_otp_confirm: str = "5/300"
+    rate_limit_phone_verify: str = "3/300"
+    # reminder: comma separated ips of the reverse proxies whose
+    # X-Forwarded-For header is trusted, "*" for any, also passed to gunicorn
+    # as forwarded_allow_ips. The ip limits count the client the first
+    # untrusted address of the header, from the right, belongs to
+    trusted_proxies: str = "127.0.0.1"
+    # reminder: http cache config, caches role and resource responses in redis
+    http_cache_enabled: bool = True
+    http_cache_ttl: int = 300
+    # reminder: user cache config, caches the users resolved by batch lookups
+    # in redis until they are written or user_cache_ttl expires
+    user_cache_enabled: bool = False
+    user_cache_ttl: int = 300
+    # reminder: token cache config, token introspection results are cached in
+    # every worker and in redis until the token expires or token_cache_ttl
+    # elapses, whichever comes first
+    token_cache_ttl: int = 300
+    token_cache_local_size: int = 10000
+    # reminder: token revocation config, revoked tokens are denied in redis
+    # until they expire and every worker keeps a bloom filter of the denylist,
+    # synced over pub/sub and rebuilt every token_revocation_rebuild_interval
+    # seconds. Revoking every token of a user is kept for token_max_lifetime
+    # seconds, which must not be less than the lifetime of an access token
+    token_revocation_capacity: int = 100000
+    token_revocation_error_rate: float = 0.001
+    token_revocation_rebuild_interval: int = 300
+    token_max_lifetime: int = 3600
+    # reminder: activity tracking config, the last time every authenticated
+    # user was seen is kept by each worker and written to the database every
+    # activity_flush_interval seconds, or as soon as activity_flush_size users
+    # are waiting
+    activity_flush_interval: int = 30
+    activity_flush_size: int = 1000
+    # reminder: internal rpc server config, see app/rpc_server.py, every call
+    # opens a session of its own and closes it when the call ends, so up to
+    # grpc_max_workers connections are held at once, keep it within
+    # db_pool_size + db_max_overflow. The server is not encrypted, set
+    # grpc_host to the internal interface to reach it from other hosts
+    grpc_host: str = "localhost"
+    grpc_port: int = 50051
+    grpc_max_workers: int = 10
+    # reminder: role the service accounts of internal callers are granted, the
+    # rpc api and token introspection are only served to them
+    internal_service_role: str = "internal-service"
     # reminder: jwt config
     jwt_algorithms = ["HS256", "RS256"]
     jwt_public_key: str = ""
@@ -36,6 +128,10 @@ class BaseConfig(BaseSettings):
     kafka_server_password: str = ""
     kafka_subscriptions: str = ""
     kafka_consumer_group_id: str = "FASTAPI_GROUP"
+    kafka_event_topic: str = "USER_ACCOUNT_EVENTS"
+    kafka_event_flush_interval: float = 1.0
+    kafka_event_batch_size: int = 500
+    kafka_compression_type: str = "gzip"
     # KEYCLOAK CONFIGURATION
     keycloak_client_id: str = ""
     keycloak_client_secret: str = ""
@@ -43,6 +139,8 @@ class BaseConfig(BaseSettings):
     keycloak_realm: str = ""
     keycloak_admin_username: str = ""
     keycloak_admin_password: str = ""
+    keycloak_timeout: float = 10.0
+    keycloak_pool_size: int = 10
 
     @property
     def SQLALCHEMY_DATABASE_URI(self):  # noqa
@@ -63,10 +161,12 @@ class DevelopmentConfig(BaseConfig):
 
 
 class ProductionConfig(BaseConfig):
-    pass
+    query_stats_headers: bool = False
 
 
 class TestingConfig(BaseConfig):
+    otp_store_backend: str = constants.SQL_OTP_STORE
+    warm_up_enabled: bool = False
     test_db_host: str = ""
     test_db_user: str = ""
     test_db_password: str = ""
@@ -0,0 +1,154 @@
+"""
+Gunicorn settings, selected by the FASTAPI_CONFIG environment variable.
+
+usage: gunicorn --config gunicorn_conf.py app.asgi:app
+
+The production profile preloads the application in the master and freezes
+its objects before forking, so workers share the imported modules copy on
+write instead of each holding a copy. Any setting can be overridden with the
+environment variables read below, e.g. WEB_CONCURRENCY for the worker count.
+"""
+import gc
+import os
+from typing import Any, Dict, Optional
+
+from prometheus_client import multiprocess
+
+from app import constants
+from app.core.database import engine
+from app.utils.lazy import is_created
+from config import settings
+
+PROFILES: Dict[str, Dict[str, Any]] = {
+    constants.DEVELOPMENT_ENVIRONMENT: {
+        "workers_per_core": 1,
+        "max_workers": 2,
+        "preload_app": False,
+        "reload": True,
+        "max_requests": 0,
+        "loglevel": "debug",
+    },
+    constants.PRODUCTION_ENVIRONMENT: {
+        "workers_per_core": 1,
+        "max_workers": 8,
+        "preload_app": True,
+        "reload": False,
+        "max_requests": 10000,
+        "loglevel": "info",
+    },
+}
+
+
+def get_profile(config_name: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Return the gunicorn profile of an environment.
+
+    :param config_name: The environment, defaults to FASTAPI_CONFIG.
+    :type config_name: str, optional
+    :return: The settings of the profile.
+    :rtype: dict
+    """
+    config_name = config_name or os.getenv(
+        "FASTAPI_CONFIG", default=constants.DEVELOPMENT_ENVIRONMENT
+    )
+    return PROFILES.get(config_name, PROFILES[constants.PRODUCTION_ENVIRONMENT])
+
+
+def available_cores() -> int:
+    """
+    Return the number of cores this process may run on.
+
+    :return: The number of cores, which can be less than the cpu count of the
+        host when the process is pinned to some of them.
+    :rtype: int
+    """
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def worker_count(cores: int, workers_per_core: float, max_workers: int) -> int:
+    """
+    Size the workers from the cores available.
+
+    Async workers do not block on io, so one worker per core saturates the
+    cpus, more workers only add memory and database connections.
+
+    :param cores: The number of cores available.
+    :type cores: int
+    :param workers_per_core: The number of workers started for each core.
+    :type workers_per_core: float
+    :param max_workers: The upper bound of workers, 0 for no bound.
+    :type max_workers: int
+    :return: The number of workers, at least 2 so a worker restart never
+        leaves the server without a worker.
+    :rtype: int
+    """
+    workers = max(int(cores * workers_per_core), 2)
+    if max_workers:
+        workers = min(workers, max_workers)
+    return workers
+
+
+profile = get_profile()
+
+# reminder: server socket
+bind = os.getenv("BIND", "0.0.0.0:8000")
+backlog = int(os.getenv("GUNICORN_BACKLOG", 2048))
+
+# reminder: workers
+worker_class = "app.core.workers.UvloopWorker"
+workers = int(
+    os.getenv("WEB_CONCURRENCY", 0)
+    or worker_count(
+        cores=available_cores(),
+        workers_per_core=float(
+            os.getenv("GUNICORN_WORKERS_PER_CORE", profile["workers_per_core"])
+        ),
+        max_workers=int(os.getenv("GUNICORN_MAX_WORKERS", profile["max_workers"])),
+    )
+)
+preload_app = os.getenv("GUNICORN_PRELOAD", str(profile["preload_app"])).lower() in (
+    "1",
+    "true",
+)
+reload = profile["reload"] and not preload_app
+# workers are recycled after max_requests, give or take the jitter, so a
+# leak cannot grow a worker forever and workers do not all restart at once
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", profile["max_requests"]))
+max_requests_jitter = int(os.getenv("GUNICORN_MAX_REQUESTS_JITTER", max_requests // 10))
+timeout = int(os.getenv("GUNICORN_TIMEOUT", 60))
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", 30))
+# keep idle connections of the load balancer open longer than it does, so it
+# never sends a request on a connection the worker is closing
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", 75))
+# the workers rewrite the client of a request from the X-Forwarded-For and
+# X-Forwarded-Proto headers of these proxies only
+forwarded_allow_ips = settings.trusted_proxies
+
+# reminder: logging
+loglevel = os.getenv("GUNICORN_LOGLEVEL", profile["loglevel"])
+errorlog = "-"
+accesslog = os.getenv("GUNICORN_ACCESSLOG", "-") or None
+
+
+def when_ready(server):
+    # move the objects of the preloaded app to the permanent generation, the
+    # collector of a worker then never writes to the pages it shares with the
+    # master, which would copy them
+    if preload_app:
+        gc.collect()
+        gc.freeze()
+        server.log.info(f"froze {gc.get_freeze_count()} objects of the preloaded app")
+
+
+def post_fork(server, worker):
+    # connections opened by the master must not be shared with the workers
+    if is_created(engine):
+        engine.dispose(close=False)
+
+
+def child_exit(server, worker):
+    # drop the live gauges of the worker, its counters keep being aggregated
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        multiprocess.mark_process_dead(worker.pid)
@@ -2,4 +2,10 @@
 
 alembic upgrade head
 
-gunicorn --worker-class uvicorn.workers.UvicornWorker --workers 4  --bind 0.0.0.0:8000 --error-logfile - --access-logfile -  app.asgi:app
+# every worker writes its metrics to this directory, /metrics aggregates them,
+# it is emptied so metrics of a previous run are not aggregated
+export PROMETHEUS_MULTIPROC_DIR="${PROMETHEUS_MULTIPROC_DIR:-/tmp/prometheus_multiproc}"
+rm -rf "$PROMETHEUS_MULTIPROC_DIR"
+mkdir -p "$PROMETHEUS_MULTIPROC_DIR"
+
+gunicorn --config gunicorn_conf.py app.asgi:app
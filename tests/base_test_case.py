@@ -6,6 +6,7 @@ from fastapi.testclient import TestClient
 
 from app import constants
 from app.controllers import ResourceController, RoleController, UserController
+from app.core.container import get_session
 from app.core.database import Base, db, engine
 from app.models import (
     PermissionModel,
@@ -24,6 +25,7 @@ from app.repositories import (
     UserRepository,
     UserRoleRepository,
 )
+from app.services import HttpCacheService, SQLOtpStore, TokenRevocationService
 from tests.data import ResourceTestData, RoleTestData, UserTestData
 from tests.utils import MockKeycloakAuthService, MockSideEffects
 
@@ -42,12 +44,15 @@ class BaseTestCase(MockSideEffects):
         self.refresh_token = self.access_token
         self.headers = {"Authorization": f"Bearer {self.access_token}"}
         Base.metadata.drop_all(bind=engine)
-        test_client = TestClient(app)
         self.setup_test_data()
         self.setup_patches(mocker)
         self.instantiate_classes()
+        # reminder: requests share the session of the test case, so the test
+        # data and the assertions see what the requests wrote
+        app.dependency_overrides[get_session] = lambda: self.db_instance
         try:
-            yield test_client
+            with TestClient(app) as test_client:
+                yield test_client
         finally:
             self.db_instance.close()
             Base.metadata.drop_all(bind=engine)
@@ -80,11 +85,16 @@ class BaseTestCase(MockSideEffects):
         self.user_repository = UserRepository()
         self.user_otp_repository = UserOtpRepository()
         self.mock_auth_service = MockKeycloakAuthService()
+        self.token_revocation_service = TokenRevocationService(
+            capacity=1000, error_rate=0.01, rebuild_interval=60
+        )
         self.user_controller = UserController(
             user_repository=self.user_repository,
-            user_otp_repository=self.user_otp_repository,
+            otp_store=SQLOtpStore(user_otp_repository=self.user_otp_repository),
             keycloak_auth_service=self.mock_auth_service,
+            token_revocation_service=self.token_revocation_service,
         )
+        self.http_cache_service = HttpCacheService()
         self.role_repository = RoleRepository()
         self.user_role_repository = UserRoleRepository()
         self.permission_repository = PermissionRepository()
@@ -95,16 +105,19 @@ class BaseTestCase(MockSideEffects):
             user_role_repository=self.user_role_repository,
             permission_repository=self.permission_repository,
             role_permission_repository=self.role_permission_repository,
+            http_cache_service=self.http_cache_service,
         )
         self.resource_repository = ResourceRepository()
         self.resource_controller = ResourceController(
             resource_repository=self.resource_repository,
             permission_repository=self.permission_repository,
+            http_cache_service=self.http_cache_service,
         )
 
     def setup_patches(self, mocker, **kwargs):
         mocker.patch(
-            "app.services.redis_service.redis_conn", fakeredis.FakeStrictRedis()
+            "app.services.redis_service.redis_conn",
+            fakeredis.FakeStrictRedis(server=fakeredis.FakeServer()),
         )
         mocker.patch(
             "app.utils.auth.jwt.decode",
@@ -118,3 +131,6 @@ class BaseTestCase(MockSideEffects):
             "app.notifications.email_notification_handler.publish_to_kafka",
             return_value=True,
         )
+        self.mock_event_publisher = mocker.patch(
+            "app.event.event_notification_handler.event_publisher"
+        )
@@ -3,6 +3,7 @@ import uuid
 import pytest
 from fastapi_pagination import Page
 
+from app import constants
 from app.core.exceptions import AppException
 from app.enums import SortResultEnum
 from app.models import PermissionModel, ResourceModel, RoleModel
@@ -48,6 +49,11 @@ class TestResourceController(BaseTestCase):
         assert result
         assert isinstance(result, PermissionModel)
         assert self.db_instance.query(PermissionModel).count() == 2
+        version = self.http_cache_service.version(constants.RESOURCE_CACHE_NAMESPACE)
+        assert version[0] == 2
+        event = self.mock_event_publisher.publish.call_args.kwargs
+        assert event["key"] == str(new_resource.id)
+        assert event["value"]["event"] == "permission.assigned"
 
     @pytest.mark.controller
     def test_assign_role_to_user(self, test_app):
@@ -3,6 +3,7 @@ import uuid
 import pytest
 from fastapi_pagination import Page
 
+from app import constants
 from app.core.exceptions import AppException
 from app.enums import SortResultEnum
 from app.models import PermissionModel, RoleModel
@@ -42,6 +43,7 @@ class TestRoleController(BaseTestCase):
         assert result
         assert isinstance(result, RoleModel)
         assert self.db_instance.query(RoleModel).count() == 2
+        assert self.http_cache_service.version(constants.ROLE_CACHE_NAMESPACE)[0] == 1
 
     @pytest.mark.controller
     def test_assign_role_to_user(self, test_app):
@@ -57,6 +59,9 @@ class TestRoleController(BaseTestCase):
         )
         assert result
         assert isinstance(result, RoleModel)
+        event = self.mock_event_publisher.publish.call_args.kwargs
+        assert event["key"] == str(self.user_model.id)
+        assert event["value"]["event"] == "role.assigned"
         with pytest.raises(AppException.OperationErrorException) as op_exc:
             data["role_id"] = uuid.uuid4()
             self.role_controller.assign_role_to_user(
@@ -75,6 +80,9 @@ class TestRoleController(BaseTestCase):
         )
         assert result
         assert isinstance(result, PermissionModel)
+        event = self.mock_event_publisher.publish.call_args.kwargs
+        assert event["key"] == str(self.role_model.id)
+        assert event["value"]["event"] == "permission.assigned"
         with pytest.raises(AppException.OperationErrorException) as op_exc:
             data["permission_id"] = uuid.uuid4()
             self.role_controller.assign_permission_to_role(
@@ -82,3 +90,24 @@ class TestRoleController(BaseTestCase):
                 obj_data=data,
             )
         assert op_exc.value.status_code == 400
+
+    @pytest.mark.controller
+    def test_check_permission(self, test_app):
+        user_id = str(self.user_model.id)
+        resource = self.resource_model.type
+        assert not self.role_controller.check_permission(user_id, resource, "write")
+
+        data = self.role_test_data.assign_permission_to_role
+        data["permission_id"] = self.permission_model.id
+        self.role_controller.assign_permission_to_role(
+            auth_user=self.mock_decode_token(username=self.user_model.username),
+            obj_data=data,
+        )
+        assert self.role_controller.check_permission(user_id, resource, "write")
+        assert not self.role_controller.check_permission(user_id, resource, "read")
+        assert not self.role_controller.check_permission(user_id, "user", "write")
+        assert not self.role_controller.check_permission("invalid", resource, "write")
+
+        self.role_model.is_active = False
+        self.db_instance.commit()
+        assert not self.role_controller.check_permission(user_id, resource, "write")
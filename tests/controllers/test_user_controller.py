@@ -8,6 +8,7 @@ from fastapi_pagination import Page
 from app.core.exceptions import AppException
 from app.enums import SortResultEnum
 from app.models import UserModel
+from app.services import RedisOtpStore
 from app.utils import Params
 from tests.base_test_case import BaseTestCase
 
@@ -72,6 +73,21 @@ class TestUserController(BaseTestCase):
         assert not_found.value.status_code == 404
         assert "not found" in not_found.value.error_message
 
+    @pytest.mark.controller
+    def test_user_events(self, test_app):
+        self.user_controller.update_user(
+            obj_id=self.user_model.id, obj_data=self.user_test_data.update_user
+        )
+        self.user_controller.delete_user(obj_id=self.user_model.id)
+
+        calls = self.mock_event_publisher.publish.call_args_list
+        assert [call.kwargs["value"]["event"] for call in calls] == [
+            "user.updated",
+            "user.deleted",
+        ]
+        assert {call.kwargs["key"] for call in calls} == {str(self.user_model.id)}
+        assert "password" not in calls[0].kwargs["value"]["details"]
+
     def test_user_profile(self, test_app):
         result = self.user_controller.user_profile(
             auth_user=self.mock_decode_token(self.user_model.username)
@@ -365,3 +381,29 @@ class TestUserController(BaseTestCase):
             )
         assert not_found.value.status_code == 404
         assert "not found" in not_found.value.error_message
+
+    @pytest.mark.controller
+    def test_confirm_otp_code_with_redis_store(self, test_app):
+        self.user_controller.otp_store = RedisOtpStore()
+        self.user_controller.send_otp_code(
+            sms=True,
+            email=True,
+            obj_data={"phone": self.user_model.phone},
+        )
+        result = self.user_controller.confirm_otp_code(
+            obj_data={"user_id": self.user_model.id, "otp_code": "123456"}
+        )
+        assert result.get("sec_token")
+        with pytest.raises(AppException.NotFoundException) as not_found:
+            self.user_controller.confirm_otp_code(
+                obj_data={"user_id": self.user_model.id, "otp_code": "123456"}
+            )
+        assert not_found.value.status_code == 404
+        reset_password = {
+            "user_id": self.user_model.id,
+            "new_password": self.user_test_data.create_user.get("password"),
+            "sec_token": result.get("sec_token"),
+        }
+        assert self.user_controller.reset_user_password(obj_data=reset_password)
+        with pytest.raises(AppException.NotFoundException):
+            self.user_controller.reset_user_password(obj_data=reset_password)
@@ -0,0 +1,88 @@
+import time
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy.exc import InvalidRequestError
+
+from app.core.exceptions import AppException
+from app.services import ActivityTrackerService
+from tests.base_test_case import BaseTestCase
+
+
+class TestActivityTrackerService(BaseTestCase):
+    @pytest.fixture
+    def service(self, test_app):
+        container = test_app.app.state.container
+        service = ActivityTrackerService(
+            flush=container.flush_activity, flush_interval=60, flush_size=100
+        )
+        yield service
+        service.stop()
+
+    def last_active(self):
+        self.db_instance.refresh(self.user_model)
+        return self.user_model.last_active
+
+    def test_flush(self, service, mocker):
+        spy = mocker.spy(service, "_flush")
+        service.record(self.user_model.username)
+        service.record(self.user_model.username)
+        service.record("unknown")
+        assert self.last_active() is None
+
+        service.flush()
+        service.flush()
+        assert spy.call_count == 1
+        assert set(spy.call_args.args[0]) == {self.user_model.username, "unknown"}
+        assert self.last_active() is not None
+
+    def test_flush_keeps_later_activity(self, service):
+        later = datetime.now() + timedelta(hours=1)
+        service._flush({self.user_model.username: later})
+        service.record(self.user_model.username)
+        service.flush()
+        assert self.last_active() == later
+
+    def test_flush_failure(self, service, mocker):
+        mocker.patch.object(
+            service,
+            "_flush",
+            side_effect=AppException.OperationErrorException(error_message="error"),
+        )
+        service.record(self.user_model.username)
+        service.flush()
+        assert self.last_active() is None
+
+        mocker.stopall()
+        service.flush()
+        assert self.last_active() is not None
+
+    def test_flush_unexpected_failure(self, service, mocker):
+        mocker.patch.object(service, "_flush", side_effect=InvalidRequestError("error"))
+        service.flush_size = 1
+        service.start()
+        service.record(self.user_model.username)
+        deadline = time.monotonic() + 5
+        while service._flush.call_count < 1 or not service._pending:
+            assert time.monotonic() < deadline, "timed out"
+            time.sleep(0.01)
+        assert service._thread.is_alive()
+
+        mocker.stopall()
+        service.flush()
+        assert self.last_active() is not None
+
+    def test_flush_size(self, service):
+        service.flush_size = 1
+        service.start()
+        service.record(self.user_model.username)
+        deadline = time.monotonic() + 5
+        while self.last_active() is None:
+            assert time.monotonic() < deadline, "timed out"
+            time.sleep(0.01)
+
+    def test_stop(self, service):
+        service.start()
+        service.record(self.user_model.username)
+        service.stop()
+        assert self.last_active() is not None
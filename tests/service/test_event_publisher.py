@@ -0,0 +1,89 @@
+import pytest
+from kafka.errors import KafkaError, KafkaTimeoutError
+from kafka.future import Future
+
+from app.producer import KafkaBatchPublisher
+
+
+class TestKafkaBatchPublisher:
+    @pytest.fixture
+    def publisher(self, mocker):
+        publisher = KafkaBatchPublisher(flush_interval=60, batch_size=2)
+        mocker.patch.object(publisher, "_start_worker")
+        self.mock_producer = mocker.patch.object(publisher, "get_producer")
+        self.mock_producer.return_value.send.side_effect = self.delivered
+        return publisher
+
+    # noinspection PyMethodMayBeStatic
+    def delivered(self, **kwargs):
+        return Future().success(None)
+
+    def test_flush(self, publisher):
+        publisher.publish(topic="events", key="user_1", value={"event": "one"})
+        publisher.publish(topic="events", key="user_2", value={"event": "two"})
+
+        assert publisher.flush() == 2
+        assert publisher.flush() == 0
+        producer = self.mock_producer.return_value
+        assert producer.send.call_count == 2
+        assert producer.send.call_args.kwargs["key"] == "user_2"
+        producer.flush.assert_called_once()
+
+    def test_flush_triggered_by_batch_size(self, publisher):
+        publisher.publish(topic="events", key="user_1", value={"event": "one"})
+        assert not publisher._wakeup.is_set()
+        publisher.publish(topic="events", key="user_1", value={"event": "two"})
+        assert publisher._wakeup.is_set()
+
+    def test_flush_failure_requeues_batch(self, publisher):
+        self.mock_producer.return_value.send.side_effect = KafkaError("down")
+        publisher.publish(topic="events", key="user_1", value={"event": "one"})
+
+        assert publisher.flush() == 0
+        self.mock_producer.return_value.send.side_effect = self.delivered
+        assert publisher.flush() == 1
+
+    def test_failed_delivery_requeues_message(self, publisher):
+        producer = self.mock_producer.return_value
+        producer.send.side_effect = [
+            Future().success(None),
+            Future().failure(KafkaError("rejected")),
+        ]
+        publisher.publish(topic="events", key="user_1", value={"event": "one"})
+        publisher.publish(topic="events", key="user_2", value={"event": "two"})
+
+        assert publisher.flush() == 1
+        assert [message[1] for message in publisher._buffer] == ["user_2"]
+        producer.send.side_effect = self.delivered
+        assert publisher.flush() == 1
+
+    def test_unconfirmed_delivery_requeues_message(self, publisher):
+        pending = Future()
+        producer = self.mock_producer.return_value
+        producer.send.side_effect = [pending]
+        producer.flush.side_effect = KafkaTimeoutError("timed out")
+        publisher.publish(topic="events", key="user_1", value={"event": "one"})
+
+        assert publisher.flush() == 0
+        assert [message[1] for message in publisher._buffer] == ["user_1"]
+        pending.failure(KafkaError("expired"))
+        assert [message[1] for message in publisher._buffer] == ["user_1"]
+
+    def test_failed_deliveries_keep_their_order(self, publisher, mocker):
+        logger = mocker.patch("app.producer.logger")
+        producer = self.mock_producer.return_value
+        producer.send.side_effect = [
+            Future().failure(KafkaError("rejected")),
+            Future().success(None),
+            Future().failure(KafkaError("rejected")),
+            Future().failure(KafkaError("rejected")),
+        ]
+        for key in ("user_1", "user_2", "user_3", "user_4"):
+            publisher.publish(topic="events", key=key, value={"event": "one"})
+        publisher.max_buffer_size = 2
+
+        assert publisher.flush() == 1
+        assert [message[1] for message in publisher._buffer] == ["user_1", "user_3"]
+        logger.error.assert_called_with(
+            "dropped 1 messages, the buffer holds up to 2 messages"
+        )
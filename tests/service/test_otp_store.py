@@ -0,0 +1,58 @@
+import uuid
+from time import sleep
+
+import fakeredis
+import pytest
+
+from app.enums import CodeStatusEnum
+from app.services import RedisOtpStore
+
+
+class TestRedisOtpStore:
+    @pytest.fixture
+    def otp_store(self, mocker):
+        self.redis = fakeredis.FakeStrictRedis()
+        mocker.patch("app.services.redis_service.redis_conn", self.redis)
+        self.user_id = uuid.uuid4()
+        return RedisOtpStore()
+
+    def test_save_code(self, otp_store):
+        otp_store.save_code(self.user_id, "sec_token", "token", lifetime=60)
+        otp_store.save_code(self.user_id, "otp_code", "123456", lifetime=60)
+
+        key = otp_store.key(self.user_id, "otp_code")
+        assert self.redis.get(key).endswith(b":123456")
+        assert 0 < self.redis.ttl(key) <= 60 + 3600
+        assert not self.redis.exists(otp_store.key(self.user_id, "sec_token"))
+
+    def test_consume_code(self, otp_store):
+        otp_store.save_code(self.user_id, "otp_code", "123456", lifetime=60)
+
+        assert (
+            otp_store.consume_code(self.user_id, "otp_code", "654321")
+            == CodeStatusEnum.invalid
+        )
+        assert (
+            otp_store.consume_code(self.user_id, "otp_code", "123456")
+            == CodeStatusEnum.valid
+        )
+        assert (
+            otp_store.consume_code(self.user_id, "otp_code", "123456")
+            == CodeStatusEnum.missing
+        )
+
+    def test_consume_master_code(self, otp_store):
+        otp_store.save_code(self.user_id, "otp_code", "123456", lifetime=60)
+
+        result = otp_store.consume_code(
+            self.user_id, "otp_code", "000000", master_codes=["000000"]
+        )
+        assert result == CodeStatusEnum.valid
+
+    def test_consume_expired_code(self, otp_store):
+        otp_store.save_code(self.user_id, "sec_token", "token", lifetime=1)
+        sleep(1)
+
+        result = otp_store.consume_code(self.user_id, "sec_token", "token")
+        assert result == CodeStatusEnum.expired
+        assert not self.redis.exists(otp_store.key(self.user_id, "sec_token"))
@@ -0,0 +1,44 @@
+import fakeredis
+import pytest
+from redis.exceptions import ConnectionError
+
+from app.enums import RateLimitAlgorithmEnum
+from app.services import MemoryRateLimitStore, RedisRateLimitStore
+
+
+class TestRateLimitStore:
+    @pytest.fixture(params=["redis", "memory"])
+    def rate_limit_store(self, request, mocker):
+        mocker.patch(
+            "app.services.redis_service.redis_conn", fakeredis.FakeStrictRedis()
+        )
+        if request.param == "redis":
+            return RedisRateLimitStore()
+        return MemoryRateLimitStore()
+
+    @pytest.mark.parametrize("algorithm", list(RateLimitAlgorithmEnum))
+    def test_hit(self, rate_limit_store, algorithm):
+        for _ in range(3):
+            assert rate_limit_store.hit(["user"], [(3, 60)], algorithm) == 0
+
+        retry_after = rate_limit_store.hit(["user"], [(3, 60)], algorithm)
+        assert 0 < retry_after <= 60
+        assert rate_limit_store.hit(["other_user"], [(3, 60)], algorithm) == 0
+
+    @pytest.mark.parametrize("algorithm", list(RateLimitAlgorithmEnum))
+    def test_hit_multiple_keys(self, rate_limit_store, algorithm):
+        assert rate_limit_store.hit(["ip", "user"], [(5, 60), (1, 60)], algorithm) == 0
+        assert rate_limit_store.hit(["ip", "user"], [(5, 60), (1, 60)], algorithm) > 0
+        # the rejected request is not counted against the ip
+        for _ in range(4):
+            assert rate_limit_store.hit(["ip"], [(5, 60)], algorithm) == 0
+        assert rate_limit_store.hit(["ip"], [(5, 60)], algorithm) > 0
+
+    def test_redis_fallback(self, mocker):
+        redis = mocker.patch("app.services.redis_service.redis_conn")
+        redis.register_script.side_effect = ConnectionError
+        rate_limit_store = RedisRateLimitStore()
+        algorithm = RateLimitAlgorithmEnum.sliding_window
+
+        assert rate_limit_store.hit(["user"], [(1, 60)], algorithm) == 0
+        assert rate_limit_store.hit(["user"], [(1, 60)], algorithm) > 0
@@ -0,0 +1,45 @@
+import time
+
+from redis.exceptions import ConnectionError
+
+from app.services import TokenCacheService, redis_service
+from tests.base_test_case import BaseTestCase
+
+
+class TestTokenCacheService(BaseTestCase):
+    result = {"active": True, "username": "test"}
+
+    def test_shared_between_workers(self, test_app):
+        worker, other_worker = TokenCacheService(60, 10), TokenCacheService(60, 10)
+        assert worker.get("token") is None
+
+        worker.set("token", self.result, expires_at=time.time() + 30)
+        assert worker.get("token") == self.result
+        assert other_worker.get("token") == self.result
+        assert other_worker._local
+
+    def test_expiry(self, test_app, mocker):
+        cache = TokenCacheService(ttl=60, local_size=10)
+        cache.set("expired", self.result, expires_at=time.time() - 1)
+        assert cache.get("expired") is None
+
+        cache.set("token", self.result, expires_at=time.time() + 3600)
+        assert 0 < redis_service.redis_conn.ttl(cache.key("token")) <= 60
+        mocker.patch("app.services.token_cache_service.time.time", return_value=1e12)
+        assert cache.get("token") is None
+
+    def test_local_size(self, test_app, mocker):
+        cache = TokenCacheService(ttl=60, local_size=2)
+        for token in ("first", "second", "third"):
+            cache.set(token, self.result, expires_at=time.time() + 30)
+        assert list(cache._local) == [cache.key("second"), cache.key("third")]
+
+    def test_redis_unavailable(self, test_app, mocker):
+        redis_conn = mocker.patch("app.services.redis_service.redis_conn")
+        redis_conn.set.side_effect = ConnectionError
+        redis_conn.pipeline.side_effect = ConnectionError
+        cache = TokenCacheService(ttl=60, local_size=10)
+
+        cache.set("token", self.result, expires_at=time.time() + 30)
+        assert cache.get("token") == self.result
+        assert TokenCacheService(ttl=60, local_size=10).get("token") is None
@@ -0,0 +1,73 @@
+import time
+
+import pytest
+from redis.exceptions import ConnectionError
+
+from app.services import TokenRevocationService, redis_service
+from app.utils import token_digest
+from tests.base_test_case import BaseTestCase
+
+
+class TestTokenRevocationService(BaseTestCase):
+    @pytest.fixture
+    def service(self, test_app):
+        service = TokenRevocationService(
+            capacity=1000, error_rate=0.01, rebuild_interval=60
+        )
+        yield service
+        service.stop()
+
+    def wait_until(self, condition) -> None:
+        deadline = time.monotonic() + 5
+        while not condition():
+            assert time.monotonic() < deadline, "timed out"
+            time.sleep(0.01)
+
+    def test_revoke_token(self, service):
+        payload = {"username": "test", "exp": time.time() + 30}
+        assert not service.is_revoked("token", payload)
+
+        service.revoke_token("token", expires_at=payload["exp"])
+        assert service.is_revoked("token", payload)
+        assert not service.is_revoked("other token", payload)
+        key = service.key("token", token_digest("token"))
+        assert 0 < redis_service.redis_conn.ttl(key) <= 31
+
+    def test_revoke_user(self, service):
+        issued_before = {"username": "test", "iat": int(time.time()) - 1}
+        service.revoke_user("test")
+        issued_after = {"username": "test", "iat": int(time.time()) + 1}
+
+        assert service.is_revoked("token", issued_before)
+        assert not service.is_revoked("token", issued_after)
+        assert not service.is_revoked("token", {"username": "other", "iat": 0})
+
+    def test_sync(self, service, mocker):
+        service.revoke_token("revoked before start", expires_at=time.time() + 30)
+        service.start()
+        self.wait_until(lambda: service.synced)
+        assert service.key("user", "test") not in service.bloom_filter
+
+        # revoked by another worker
+        TokenRevocationService(1000, 0.01, 60).revoke_user("test")
+        self.wait_until(lambda: service.key("user", "test") in service.bloom_filter)
+
+        mget = mocker.spy(redis_service.redis_conn, "mget")
+        payload = {"username": "other", "iat": 0}
+        assert not service.is_revoked("token", payload)
+        assert mget.call_count == 0
+        assert service.is_revoked("revoked before start", payload)
+        assert service.is_revoked("token", {"username": "test", "iat": 0})
+        assert mget.call_count == 2
+
+    def test_redis_unavailable(self, service, mocker):
+        mocker.patch.object(
+            redis_service.redis_conn, "mget", side_effect=ConnectionError
+        )
+        # never synced: only the keys revoked by the worker are denied
+        assert not service.is_revoked("token", {"username": "test"})
+        service.bloom_filter.add(service.key("user", "test"))
+        assert service.is_revoked("token", {"username": "test"})
+        service.synced = True
+        assert service.is_revoked("token", {"username": "test"})
+        assert not service.is_revoked("token", {"username": "other"})
@@ -0,0 +1,44 @@
+from app.core.database import QueryStats, query_stats
+from app.repositories import UserRepository
+from app.services import UserCacheService
+from tests.base_test_case import BaseTestCase
+
+
+class TestUserCacheService(BaseTestCase):
+    def find_many_by(self, repository: UserRepository, field: str, values: list):
+        stats = QueryStats()
+        token = query_stats.set(stats)
+        try:
+            return repository.find_many_by(field, values), stats.count
+        finally:
+            query_stats.reset(token)
+
+    def test_find_many_by_reads_cache_first(self, test_app):
+        repository = UserRepository(user_cache_service=UserCacheService(ttl=60))
+        user_id = str(self.user_model.id)
+        username = self.user_model.username
+
+        users, queries = self.find_many_by(repository, "id", [user_id])
+        assert [str(user.id) for user in users] == [user_id]
+        assert queries == 1
+
+        for field, value in (("id", user_id), ("username", username)):
+            users, queries = self.find_many_by(repository, field, [value])
+            assert [user.username for user in users] == [username]
+            assert users[0].password is None
+            assert queries == 0
+
+        repository.update_by_id(user_id, {"username": "renamed"})
+        users, queries = self.find_many_by(repository, "username", [username])
+        assert users == []
+        assert queries == 1
+        users, queries = self.find_many_by(repository, "username", ["renamed"])
+        assert [str(user.id) for user in users] == [user_id]
+        assert queries == 1
+
+    def test_find_many_by_without_cache(self, test_app):
+        repository = UserRepository()
+        users, queries = self.find_many_by(repository, "email", ["test@example.com"])
+        assert [user.id for user in users] == [self.user_model.id]
+        users, queries = self.find_many_by(repository, "email", ["test@example.com"])
+        assert queries == 1
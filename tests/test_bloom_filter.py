@@ -0,0 +1,15 @@
+from app.utils import BloomFilter
+
+
+def test_bloom_filter():
+    bloom_filter = BloomFilter(capacity=1000, error_rate=0.01)
+    items = [f"revoked:token:{index}" for index in range(1000)]
+    for item in items:
+        bloom_filter.add(item)
+
+    assert all(item in bloom_filter for item in items)
+    false_positives = sum(
+        f"revoked:user:{index}" in bloom_filter for index in range(10000)
+    )
+    assert false_positives < 200
+    assert bloom_filter.hash_count == 7
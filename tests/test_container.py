@@ -0,0 +1,53 @@
+import pytest
+
+from app import constants
+from app.controllers import ResourceController, RoleController, UserController
+from app.core.container import Container, get_session
+from app.services import RedisOtpStore, SQLOtpStore
+from tests.base_test_case import BaseTestCase
+
+
+class TestContainer(BaseTestCase):
+    def test_app_container(self, test_app):
+        container = test_app.app.state.container
+
+        assert isinstance(container, Container)
+        session = self.db_instance
+        assert isinstance(container.user_controller(session), UserController)
+        assert isinstance(container.role_controller(session), RoleController)
+        assert isinstance(container.resource_controller(session), ResourceController)
+
+    def test_scopes(self, test_app):
+        container = Container()
+        first_controller = container.role_controller(self.db_instance)
+        second_controller = container.role_controller(self.db_instance)
+
+        assert first_controller is not second_controller
+        assert first_controller.role_repository is not second_controller.role_repository
+        assert (
+            first_controller.http_cache_service is second_controller.http_cache_service
+        )
+
+    @pytest.mark.parametrize(
+        "backend, otp_store",
+        [
+            (constants.SQL_OTP_STORE, SQLOtpStore),
+            (constants.REDIS_OTP_STORE, RedisOtpStore),
+        ],
+    )
+    def test_otp_store(self, test_app, mocker, backend, otp_store):
+        mocker.patch("app.core.container.settings.otp_store_backend", backend)
+        user_controller = Container().user_controller(self.db_instance)
+
+        assert isinstance(user_controller.otp_store, otp_store)
+
+    def test_session_per_request(self, test_app, mocker):
+        create_session = mocker.patch("app.core.container.create_session")
+        create_session.side_effect = lambda: mocker.Mock()
+        first_request, second_request = get_session(), get_session()
+        first_session, second_session = next(first_request), next(second_request)
+
+        assert first_session is not second_session
+        first_request.close()
+        first_session.close.assert_called_once()
+        second_session.close.assert_not_called()
@@ -0,0 +1,104 @@
+import gzip
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from decimal import Decimal
+
+import anyio
+import orjson
+import pytest
+
+from app.enums import StatusEnum
+from app.utils import (
+    ORJSONResponse,
+    accepts_gzip,
+    close_after_stream,
+    encode_csv,
+    encode_ndjson,
+    gzip_stream,
+)
+
+
+def test_orjson_response():
+    user_id = uuid.uuid4()
+    created_at = datetime(2023, 1, 1, tzinfo=timezone.utc)
+    response = ORJSONResponse(
+        {
+            "id": user_id,
+            "balance": Decimal("10.50"),
+            "status": StatusEnum.active,
+            "created_at": created_at,
+            1: "non string key",
+        }
+    )
+
+    assert response.media_type == "application/json"
+    assert orjson.loads(response.body) == {
+        "id": str(user_id),
+        "balance": "10.50",
+        "status": "active",
+        "created_at": "2023-01-01T00:00:00+00:00",
+        "1": "non string key",
+    }
+
+
+def test_encode_csv():
+    user_id = uuid.uuid4()
+    batches = [[(user_id, "a,b", None, StatusEnum.active)], [(user_id, "c", 1, None)]]
+    chunks = list(encode_csv(["id", "name", "count", "status"], batches))
+    assert chunks == [
+        b"id,name,count,status\r\n",
+        f'{user_id},"a,b",,active\r\n'.encode(),
+        f"{user_id},c,1,\r\n".encode(),
+    ]
+
+
+def test_encode_ndjson_gzip():
+    batches = [[(1, StatusEnum.active), (2, None)]]
+    compressed = b"".join(gzip_stream(encode_ndjson(["id", "status"], batches)))
+    assert gzip.decompress(compressed) == (
+        b'{"id":1,"status":"active"}\n{"id":2,"status":null}\n'
+    )
+
+
+@pytest.mark.parametrize(
+    "accept_encoding, expected",
+    [
+        ("gzip, deflate", True),
+        ("deflate, gzip;q=0.5", True),
+        ("*", True),
+        ("gzip;q=0", False),
+        ("gzip; q=0, *", False),
+        ("identity", False),
+        ("", False),
+    ],
+)
+def test_accepts_gzip(accept_encoding, expected):
+    assert accepts_gzip(accept_encoding) is expected
+
+
+def test_close_after_stream_on_disconnect():
+    closed = threading.Event()
+
+    def chunks():
+        try:
+            while True:
+                time.sleep(0.001)
+                yield b"chunk"
+        finally:
+            closed.set()
+
+    async def disconnect():
+        async with anyio.create_task_group() as task_group:
+
+            async def stream():
+                async for _ in close_after_stream(chunks()):
+                    pass
+
+            task_group.start_soon(stream)
+            await anyio.sleep(0.05)
+            task_group.cancel_scope.cancel()
+
+    anyio.run(disconnect)
+    assert closed.is_set()
@@ -0,0 +1,47 @@
+import time
+import uuid
+
+from sqlalchemy.dialects import postgresql, sqlite
+
+from app.models import ResourceModel
+from app.utils import GUID, uuid7
+from tests.base_test_case import BaseTestCase
+
+
+def test_uuid7():
+    before: int = time.time_ns() // 1_000_000
+    ids = [uuid7() for _ in range(10_000)]
+    after: int = time.time_ns() // 1_000_000
+
+    assert all(id.version == 7 and id.variant == uuid.RFC_4122 for id in ids)
+    assert ids == sorted(ids)
+    assert len(set(ids)) == len(ids)
+    assert before <= ids[0].int >> 80 <= ids[-1].int >> 80 <= after + 1
+
+
+def test_guid_processors():
+    guid = GUID()
+    id = uuid7()
+
+    dialect = postgresql.psycopg2.dialect()
+    assert guid.bind_processor(dialect)(id) is id
+    assert guid.bind_processor(dialect)(str(id)) == str(id)
+    assert guid.result_processor(dialect, None) is None
+
+    dialect = sqlite.dialect()
+    assert guid.bind_processor(dialect)(id) == id.hex
+    assert guid.result_processor(dialect, None)(id.hex) == id
+
+
+class TestGuidColumn(BaseTestCase):
+    def test_uuid7_primary_key(self, test_app):
+        resource = ResourceModel(
+            type="benchmark", created_by=str(uuid.uuid4()), updated_by=str(uuid.uuid4())
+        )
+        self.commit_data_model(resource)
+
+        assert resource.id.version == 7
+        self.db_instance.expunge_all()
+        found = self.db_instance.query(ResourceModel).filter_by(id=str(resource.id))
+        assert isinstance(found.one().id, uuid.UUID)
+        assert found.one().id == resource.id
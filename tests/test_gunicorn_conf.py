@@ -0,0 +1,29 @@
+import gunicorn_conf
+from app import constants
+from config import settings
+
+
+def test_worker_count():
+    assert gunicorn_conf.worker_count(cores=1, workers_per_core=1, max_workers=8) == 2
+    assert gunicorn_conf.worker_count(cores=4, workers_per_core=1, max_workers=8) == 4
+    assert gunicorn_conf.worker_count(cores=16, workers_per_core=1, max_workers=8) == 8
+    assert gunicorn_conf.worker_count(cores=16, workers_per_core=2, max_workers=0) == 32
+
+
+def test_get_profile():
+    production = gunicorn_conf.get_profile(constants.PRODUCTION_ENVIRONMENT)
+    development = gunicorn_conf.get_profile(constants.DEVELOPMENT_ENVIRONMENT)
+    assert production["preload_app"] and not production["reload"]
+    assert production["max_requests"] > 0
+    assert development["reload"] and not development["preload_app"]
+    assert gunicorn_conf.get_profile("unknown") == production
+
+
+def test_settings():
+    assert gunicorn_conf.worker_class == "app.core.workers.UvloopWorker"
+    assert gunicorn_conf.max_requests_jitter == gunicorn_conf.max_requests // 10
+    assert gunicorn_conf.workers >= 2
+
+
+def test_forwarded_allow_ips():
+    assert gunicorn_conf.forwarded_allow_ips == settings.trusted_proxies
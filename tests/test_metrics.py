@@ -0,0 +1,87 @@
+import fakeredis
+import pytest
+import redis
+from prometheus_client import REGISTRY
+
+from app.api.api_v1.endpoints import health_base_url, metrics_base_url, role_base_url
+from app.core.metrics import UNMATCHED_ROUTE, observe_dependency
+from app.services.redis_service import TimedRedis
+from tests.base_test_case import BaseTestCase
+
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+class TestMetrics(BaseTestCase):
+    def test_request_metrics(self, test_app):
+        labels = {"method": "GET", "route": f"{role_base_url}/{{role_id}}"}
+        requests = sample("http_requests_total", status="200", **labels)
+        observed = sample("http_request_duration_seconds_count", **labels)
+
+        response = test_app.get(
+            f"{role_base_url}/{self.role_model.id}", headers=self.headers
+        )
+        assert response.status_code == 200
+        assert sample("http_requests_total", status="200", **labels) == requests + 1
+        assert sample("http_request_duration_seconds_count", **labels) == observed + 1
+
+    def test_unmatched_route(self, test_app):
+        labels = {"method": "GET", "route": UNMATCHED_ROUTE, "status": "404"}
+        requests = sample("http_requests_total", **labels)
+        test_app.get("/does-not-exist")
+        test_app.get("/does-not-exist-either")
+        assert sample("http_requests_total", **labels) == requests + 2
+
+    def test_database_metrics(self, test_app):
+        labels = {"dependency": "database", "operation": "SELECT", "outcome": "success"}
+        queries = sample("dependency_request_duration_seconds_count", **labels)
+        test_app.get(f"{role_base_url}/{self.role_model.id}", headers=self.headers)
+        assert sample("dependency_request_duration_seconds_count", **labels) > queries
+
+    def test_metrics_endpoint(self, test_app):
+        test_app.get(f"{health_base_url}/live")
+        response = test_app.get(metrics_base_url)
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        assert (
+            f'http_requests_total{{method="GET",route="{health_base_url}/live",'
+            f'status="200"}}' in response.text
+        )
+
+
+def test_observe_dependency():
+    labels = {"dependency": "kafka", "operation": "FLUSH", "outcome": "error"}
+    errors = sample("dependency_request_duration_seconds_count", **labels)
+    with pytest.raises(ConnectionError):
+        with observe_dependency("kafka", "FLUSH"):
+            raise ConnectionError
+    assert sample("dependency_request_duration_seconds_count", **labels) == errors + 1
+
+
+def test_timed_redis():
+    connection_pool = redis.ConnectionPool(
+        connection_class=fakeredis.FakeConnection, server=fakeredis.FakeServer()
+    )
+    redis_conn = TimedRedis(connection_pool=connection_pool)
+    labels = {"dependency": "redis", "outcome": "success"}
+    sets = sample("dependency_request_duration_seconds_count", operation="SET", **labels)
+    pipelines = sample(
+        "dependency_request_duration_seconds_count", operation="PIPELINE", **labels
+    )
+
+    redis_conn.set("key", "value")
+    pipeline = redis_conn.pipeline()
+    pipeline.get("key")
+    assert pipeline.execute() == [b"value"]
+
+    assert (
+        sample("dependency_request_duration_seconds_count", operation="SET", **labels)
+        == sets + 1
+    )
+    assert (
+        sample(
+            "dependency_request_duration_seconds_count", operation="PIPELINE", **labels
+        )
+        == pipelines + 1
+    )
@@ -0,0 +1,106 @@
+import threading
+import time
+
+import pytest
+
+from app import create_app
+from app.api.api_v1.endpoints import health_base_url, profile_base_url, role_base_url
+from app.core.profiling import SamplingProfiler
+from config import settings
+from tests.base_test_case import BaseTestCase
+
+
+class TestProfiling(BaseTestCase):
+    @pytest.fixture
+    def app(self, mocker):
+        mocker.patch.object(settings, "profiling_enabled", True)
+        return create_app()
+
+    @pytest.fixture
+    def admin(self, test_app, mocker):
+        payload = self.mock_decode_token(self.user_model.username)
+        payload["realm_access"] = {"roles": [settings.profiling_admin_role]}
+        mocker.patch("app.utils.auth.jwt.decode", return_value=payload)
+
+    @pytest.mark.usefixtures("admin")
+    def test_profile_request(self, test_app):
+        response = test_app.get(
+            f"{role_base_url}/{self.role_model.id}",
+            headers={**self.headers, settings.profiling_header: "1"},
+        )
+        assert response.status_code == 200
+        profile_id = response.headers["X-Profile-Id"]
+
+        response = test_app.get(f"{profile_base_url}/{profile_id}", headers=self.headers)
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        stack, _, count = response.text.splitlines()[0].rpartition(" ")
+        assert ";" in stack
+        assert int(count) > 0
+
+    @pytest.mark.usefixtures("admin")
+    def test_profile_with_request_id(self, test_app):
+        response = test_app.get(
+            f"{health_base_url}/live",
+            headers={
+                **self.headers,
+                settings.profiling_header: "1",
+                "X-Request-ID": "request-1",
+            },
+        )
+        profile_id = response.headers["X-Profile-Id"]
+        assert profile_id != "request-1"
+
+        response = test_app.get(f"{profile_base_url}/{profile_id}", headers=self.headers)
+        assert response.status_code == 200
+        assert response.headers["X-Request-ID"] == "request-1"
+
+    def test_profile_header_requires_admin(self, test_app):
+        response = test_app.get(
+            f"{health_base_url}/live",
+            headers={**self.headers, settings.profiling_header: "1"},
+        )
+        assert response.status_code == 200
+        assert "X-Profile-Id" not in response.headers
+
+    def test_sampled_path(self, test_app, mocker):
+        mocker.patch.object(settings, "profiling_sample_rate", 1.0)
+        mocker.patch.object(settings, "profiling_paths", f"{health_base_url},/other")
+        assert "X-Profile-Id" in test_app.get(f"{health_base_url}/live").headers
+        assert "X-Profile-Id" not in test_app.get("/does-not-exist").headers
+
+    def test_get_profile_requires_admin(self, test_app):
+        response = test_app.get(f"{profile_base_url}/profile-1", headers=self.headers)
+        assert response.status_code == 403
+
+    @pytest.mark.usefixtures("admin")
+    def test_get_missing_profile(self, test_app):
+        response = test_app.get(f"{profile_base_url}/profile-1", headers=self.headers)
+        assert response.status_code == 404
+
+
+def test_profiling_disabled():
+    app = create_app()
+    paths = [route.path for route in app.routes]
+    assert f"{profile_base_url}/{{profile_id}}" not in paths
+
+
+def test_sampling_profiler():
+    stopped = threading.Event()
+
+    def busy():
+        while not stopped.is_set():
+            sum(range(1000))
+
+    thread = threading.Thread(target=busy, name="busy")
+    thread.start()
+    profiler = SamplingProfiler(interval=0.001)
+    profiler.start()
+    time.sleep(0.05)
+    profiler.stop()
+    stopped.set()
+    thread.join()
+
+    stacks = [line.rpartition(" ")[0] for line in profiler.folded().splitlines()]
+    assert any(stack.startswith("busy;") for stack in stacks)
+    assert not any(stack.startswith("profiler;") for stack in stacks)
@@ -0,0 +1,57 @@
+from sqlalchemy import text
+
+from app.api.api_v1.endpoints import role_base_url
+from app.core.database import QueryStats, query_stats
+from config import settings
+from tests.base_test_case import BaseTestCase
+
+
+class TestQueryTracker(BaseTestCase):
+    def test_query_stats_headers(self, test_app):
+        response = test_app.get(
+            f"{role_base_url}/{self.role_model.id}", headers=self.headers
+        )
+        assert response.status_code == 200
+        assert int(response.headers["X-DB-Query-Count"]) > 0
+        assert float(response.headers["X-DB-Query-Time"]) >= 0
+
+    def test_query_stats_headers_disabled(self, test_app, mocker):
+        mocker.patch.object(settings, "query_stats_headers", False)
+        response = test_app.get(
+            f"{role_base_url}/{self.role_model.id}", headers=self.headers
+        )
+        assert "X-DB-Query-Count" not in response.headers
+
+    def test_query_stats(self, test_app):
+        stats = QueryStats()
+        token = query_stats.set(stats)
+        try:
+            for _ in range(3):
+                self.db_instance.execute(text("SELECT 1")).scalar()
+        finally:
+            query_stats.reset(token)
+        assert stats.count == 3
+        assert stats.statements["SELECT 1"] == 3
+        assert stats.repeated_statements(3) == {"SELECT 1": 3}
+        assert stats.repeated_statements(4) == {}
+
+    def test_n_plus_one_warning(self, test_app, mocker):
+        mocker.patch.object(settings, "n_plus_one_threshold", 1)
+        mock_logger = mocker.patch("app.core.database.query_tracker.logger")
+        test_app.get(f"{role_base_url}/{self.role_model.id}", headers=self.headers)
+        messages = [call.args[0] for call in mock_logger.warning.call_args_list]
+        assert any(
+            message.startswith(f"probable N+1 query on GET {role_base_url}/{{role_id}}")
+            for message in messages
+        )
+
+    def test_slow_query_explain(self, test_app, mocker):
+        mocker.patch.object(settings, "slow_query_threshold_ms", 0)
+        mock_logger = mocker.patch("app.core.database.query_tracker.logger")
+        result = self.db_instance.execute(
+            text("SELECT name FROM roles WHERE id = :id"), {"id": self.role_model.id}
+        )
+        assert result.scalar() == self.role_model.name
+        message = mock_logger.warning.call_args.args[0]
+        assert message.startswith("slow query took")
+        assert "Scan" in message
@@ -0,0 +1,49 @@
+import pytest
+from starlette.requests import Request
+
+from app.enums import RateLimitKeyEnum
+from app.utils import KeycloakJwtAuthentication, RateLimiter
+from app.utils.rate_limit import client_ip
+from config import settings
+
+
+def make_request(host: str, forwarded_for: str = "", token: str = "") -> Request:
+    headers = []
+    if forwarded_for:
+        headers.append((b"x-forwarded-for", forwarded_for.encode()))
+    if token:
+        headers.append((b"authorization", f"Bearer {token}".encode()))
+    return Request(
+        {"type": "http", "headers": headers, "client": (host, 1234), "state": {}}
+    )
+
+
+@pytest.mark.parametrize(
+    "trusted_proxies, host, forwarded_for, expected",
+    [
+        ("127.0.0.1", "10.0.0.5", "", "10.0.0.5"),
+        ("127.0.0.1", "10.0.0.5", "1.2.3.4", "10.0.0.5"),
+        ("10.0.0.5", "10.0.0.5", "1.2.3.4", "1.2.3.4"),
+        ("10.0.0.5, 10.0.0.6", "10.0.0.5", "6.6.6.6, 1.2.3.4, 10.0.0.6", "1.2.3.4"),
+        ("10.0.0.5", "10.0.0.5", "", "10.0.0.5"),
+        ("*", "10.0.0.5", "1.2.3.4, 10.0.0.6", "1.2.3.4"),
+    ],
+)
+def test_client_ip(mocker, trusted_proxies, host, forwarded_for, expected):
+    mocker.patch.object(settings, "trusted_proxies", trusted_proxies)
+    assert client_ip(make_request(host, forwarded_for)) == expected
+
+
+def test_token_decoded_once(mocker):
+    decode_token = mocker.patch.object(
+        KeycloakJwtAuthentication,
+        "decode_token",
+        return_value={"username": "user", "user_id": "id"},
+    )
+    request = make_request("10.0.0.5", token="token")
+    rate_limiter = RateLimiter("login", {RateLimitKeyEnum.username: "5/60"})
+
+    identities = rate_limiter.identities(request, {})
+    assert identities[RateLimitKeyEnum.username] == "user"
+    assert KeycloakJwtAuthentication().token_payload(request, "token")["user_id"]
+    decode_token.assert_called_once()
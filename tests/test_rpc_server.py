@@ -0,0 +1,181 @@
+import uuid
+from functools import partial
+
+import grpc
+import pytest
+from jwt.exceptions import ExpiredSignatureError
+from sqlalchemy.orm import Session
+
+from app.core.container import Container
+from app.core.database import create_session
+from app.models import RolePermissionModel
+from app.rpc import create_rpc_server
+from app.rpc.user_service_pb2 import (
+    BatchGetUsersRequest,
+    CheckPermissionRequest,
+    GetUserRequest,
+    LookupField,
+    ValidateTokenRequest,
+)
+from app.rpc.user_service_pb2_grpc import UserServiceStub
+from config import settings
+from tests.base_test_case import BaseTestCase
+
+
+class AuthenticatedStub:
+    def __init__(self, stub: UserServiceStub, token: str):
+        self.stub = stub
+        self.metadata = [("authorization", f"Bearer {token}")]
+
+    def __getattr__(self, name):
+        return partial(getattr(self.stub, name), metadata=self.metadata)
+
+
+class TestRpcServer(BaseTestCase):
+    @pytest.fixture
+    def service_payload(self, mocker):
+        payload = self.mock_decode_token("service-account-orders")
+        payload["realm_access"] = {"roles": [settings.internal_service_role]}
+        mocker.patch("app.rpc.interceptors.decode_token", return_value=payload)
+        return payload
+
+    @pytest.fixture
+    def raw_stub(self, test_app, service_payload):
+        server = create_rpc_server(Container(), max_workers=2)
+        port = server.add_insecure_port("localhost:0")
+        server.start()
+        channel = grpc.insecure_channel(f"localhost:{port}")
+        try:
+            yield UserServiceStub(channel)
+        finally:
+            channel.close()
+            server.stop(None)
+
+    @pytest.fixture
+    def stub(self, raw_stub):
+        return AuthenticatedStub(raw_stub, "service-token")
+
+    def test_authentication(self, raw_stub, service_payload):
+        request = GetUserRequest(id=str(self.user_model.id))
+        with pytest.raises(grpc.RpcError) as error:
+            raw_stub.GetUser(request)
+        assert error.value.code() == grpc.StatusCode.UNAUTHENTICATED
+        with pytest.raises(grpc.RpcError) as error:
+            list(raw_stub.StreamGetUsers(iter([request])))
+        assert error.value.code() == grpc.StatusCode.UNAUTHENTICATED
+
+        service_payload["realm_access"] = {"roles": ["offline_access"]}
+        with pytest.raises(grpc.RpcError) as error:
+            AuthenticatedStub(raw_stub, "user-token").GetUser(request)
+        assert error.value.code() == grpc.StatusCode.PERMISSION_DENIED
+
+    def grant_permission(self):
+        self.commit_data_model(
+            RolePermissionModel(
+                role_id=self.role_model.id, permission_id=self.permission_model.id
+            )
+        )
+
+    def test_get_user(self, stub):
+        user_id = str(self.user_model.id)
+
+        response = stub.GetUser(GetUserRequest(id=user_id))
+        assert response.found
+        assert response.user.id == user_id
+        assert response.user.username == self.user_model.username
+        assert response.user.birth_date == self.user_model.birth_date.isoformat()
+        assert response.user.created_at.ToDatetime().year >= 2023
+        assert not response.user.HasField("deleted_at")
+        for missing_id in (str(uuid.uuid4()), "invalid"):
+            with pytest.raises(grpc.RpcError) as error:
+                stub.GetUser(GetUserRequest(id=missing_id))
+            assert error.value.code() == grpc.StatusCode.NOT_FOUND
+
+    def test_batch_get_users(self, stub):
+        response = stub.BatchGetUsers(
+            BatchGetUsersRequest(
+                field=LookupField.USERNAME,
+                values=[self.user_model.username, "unknown"],
+            )
+        )
+        assert [user.id for user in response.users] == [str(self.user_model.id)]
+        assert list(response.missing) == ["unknown"]
+
+        response = stub.BatchGetUsers(
+            BatchGetUsersRequest(values=[str(self.user_model.id)])
+        )
+        assert [user.username for user in response.users] == [self.user_model.username]
+
+        with pytest.raises(grpc.RpcError) as error:
+            stub.BatchGetUsers(BatchGetUsersRequest(field=LookupField.EMAIL))
+        assert error.value.code() == grpc.StatusCode.INVALID_ARGUMENT
+
+    def test_check_permission(self, stub):
+        request = CheckPermissionRequest(
+            user_id=str(self.user_model.id),
+            resource=self.resource_model.type,
+            mode=self.permission_model.mode,
+        )
+        assert not stub.CheckPermission(request).allowed
+        self.grant_permission()
+        assert stub.CheckPermission(request).allowed
+
+        with pytest.raises(grpc.RpcError) as error:
+            stub.CheckPermission(CheckPermissionRequest(user_id=request.user_id))
+        assert error.value.code() == grpc.StatusCode.INVALID_ARGUMENT
+
+    def test_validate_token(self, stub, mocker):
+        response = stub.ValidateToken(ValidateTokenRequest(token=self.access_token))
+        assert response.valid
+        assert response.username == self.user_model.username
+
+        mocker.patch(
+            "app.utils.auth.jwt.decode",
+            side_effect=ExpiredSignatureError("Signature has expired"),
+        )
+        response = stub.ValidateToken(ValidateTokenRequest(token=self.access_token))
+        assert not response.valid
+        assert response.error == "Signature has expired"
+
+    def test_streams(self, stub):
+        self.grant_permission()
+        user_id = str(self.user_model.id)
+        missing_id = str(uuid.uuid4())
+
+        responses = stub.StreamGetUsers(
+            iter([GetUserRequest(id=user_id), GetUserRequest(id=missing_id)])
+        )
+        assert [(response.id, response.found) for response in responses] == [
+            (user_id, True),
+            (missing_id, False),
+        ]
+
+        responses = stub.StreamCheckPermissions(
+            CheckPermissionRequest(
+                user_id=user_id, resource=self.resource_model.type, mode=mode
+            )
+            for mode in ("write", "read", "write")
+        )
+        assert [response.allowed for response in responses] == [True, False, True]
+
+        responses = stub.StreamValidateTokens(
+            iter([ValidateTokenRequest(token=self.access_token)] * 3)
+        )
+        assert [response.valid for response in responses] == [True] * 3
+
+    def test_session_per_call(self, stub, mocker):
+        sessions = []
+
+        def open_session(**kwargs):
+            sessions.append(create_session(**kwargs))
+            return sessions[-1]
+
+        mocker.patch("app.rpc.user_rpc_service.create_session", side_effect=open_session)
+        close = mocker.spy(Session, "close")
+        request = GetUserRequest(id=str(self.user_model.id))
+        assert stub.GetUser(request).found
+        assert stub.GetUser(request).found
+
+        assert len(sessions) == 2 and sessions[0] is not sessions[1]
+        closed = [call.args[0] for call in close.call_args_list]
+        assert all(session in closed for session in sessions)
@@ -0,0 +1,67 @@
+import io
+import json
+import uuid
+from datetime import date
+
+from app import constants
+from app.core.factory import CopyStream
+from app.enums import StatusEnum
+from app.factory.seed_db import UserFactory, seed_db
+from app.models import RolePermissionModel, UserModel, UserRoleModel
+from tests.base_test_case import BaseTestCase
+
+
+class TestSeedDb(BaseTestCase):
+    def test_seed_db(self, test_app, mocker):
+        mocker.patch.object(constants, "FACTORY_PASSWORDS", ["1234"])
+        fixtures = io.StringIO()
+        counts = seed_db(
+            users=20,
+            roles=3,
+            resources=2,
+            roles_per_user=2,
+            permissions_per_role=3,
+            seed=1,
+            keycloak_fixtures=fixtures,
+        )
+        assert counts == {
+            "users": 20,
+            "roles": 3,
+            "resources": 2,
+            "permissions": 8,
+            "role_permissions": 9,
+            "user_roles": 40,
+        }
+
+        username: str = UserFactory(1, ["hash"]).row(0)["username"]
+        user = self.db_instance.query(UserModel).filter_by(username=username).one()
+        assert user.verify_password("1234")
+        assert (
+            self.db_instance.query(UserRoleModel).filter_by(user_id=user.id).count() == 2
+        )
+        role_permissions = self.db_instance.query(RolePermissionModel).all()
+        assert len({(row.role_id, row.permission_id) for row in role_permissions}) == 9
+
+        keycloak_users = [json.loads(line) for line in fixtures.getvalue().splitlines()]
+        assert len(keycloak_users) == 20
+        assert keycloak_users[0]["username"] == username
+        assert keycloak_users[0]["id"] == user.auth_provider_id
+
+
+def test_user_factory_is_deterministic():
+    rows = list(UserFactory(1, ["hash"]).rows(5))
+    assert rows == list(UserFactory(1, ["hash"]).rows(5))
+    assert rows != list(UserFactory(2, ["hash"]).rows(5))
+
+
+def test_copy_stream():
+    rows = [
+        (uuid.UUID(int=1), "a,b", None, True, StatusEnum.active, date(2024, 1, 2)),
+        (uuid.UUID(int=2), "c", 3, False, StatusEnum.inactive, None),
+    ]
+    stream = CopyStream(rows)
+    assert stream.read(8) + stream.read() == (
+        b'00000000-0000-0000-0000-000000000001,"a,b",,t,active,2024-01-02\n'
+        b"00000000-0000-0000-0000-000000000002,c,3,f,inactive,\n"
+    )
+    assert stream.count == 2
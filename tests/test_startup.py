@@ -0,0 +1,37 @@
+import subprocess
+import sys
+from unittest import mock
+
+from app.utils.lazy import LazyObject, is_created, unwrap
+
+# modules that are slow to import and only needed once a client is used
+LAZY_MODULES = ("kafka", "requests", "psycopg2", "passlib.handlers.bcrypt")
+
+
+def test_lazy_imports():
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import sys, app; "
+            f"print(*[m for m in {LAZY_MODULES!r} if m in sys.modules], sep=',')",
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    assert result.stdout.strip() == ""
+
+
+def test_lazy_object():
+    factory = mock.Mock(return_value=mock.Mock(name="client"))
+    client = LazyObject(factory)
+
+    assert not is_created(client)
+    client.ping()
+    client.ping()
+    assert is_created(client)
+    assert unwrap(client) is factory.return_value
+    assert factory.call_count == 1
+    assert factory.return_value.ping.call_count == 2
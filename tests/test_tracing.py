@@ -0,0 +1,122 @@
+import json
+
+import pytest
+from opentelemetry import trace
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+
+from app import constants, create_app
+from app.api.api_v1.endpoints import user_base_url
+from app.core.tracing import (
+    create_span_exporter,
+    extract_kafka_context,
+    kafka_headers,
+    trace_methods,
+    tracer,
+)
+from app.producer import KafkaBatchPublisher
+from config import settings
+from tests.base_test_case import BaseTestCase
+
+TRACE_ID = "4bf92f3577b34da6a3ce929d0e0e4736"
+span_exporter = InMemorySpanExporter()
+
+
+@pytest.fixture
+def spans():
+    # the tracer provider can only be set once per process
+    if not isinstance(trace.get_tracer_provider(), TracerProvider):
+        provider = TracerProvider()
+        provider.add_span_processor(SimpleSpanProcessor(span_exporter))
+        trace.set_tracer_provider(provider)
+    span_exporter.clear()
+    yield span_exporter
+    span_exporter.clear()
+
+
+class TestTracing(BaseTestCase):
+    @pytest.fixture
+    def app(self, spans, mocker):
+        mocker.patch.object(settings, "tracing_enabled", True)
+        yield create_app()
+
+    def test_login_spans(self, test_app, spans, mocker):
+        keycloak_response = mocker.Mock(status_code=200)
+        keycloak_response.json.return_value = self.mock_auth_service.tokens
+        request = mocker.patch(
+            "app.services.keycloak_service.http_session.request",
+            return_value=keycloak_response,
+        )
+        response = test_app.post(
+            f"{user_base_url}/token/access",
+            json=self.user_test_data.login_user,
+            headers={"traceparent": f"00-{TRACE_ID}-00f067aa0ba902b7-01"},
+        )
+        assert response.status_code == 200
+
+        finished = {span.name: span for span in spans.get_finished_spans()}
+        server = finished[f"POST {user_base_url}/token/access"]
+        assert format(server.context.trace_id, "032x") == TRACE_ID
+        assert server.attributes["http.status_code"] == 200
+        for name in (
+            "UserController.user_login",
+            "UserRepository.find",
+            "bcrypt.verify",
+            "database SELECT",
+            "keycloak POST",
+        ):
+            assert finished[name].context.trace_id == server.context.trace_id
+        keycloak_span = finished["keycloak POST"]
+        traceparent = request.call_args.kwargs["headers"]["traceparent"]
+        assert traceparent.split("-")[2] == format(keycloak_span.context.span_id, "016x")
+
+
+def test_kafka_context_propagation(spans, mocker):
+    publisher = KafkaBatchPublisher(flush_interval=60, batch_size=10)
+    mocker.patch.object(publisher, "_start_worker")
+    producer = mocker.patch.object(publisher, "get_producer").return_value
+
+    with tracer.start_as_current_span("publish") as span:
+        headers = kafka_headers()
+        publisher.publish(topic="events", key="user_1", value={"event": "one"})
+    publisher.flush()
+
+    assert [key for key, _ in headers] == ["traceparent"]
+    assert producer.send.call_args.kwargs["headers"] == headers
+    context = extract_kafka_context(headers)
+    with tracer.start_as_current_span("consume", context=context) as consumer_span:
+        assert consumer_span.context.trace_id == span.context.trace_id
+
+
+def test_generator_method_span(spans):
+    @trace_methods
+    class Repository:
+        def stream(self):
+            with tracer.start_as_current_span("query"):
+                pass
+            yield 1
+            yield 2
+
+    batches = Repository().stream()
+    assert not spans.get_finished_spans()
+    assert list(batches) == [1, 2]
+    query_span, stream_span = spans.get_finished_spans()
+    assert stream_span.name == "Repository.stream"
+    assert query_span.parent.span_id == stream_span.context.span_id
+
+
+def test_no_kafka_headers_outside_of_a_span(spans):
+    assert kafka_headers() == []
+
+
+def test_file_span_exporter(spans, tmp_path, mocker):
+    mocker.patch.object(settings, "tracing_file", str(tmp_path / "traces.jsonl"))
+    exporter = create_span_exporter(constants.FILE_SPAN_EXPORTER)
+    with tracer.start_as_current_span("exported"):
+        pass
+    exporter.export(spans.get_finished_spans())
+    exporter.shutdown()
+
+    lines = (tmp_path / "traces.jsonl").read_text().splitlines()
+    assert [json.loads(line)["name"] for line in lines] == ["exported"]
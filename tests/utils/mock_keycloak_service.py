@@ -18,6 +18,9 @@ class MockKeycloakAuthService(KeycloakAuthService):
     def refresh_token(self, *args, **kwargs):
         return self.tokens
 
+    def logout(self, *args, **kwargs):
+        return True
+
     def create_user(self, *args, **kwargs):
         return self.user_data
 
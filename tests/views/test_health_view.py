@@ -0,0 +1,86 @@
+import pytest
+
+from app.api.api_v1.endpoints import health_base_url
+from app.services import HealthService
+from tests.base_test_case import BaseTestCase
+
+
+class TestHealthView(BaseTestCase):
+    @pytest.fixture
+    def health_service(self, test_app, mocker):
+        health_service = test_app.app.state.container.health_service
+        mocker.patch.object(health_service, "check_keycloak", return_value=None)
+        mocker.patch.object(health_service, "check_kafka", return_value=None)
+        return health_service
+
+    @pytest.mark.view
+    def test_live(self, test_app):
+        response = test_app.get(f"{health_base_url}/live")
+        assert response.status_code == 200
+        assert response.json() == {"status": "ok", "checks": {}}
+
+    @pytest.mark.view
+    def test_ready(self, test_app, health_service):
+        response = test_app.get(f"{health_base_url}/ready")
+        assert response.status_code == 200
+        assert response.json() == {
+            "status": "ok",
+            "checks": {"database": True, "redis": True, "keycloak": True, "kafka": True},
+        }
+
+    @pytest.mark.view
+    def test_ready_with_failed_check(self, test_app, health_service, mocker):
+        mocker.patch.object(
+            health_service, "check_redis", side_effect=ConnectionError("down")
+        )
+        response = test_app.get(f"{health_base_url}/ready")
+        response_data = response.json()
+        assert response.status_code == 503
+        assert response_data["status"] == "unavailable"
+        assert response_data["checks"]["redis"] is False
+
+    @pytest.mark.view
+    def test_ready_ignores_kafka(self, test_app, health_service, mocker):
+        mocker.patch.object(
+            health_service, "check_kafka", side_effect=ConnectionError("down")
+        )
+        response = test_app.get(f"{health_base_url}/ready")
+        assert response.status_code == 200
+        assert response.json()["checks"]["kafka"] is False
+
+    @pytest.mark.view
+    def test_ready_before_warm_up(self, test_app, health_service):
+        health_service.warmed_up = False
+        response = test_app.get(f"{health_base_url}/ready")
+        assert response.status_code == 503
+
+    @pytest.mark.view
+    def test_ready_caches_checks(self, test_app, health_service, mocker):
+        check_database = mocker.spy(health_service, "check_database")
+        test_app.get(f"{health_base_url}/ready")
+        test_app.get(f"{health_base_url}/ready")
+        assert check_database.call_count == 1
+
+    def test_warm_up(self, health_service, mocker):
+        warm_up_keycloak = mocker.patch.object(health_service, "warm_up_keycloak")
+        health_service.warmed_up = False
+        result = health_service.warm_up()
+        assert result == {
+            "database": True,
+            "redis": True,
+            "keycloak": True,
+            "kafka": True,
+        }
+        assert health_service.warmed_up
+        warm_up_keycloak.assert_called_once()
+
+    def test_checks_expire(self, test_app, mocker):
+        health_service = HealthService(
+            keycloak_auth_service=self.mock_auth_service, cache_ttl=0
+        )
+        mocker.patch.object(health_service, "check_keycloak")
+        mocker.patch.object(health_service, "check_kafka")
+        check_redis = mocker.spy(health_service, "check_redis")
+        health_service.checks()
+        health_service.checks()
+        assert check_redis.call_count == 2
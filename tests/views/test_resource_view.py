@@ -53,3 +53,19 @@ class TestResourceView(BaseTestCase):
         assert response_data
         assert response.status_code == 200
         assert isinstance(response_data, dict)
+
+    @pytest.mark.view
+    def test_get_resource_conditional(self, test_app):
+        response = test_app.get(
+            f"{resource_base_url}/{self.resource_model.id}", headers=self.headers
+        )
+        last_modified = response.headers.get("Last-Modified")
+        assert response.status_code == 200
+        assert last_modified
+
+        response = test_app.get(
+            f"{resource_base_url}/{self.resource_model.id}",
+            headers={**self.headers, "If-Modified-Since": last_modified},
+        )
+        assert response.status_code == 304
+        assert not response.content
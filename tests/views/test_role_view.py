@@ -1,6 +1,9 @@
+import uuid
+
 import pytest
 
 from app.api.api_v1.endpoints import role_base_url
+from app.controllers import RoleController
 from tests.base_test_case import BaseTestCase
 
 
@@ -67,3 +70,53 @@ class TestRoleView(BaseTestCase):
         assert response_data
         assert response.status_code == 200
         assert isinstance(response_data, dict)
+
+    @pytest.mark.view
+    def test_get_all_roles_conditional(self, test_app, mocker):
+        view_all_roles = mocker.spy(RoleController, "view_all_roles")
+        response = test_app.get(f"{role_base_url}/", headers=self.headers)
+        etag = response.headers.get("ETag")
+        assert response.status_code == 200
+        assert etag
+        assert response.headers.get("Last-Modified")
+
+        response = test_app.get(
+            f"{role_base_url}/", headers={**self.headers, "If-None-Match": etag}
+        )
+        assert response.status_code == 304
+        response = test_app.get(f"{role_base_url}/", headers=self.headers)
+        assert response.status_code == 200
+        assert response.headers.get("ETag") == etag
+        assert view_all_roles.call_count == 1
+
+        test_app.post(
+            f"{role_base_url}/",
+            json=self.role_test_data.create_role,
+            headers=self.headers,
+        )
+        response = test_app.get(
+            f"{role_base_url}/", headers={**self.headers, "If-None-Match": etag}
+        )
+        assert response.status_code == 200
+        assert response.headers.get("ETag") != etag
+        assert response.json().get("count") == 2
+        assert view_all_roles.call_count == 2
+
+    @pytest.mark.view
+    def test_get_role_conditional(self, test_app):
+        response = test_app.get(
+            f"{role_base_url}/{self.role_model.id}", headers=self.headers
+        )
+        etag = response.headers.get("ETag")
+        assert response.status_code == 200
+        response = test_app.get(
+            f"{role_base_url}/{self.role_model.id}",
+            headers={**self.headers, "If-None-Match": etag},
+        )
+        assert response.status_code == 304
+
+        response = test_app.get(
+            f"{role_base_url}/{uuid.uuid4()}",
+            headers={**self.headers, "If-None-Match": "*"},
+        )
+        assert response.status_code == 404
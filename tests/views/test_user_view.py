@@ -1,12 +1,27 @@
+import csv
+import io
+import json
+import time
+import uuid
 from unittest import mock
 
 import pytest
+from jwt.exceptions import ExpiredSignatureError
 
-from app.api.api_v1.endpoints.user_view import user_base_url
+from app.api.api_v1.endpoints.user_view import internal_service, user_base_url
+from config import settings
 from tests.base_test_case import BaseTestCase
 
 
 class TestUserView(BaseTestCase):
+    service_headers = {"Authorization": "Bearer service-token"}
+
+    @pytest.fixture
+    def service_caller(self, mocker):
+        payload = self.mock_decode_token("service-account-orders")
+        payload["realm_access"] = {"roles": [settings.internal_service_role]}
+        mocker.patch.object(internal_service, "decode_token", return_value=payload)
+
     @pytest.mark.view
     def test_get_all_users(self, test_app):
         response = test_app.get(f"{user_base_url}/", headers=self.headers)
@@ -15,6 +30,30 @@ class TestUserView(BaseTestCase):
         assert response.status_code == 200
         assert isinstance(response_data, dict)
 
+    @pytest.mark.view
+    def test_get_all_users_sparse_fields(self, test_app):
+        response = test_app.get(
+            f"{user_base_url}/",
+            params={"fields": "id, username,id"},
+            headers=self.headers,
+        )
+        assert response.status_code == 200
+        assert response.json() == {
+            "data": [
+                {"id": str(self.user_model.id), "username": self.user_model.username}
+            ],
+            "count": 1,
+        }
+
+    @pytest.mark.view
+    def test_get_all_users_unknown_fields(self, test_app):
+        response = test_app.get(
+            f"{user_base_url}/",
+            params={"fields": "username,password"},
+            headers=self.headers,
+        )
+        assert response.status_code == 400
+
     def test_get_user(self, test_app):
         response = test_app.get(
             f"{user_base_url}/{self.user_model.id}", headers=self.headers
@@ -63,6 +102,9 @@ class TestUserView(BaseTestCase):
             f"{user_base_url}/{self.user_model.id}", headers=self.headers
         )
         assert response.status_code == 204
+        # the tokens issued to the deleted user are revoked
+        response = test_app.get(f"{user_base_url}/account/profile", headers=self.headers)
+        assert response.status_code == 401
 
     @pytest.mark.view
     @mock.patch("app.services.keycloak_service.KeycloakAuthService.get_token")
@@ -76,6 +118,24 @@ class TestUserView(BaseTestCase):
         assert response.status_code == 200
         assert isinstance(response_data, dict)
 
+    @pytest.mark.view
+    @mock.patch("app.services.keycloak_service.KeycloakAuthService.get_token")
+    def test_user_login_rate_limit(self, mock_get_token, test_app):
+        login_data = {**self.user_test_data.login_user, "password": "wrong"}
+        for _ in range(5):
+            response = test_app.post(f"{user_base_url}/token/access", json=login_data)
+            assert response.status_code == 400
+        response = test_app.post(f"{user_base_url}/token/access", json=login_data)
+        assert response.status_code == 429
+        assert response.headers.get("Retry-After")
+        assert response.json().get("error") == "TooManyRequestsException"
+        response = test_app.post(
+            f"{user_base_url}/token/access",
+            json={**login_data, "username": "another_user"},
+        )
+        assert response.status_code == 400
+        assert not mock_get_token.called
+
     @pytest.mark.view
     def test_user_profile(self, test_app):
         response = test_app.get(f"{user_base_url}/account/profile", headers=self.headers)
@@ -84,6 +144,16 @@ class TestUserView(BaseTestCase):
         assert response.status_code == 200
         assert isinstance(response_data, dict)
 
+    @pytest.mark.view
+    def test_user_activity(self, test_app):
+        assert self.user_model.last_active is None
+        response = test_app.get(f"{user_base_url}/account/profile", headers=self.headers)
+        assert response.status_code == 200
+
+        test_app.app.state.container.activity_tracker_service.flush()
+        self.db_instance.refresh(self.user_model)
+        assert self.user_model.last_active is not None
+
     @pytest.mark.view
     @mock.patch("app.services.keycloak_service.KeycloakAuthService.refresh_token")
     def test_refresh_token(self, mock_refresh_token, test_app):
@@ -229,6 +299,17 @@ class TestUserView(BaseTestCase):
         assert self.user_otp_model.otp_code is not None
         assert self.user_otp_model.otp_code_expiration is not None
 
+    @pytest.mark.view
+    def test_send_otp_rate_limit(self, test_app):
+        phone = self.user_model.phone
+        for same_phone in (phone, f"+233{phone[-9:]}", f"233{phone[-9:]}"):
+            response = test_app.post(
+                f"{user_base_url}/otp/send", json={"phone": same_phone}
+            )
+            assert response.status_code != 429
+        response = test_app.post(f"{user_base_url}/otp/send", json={"phone": phone})
+        assert response.status_code == 429
+
     @pytest.mark.view
     def test_confirm_otp(self, test_app):
         send_otp = test_app.post(
@@ -253,3 +334,136 @@ class TestUserView(BaseTestCase):
         assert self.user_otp_model.otp_code_expiration is None
         assert self.user_otp_model.sec_token is not None
         assert self.user_otp_model.sec_token_expiration is not None
+
+    @pytest.mark.view
+    @pytest.mark.usefixtures("service_caller")
+    @mock.patch("app.services.keycloak_service.KeycloakAuthService.logout")
+    def test_user_logout(self, mock_logout, test_app):
+        response = test_app.post(
+            f"{user_base_url}/logout",
+            json={"refresh_token": self.refresh_token},
+            headers=self.headers,
+        )
+        assert response.status_code == 204
+        mock_logout.assert_called_once_with(refresh_token=self.refresh_token)
+
+        response = test_app.get(f"{user_base_url}/account/profile", headers=self.headers)
+        assert response.status_code == 401
+        response = test_app.post(
+            f"{user_base_url}/token/introspect",
+            json={"token": self.access_token},
+            headers=self.service_headers,
+        )
+        assert response.json() == {"active": False}
+
+    @pytest.mark.view
+    @pytest.mark.usefixtures("service_caller")
+    def test_introspect_token(self, test_app, mocker):
+        payload = self.mock_decode_token(self.user_model.username)
+        payload["exp"] = int(time.time()) + 60
+        payload["realm_access"] = {"roles": ["offline_access"]}
+        decode = mocker.patch("app.utils.auth.jwt.decode", return_value=payload)
+        for _ in range(2):
+            response = test_app.post(
+                f"{user_base_url}/token/introspect",
+                json={"token": self.access_token},
+                headers=self.service_headers,
+            )
+            assert response.status_code == 200
+            assert response.json() == {
+                "active": True,
+                "user_id": str(self.user_model.id),
+                "username": self.user_model.username,
+                "status": self.user_model.status.value,
+                "roles": ["admin", "offline_access"],
+                "exp": payload["exp"],
+            }
+        assert decode.call_count == 1
+
+    @pytest.mark.view
+    @pytest.mark.usefixtures("service_caller")
+    def test_introspect_invalid_token(self, test_app, mocker):
+        mocker.patch(
+            "app.utils.auth.jwt.decode",
+            side_effect=ExpiredSignatureError("Signature has expired"),
+        )
+        response = test_app.post(
+            f"{user_base_url}/token/introspect",
+            json={"token": self.access_token},
+            headers=self.service_headers,
+        )
+        assert response.status_code == 200
+        assert response.json() == {"active": False}
+
+    @pytest.mark.view
+    def test_introspect_token_requires_service(self, test_app):
+        data = {"token": self.access_token}
+        response = test_app.post(f"{user_base_url}/token/introspect", json=data)
+        assert response.status_code == 403
+        response = test_app.post(
+            f"{user_base_url}/token/introspect", json=data, headers=self.headers
+        )
+        assert response.status_code == 403
+
+    @pytest.mark.view
+    def test_get_users_batch(self, test_app):
+        user_id = str(self.user_model.id)
+        unknown_id = str(uuid.uuid4())
+        response = test_app.post(
+            f"{user_base_url}/batch",
+            json={"values": [user_id.upper(), "not-a-uuid", unknown_id, user_id]},
+            headers=self.headers,
+        )
+        assert response.status_code == 200
+        response_data = response.json()
+        assert [user["id"] for user in response_data["data"]] == [user_id]
+        assert response_data["missing"] == ["not-a-uuid", unknown_id]
+
+        response = test_app.post(
+            f"{user_base_url}/batch",
+            json={"field": "username", "values": [self.user_model.username, "nobody"]},
+            headers=self.headers,
+        )
+        assert [user["id"] for user in response.json()["data"]] == [user_id]
+        assert response.json()["missing"] == ["nobody"]
+
+    @pytest.mark.view
+    def test_get_users_batch_too_large(self, test_app):
+        response = test_app.post(
+            f"{user_base_url}/batch",
+            json={"values": [str(uuid.uuid4()) for _ in range(101)]},
+            headers=self.headers,
+        )
+        assert response.status_code == 400
+
+    @pytest.mark.view
+    def test_export_users_csv(self, test_app):
+        response = test_app.get(f"{user_base_url}/export", headers=self.headers)
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/csv")
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.headers["vary"] == "Accept-Encoding"
+        rows = list(csv.DictReader(io.StringIO(response.text)))
+        assert len(rows) == 1
+        assert rows[0]["id"] == str(self.user_model.id)
+        assert rows[0]["username"] == self.user_model.username
+        assert rows[0]["status"] == self.user_model.status.value
+        assert "password" not in rows[0]
+
+    @pytest.mark.view
+    def test_export_users_ndjson(self, test_app):
+        response = test_app.get(
+            f"{user_base_url}/export",
+            params={"format": "ndjson", "search": "no-such-user"},
+            headers={**self.headers, "Accept-Encoding": "gzip;q=0, identity"},
+        )
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/x-ndjson"
+        assert "content-encoding" not in response.headers
+        assert response.content == b""
+
+        response = test_app.get(
+            f"{user_base_url}/export", params={"format": "ndjson"}, headers=self.headers
+        )
+        users = [json.loads(line) for line in response.text.splitlines()]
+        assert [user["id"] for user in users] == [str(self.user_model.id)]